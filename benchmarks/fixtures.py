@@ -0,0 +1,60 @@
+import time
+import random
+from utils.fake_openai_server import ANSWER_SENTENCES
+from .mock_llm import LatencyModel
+
+# 자막 문장 (오타 사전에 있는 이름과 어려운 단어를 섞어서 실제 자막과 비슷하게)
+TRANSCRIPT_SENTENCES = [
+    "오늘은 인공지능이 우리 생활을 어떻게 바꾸는지 알아보겠습니다.",
+    "스아레즈 선수는 경기에서 데이터 분석을 활용한다고 합니다.",
+    "메씨도 훈련할 때 알고리즘이 추천한 프로그램을 씁니다.",
+    "로봇 기술은 공장 자동화에서 시작해서 이제는 집안일까지 돕고 있습니다.",
+    "우주 탐사선은 스스로 길을 찾아서 먼 행성까지 날아갑니다.",
+    "바다 속 생물을 연구하는 과학자들도 카메라와 인공지능을 함께 씁니다.",
+    "음악을 만드는 인공지능은 수많은 노래의 패턴을 학습했습니다.",
+    "이런 기술에는 좋은 점도 있지만 조심해야 할 점도 있습니다.",
+    # 가짜 서버의 Q&A 답변 문장도 영상에서 말한 내용 (근거 확인이 자막에서 찾을 수 있도록)
+    *ANSWER_SENTENCES,
+]
+
+def make_video_info(video_id="benchmark01", sentences=400, seed=0):
+    """
+    get_video_info()와 같은 형식의 고정 비디오 정보 (네트워크 없이 실행)
+
+    Args:
+        video_id: 비디오 ID
+        sentences: 자막 문장 수 (기본 400문장, 약 10분 분량)
+        seed: 문장 순서를 섞는 시드
+    """
+    rng = random.Random(seed)
+    lines = [rng.choice(TRANSCRIPT_SENTENCES) for _ in range(sentences)]
+    return {
+        "video_id": video_id,
+        "title": "인공지능과 로봇이 바꾸는 세상",
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "thumbnail_url": f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg",
+        "description": "벤치마크용 고정 비디오",
+        "duration": sentences * 1.5,
+        "transcript": " ".join(lines),
+        "language_used": "ko",
+        # 자막 줄마다 1.5초 (근거 확인이 인용하는 시작 시각)
+        "segments": [{"text": line, "start": i * 1.5, "duration": 1.5} for i, line in enumerate(lines)],
+    }
+
+def fixture_video_fetcher(video_info, latency="fixed:0", seed=0, sleep=time.sleep):
+    """
+    get_video_info 대신 쓰는 함수 (URL과 관계없이 같은 비디오 정보, 지연시간만 흉내)
+
+    Returns:
+        url → video_info 복사본을 돌려주는 함수
+    """
+    latency = LatencyModel.parse(latency)
+    rng = random.Random(seed)
+
+    def get_video_info(url):
+        delay = latency.sample(rng)
+        if delay > 0:
+            sleep(delay)
+        return dict(video_info, url=url or video_info["url"])
+
+    return get_video_info
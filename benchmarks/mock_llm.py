@@ -0,0 +1,135 @@
+import math
+import time
+import random
+import hashlib
+import threading
+from utils.fake_openai_server import classify_prompt, estimate_tokens, scripted_response
+
+class LatencyModel:
+    """
+    LLM 응답 지연시간 분포
+
+    - "fixed:0.2": 항상 0.2초
+    - "uniform:0.1,0.5": 0.1~0.5초 균등분포
+    - "normal:0.3,0.1": 평균 0.3초, 표준편차 0.1초 (0 미만은 0)
+    - "lognormal:0.8,0.5": 중앙값 0.8초, 시그마 0.5 (실제 API처럼 꼬리가 긴 분포)
+    """
+
+    KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+
+    def __init__(self, kind="fixed", *params):
+        if kind not in self.KINDS:
+            raise ValueError(f"알 수 없는 지연시간 분포: {kind} (가능: {', '.join(self.KINDS)})")
+        if len(params) != self.KINDS[kind]:
+            raise ValueError(f"{kind} 분포는 인자 {self.KINDS[kind]}개가 필요합니다: {params}")
+        self.kind = kind
+        self.params = tuple(float(p) for p in params)
+
+    @classmethod
+    def parse(cls, spec):
+        """"lognormal:0.8,0.5" 같은 문자열 → LatencyModel ("0.2"는 fixed:0.2)"""
+        if isinstance(spec, cls):
+            return spec
+        kind, _, params = str(spec).partition(":")
+        if not params:
+            kind, params = "fixed", kind
+        return cls(kind.strip(), *params.split(","))
+
+    def sample(self, rng):
+        """rng(random.Random)로 지연시간(초) 하나 뽑기"""
+        if self.kind == "fixed":
+            value = self.params[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(*self.params)
+        elif self.kind == "normal":
+            value = rng.gauss(*self.params)
+        else:
+            median, sigma = self.params
+            value = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        return max(0.0, value)
+
+    def __str__(self):
+        return f"{self.kind}:{','.join(f'{p:g}' for p in self.params)}"
+
+class MockLLM:
+    """
+    결정적인 벤치마크용 LLM (call_llm_with_usage와 같은 시그니처)
+
+    응답은 (seed, 모델, 프롬프트)로, 지연시간은 여기에 같은 프롬프트의 n번째 호출을 더해서 정하므로
+    스레드 실행 순서와 관계없이 호출 수와 지연시간 분포가 재현되어 실행끼리 비교할 수 있습니다.
+    응답은 실제 파이프라인이 파싱할 수 있는 형식(JSON/YAML/텍스트)으로 만듭니다.
+
+    Args:
+        latency: 기본 지연시간 분포 (LatencyModel 또는 문자열)
+        model_latency: {모델 이름: 분포} (예: gpt-4o만 느리게)
+        seed: 난수 시드
+        sleep: 지연 함수 (테스트에서 바꿀 수 있음)
+    """
+
+    def __init__(self, latency="fixed:0", model_latency=None, seed=0, sleep=time.sleep):
+        self.latency = LatencyModel.parse(latency)
+        self.model_latency = {model: LatencyModel.parse(spec) for model, spec in (model_latency or {}).items()}
+        self.seed = seed
+        self.sleep = sleep
+        self.calls = []
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, model="gpt-4o-mini", json_mode=False):
+        with self._lock:
+            key = (model, prompt)
+            nth = self._seen.get(key, 0)
+            self._seen[key] = nth + 1
+
+        # 응답은 (시드, 모델, 프롬프트)로만 정해서 동시 실행의 순서가 이후 프롬프트를 바꾸지 않게 하고,
+        # 지연시간은 n번째 호출마다 새로 뽑음
+        content_rng = random.Random(hashlib.sha256(f"{self.seed}|{model}|{prompt}".encode("utf-8")).digest())
+        timing_rng = random.Random(hashlib.sha256(f"{self.seed}|{model}|{nth}|{prompt}".encode("utf-8")).digest())
+        kind = classify_prompt(prompt)
+        latency = self.model_latency.get(model, self.latency).sample(timing_rng)
+
+        start_time = time.perf_counter()
+        if latency > 0:
+            self.sleep(latency)
+        response = self.respond(kind, prompt, content_rng)
+        usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(response)}
+
+        with self._lock:
+            self.calls.append({
+                "kind": kind,
+                "model": model,
+                "latency": time.perf_counter() - start_time,
+                **usage,
+            })
+        return response, usage
+
+    def respond(self, kind, prompt, rng):
+        """프롬프트 종류별 응답 텍스트 (가짜 OpenAI 서버와 같은 대본)"""
+        return scripted_response(kind, prompt, rng)
+
+    def summary(self):
+        """
+        호출 통계
+
+        Returns:
+            {"total_calls", "prompt_tokens", "completion_tokens",
+             "by_kind": {종류: 호출 수}, "by_model": {모델: 호출 수}}
+        """
+        with self._lock:
+            calls = list(self.calls)
+        by_kind, by_model = {}, {}
+        for call in calls:
+            by_kind[call["kind"]] = by_kind.get(call["kind"], 0) + 1
+            by_model[call["model"]] = by_model.get(call["model"], 0) + 1
+        return {
+            "total_calls": len(calls),
+            "prompt_tokens": sum(call["prompt_tokens"] for call in calls),
+            "completion_tokens": sum(call["completion_tokens"] for call in calls),
+            "by_kind": dict(sorted(by_kind.items())),
+            "by_model": dict(sorted(by_model.items())),
+        }
+
+    def reset(self):
+        """호출 기록 초기화 (워밍업 후 사용, 같은 프롬프트의 호출 횟수는 유지해서 다음 실행은 새 표본을 뽑음)"""
+        with self._lock:
+            self.calls.clear()
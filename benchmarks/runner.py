@@ -0,0 +1,489 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import flow as flow_module
+import utils.model_router as model_router
+import utils.output_store as output_store
+from utils.output_store import atomic_write
+from utils.fake_openai_server import FakeOpenAIServer, parse_error_rates
+from utils.kid_friendly_converter import level_age
+from .mock_llm import MockLLM
+from .fixtures import make_video_info, fixture_video_fetcher
+
+RESULTS_VERSION = 1
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# 실제 API와 비슷한 꼬리가 긴 분포 (중앙값 0.8초)
+DEFAULT_LATENCY = "lognormal:0.8,0.4"
+
+# 회귀 판정: 기준보다 20% 넘게 느려지고, 그 차이가 5ms를 넘을 때만 (짧은 노드의 잡음 무시)
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_MIN_DELTA_MS = 5.0
+DEFAULT_MIN_RSS_DELTA_MB = 20.0
+
+PERCENTILES = (50, 95, 99)
+
+# 벤치마크 중에는 실제 서비스 설정을 쓰지 않음 (노션 업로드 등)
+_CLEARED_ENV = ("NOTION_TOKEN", "NOTION_DATABASE_ID", "HTML_OFFLINE", "SEMANTIC_INDEX")
+
+def percentile(values, p):
+    """선형 보간 백분위수 (numpy.percentile 기본값과 같음)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def summarize(samples):
+    """초 단위 표본 → {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}"""
+    stats = {"count": len(samples), "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0}
+    for p in PERCENTILES:
+        stats[f"p{p}_ms"] = round(percentile(samples, p) * 1000, 3)
+    stats["max_ms"] = round(max(samples, default=0.0) * 1000, 3)
+    return stats
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB, resource 모듈이 없는 Windows에서는 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def flow_node_classes(flow):
+    """Flow에 연결된 노드 클래스들 (시작 노드부터 순서대로)"""
+    classes, pending, seen = [], [flow.start_node], set()
+    while pending:
+        node = pending.pop(0)
+        if node is None or id(node) in seen:
+            continue
+        seen.add(id(node))
+        if type(node) not in classes:
+            classes.append(type(node))
+        pending.extend(node.successors.values())
+    return classes
+
+@contextmanager
+def timed_nodes(node_classes, samples):
+    """
+    노드 클래스의 _run(prep → exec → post)을 감싸서 노드별 실행 시간 기록
+
+    Flow는 실행마다 노드를 복사하므로 인스턴스가 아니라 클래스에 설치합니다.
+    samples: {노드 이름: [초, ...]} (스레드 안전하게 추가됨)
+    """
+    lock = threading.Lock()
+    originals = {}
+
+    def wrap(cls, original):
+        def _run(self, shared):
+            start_time = time.perf_counter()
+            try:
+                return original(self, shared)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                with lock:
+                    samples.setdefault(cls.__name__, []).append(elapsed)
+        return _run
+
+    for cls in node_classes:
+        originals[cls] = cls.__dict__.get("_run")
+        cls._run = wrap(cls, cls._run)
+    try:
+        yield samples
+    finally:
+        for cls, original in originals.items():
+            if original is None:
+                del cls._run
+            else:
+                cls._run = original
+
+@contextmanager
+def benchmark_environment(llm, get_video_info, workdir, base_url=None):
+    """
+    실제 Flow를 그대로 쓰되 바깥 의존성만 바꿔치기
+
+    - LLM: 라우터가 부르는 call_llm_with_usage → MockLLM (API 키는 더미로 설정해서 실제 경로를 탐)
+      base_url이 있으면 바꿔치지 않고 OPENAI_BASE_URL로 가짜 OpenAI 서버에 실제 HTTP 요청
+    - YouTube: flow.get_video_info → 고정 비디오
+    - 결과 파일: 임시 디렉터리의 OutputStore
+    - 노션 설정/오프라인 내보내기 환경변수는 비우고, 실행마다 찍히는 로그는 ERROR만 남김
+    - 단계 결과 재사용(utils.stage_cache)은 꺼서 실행마다 모든 단계를 계산
+    """
+    saved_env = {name: os.environ.get(name)
+                 for name in ("OPENAI_API_KEY", "OPENAI_BASE_URL", "STAGE_CACHE", *_CLEARED_ENV)}
+    saved = (model_router.call_llm_with_usage, flow_module.get_video_info, output_store._store)
+    root_logger = logging.getLogger()
+    saved_level = root_logger.level
+
+    os.environ["OPENAI_API_KEY"] = "benchmark-mock-key"
+    os.environ["STAGE_CACHE"] = "0"  # 실행마다 모든 단계를 실제로 계산
+    for name in _CLEARED_ENV:
+        os.environ.pop(name, None)
+    if base_url:
+        os.environ["OPENAI_BASE_URL"] = base_url
+    else:
+        os.environ.pop("OPENAI_BASE_URL", None)
+        model_router.call_llm_with_usage = llm
+    flow_module.get_video_info = get_video_info
+    output_store._store = output_store.OutputStore(os.path.join(workdir, "outputs"))
+    root_logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        model_router.call_llm_with_usage, flow_module.get_video_info, output_store._store = saved
+        root_logger.setLevel(saved_level)
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def _server_summary(stats):
+    """가짜 OpenAI 서버 집계 → MockLLM.summary()와 같은 형식 (+ 오류/연결 수)"""
+    return {
+        "total_calls": stats["requests"],
+        "prompt_tokens": stats["prompt_tokens"],
+        "completion_tokens": stats["completion_tokens"],
+        "by_kind": dict(sorted(stats["by_kind"].items())),
+        "by_model": {model: model_stats["completions"] for model, model_stats in sorted(stats["by_model"].items())},
+        "rate_limited": stats["rate_limited"],
+        "server_errors": stats["server_errors"],
+        "connections": stats["connections"],
+    }
+
+def run_benchmark(runs=10, concurrency=1, latency=DEFAULT_LATENCY, model_latency=None,
+                  video_latency="fixed:0", transcript_sentences=400, seed=0, warmup=1, http=False,
+                  error_rates=None, sleep=time.sleep):
+    """
+    create_youtube_processor_flow()로 만든 실제 Flow를 결정적인 Mock LLM으로 여러 번 실행
+
+    Args:
+        runs: 측정할 실행 수 (워밍업 제외)
+        concurrency: 동시에 실행할 Flow 수 (처리량 측정용)
+        latency: LLM 지연시간 분포 (예: "lognormal:0.8,0.4", "fixed:0.05")
+        model_latency: {모델: 분포} 모델별 지연시간 (예: {"gpt-4o": "lognormal:1.5,0.4"})
+        video_latency: 비디오 정보/자막 가져오기 지연시간 분포
+        transcript_sentences: 고정 자막 길이 (문장 수)
+        seed: 난수 시드 (같은 시드면 같은 응답/지연시간)
+        warmup: 측정 전 실행 수 (지연 import, 어휘 사전 로드 등을 빼기 위해)
+        http: True면 가짜 OpenAI 서버를 띄워 openai SDK로 실제 HTTP 호출 (연결 풀/재시도/타임아웃 포함)
+        error_rates: http 모드에서 주입할 오류 비율 {상태 코드: 확률} (예: {429: 0.05})
+
+    Returns:
+        JSON으로 저장할 수 있는 결과 딕셔너리
+    """
+    llm = MockLLM(latency=latency, model_latency=model_latency, seed=seed, sleep=sleep)
+    video_info = make_video_info(sentences=transcript_sentences, seed=seed)
+    fetcher = fixture_video_fetcher(video_info, latency=video_latency, seed=seed, sleep=sleep)
+    config = {
+        "runs": runs,
+        "concurrency": concurrency,
+        "latency": str(llm.latency),
+        "model_latency": {model: str(spec) for model, spec in llm.model_latency.items()},
+        "video_latency": video_latency,
+        "transcript_sentences": transcript_sentences,
+        "seed": seed,
+        "warmup": warmup,
+        "http": http,
+        "error_rates": {str(status): rate for status, rate in (error_rates or {}).items()},
+    }
+    server = None
+    if http:
+        server = FakeOpenAIServer(
+            latency=lambda rng, model: llm.model_latency.get(model, llm.latency).sample(rng),
+            error_rates=error_rates, seed=seed
+        ).start()
+
+    def run_once(index):
+        shared = {"url": f"https://www.youtube.com/watch?v={video_info['video_id']}", "run_id": f"bench-{index:04d}"}
+        start_time = time.perf_counter()
+        flow.run(shared)
+        return time.perf_counter() - start_time
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            benchmark_environment(llm, fetcher, workdir, base_url=server.base_url if server else None):
+        flow = flow_module.create_youtube_processor_flow()
+        for index in range(warmup):
+            run_once(-index - 1)
+
+        llm.reset()
+        if server:
+            server.reset_stats()
+        model_router.reset_stage_stats()
+        samples = {}
+        with timed_nodes(flow_node_classes(flow), samples):
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                run_times = list(executor.map(run_once, range(runs)))
+            wall_seconds = time.perf_counter() - start_time
+
+    if server:
+        server.stop()
+        llm_summary = _server_summary(server.stats)
+    else:
+        llm_summary = llm.summary()
+    llm_latencies = {}
+    for call in llm.calls:
+        llm_latencies.setdefault(call["kind"], []).append(call["latency"])
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "config": config,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput": {
+            "runs_per_minute": round(runs / wall_seconds * 60, 2) if wall_seconds else 0.0,
+            "llm_calls_per_second": round(llm_summary["total_calls"] / wall_seconds, 2) if wall_seconds else 0.0,
+        },
+        "flow": summarize(run_times),
+        "nodes": {name: summarize(values) for name, values in samples.items()},
+        "llm": {
+            **llm_summary,
+            "calls_per_run": round(llm_summary["total_calls"] / runs, 2) if runs else 0.0,
+            "latency": {kind: summarize(values) for kind, values in sorted(llm_latencies.items())},
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def compare_results(current, baseline, tolerance=DEFAULT_TOLERANCE, min_delta_ms=DEFAULT_MIN_DELTA_MS,
+                    min_rss_delta_mb=DEFAULT_MIN_RSS_DELTA_MB):
+    """
+    기준 결과와 비교해서 회귀 목록 반환
+
+    - 전체/노드별 p50, p95가 tolerance 비율과 min_delta_ms를 모두 넘게 느려짐
+    - 처리량이 tolerance 비율 넘게 감소
+    - 실행당 LLM 호출 수 증가 (Mock LLM은 결정적이므로 조금만 늘어도 회귀)
+    - 최대 RSS가 tolerance 비율과 min_rss_delta_mb를 모두 넘게 증가
+
+    Returns:
+        [{"metric", "baseline", "current", "change"}, ...] (비어 있으면 회귀 없음)
+    """
+    regressions = []
+
+    def slower(metric, before, after, min_delta):
+        if before is None or after is None:
+            return
+        if after > before * (1 + tolerance) and after - before > min_delta:
+            regressions.append({
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": f"+{(after - before) / before * 100:.0f}%" if before else "new",
+            })
+
+    timings = {"flow": current["flow"], **current["nodes"]}
+    baseline_timings = {"flow": baseline["flow"], **baseline["nodes"]}
+    for name, stats in timings.items():
+        if name not in baseline_timings:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            slower(f"{name}.{key}", baseline_timings[name][key], stats[key], min_delta_ms)
+
+    before, after = baseline["throughput"]["runs_per_minute"], current["throughput"]["runs_per_minute"]
+    if after < before * (1 - tolerance):
+        regressions.append({"metric": "throughput.runs_per_minute", "baseline": before, "current": after,
+                            "change": f"{(after - before) / before * 100:.0f}%"})
+
+    before, after = baseline["llm"]["calls_per_run"], current["llm"]["calls_per_run"]
+    if after > before:
+        regressions.append({"metric": "llm.calls_per_run", "baseline": before, "current": after,
+                            "change": f"+{after - before:g}"})
+
+    slower("peak_rss_mb", baseline.get("peak_rss_mb"), current.get("peak_rss_mb"), min_rss_delta_mb)
+    return regressions
+
+def config_differences(current, baseline):
+    """두 결과의 벤치마크 설정 차이 (다르면 비교 결과를 그대로 믿기 어려움)"""
+    keys = sorted(set(current["config"]) | set(baseline["config"]))
+    return {key: (baseline["config"].get(key), current["config"].get(key))
+            for key in keys if current["config"].get(key) != baseline["config"].get(key)}
+
+def save_results(result, path=None):
+    """결과를 JSON으로 저장 (기본: benchmarks/results/<시각>.json)"""
+    if not path:
+        path = os.path.join(DEFAULT_RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    atomic_write(path, json.dumps(result, ensure_ascii=False, indent=2))
+    return path
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def format_report(result, regressions=None):
+    """결과를 사람이 읽는 표로 변환"""
+    config = result["config"]
+    lines = [
+        f"📊 실행 {config['runs']}회 (동시 {config['concurrency']}), LLM 지연 {config['latency']}",
+        f"   ⏱️  전체 {result['wall_seconds']:.2f}초, 처리량 {result['throughput']['runs_per_minute']:.1f}회/분, "
+        f"LLM {result['throughput']['llm_calls_per_second']:.1f}회/초",
+        f"   📞 LLM 호출 {result['llm']['total_calls']}회 (실행당 {result['llm']['calls_per_run']:g}회) "
+        + ", ".join(f"{kind} {count}" for kind, count in result["llm"]["by_kind"].items()),
+        f"   🧠 최대 RSS: {result['peak_rss_mb']} MB" if result.get("peak_rss_mb") is not None else "   🧠 최대 RSS: 측정 불가",
+    ]
+    if "connections" in result["llm"]:
+        llm = result["llm"]
+        lines.append(f"   🌐 HTTP: 새 연결 {llm['connections']}개, 429 {llm['rate_limited']}회, 5xx {llm['server_errors']}회")
+    lines += [
+        "",
+        f"   {'노드':<22}{'횟수':>6}{'p50':>11}{'p95':>11}{'p99':>11}",
+    ]
+    for name, stats in [("Flow 전체", result["flow"]), *result["nodes"].items()]:
+        lines.append(f"   {name:<22}{stats['count']:>6}{stats['p50_ms']:>9.1f}ms{stats['p95_ms']:>9.1f}ms{stats['p99_ms']:>9.1f}ms")
+
+    if regressions is not None:
+        lines.append("")
+        if regressions:
+            lines.append(f"   ❌ 회귀 {len(regressions)}건")
+            for regression in regressions:
+                lines.append(f"      - {regression['metric']}: {regression['baseline']} → {regression['current']} "
+                             f"({regression['change']})")
+        else:
+            lines.append("   ✅ 기준 대비 회귀 없음")
+    return "\n".join(lines)
+
+DEFAULT_LEVELS = ("5살", "초등학생", "중학생", "고등학생")
+
+def compare_audience_levels(levels=DEFAULT_LEVELS, latency="fixed:0.02", transcript_sentences=400, seed=0,
+                            sleep=time.sleep):
+    """
+    독자 수준 여러 개를 따로 실행할 때와 한 번에 실행할 때의 LLM 비용 비교
+
+    따로: 수준마다 target_age를 바꿔 전체 Flow를 실행 (단계 캐시 없이)
+    한 번에: settings["levels"]로 한 번 실행 (자막/주제/Q&A는 한 번, 변환은 주제마다 한 번)
+
+    Returns:
+        {"levels", "separate": {...}, "combined": {...}, "savings": {...}}
+        separate/combined: {"llm_calls", "prompt_tokens", "completion_tokens", "seconds", "by_kind"}
+    """
+    llm = MockLLM(latency=latency, seed=seed, sleep=sleep)
+    video_info = make_video_info(sentences=transcript_sentences, seed=seed)
+    fetcher = fixture_video_fetcher(video_info, seed=seed, sleep=sleep)
+    url = f"https://www.youtube.com/watch?v={video_info['video_id']}"
+
+    def measure(settings_list):
+        llm.reset()
+        start_time = time.perf_counter()
+        for settings in settings_list:
+            flow_module.create_youtube_processor_flow().run({"url": url, "settings": settings})
+        seconds = time.perf_counter() - start_time
+        summary = llm.summary()
+        return {
+            "llm_calls": summary["total_calls"],
+            "prompt_tokens": summary["prompt_tokens"],
+            "completion_tokens": summary["completion_tokens"],
+            "seconds": round(seconds, 3),
+            "by_kind": summary["by_kind"],
+        }
+
+    with tempfile.TemporaryDirectory() as workdir, benchmark_environment(llm, fetcher, workdir):
+        separate = measure([{"target_age": level_age(level)} for level in levels])
+        combined = measure([{"levels": list(levels)}])
+
+    def ratio(metric):
+        return round(combined[metric] / separate[metric], 3) if separate[metric] else 0.0
+
+    return {
+        "levels": list(levels),
+        "separate": separate,
+        "combined": combined,
+        "savings": {metric: ratio(metric) for metric in ("llm_calls", "prompt_tokens", "completion_tokens", "seconds")},
+    }
+
+def format_levels_report(result):
+    """compare_audience_levels 결과를 사람이 읽는 표로 변환"""
+    lines = [f"🎚️ 독자 수준 {len(result['levels'])}개: {', '.join(result['levels'])}",
+             f"   {'':<12}{'LLM 호출':>10}{'입력 토큰':>12}{'출력 토큰':>12}{'시간':>10}"]
+    for label, key in (("따로 실행", "separate"), ("한 번에", "combined")):
+        stats = result[key]
+        lines.append(f"   {label:<12}{stats['llm_calls']:>10}{stats['prompt_tokens']:>12}"
+                     f"{stats['completion_tokens']:>12}{stats['seconds']:>9.2f}s")
+    savings = result["savings"]
+    lines.append(f"   📉 한 번에 / 따로: 호출 {savings['llm_calls']:.0%}, 입력 토큰 {savings['prompt_tokens']:.0%}, "
+                 f"출력 토큰 {savings['completion_tokens']:.0%}, 시간 {savings['seconds']:.0%}")
+    return "\n".join(lines)
+
+def _parse_model_latency(values):
+    model_latency = {}
+    for value in values:
+        model, _, spec = value.partition("=")
+        if not spec:
+            raise argparse.ArgumentTypeError(f"MODEL=SPEC 형식이어야 합니다: {value}")
+        model_latency[model] = spec
+    return model_latency
+
+def main(argv=None):
+    """벤치마크 실행 → 결과 저장 → (기준이 있으면) 회귀 확인, 회귀가 있으면 종료 코드 1"""
+    parser = argparse.ArgumentParser(description="Benchmark the YouTube processor flow with a deterministic mock LLM.")
+    parser.add_argument("--runs", type=int, default=10, help="Measured runs (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Flows run at the same time (default: 1)")
+    parser.add_argument("--latency", default=DEFAULT_LATENCY,
+                        help=f"LLM latency distribution, e.g. fixed:0.05, uniform:0.1,0.5, lognormal:0.8,0.4 "
+                             f"(default: {DEFAULT_LATENCY})")
+    parser.add_argument("--model-latency", action="append", default=[], metavar="MODEL=SPEC",
+                        help="Per-model latency distribution (repeatable)")
+    parser.add_argument("--video-latency", default="fixed:0", help="Video info/transcript fetch latency")
+    parser.add_argument("--transcript-sentences", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--http", action="store_true",
+                        help="Serve the mock LLM from a local OpenAI-compatible server and call it through the SDK")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="STATUS=RATE",
+                        help="With --http, inject errors, e.g. 429=0.05 (repeatable)")
+    parser.add_argument("--save", default=None, help="Result JSON path (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--baseline", default=None, help="Earlier result JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown ratio before flagging (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--levels", nargs="?", const=",".join(DEFAULT_LEVELS), default=None,
+                        help="Compare separate runs per audience level with one multi-level run "
+                             f"(default levels: {','.join(DEFAULT_LEVELS)})")
+    args = parser.parse_args(argv)
+
+    if args.levels:
+        levels = [level.strip() for level in args.levels.split(",") if level.strip()]
+        latency = args.latency if args.latency != DEFAULT_LATENCY else "fixed:0.02"
+        print(format_levels_report(compare_audience_levels(levels, latency=latency,
+                                                           transcript_sentences=args.transcript_sentences,
+                                                           seed=args.seed)))
+        return 0
+
+    result = run_benchmark(
+        runs=args.runs,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        model_latency=_parse_model_latency(args.model_latency),
+        video_latency=args.video_latency,
+        transcript_sentences=args.transcript_sentences,
+        seed=args.seed,
+        warmup=args.warmup,
+        http=args.http,
+        error_rates=parse_error_rates(args.error_rate),
+    )
+
+    regressions = None
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        differences = config_differences(result, baseline)
+        if differences:
+            print(f"⚠️ 기준과 설정이 다릅니다: {differences}")
+        regressions = compare_results(result, baseline, tolerance=args.tolerance)
+
+    print(format_report(result, regressions))
+    if not args.no_save:
+        print(f"\n💾 결과 저장: {save_results(result, args.save)}")
+    return 1 if regressions else 0
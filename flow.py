@@ -1,16 +1,27 @@
 from typing import List, Dict, Any
+import json
 import logging
 import os
+import time
 from pocketflow import Node, BatchNode, Flow
 from utils.call_llm import call_llm
-from utils.youtube_processor import get_video_info
-from utils.html_generator import html_generator, streamlit_html_generator
+from utils.env import load_env
+from utils.youtube_processor import get_video_info, transcript_passages
+from utils.html_generator import render_summary_html, sections_from_topics
+from utils.offline_export import write_offline_html, format_size_report
+from utils.output_store import get_output_store, new_run_id
 from utils.topic_extractor import extract_interesting_topics
 from utils.qa_generator import generate_qa_pairs
-from utils.kid_friendly_converter import convert_to_kid_friendly
+from utils.kid_friendly_converter import convert_to_kid_friendly, convert_for_levels, level_age
 from utils.content_validator import validate_transcript_quality, ensure_topic_diversity
+from utils.hierarchical_summarizer import summary_settings, needs_hierarchy, summarize_transcript, tree_context
 from utils.final_reviewer import review_and_correct_summary, generate_review_summary
-from utils.notion_client import save_to_notion
+from utils.grounding import grounding_settings, DEFAULT_SPAN_WORDS
+from utils.notion_outbox import get_outbox, get_drainer
+from utils.model_router import get_stage_report, format_stage_report, get_stage_config, recording_stage_stats
+from utils.stage_cache import (pipeline_settings, stage_key, stage_cache_enabled, get_stage_cache,
+                               format_stage_log)
+from utils.metrics import track_stage, NOTION_OUTBOX_DEPTH
 
 # Set up logging
 logging.basicConfig(
@@ -19,8 +30,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class ProcessYouTubeURL(Node):
+class TrackedStage:
+    """
+    노드 실행 시간/결과(ok/error/cancelled)를 utils.metrics에 기록하는 믹스인 (stage 레이블은 클래스 이름)
+
+    노드 안의 LLM 호출은 이 실행의 shared["llm_stage_stats"]에도 쌓여서 동시에 도는 다른 실행과 섞이지 않습니다.
+    """
+    def _run(self, shared):
+        with track_stage(type(self).__name__), recording_stage_stats(shared.setdefault("llm_stage_stats", {})):
+            return super()._run(shared)
+
+class MemoizedStage:
+    """
+    입력/설정/코드 버전이 같으면 utils.stage_cache에 저장된 출력을 복원하고 prep/exec/post를 건너뛰는 믹스인
+
+    - MEMO_INPUTS: 노드가 읽는 shared 키
+    - MEMO_OUTPUTS: 노드가 쓰는 shared 키
+    - MEMO_SETTINGS: 결과에 영향을 주는 실행 설정 (utils.stage_cache.pipeline_settings)
+    - MEMO_LLM_STAGES: 사용하는 라우팅 단계 (모델이 바뀌면 다시 계산)
+    - CODE_VERSION: 프롬프트나 후처리를 바꾸면 올림
+
+    재사용/계산 여부는 shared["stage_log"]에 순서대로 남습니다.
+    """
+    MEMO_INPUTS = ()
+    MEMO_OUTPUTS = ()
+    MEMO_SETTINGS = ()
+    MEMO_LLM_STAGES = ()
+    CODE_VERSION = "1"
+
+    def memo_config(self, shared):
+        settings = pipeline_settings(shared.get("settings"))
+        return {
+            "settings": {name: settings[name] for name in self.MEMO_SETTINGS},
+            "routing": {stage: get_stage_config(stage) for stage in self.MEMO_LLM_STAGES},
+            "mock": not os.getenv("OPENAI_API_KEY"),
+        }
+
+    def _run(self, shared):
+        if not stage_cache_enabled():
+            return super()._run(shared)
+        
+        # 중단 확인 (재사용할 때도 prep을 건너뛰기 전에)
+        stop_flag = shared.get("stop_flag", {})
+        if hasattr(stop_flag, 'should_stop') and stop_flag.should_stop:
+            raise InterruptedError("처리가 중단되었습니다.")
+        
+        stage = type(self).__name__
+        start_time = time.time()
+        cache = get_stage_cache()
+        key = stage_key(stage, self.CODE_VERSION, {name: shared.get(name) for name in self.MEMO_INPUTS},
+                        self.memo_config(shared))
+        stage_log = shared.setdefault("stage_log", [])
+        cached = cache.get(key, stage)
+        if cached is not None:
+            for name, value in cached["outputs"].items():
+                if value is None:
+                    shared.pop(name, None)
+                else:
+                    shared[name] = value
+            stage_log.append({"stage": stage, "status": "reused", "key": key[:12]})
+            logger.info(f"♻️ {stage}: 입력과 설정이 같아 저장된 결과 재사용 ({key[:12]})")
+            callback = shared.get("progress_callback")
+            if callback:
+                callback(f"{stage} 재사용", f"♻️ {stage}: 이전 결과를 재사용합니다", None)
+            return cached["action"]
+        
+        action = super()._run(shared)
+        cache.put(key, stage, {"action": action, "outputs": {name: shared.get(name) for name in self.MEMO_OUTPUTS}})
+        stage_log.append({"stage": stage, "status": "computed", "key": key[:12],
+                          "seconds": round(time.time() - start_time, 3)})
+        return action
+
+class ProcessYouTubeURL(TrackedStage, MemoizedStage, Node):
     """Process YouTube URL to extract video information"""
+    MEMO_INPUTS = ("url",)
+    MEMO_OUTPUTS = ("video_info",)
+    CODE_VERSION = "2"  # video_info에 자막 줄별 시작 시각(segments) 추가
+    
+    def memo_config(self, shared):
+        # 자막/제목은 올린 뒤에도 바뀔 수 있으므로 VIDEO_INFO_TTL초(0이면 만료 없음) 구간이 바뀌면 다시 가져옴
+        ttl = float(os.getenv("VIDEO_INFO_TTL", 0))
+        return {**super().memo_config(shared), "fetched": int(time.time() // ttl) if ttl > 0 else None}
+    
     def prep(self, shared):
         """Get URL from shared"""
         # 중단 확인
@@ -46,9 +137,10 @@ class ProcessYouTubeURL(Node):
         if "error" in video_info:
             raise ValueError(f"Error processing video: {video_info['error']}")
         
-        # Validate transcript quality
+        # Validate transcript quality (계층 요약을 쓸 수 있으면 긴 자막은 문제가 아님)
         transcript = video_info.get("transcript", "")
-        validation = validate_transcript_quality(transcript)
+        max_words = 10000 if summary_settings()["mode"] == "off" else None
+        validation = validate_transcript_quality(transcript, max_words=max_words)
         
         if not validation["is_valid"]:
             logger.warning(f"Transcript quality issues: {validation['issues']}")
@@ -71,8 +163,68 @@ class ProcessYouTubeURL(Node):
         
         return "default"
 
-class ExtractTopics(Node):
+class SummarizeLongTranscript(TrackedStage, MemoizedStage, Node):
+    """Summarize long transcripts into a chunk tree so later stages see the whole video"""
+    MEMO_INPUTS = ("video_info",)
+    MEMO_OUTPUTS = ("transcript_tree", "topic_source")
+    MEMO_LLM_STAGES = ("summary",)
+    
+    def memo_config(self, shared):
+        return {**super().memo_config(shared), "summary": summary_settings()}
+    
+    def prep(self, shared):
+        """Decide whether the transcript needs hierarchical summarization"""
+        # 중단 확인
+        stop_flag = shared.get("stop_flag", {})
+        if hasattr(stop_flag, 'should_stop') and stop_flag.should_stop:
+            raise InterruptedError("처리가 중단되었습니다.")
+        
+        transcript = shared.get("video_info", {}).get("transcript", "")
+        enabled = bool(transcript) and needs_hierarchy(len(transcript.split()))
+        
+        # 진행상황 업데이트
+        callback = shared.get("progress_callback")
+        if callback and enabled:
+            callback("긴 자막 요약", "긴 자막을 구간별로 나눠 요약하는 중...", 22)
+        
+        return {"transcript": transcript, "enabled": enabled}
+    
+    def exec(self, data):
+        """Build the summary tree (levels in parallel, cached per chunk)"""
+        if not data["enabled"]:
+            return None
+        
+        use_mock = not os.getenv("OPENAI_API_KEY")
+        return summarize_transcript(data["transcript"], use_mock=use_mock)
+    
+    def post(self, shared, prep_res, exec_res):
+        """Store the tree and the text topic extraction should read"""
+        if exec_res is None:
+            shared.pop("transcript_tree", None)
+            shared.pop("topic_source", None)
+            return "default"
+        
+        shared["transcript_tree"] = exec_res
+        shared["topic_source"] = tree_context(exec_res)
+        logger.info(
+            f"계층 요약: 구간 {exec_res['chunks']}개, 깊이 {exec_res['depth']}, "
+            f"LLM 호출 {exec_res['llm_calls']}회, 캐시 {exec_res['cache_hits']}개, {exec_res['seconds']:.1f}초"
+        )
+        
+        # 진행상황 업데이트
+        callback = shared.get("progress_callback")
+        if callback:
+            callback("긴 자막 요약 완료", f"✅ 구간 {exec_res['chunks']}개를 {exec_res['depth']}단계로 요약완료!", 24)
+        
+        return "default"
+
+class ExtractTopics(TrackedStage, MemoizedStage, Node):
     """Extract interesting topics from the video transcript"""
+    MEMO_INPUTS = ("video_info", "topic_source")
+    MEMO_OUTPUTS = ("topics",)
+    MEMO_SETTINGS = ("num_topics",)
+    MEMO_LLM_STAGES = ("topics",)
+    
     def prep(self, shared):
         """Get transcript from video_info"""
         # 중단 확인
@@ -85,12 +237,19 @@ class ExtractTopics(Node):
         if callback:
             callback("주제 추출", "트랜스크립트에서 흥미로운 주제 찾는 중...", 25)
         
+        num_topics = pipeline_settings(shared.get("settings"))["num_topics"]
+        
+        # 긴 자막은 요약 트리의 위쪽 단계에서 주제를 찾음
+        if shared.get("topic_source"):
+            return {"transcript": shared["topic_source"], "num_topics": num_topics}
+        
         video_info = shared.get("video_info", {})
         transcript = video_info.get("transcript", "")
-        return transcript
+        return {"transcript": transcript, "num_topics": num_topics}
     
-    def exec(self, transcript):
+    def exec(self, data):
         """Extract topics using our topic_extractor utility"""
+        transcript = data["transcript"]
         if not transcript:
             raise ValueError("No transcript available for topic extraction")
         
@@ -101,7 +260,7 @@ class ExtractTopics(Node):
         if use_mock:
             logger.info("Using Mock mode for topic extraction")
         
-        topics = extract_interesting_topics(transcript, num_topics=5, use_mock=use_mock)
+        topics = extract_interesting_topics(transcript, num_topics=data["num_topics"], use_mock=use_mock)
         
         if not topics:
             raise ValueError("Failed to extract topics from transcript")
@@ -126,8 +285,13 @@ class ExtractTopics(Node):
         
         return "default"
 
-class GenerateQA(BatchNode):
+class GenerateQA(TrackedStage, MemoizedStage, BatchNode):
     """Generate Q&A pairs for each topic"""
+    MEMO_INPUTS = ("topics",)
+    MEMO_OUTPUTS = ("topics_with_qa",)
+    MEMO_SETTINGS = ("num_questions",)
+    MEMO_LLM_STAGES = ("qa",)
+    
     def prep(self, shared):
         """Return list of topics for batch processing"""
         # 중단 확인
@@ -140,11 +304,13 @@ class GenerateQA(BatchNode):
         if callback:
             callback("Q&A 생성", "각 주제별로 질문과 답변 만드는 중...", 40)
         
+        num_questions = pipeline_settings(shared.get("settings"))["num_questions"]
         topics = shared.get("topics", [])
-        return topics
+        return [{"topic": topic, "num_questions": num_questions} for topic in topics]
     
-    def exec(self, topic):
+    def exec(self, item):
         """Generate Q&A pairs for a single topic"""
+        topic = item["topic"]
         topic_title = topic.get("title", "")
         topic_content = topic.get("content", "")
         
@@ -156,7 +322,7 @@ class GenerateQA(BatchNode):
         qa_pairs = generate_qa_pairs(
             topic_title=topic_title,
             topic_content=topic_content,
-            num_questions=3,
+            num_questions=item["num_questions"],
             use_mock=use_mock
         )
         
@@ -180,8 +346,13 @@ class GenerateQA(BatchNode):
         
         return "default"
 
-class ConvertToKidFriendly(BatchNode):
+class ConvertToKidFriendly(TrackedStage, MemoizedStage, BatchNode):
     """Convert content to kid-friendly explanations"""
+    MEMO_INPUTS = ("topics_with_qa",)
+    MEMO_OUTPUTS = ("final_topics",)
+    MEMO_SETTINGS = ("target_age", "levels")
+    MEMO_LLM_STAGES = ("kid_friendly",)
+    
     def prep(self, shared):
         """Return list of topics with Q&A pairs for batch processing"""
         # 중단 확인
@@ -189,13 +360,28 @@ class ConvertToKidFriendly(BatchNode):
         if hasattr(stop_flag, 'should_stop') and stop_flag.should_stop:
             raise InterruptedError("처리가 중단되었습니다.")
         
+        settings = pipeline_settings(shared.get("settings"))
+        target_age = settings["target_age"]
+        levels = settings["levels"]
+        
         # 진행상황 업데이트
         callback = shared.get("progress_callback")
         if callback:
-            callback("아이 친화적 변환", "5살 아이도 이해할 수 있도록 쉽게 바꾸는 중...", 60)
+            if levels:
+                callback("독자 수준별 변환", f"{', '.join(levels)} 버전을 함께 만드는 중...", 60)
+            else:
+                callback("아이 친화적 변환", f"{target_age}살 아이도 이해할 수 있도록 쉽게 바꾸는 중...", 60)
         
         topics_with_qa = shared.get("topics_with_qa", [])
         
+        # 여러 수준: 주제 하나(Q&A 묶음)당 프롬프트 하나로 모든 수준을 함께 변환
+        if levels:
+            return [{
+                "topic_title": topic["title"],
+                "qa_pairs": [{"question": qa["question"], "answer": qa["answer"]} for qa in topic["qa_pairs"]],
+                "levels": levels
+            } for topic in topics_with_qa]
+        
         # Flatten Q&A pairs for individual processing
         items = []
         for topic in topics_with_qa:
@@ -203,13 +389,17 @@ class ConvertToKidFriendly(BatchNode):
                 items.append({
                     "topic_title": topic["title"],
                     "question": qa_pair["question"],
-                    "answer": qa_pair["answer"]
+                    "answer": qa_pair["answer"],
+                    "target_age": target_age
                 })
         
         return items
     
     def exec(self, item):
-        """Convert a single Q&A pair to kid-friendly version"""
+        """Convert a single Q&A pair (or one topic's Q&A group for every level) to kid-friendly versions"""
+        if "levels" in item:
+            return self._exec_levels(item)
+        
         topic_title = item["topic_title"]
         question = item["question"]
         answer = item["answer"]
@@ -222,14 +412,14 @@ class ConvertToKidFriendly(BatchNode):
         # Convert question to kid-friendly
         kid_friendly_question = convert_to_kid_friendly(
             text=question,
-            target_age=5,
+            target_age=item["target_age"],
             use_mock=use_mock
         )
         
         # Convert answer to kid-friendly
         kid_friendly_answer = convert_to_kid_friendly(
             text=answer,
-            target_age=5,
+            target_age=item["target_age"],
             use_mock=use_mock
         )
         
@@ -241,8 +431,28 @@ class ConvertToKidFriendly(BatchNode):
             "kid_friendly_answer": kid_friendly_answer
         }
     
+    def _exec_levels(self, group):
+        """한 주제의 Q&A를 모든 수준으로 변환 (첫 번째 수준이 기본 표시/검토 대상)"""
+        logger.info(f"Converting to {', '.join(group['levels'])}: {group['topic_title'][:50]}")
+        
+        use_mock = not os.getenv("OPENAI_API_KEY")
+        versions = convert_for_levels(group["topic_title"], group["qa_pairs"], group["levels"], use_mock=use_mock)
+        primary = group["levels"][0]
+        
+        return [{
+            "topic_title": group["topic_title"],
+            "original_question": qa["question"],
+            "original_answer": qa["answer"],
+            "kid_friendly_question": version[primary]["question"],
+            "kid_friendly_answer": version[primary]["answer"],
+            "levels": version
+        } for qa, version in zip(group["qa_pairs"], versions)]
+    
     def post(self, shared, prep_res, exec_res_list):
         """Reorganize kid-friendly content by topic"""
+        # 여러 수준 모드는 주제별 목록을 돌려주므로 Q&A 단위로 펼침
+        exec_res_list = [qa for result in exec_res_list for qa in (result if isinstance(result, list) else [result])]
+        
         # Group by topic
         topics_dict = {}
         for item in exec_res_list:
@@ -253,12 +463,15 @@ class ConvertToKidFriendly(BatchNode):
                     "qa_pairs": []
                 }
             
-            topics_dict[topic_title]["qa_pairs"].append({
+            qa = {
                 "original_question": item["original_question"],
                 "original_answer": item["original_answer"],
                 "kid_friendly_question": item["kid_friendly_question"],
                 "kid_friendly_answer": item["kid_friendly_answer"]
-            })
+            }
+            if "levels" in item:
+                qa["levels"] = item["levels"]
+            topics_dict[topic_title]["qa_pairs"].append(qa)
         
         # Convert back to list
         final_topics = list(topics_dict.values())
@@ -273,8 +486,17 @@ class ConvertToKidFriendly(BatchNode):
         
         return "default"
 
-class ReviewAndCorrect(Node):
+class ReviewAndCorrect(TrackedStage, MemoizedStage, Node):
     """AI가 최종 요약본을 검토하고 개선"""
+    MEMO_INPUTS = ("final_topics", "video_info")
+    MEMO_OUTPUTS = ("final_topics", "review_report")
+    MEMO_SETTINGS = ("review", "target_age", "levels")
+    MEMO_LLM_STAGES = ("review", "correction")
+    CODE_VERSION = "4"
+    
+    def memo_config(self, shared):
+        return {**super().memo_config(shared), "grounding": grounding_settings()}
+    
     def prep(self, shared):
         """Get final topics and video info for review"""
         # 진행상황 업데이트
@@ -292,7 +514,9 @@ class ReviewAndCorrect(Node):
             for qa in topic["qa_pairs"]:
                 qa_pairs.append({
                     "question": qa["kid_friendly_question"],
-                    "answer": qa["kid_friendly_answer"]
+                    "answer": qa["kid_friendly_answer"],
+                    # 자막 근거 확인은 쉬운 말로 바꾸기 전 답변으로 (낱말이 자막과 같음)
+                    "source_answer": qa.get("original_answer")
                 })
             
             review_topics.append({
@@ -300,20 +524,38 @@ class ReviewAndCorrect(Node):
                 "qa_pairs": qa_pairs
             })
         
+        settings = pipeline_settings(shared.get("settings"))
         return {
             "topics": review_topics,
             "video_title": video_info.get("title", ""),
-            "video_context": video_info.get("description", "")
+            "video_context": video_info.get("description", ""),
+            "passages": transcript_passages(video_info, words=DEFAULT_SPAN_WORDS),
+            "transcript_language": video_info.get("language_used"),
+            "review": settings["review"],
+            # 검토 대상 kid_friendly 문장은 첫 번째 수준 버전이므로 그 수준의 나이로 검토
+            "target_age": level_age(settings["levels"][0]) if settings["levels"] else settings["target_age"],
+            # 수준별 버전은 검토하지 않고 그대로 옮김 (첫 번째 수준만 검토 결과로 바뀜)
+            "levels": [[qa.get("levels") for qa in topic["qa_pairs"]] for topic in final_topics]
         }
     
     def exec(self, data):
         """AI가 요약본 검토 및 개선"""
+        if not data["review"]:
+            logger.info("AI 검토가 설정에서 꺼져 있어 건너뛰기")
+            return {
+                "improved_topics": data["topics"],
+                "review_report": {"status": "skipped", "reason": "disabled"}
+            }
+        
         logger.info("AI가 최종 요약본을 검토하고 개선하는 중...")
         
         improved_topics, review_report = review_and_correct_summary(
             topics_with_qa=data["topics"],
             video_title=data["video_title"],
-            video_context=data["video_context"]
+            video_context=data["video_context"],
+            passages=data["passages"],
+            target_age=data["target_age"],
+            transcript_language=data["transcript_language"]
         )
         
         return {
@@ -328,15 +570,21 @@ class ReviewAndCorrect(Node):
         
         # Convert back to original format
         final_topics = []
-        for topic in improved_topics:
+        for topic_index, topic in enumerate(improved_topics):
+            topic_levels = prep_res["levels"][topic_index] if topic_index < len(prep_res["levels"]) else []
             qa_pairs = []
-            for qa in topic["qa_pairs"]:
-                qa_pairs.append({
+            for qa_index, qa in enumerate(topic["qa_pairs"]):
+                reviewed = {
                     "kid_friendly_question": qa["question"],
                     "kid_friendly_answer": qa["answer"],
                     "original_question": qa["question"],  # Keep for compatibility
                     "original_answer": qa["answer"]      # Keep for compatibility
-                })
+                }
+                levels = topic_levels[qa_index] if qa_index < len(topic_levels) else None
+                if levels:
+                    primary = next(iter(levels))
+                    reviewed["levels"] = {**levels, primary: {"question": qa["question"], "answer": qa["answer"]}}
+                qa_pairs.append(reviewed)
             
             final_topics.append({
                 "title": topic["topic"],
@@ -358,7 +606,7 @@ class ReviewAndCorrect(Node):
         
         return "default"
 
-class SaveToNotion(Node):
+class SaveToNotion(TrackedStage, Node):
     """Save the processed content to Notion database"""
     def prep(self, shared):
         """Get video info and final topics from shared"""
@@ -366,7 +614,7 @@ class SaveToNotion(Node):
         callback = shared.get("progress_callback")
         if callback:
             if os.getenv('NOTION_TOKEN') and os.getenv('NOTION_DATABASE_ID'):
-                callback("노션 저장", "노션 데이터베이스에 요약 결과 저장 중...", 90)
+                callback("노션 저장", "노션 저장 대기열에 요약 결과 기록 중...", 90)
             else:
                 callback("노션 건너뛰기", "노션 설정이 없어 이 단계를 건너뜁니다...", 90)
         
@@ -379,7 +627,7 @@ class SaveToNotion(Node):
         }
     
     def exec(self, data):
-        """Save to Notion database"""
+        """Queue the summary in the Notion outbox (a background drainer uploads it)"""
         video_info = data["video_info"]
         final_topics = data["final_topics"]
         
@@ -388,7 +636,7 @@ class SaveToNotion(Node):
             logger.info("노션 설정이 없어 건너뛰기")
             return {"success": False, "error": "노션 설정이 없습니다"}
         
-        logger.info("노션에 저장 중...")
+        logger.info("노션 저장 대기열에 기록 중...")
         
         # 노션용 데이터 변환
         topics_list = [topic["title"] for topic in final_topics]
@@ -406,16 +654,27 @@ class SaveToNotion(Node):
                     "answer": qa.get("kid_friendly_answer", "")
                 })
         
-        # 노션에 저장
-        result = save_to_notion(video_info, topics_list, qa_pairs, kid_friendly_pairs)
+        # 대기열에 기록만 하고 바로 다음 단계로 (노션 지연/장애가 HTML 생성을 막지 않음)
+        outbox = get_outbox()
+        video_id = outbox.enqueue(video_info, topics_list, qa_pairs, kid_friendly_pairs)
+        get_drainer().notify()
+        queue_depth = outbox.metrics()["queue_depth"]
+        NOTION_OUTBOX_DEPTH.set(queue_depth)
         
-        return result
+        return {
+            "success": True,
+            "queued": True,
+            "video_id": video_id,
+            "queue_depth": queue_depth
+        }
     
     def post(self, shared, prep_res, exec_res):
         """Store notion result in shared"""
         shared["notion_result"] = exec_res
         
-        if exec_res.get("success"):
+        if exec_res.get("queued"):
+            logger.info(f"📥 노션 저장 대기열에 기록: {exec_res.get('video_id')} (대기 {exec_res.get('queue_depth')}건)")
+        elif exec_res.get("success"):
             logger.info(f"✅ 노션 저장 완료: {exec_res.get('page_url', '')}")
         else:
             logger.warning(f"⚠️ 노션 저장 실패: {exec_res.get('error', '알 수 없는 오류')}")
@@ -423,14 +682,16 @@ class SaveToNotion(Node):
         # 진행상황 업데이트
         callback = shared.get("progress_callback")
         if callback:
-            if exec_res.get("success"):
+            if exec_res.get("queued"):
+                callback("노션 저장 예약", "📥 노션 저장이 예약되었습니다 (백그라운드에서 업로드)", 95)
+            elif exec_res.get("success"):
                 callback("노션 저장 완료", "✅ 노션 데이터베이스에 성공적으로 저장되었습니다!", 95)
             else:
                 callback("노션 저장 건너뛰기", "ℹ️ 노션 설정이 없어 이 단계를 건너뛰었습니다", 95)
         
         return "default"
 
-class GenerateHTML(Node):
+class GenerateHTML(TrackedStage, Node):
     """Generate HTML output from processed content"""
     def prep(self, shared):
         """Get video info and final topics from shared"""
@@ -448,7 +709,7 @@ class GenerateHTML(Node):
         }
     
     def exec(self, data):
-        """Generate HTML using html_generator"""
+        """Generate file and Streamlit HTML in a single render pass"""
         video_info = data["video_info"]
         final_topics = data["final_topics"]
         
@@ -457,36 +718,11 @@ class GenerateHTML(Node):
         
         logger.info("Generating HTML output...")
         
-        # Prepare sections for HTML generator
-        sections = []
-        for topic in final_topics:
-            topic_title = topic["title"]
-            qa_pairs = topic["qa_pairs"]
-            
-            # Skip topics without Q&A pairs
-            if not qa_pairs:
-                continue
-            
-            # Prepare bullets (question-answer pairs)
-            bullets = []
-            for qa in qa_pairs:
-                question = qa["kid_friendly_question"]
-                answer = qa["kid_friendly_answer"]
-                
-                # Only add if both question and answer have content
-                if question.strip() and answer.strip():
-                    bullets.append((f"Q: {question}", f"A: {answer}"))
-            
-            # Only include section if it has bullets
-            if bullets:
-                sections.append({
-                    "title": topic_title,
-                    "bullets": bullets
-                })
+        # Prepare sections for HTML generator (skips empty topics/Q&A)
+        sections = sections_from_topics(final_topics)
         
-        # Generate HTML for both purposes
-        file_html = html_generator(title, thumbnail_url, sections)
-        streamlit_html = streamlit_html_generator(title, thumbnail_url, sections)
+        # Generate HTML for both purposes (one traversal of sections)
+        file_html, streamlit_html = render_summary_html(title, thumbnail_url, sections)
         
         return {
             "file_html": file_html,
@@ -494,16 +730,60 @@ class GenerateHTML(Node):
         }
     
     def post(self, shared, prep_res, exec_res):
-        """Store HTML output and save to file"""
+        """Store HTML output and save to a per-video run directory"""
         shared["html_output"] = exec_res["streamlit_html"]  # Streamlit용 HTML
         shared["file_html"] = exec_res["file_html"]  # 파일 다운로드용 HTML
         
-        # Write HTML to file
-        output_file = "output.html"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(exec_res["file_html"])
+        # 비디오/실행별 경로에 원자적으로 기록 (동시 실행끼리 덮어쓰지 않음)
+        store = get_output_store()
+        video_info = prep_res["video_info"]
+        run_id = shared.setdefault("run_id", new_run_id())
+        # 자막 구간도 함께 저장해서 임베더를 바꿔도 저장된 결과만으로 의미 색인을 다시 만들 수 있게 함
+        passages = transcript_passages(video_info)
+        summary_json = json.dumps({
+            "video_info": {
+                name: video_info.get(name)
+                for name in ("video_id", "title", "url", "duration", "thumbnail_url")
+                if video_info.get(name) is not None
+            },
+            "topics": prep_res["final_topics"],
+            "passages": passages,
+            "run_id": run_id
+        }, ensure_ascii=False, indent=2)
+        output_files = {
+            "html": store.write(video_info, run_id, "summary.html", exec_res["file_html"]),
+            "json": store.write(video_info, run_id, "summary.json", summary_json)
+        }
         
-        logger.info(f"Generated HTML output and saved to {output_file}")
+        # 오프라인 내보내기: CSS/폰트를 인라인한 단일 파일 + 미리 압축한 .gz/.br
+        if shared.get("offline_html") or os.getenv("HTML_OFFLINE") == "1":
+            offline_file = os.path.join(store.run_dir(video_info, run_id), "summary.offline.html")
+            report = write_offline_html(exec_res["file_html"], offline_file)
+            output_files["offline_html"] = offline_file
+            shared["html_export_report"] = report
+            logger.info(f"오프라인 HTML 저장: {offline_file}\n{format_size_report(report)}")
+        
+        # 모든 파일을 쓴 뒤에 매니페스트 갱신 (매니페스트는 항상 완성된 파일만 가리킴)
+        store.record(video_info, run_id, output_files)
+        shared["output_files"] = output_files
+        logger.info(f"Generated HTML output and saved to {output_files['html']}")
+        
+        # 의미 색인 (SEMANTIC_INDEX=1): numpy가 필요해서 켰을 때만 로드, 실패해도 결과 저장은 그대로
+        if os.getenv("SEMANTIC_INDEX", "0").strip().lower() in ("1", "true", "yes", "on"):
+            try:
+                from utils.semantic_index import get_semantic_index
+                report = get_semantic_index().index_video(video_info, run_id, prep_res["final_topics"], passages)
+                logger.info(f"의미 색인: {report}")
+            except Exception as e:
+                logger.warning(f"의미 색인 추가 실패: {e}")
+        
+        # 단계별 재사용 여부 (설정만 바꿔 다시 실행했을 때 어디부터 다시 계산했는지)
+        if shared.get("stage_log"):
+            logger.info(f"단계 결과 {format_stage_log(shared['stage_log'])}")
+        
+        # 단계별 LLM 지연시간/비용 리포트 (라우팅 튜닝용)
+        shared["llm_stage_report"] = get_stage_report(shared.get("llm_stage_stats", {}))
+        logger.info(f"LLM 단계별 리포트:\n{format_stage_report(shared['llm_stage_report'])}")
         
         # 진행상황 업데이트
         callback = shared.get("progress_callback")
@@ -514,8 +794,12 @@ class GenerateHTML(Node):
 
 def create_youtube_processor_flow():
     """Create and connect the nodes for the YouTube processor flow"""
+    # .env는 import 시점이 아니라 Flow를 만들 때 로드 (노드들이 OPENAI_API_KEY로 Mock 여부를 정함)
+    load_env()
+    
     # Create nodes with retry configuration
     process_url = ProcessYouTubeURL(max_retries=2, wait=5)
+    summarize_long = SummarizeLongTranscript(max_retries=2, wait=2)
     extract_topics = ExtractTopics(max_retries=3, wait=2)
     generate_qa = GenerateQA(max_retries=3, wait=2)
     convert_kid_friendly = ConvertToKidFriendly(max_retries=3, wait=2)
@@ -524,7 +808,7 @@ def create_youtube_processor_flow():
     generate_html = GenerateHTML(max_retries=2, wait=1)
     
     # Connect nodes in sequence with AI Review and Notion Save steps
-    process_url >> extract_topics >> generate_qa >> convert_kid_friendly >> review_and_correct >> save_to_notion >> generate_html
+    process_url >> summarize_long >> extract_topics >> generate_qa >> convert_kid_friendly >> review_and_correct >> save_to_notion >> generate_html
     
     # Create flow
     flow = Flow(start=process_url)
@@ -0,0 +1,478 @@
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.metrics import get_registry, CONTENT_TYPE as METRICS_CONTENT_TYPE, STAGE_BUCKETS
+from utils.env import load_env
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 500
+# 메모리에 남겨 둘 끝난 작업 수 (오래된 것부터 삭제)
+DEFAULT_MAX_FINISHED = 1000
+# SSE 연결이 끊기지 않도록 보내는 주석 줄 간격(초)
+SSE_HEARTBEAT = 15.0
+MAX_BODY_BYTES = 64 * 1024
+
+# POST /jobs의 options로 받을 수 있는 값 → shared 키
+JOB_OPTIONS = {"offline": "offline_html"}
+
+FINISHED = ("succeeded", "failed", "cancelled")
+
+_registry = get_registry()
+JOBS_FINISHED = _registry.counter("jobs_finished_total", "끝난 작업 수 (status: succeeded/failed/cancelled)", ("status",))
+JOBS_REJECTED = _registry.counter("jobs_rejected_total", "대기열이 가득 차서 503으로 거절한 작업 수")
+JOB_QUEUE_WAIT = _registry.histogram("job_queue_wait_seconds", "작업이 워커를 기다린 시간", buckets=STAGE_BUCKETS)
+JOBS_QUEUED = _registry.gauge("jobs_queued", "대기열에 있는 작업 수")
+JOBS_RUNNING = _registry.gauge("jobs_running", "실행 중인 작업 수")
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+class StopFlag:
+    """Flow 노드가 prep에서 확인하는 중단 플래그 (Streamlit 세션 상태와 같은 속성)"""
+
+    def __init__(self):
+        self.should_stop = False
+
+class Job:
+    """작업 하나의 상태, 진행 이벤트, 결과"""
+
+    def __init__(self, url, options):
+        self.id = uuid.uuid4().hex[:12]
+        self.url = url
+        self.options = options
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self.subscribers = set()
+        self.result = None
+        self.error = None
+        self.stop_flag = StopFlag()
+
+    @property
+    def queue_wait_seconds(self):
+        """대기열에서 기다린 시간 (아직 대기 중이면 지금까지)"""
+        end = self.started_at or self.finished_at or time.time()
+        return round(end - self.created_at, 3)
+
+    @property
+    def processing_seconds(self):
+        """Flow 실행 시간 (대기 시간 제외)"""
+        if self.started_at is None:
+            return None
+        return round((self.finished_at or time.time()) - self.started_at, 3)
+
+    def to_dict(self):
+        last_event = self.events[-1] if self.events else None
+        return {
+            "id": self.id,
+            "url": self.url,
+            "options": self.options,
+            "status": self.status,
+            "progress": last_event["progress"] if last_event and last_event.get("progress") is not None else 0,
+            "last_event": last_event,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_wait_seconds": self.queue_wait_seconds,
+            "processing_seconds": self.processing_seconds,
+            "result": self.result,
+            "error": self.error,
+        }
+
+def job_result(shared):
+    """처리가 끝난 shared에서 API로 돌려줄 결과만 추림 (자막 원문, HTML 본문 제외)"""
+    video_info = shared.get("video_info", {})
+    return {
+        "video": {name: video_info.get(name) for name in ("video_id", "title", "url", "thumbnail_url")
+                  if video_info.get(name) is not None},
+        "run_id": shared.get("run_id"),
+        "output_files": shared.get("output_files", {}),
+        "final_topics": shared.get("final_topics", []),
+        "notion_queued": bool(shared.get("notion_result", {}).get("queued")),
+    }
+
+class JobManager:
+    """
+    작업 대기열 + 고정 크기 워커 풀
+
+    대기열이 max_queue를 넘으면 submit이 QueueFull을 일으켜(→ 503) 요청자가 나중에 다시 보내게 하고,
+    워커 workers개가 대기열에서 작업을 꺼내 스레드 풀에서 Flow를 실행합니다.
+    Flow의 progress_callback은 워커 스레드에서 불리므로 이벤트 루프로 넘겨서 구독자(SSE)에 전달합니다.
+    """
+
+    def __init__(self, flow_factory=None, workers=None, max_queue=None, max_finished=DEFAULT_MAX_FINISHED):
+        self.flow_factory = flow_factory
+        self.workers = workers or int(os.getenv("JOB_WORKERS", DEFAULT_WORKERS))
+        self.max_queue = max_queue or int(os.getenv("JOB_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+        self.max_finished = max_finished
+        self.jobs = {}
+        self._finished = deque()
+        self._queue = None
+        self._loop = None
+        self._flow = None
+        self._tasks = []
+        self._executor = None
+        self.counters = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "cancelled": 0}
+
+    async def start(self):
+        if self.flow_factory is None:
+            from flow import create_youtube_processor_flow
+            self.flow_factory = create_youtube_processor_flow
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        # Flow는 실행마다 노드를 복사하므로 하나를 모든 워커가 같이 씀
+        self._flow = self.flow_factory()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job-worker")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.stop_flag.should_stop = True
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, url, options=None):
+        """작업 등록 (대기열이 가득 차면 asyncio.QueueFull)"""
+        job = Job(url, options or {})
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            JOBS_REJECTED.inc()
+            raise
+        self.jobs[job.id] = job
+        self.counters["submitted"] += 1
+        self._publish(job, {"stage": "대기", "message": f"대기열 {self._queue.qsize()}번째", "progress": 0})
+        return job
+
+    def cancel(self, job):
+        """대기 중이면 바로 취소, 실행 중이면 다음 노드 시작 전에 중단"""
+        if job.status in FINISHED:
+            return False
+        job.stop_flag.should_stop = True
+        if job.status == "queued":
+            self._finish(job, "cancelled", error="취소되었습니다")
+        return True
+
+    def stats(self):
+        finished = [self.jobs[job_id] for job_id in self._finished if job_id in self.jobs]
+        done = [job for job in finished if job.started_at is not None]
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": sum(1 for job in self.jobs.values() if job.status == "running"),
+            **self.counters,
+            "avg_queue_wait_seconds": round(sum(job.queue_wait_seconds for job in done) / len(done), 3) if done else 0.0,
+            "avg_processing_seconds": round(sum(job.processing_seconds for job in done) / len(done), 3) if done else 0.0,
+        }
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status != "queued":  # 대기 중에 취소됨
+                    continue
+                job.status = "running"
+                job.started_at = time.time()
+                JOB_QUEUE_WAIT.observe(job.queue_wait_seconds)
+                self._publish(job, {"stage": "시작", "message": "처리를 시작합니다",
+                                    "progress": 0, "queue_wait_seconds": job.queue_wait_seconds})
+                try:
+                    shared = await self._loop.run_in_executor(self._executor, self._run_flow, job)
+                except InterruptedError as e:
+                    self._finish(job, "cancelled", error=str(e))
+                except Exception as e:
+                    logger.warning(f"작업 {job.id} 실패: {e}")
+                    self._finish(job, "failed", error=str(e))
+                else:
+                    self._finish(job, "succeeded", result=job_result(shared))
+            finally:
+                self._queue.task_done()
+
+    def _run_flow(self, job):
+        # 워커 스레드에서 실행
+        def progress_callback(stage, message, progress=None):
+            self._loop.call_soon_threadsafe(
+                self._publish, job, {"stage": stage, "message": message, "progress": progress})
+
+        shared = {
+            "url": job.url,
+            "progress_callback": progress_callback,
+            "stop_flag": job.stop_flag,
+            **{JOB_OPTIONS[name]: value for name, value in job.options.items()},
+        }
+        self._flow.run(shared)
+        return shared
+
+    def _finish(self, job, status, result=None, error=None):
+        job.status = status
+        job.finished_at = time.time()
+        job.result = result
+        job.error = error
+        self.counters[status] += 1
+        JOBS_FINISHED.labels(status).inc()
+        self._publish(job, {"stage": "완료", "message": error or "처리가 끝났습니다",
+                            "progress": 100 if status == "succeeded" else None, "status": status,
+                            "queue_wait_seconds": job.queue_wait_seconds,
+                            "processing_seconds": job.processing_seconds}, event="done")
+
+        self._finished.append(job.id)
+        while len(self._finished) > self.max_finished:
+            self.jobs.pop(self._finished.popleft(), None)
+
+    def _publish(self, job, data, event="progress"):
+        # 이벤트 루프 스레드에서만 호출
+        entry = {"seq": len(job.events) + 1, "event": event, "time": time.time(), **data}
+        job.events.append(entry)
+        for queue in list(job.subscribers):
+            queue.put_nowait(entry)
+
+class JobServer:
+    """
+    작업 API를 제공하는 asyncio HTTP 서버 (표준 라이브러리만 사용)
+
+    - POST /jobs {"url": ..., "options": {"offline": true}} → 202 {"id", "status", ...}
+      (대기열이 가득 차면 503 + Retry-After)
+    - GET /jobs/{id} → 상태, 대기 시간/처리 시간, 결과
+    - GET /jobs/{id}/events → Server-Sent Events로 진행 이벤트 (Last-Event-ID부터 다시 받기 가능)
+    - DELETE /jobs/{id} → 취소
+    - GET /stats → 대기열/워커 상태, 평균 대기·처리 시간
+    - GET /metrics → Prometheus 텍스트 형식 (LLM/노드/노션 메트릭 + 작업 대기열)
+
+    사용 예 (테스트에서는 별도 스레드의 이벤트 루프로 실행):
+        with JobServer(workers=2) as server:
+            requests.post(f"{server.base_url}/jobs", json={"url": ...})
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, **manager_options):
+        self.host = host
+        self.port = port
+        self.manager = JobManager(**manager_options)
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def serve(self):
+        """이벤트 루프 안에서 서버 시작"""
+        await self.manager.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        return self
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.manager.stop()
+
+    def start(self):
+        """별도 스레드의 이벤트 루프에서 실행 (테스트/임베딩용)"""
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.serve())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self.close(), self._loop).result(timeout=10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop = None
+
+    def call(self, function, *args):
+        """서버 이벤트 루프에서 함수 실행 후 결과 반환 (다른 스레드에서 상태를 볼 때)"""
+        async def run():
+            return function(*args)
+        return asyncio.run_coroutine_threadsafe(run(), self._loop).result(timeout=10)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            method, path, headers, body = request
+            await self._route(writer, method, path, headers, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            await self._send_json(writer, 400, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"요청 본문이 너무 큽니다 ({length}바이트)")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?")[0].rstrip("/") or "/", headers, body
+
+    async def _route(self, writer, method, path, headers, body):
+        parts = [part for part in path.split("/") if part]
+        manager = self.manager
+
+        if parts == ["jobs"] and method == "POST":
+            await self._create_job(writer, body)
+        elif parts == ["stats"] and method == "GET":
+            await self._send_json(writer, 200, manager.stats())
+        elif parts == ["metrics"] and method == "GET":
+            stats = manager.stats()
+            JOBS_QUEUED.set(stats["queued"])
+            JOBS_RUNNING.set(stats["running"])
+            await self._send(writer, 200, _registry.render().encode("utf-8"), METRICS_CONTENT_TYPE)
+        elif len(parts) >= 2 and parts[0] == "jobs":
+            job = manager.jobs.get(parts[1])
+            if job is None:
+                await self._send_json(writer, 404, {"error": f"작업을 찾을 수 없습니다: {parts[1]}"})
+            elif len(parts) == 2 and method == "GET":
+                await self._send_json(writer, 200, job.to_dict())
+            elif len(parts) == 2 and method == "DELETE":
+                cancelled = manager.cancel(job)
+                await self._send_json(writer, 202 if cancelled else 409, job.to_dict())
+            elif parts[2:] == ["events"] and method == "GET":
+                await self._stream_events(writer, job, headers.get("last-event-id"))
+            else:
+                await self._send_json(writer, 405, {"error": f"지원하지 않는 요청: {method} {path}"})
+        else:
+            await self._send_json(writer, 404, {"error": f"알 수 없는 경로: {path}"})
+
+    async def _create_job(self, writer, body):
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON 형식이 아닙니다: {e}")
+        url = payload.get("url") if isinstance(payload, dict) else None
+        options = payload.get("options") or {} if isinstance(payload, dict) else {}
+        if not isinstance(url, str) or not url.strip():
+            raise ValueError("url이 필요합니다")
+        unknown = set(options) - set(JOB_OPTIONS) if isinstance(options, dict) else {"options"}
+        if unknown:
+            raise ValueError(f"지원하지 않는 옵션: {', '.join(sorted(unknown))} (가능: {', '.join(JOB_OPTIONS)})")
+
+        try:
+            job = self.manager.submit(url.strip(), options)
+        except asyncio.QueueFull:
+            stats = self.manager.stats()
+            # 평균 처리 시간으로 대기열 한 칸이 빌 때까지 걸릴 시간을 대략 계산
+            retry_after = max(1, round(stats["avg_processing_seconds"] / max(stats["workers"], 1)))
+            await self._send_json(writer, 503, {"error": "대기열이 가득 찼습니다", "queued": stats["queued"]},
+                                  {"Retry-After": str(retry_after)})
+            return
+
+        await self._send_json(writer, 202, {
+            "id": job.id,
+            "status": job.status,
+            "queued": self.manager.stats()["queued"],
+            "links": {"self": f"/jobs/{job.id}", "events": f"/jobs/{job.id}/events"},
+        }, {"Location": f"/jobs/{job.id}"})
+
+    async def _stream_events(self, writer, job, last_event_id):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+
+        queue = asyncio.Queue()
+        after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+        for entry in job.events[after:]:
+            queue.put_nowait(entry)
+        job.subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+                data = json.dumps({k: v for k, v in entry.items() if k not in ("seq", "event")}, ensure_ascii=False)
+                writer.write(f"id: {entry['seq']}\nevent: {entry['event']}\ndata: {data}\n\n".encode("utf-8"))
+                await writer.drain()
+                if entry["event"] == "done":
+                    break
+        finally:
+            job.subscribers.discard(queue)
+
+    async def _send_json(self, writer, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        await self._send(writer, status, data, "application/json; charset=utf-8", headers)
+
+    async def _send(self, writer, status, data, content_type, headers=None):
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}",
+                f"Content-Length: {len(data)}", "Connection: close"]
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+async def _serve_forever(args):
+    server = await JobServer(args.host, args.port, workers=args.workers, max_queue=args.max_queue).serve()
+    logger.info(f"작업 API: {server.base_url} (워커 {server.manager.workers}개, 대기열 {server.manager.max_queue})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the YouTube processor as an HTTP job API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help=f"Concurrent flows (JOB_WORKERS, default {DEFAULT_WORKERS})")
+    parser.add_argument("--max-queue", type=int, default=None,
+                        help=f"Queued jobs before POST /jobs returns 503 (JOB_MAX_QUEUE, default {DEFAULT_MAX_QUEUE})")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # JOB_WORKERS, METRICS_PORT 등을 읽기 전에 .env 로드
+    load_env()
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,10 @@ import logging
 import sys
 import os
 from flow import create_youtube_processor_flow
+from utils.notion_outbox import get_outbox, get_drainer
+from utils.metrics import write_metrics_file
+from utils.stage_cache import format_stage_log
+from utils.env import load_env
 
 # Set up logging
 logging.basicConfig(
@@ -17,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Main function to run the YouTube content processor."""
+    # Load .env before argparse reads defaults such as METRICS_FILE
+    load_env()
     
     # Parse command line arguments
     parser = argparse.ArgumentParser(
@@ -28,6 +34,29 @@ def main():
         help="YouTube video URL to process",
         required=False
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Also write summary.offline.html with inlined CSS (plus .gz/.br) for viewing without network"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=os.getenv("METRICS_FILE"),
+        help="Write Prometheus text-format metrics (LLM latency, retries, stage durations, ...) to this file when done"
+    )
+    parser.add_argument("--num-topics", type=int, help="Number of topics to extract (default: NUM_TOPICS or 5)")
+    parser.add_argument("--num-questions", type=int, help="Questions per topic (default: NUM_QUESTIONS or 3)")
+    parser.add_argument("--target-age", type=int, help="Age the explanations are written for (default: TARGET_AGE or 5)")
+    parser.add_argument(
+        "--levels",
+        help="Comma-separated audience levels generated in one run, e.g. 5살,초등학생,중학생 (default: AUDIENCE_LEVELS)"
+    )
+    parser.add_argument(
+        "--no-review",
+        action="store_true",
+        help="Skip the AI review stage"
+    )
     args = parser.parse_args()
     
     # Get YouTube URL from arguments or prompt user
@@ -41,17 +70,43 @@ def main():
     flow = create_youtube_processor_flow()
     
     # Initialize shared memory
+    # Unchanged stages are reused from the stage cache, so only the affected stages are recomputed
     shared = {
-        "url": url
+        "url": url,
+        "offline_html": args.offline,
+        "settings": {
+            "num_topics": args.num_topics,
+            "num_questions": args.num_questions,
+            "target_age": args.target_age,
+            "levels": args.levels,
+            "review": False if args.no_review else None
+        }
     }
     
     # Run the flow
     flow.run(shared)
     
+    # Wait briefly for the Notion outbox so a one-shot CLI run still uploads
+    if shared.get("notion_result", {}).get("queued"):
+        timeout = float(os.getenv("NOTION_OUTBOX_FLUSH_TIMEOUT", "30"))
+        emptied = get_drainer().flush(timeout=timeout)
+        if not emptied:
+            logger.warning(f"Notion outbox not empty, will retry on next run: {get_outbox().metrics()}")
+    
+    # One-shot run: leave the metrics for the node_exporter textfile collector (or a human) to read
+    if args.metrics_file:
+        write_metrics_file(args.metrics_file)
+        logger.info(f"Metrics written to {args.metrics_file}")
+    
     # Report success and output file location
     print("\n" + "=" * 50)
     print("Processing completed successfully!")
-    print(f"Output HTML file: {os.path.abspath('output.html')}")
+    output_files = shared.get("output_files", {})
+    print(f"Output HTML file: {os.path.abspath(output_files.get('html', ''))}")
+    if shared.get("stage_log"):
+        print(f"Stages: {format_stage_log(shared['stage_log'])}")
+    if "offline_html" in output_files:
+        print(f"Offline HTML file: {os.path.abspath(output_files['offline_html'])}")
     print("=" * 50 + "\n")
 
     return 0
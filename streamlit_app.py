@@ -3,8 +3,16 @@ import os
 import time
 from datetime import datetime
 from flow import create_youtube_processor_flow
+from utils.output_store import get_output_store
+from utils.result_cache import get_result_cache
+from utils.metrics import start_metrics_server
+from utils.youtube_processor import extract_video_id
+from utils.env import load_env
 import json
 
+# .env는 METRICS_PORT/OPENAI_API_KEY를 읽고 결과 캐시 키를 만들기 전에 로드 (첫 화면부터 반영)
+load_env()
+
 # 페이지 설정
 st.set_page_config(
     page_title="SUM-Q",
@@ -282,6 +290,19 @@ window.addEventListener('beforeunload', function (e) {
 </style>
 """, unsafe_allow_html=True)
 
+# 세션/재실행 사이에 공유하는 자원 (Flow 객체, 결과 캐시)
+@st.cache_resource
+def get_flow():
+    return create_youtube_processor_flow()
+
+@st.cache_resource
+def get_cache():
+    return get_result_cache()
+
+# METRICS_PORT가 있으면 Prometheus용 /metrics 서버를 프로세스당 한 번 띄움 (모든 세션의 메트릭 합산)
+if os.getenv("METRICS_PORT"):
+    start_metrics_server()
+
 # Session State 초기화
 if "api_key" not in st.session_state:
     st.session_state.api_key = ""
@@ -291,6 +312,8 @@ if "processing" not in st.session_state:
     st.session_state.processing = False
 if "should_stop" not in st.session_state:
     st.session_state.should_stop = False
+if "cached_result" not in st.session_state:
+    st.session_state.cached_result = None
 
 # API 키 자동 로드 (환경 변수에서)
 env_api_key = os.getenv("OPENAI_API_KEY", "")
@@ -317,6 +340,7 @@ youtube_url = st.text_input(
 if not st.session_state.processing:
     # 요약 시작 버튼 (파란색)
     process_button = st.button("✨ 요약 시작하기", type="primary", use_container_width=True)
+    force_refresh = st.checkbox("🔄 새로 요약하기 (저장된 결과 무시)", value=False)
     stop_button = False
 else:
     # 중단 버튼 (빨간색, 펄스 애니메이션)
@@ -324,18 +348,40 @@ else:
     if stop_button:
         st.session_state.should_stop = True
     process_button = False
+    force_refresh = False
 
 # URL이 변경되면 session state 업데이트
 if youtube_url != st.session_state.get("selected_url", ""):
     st.session_state.selected_url = youtube_url
+    st.session_state.cached_result = None
+
+# 이 비디오의 이전 결과 (매니페스트 조회 한 번)
+previous_video_id = extract_video_id(youtube_url) if youtube_url else None
+previous_result = get_output_store().latest(previous_video_id) if previous_video_id else None
+if previous_result and not st.session_state.processing:
+    previous_html = previous_result["files"].get("html")
+    if previous_html and os.path.exists(previous_html):
+        saved_at = datetime.fromtimestamp(previous_result["updated_at"]).strftime("%Y-%m-%d %H:%M")
+        with open(previous_html, encoding="utf-8") as f:
+            st.download_button(
+                label=f"🗂️ 이전 요약 받기 ({saved_at})",
+                data=f.read(),
+                file_name=f"sum-q_{previous_result['video_id']}_{previous_result['run_id']}.html",
+                mime="text/html"
+            )
 
 # 요약 처리
 if process_button and youtube_url:
     try:
-        # 처리 시작
-        st.session_state.processing = True
-        st.session_state.should_stop = False
-        st.rerun()
+        # 같은 비디오/설정으로 처리한 결과가 있으면 LLM/YouTube 호출 없이 바로 표시
+        video_id = extract_video_id(youtube_url)
+        cached = get_cache().get(video_id) if video_id and not force_refresh else None
+        st.session_state.cached_result = cached
+        if cached is None:
+            # 처리 시작
+            st.session_state.processing = True
+            st.session_state.should_stop = False
+            st.rerun()
         
     except InterruptedError:
         st.session_state.processing = False
@@ -368,6 +414,76 @@ if process_button and youtube_url:
 elif process_button and not youtube_url:
     st.warning("⚠️ YouTube URL을 입력해주세요!")
 
+def render_results(shared, cached_at=None):
+    """처리 결과 표시 (방금 처리한 결과와 캐시에서 꺼낸 결과 공통)"""
+    if "html_output" in shared:
+        if cached_at:
+            saved_at = datetime.fromtimestamp(cached_at).strftime("%Y-%m-%d %H:%M")
+            st.info(f"⚡ 저장된 결과를 바로 보여드려요 ({saved_at} 요약). 새로 만들려면 '새로 요약하기'를 체크하세요.")
+        # 노션 저장 결과 먼저 표시
+        if "notion_result" in shared:
+            notion_result = shared["notion_result"]
+            if notion_result.get("queued"):
+                st.success("📥 노션 저장이 예약되었습니다! 잠시 후 노션 데이터베이스에 나타납니다.")
+            elif notion_result.get("success"):
+                st.success(f"🎉 노션에 저장 완료!")
+                st.markdown(f"📝 [노션 페이지 보기]({notion_result.get('page_url')})")
+            else:
+                # 노션 설정이 없으면 안내 메시지
+                if "노션 설정이 없습니다" in notion_result.get("error", ""):
+                    st.info("💡 **노션 연결하고 싶으신가요?**  \n.env 파일에 `NOTION_TOKEN`과 `NOTION_DATABASE_ID`를 추가하면 자동으로 노션에도 저장됩니다!")
+                else:
+                    st.warning(f"⚠️ 노션 저장 실패: {notion_result.get('error', '알 수 없는 오류')}")
+        
+        # 처리 결과 요약 표시
+        if "final_topics" in shared:
+            st.success("🎯 **처리 완료 요약**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("📝 추출된 주제", len(shared["final_topics"]))
+            with col2:
+                total_qa = sum(len(topic["qa_pairs"]) for topic in shared["final_topics"])
+                st.metric("❓ 생성된 Q&A", total_qa)
+            with col3:
+                video_info = shared.get("video_info", {})
+                duration = video_info.get("duration", "N/A")
+                st.metric("⏱️ 비디오 길이", duration)
+        
+        # HTML 요약 표시
+        st.markdown(shared["html_output"], unsafe_allow_html=True)
+        if "output_files" in shared:
+            st.caption(f"💾 저장 위치: {shared['output_files']['html']}")
+        
+        # 다운로드
+        col1, col2 = st.columns(2)
+        with col1:
+            # 파일용 HTML 다운로드
+            download_html = shared.get("file_html", shared["html_output"])
+            st.download_button(
+                label="📄 HTML 다운로드",
+                data=download_html,
+                file_name=f"sum-q_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
+                mime="text/html"
+            )
+        with col2:
+            if "final_topics" in shared:
+                summary_data = {
+                    "video_info": shared.get("video_info", {}),
+                    "topics": shared.get("final_topics", [])
+                }
+                st.download_button(
+                    label="📊 JSON 다운로드",
+                    data=json.dumps(summary_data, ensure_ascii=False, indent=2),
+                    file_name=f"sum-q_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    mime="application/json"
+                )
+    else:
+        st.error("❌ 요약 생성 실패")
+
+# 저장된 결과 표시
+if st.session_state.cached_result and not st.session_state.processing:
+    render_results(st.session_state.cached_result, cached_at=st.session_state.cached_result.get("cached_at"))
+
 # 실제 처리 로직 (처리 중일 때만 실행)
 if st.session_state.processing:
     try:
@@ -397,8 +513,8 @@ if st.session_state.processing:
             st.session_state.should_stop = False
             st.rerun()
             
-        # Flow 실행
-        flow = create_youtube_processor_flow()
+        # Flow 실행 (Flow 객체는 세션 사이에 재사용)
+        flow = get_flow()
         
         # 공유된 상태에 progress callback 추가
         shared = {
@@ -451,63 +567,14 @@ if st.session_state.processing:
         status_text.empty()
         detail_text.empty()
         
+        # 결과 저장 (같은 비디오/설정이면 다음부터 바로 표시)
+        if "html_output" in shared and not st.session_state.should_stop:
+            video_id = shared.get("video_info", {}).get("video_id")
+            if video_id:
+                get_cache().put(video_id, shared)
+        
         # 결과 표시
-        if "html_output" in shared:
-            # 노션 저장 결과 먼저 표시
-            if "notion_result" in shared:
-                notion_result = shared["notion_result"]
-                if notion_result.get("success"):
-                    st.success(f"🎉 노션에 저장 완료!")
-                    st.markdown(f"📝 [노션 페이지 보기]({notion_result.get('page_url')})")
-                else:
-                    # 노션 설정이 없으면 안내 메시지
-                    if "노션 설정이 없습니다" in notion_result.get("error", ""):
-                        st.info("💡 **노션 연결하고 싶으신가요?**  \n.env 파일에 `NOTION_TOKEN`과 `NOTION_DATABASE_ID`를 추가하면 자동으로 노션에도 저장됩니다!")
-                    else:
-                        st.warning(f"⚠️ 노션 저장 실패: {notion_result.get('error', '알 수 없는 오류')}")
-            
-            # 처리 결과 요약 표시
-            if "final_topics" in shared:
-                st.success("🎯 **처리 완료 요약**")
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("📝 추출된 주제", len(shared["final_topics"]))
-                with col2:
-                    total_qa = sum(len(topic["qa_pairs"]) for topic in shared["final_topics"])
-                    st.metric("❓ 생성된 Q&A", total_qa)
-                with col3:
-                    video_info = shared.get("video_info", {})
-                    duration = video_info.get("duration", "N/A")
-                    st.metric("⏱️ 비디오 길이", duration)
-            
-            # HTML 요약 표시
-            st.markdown(shared["html_output"], unsafe_allow_html=True)
-            
-            # 다운로드
-            col1, col2 = st.columns(2)
-            with col1:
-                # 파일용 HTML 다운로드
-                download_html = shared.get("file_html", shared["html_output"])
-                st.download_button(
-                    label="📄 HTML 다운로드",
-                    data=download_html,
-                    file_name=f"sum-q_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
-                    mime="text/html"
-                )
-            with col2:
-                if "final_topics" in shared:
-                    summary_data = {
-                        "video_info": shared.get("video_info", {}),
-                        "topics": shared.get("final_topics", [])
-                    }
-                    st.download_button(
-                        label="📊 JSON 다운로드",
-                        data=json.dumps(summary_data, ensure_ascii=False, indent=2),
-                        file_name=f"sum-q_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                        mime="application/json"
-                    )
-        else:
-            st.error("❌ 요약 생성 실패")
+        render_results(shared)
             
     except InterruptedError:
         st.session_state.processing = False
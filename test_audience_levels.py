@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+여러 독자 수준 테스트 스크립트
+
+settings["levels"]로 5살/초등학생/중학생 같은 수준을 한 번에 만들 때 자막/주제/Q&A는 한 번만 만들고
+변환은 주제마다 프롬프트 하나로 모든 수준을 받는지, 응답에서 빠진 수준만 따로 다시 만드는지,
+HTML에 수준 전환 버튼이 들어가는지, 네 수준을 따로 네 번 실행할 때보다 LLM 비용이 훨씬 적은지 확인합니다.
+"""
+
+import json
+import tempfile
+from unittest.mock import patch
+from utils.stage_cache import pipeline_settings
+from utils.kid_friendly_converter import convert_for_levels, level_age
+from utils.html_generator import render_summary_html, sections_from_topics
+from benchmarks.mock_llm import MockLLM
+from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+from benchmarks.runner import benchmark_environment, compare_audience_levels, format_levels_report
+
+QA_PAIRS = [
+    {"question": "광합성은 무엇인가요?", "answer": "식물이 빛 에너지를 이용해 양분을 만드는 과정입니다."},
+    {"question": "엽록소는 왜 초록색인가요?", "answer": "엽록소가 초록색 빛을 반사하기 때문입니다."},
+]
+
+def test_level_settings():
+    """수준 목록은 쉼표 문자열/리스트 모두 받고, 모르는 수준은 오류"""
+    print("⚙️ 수준 설정 테스트")
+
+    assert pipeline_settings({"levels": "5살, 중학생,5살"})["levels"] == ["5살", "중학생"]
+    assert pipeline_settings({"levels": ["성인"]})["levels"] == ["성인"]
+    assert level_age("초등학생") == 10 and level_age("5살") == 5
+    try:
+        pipeline_settings({"levels": "유치원생"})
+        assert False, "ValueError가 나야 합니다"
+    except ValueError as e:
+        assert "유치원생" in str(e)
+    print("   ✅ 쉼표 문자열/리스트, 중복 제거, 알 수 없는 수준 거부")
+
+def test_batched_conversion():
+    """주제 하나당 LLM 호출 한 번, 빠진 수준만 항목별로 다시 변환"""
+    print("📦 묶음 변환 테스트")
+
+    llm = MockLLM()
+    levels = ["5살", "초등학생", "중학생"]
+    with patch("utils.model_router.call_llm_with_usage", llm), patch.dict("os.environ", {"OPENAI_API_KEY": "test"}):
+        versions = convert_for_levels("광합성", QA_PAIRS, levels)
+        assert llm.summary()["by_kind"] == {"levels": 1}
+        assert len(versions) == len(QA_PAIRS) and all(list(version) == levels for version in versions)
+
+        # 응답에 "5살"이 빠지면 그 수준만 항목마다 따로 변환
+        llm.reset()
+        partial = json.dumps({"levels": {"초등학생": [{"question": "q", "answer": "a"}] * 2}}, ensure_ascii=False)
+        with patch.object(llm, "respond", lambda kind, prompt, rng:
+                          partial if kind == "levels" else "쉬운 말로 바꾼 문장이에요."):
+            versions = convert_for_levels("광합성", QA_PAIRS, ["5살", "초등학생"])
+        calls = llm.summary()["by_kind"]
+        assert calls["kid_friendly"] >= 1 and calls["levels"] >= 1, calls
+        assert versions[0]["5살"]["answer"] == "쉬운 말로 바꾼 문장이에요."
+
+        # 영어 원문은 "성인" 수준이어도 건너뛰지 않고 한국어로 변환
+        llm.reset()
+        english = [{"question": "What is a black hole?", "answer": "A place where gravity is very strong."}]
+        versions = convert_for_levels("Black holes", english, ["성인"])
+        assert llm.summary()["by_kind"] == {"levels": 1} and versions[0]["성인"]["question"] != english[0]["question"]
+
+    # API 키가 없으면 LLM 없이 어휘 사전 치환만
+    with patch.dict("os.environ", {"OPENAI_API_KEY": ""}):
+        assert list(convert_for_levels("광합성", QA_PAIRS, ["성인"])[0]) == ["성인"]
+    print("   ✅ 수준 3개 × Q&A 2개를 호출 1회로, 빠진 수준만 다시 변환")
+
+def test_flow_and_html_switcher():
+    """Flow에서 수준별 버전이 검토 뒤에도 남고, HTML에 전환 버튼과 수준별 내용이 들어감"""
+    print("🎚️ Flow/HTML 테스트")
+
+    from flow import create_youtube_processor_flow
+
+    llm = MockLLM()
+    levels = ["5살", "초등학생", "고등학생"]
+    with tempfile.TemporaryDirectory() as tmp, \
+            benchmark_environment(llm, fixture_video_fetcher(make_video_info(sentences=40)), tmp):
+        shared = {"url": "https://youtu.be/levels00001", "settings": {"levels": levels}}
+        create_youtube_processor_flow().run(shared)
+        by_kind = llm.summary()["by_kind"]
+        with open(shared["output_files"]["html"], encoding="utf-8") as f:
+            file_html = f.read()
+
+    topics = shared["final_topics"]
+    assert by_kind["levels"] == len(topics) and "kid_friendly" not in by_kind, by_kind
+    for topic in topics:
+        for qa in topic["qa_pairs"]:
+            assert list(qa["levels"]) == levels
+            assert qa["levels"]["5살"] == {"question": qa["kid_friendly_question"], "answer": qa["kid_friendly_answer"]}
+
+    assert 'id="summary-level-0" class="level-radio" checked' in file_html
+    assert all(f'<label for="summary-level-{i}">{level}</label>' in file_html for i, level in enumerate(levels))
+    assert file_html.count('class="level-variant level-2"') == sum(len(topic["qa_pairs"]) for topic in topics)
+
+    # 값은 이스케이프하고, 수준 없는 섹션은 예전과 같음
+    sections = sections_from_topics([{"title": "T", "qa_pairs": [{
+        "kid_friendly_question": "q", "kid_friendly_answer": "a",
+        "levels": {"<b>": {"question": "<script>", "answer": "a&b"}}}]}])
+    file_part, streamlit_part = render_summary_html("제목", "x.jpg", sections)
+    assert "&lt;script&gt;" in file_part and "<script>" not in file_part and "a&amp;b" in streamlit_part
+    assert ">&lt;b&gt;</label>" in streamlit_part
+    plain = render_summary_html("제목", "x.jpg", [{"title": "T", "bullets": [("Q: q", "A: a")]}])[0]
+    assert "level-switcher" not in plain
+    print(f"   ✅ 주제 {len(topics)}개 → 수준 변환 호출 {by_kind['levels']}회, HTML 전환 버튼 {len(levels)}개")
+
+def test_levels_cost_less_than_separate_runs():
+    """네 수준을 한 번에 만드는 비용이 따로 네 번 실행하는 비용보다 훨씬 적음"""
+    print("📊 비용 비교 테스트")
+
+    result = compare_audience_levels(latency="fixed:0", transcript_sentences=120)
+    separate, combined = result["separate"], result["combined"]
+    assert separate["by_kind"]["topics"] == 4 and combined["by_kind"]["topics"] == 1
+    assert result["savings"]["llm_calls"] < 0.3 and result["savings"]["prompt_tokens"] < 0.5, result["savings"]
+    print("\n".join("   " + line for line in format_levels_report(result).splitlines()))
+
+if __name__ == "__main__":
+    test_level_settings()
+    test_batched_conversion()
+    test_flow_and_html_switcher()
+    test_levels_cost_less_than_separate_runs()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+벤치마크 패키지 테스트 스크립트
+
+실제 Flow를 결정적인 Mock LLM으로 돌려서 노드별 백분위수/LLM 호출 수/처리량/RSS가
+기록되는지, 같은 시드면 같은 결과가 나오는지, 기준 결과와 비교해 회귀를 찾는지 확인합니다.
+전체 벤치마크는 `python -m benchmarks --runs 20 --baseline <이전 결과.json>`으로 실행합니다
+(`--http`를 주면 가짜 OpenAI 서버를 띄워 openai SDK로 실제 HTTP 요청을 보냄).
+"""
+
+import os
+import copy
+import tempfile
+from benchmarks.mock_llm import MockLLM, LatencyModel, classify_prompt
+from benchmarks.runner import run_benchmark, compare_results, format_report, save_results, load_results, percentile
+
+NODES = ["ProcessYouTubeURL", "SummarizeLongTranscript", "ExtractTopics", "GenerateQA",
+         "ConvertToKidFriendly", "ReviewAndCorrect", "SaveToNotion", "GenerateHTML"]
+
+def test_mock_llm_is_deterministic():
+    """같은 시드/프롬프트면 같은 응답과 지연시간, 분포 문자열 파싱"""
+    print("🎲 Mock LLM 테스트")
+
+    delays = []
+    llm = MockLLM(latency="lognormal:0.5,0.5", seed=7, sleep=delays.append)
+    other = MockLLM(latency="lognormal:0.5,0.5", seed=7, sleep=delays.append)
+    prompt = '다음 주제와 내용을 바탕으로 3개의 흥미로운 질문과 답변을 생성해주세요.\n주제: 무지개\n{"qa_pairs": []}'
+
+    assert llm(prompt, "gpt-4o") == other(prompt, "gpt-4o")
+    assert delays[0] == delays[1] > 0
+    assert '"qa_pairs"' in llm(prompt, "gpt-4o")[0]
+    assert delays[2] != delays[0]  # 같은 프롬프트의 두 번째 호출은 새 표본
+    assert llm.summary()["by_kind"] == {"qa": 2}
+
+    assert classify_prompt("```yaml\nedits: []\n```") == "review"
+    assert str(LatencyModel.parse("0.2")) == "fixed:0.2"
+    assert str(LatencyModel.parse("uniform:0.1,0.5")) == "uniform:0.1,0.5"
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    print("   ✅ 결정적 응답/지연시간")
+
+def test_benchmark_runs_real_flow():
+    """실제 Flow의 모든 노드가 측정되고, 같은 시드면 LLM 호출 수가 같은지 테스트"""
+    print("🏃 벤치마크 실행 테스트")
+
+    first = run_benchmark(runs=3, concurrency=2, latency="fixed:0.001", transcript_sentences=50)
+    second = run_benchmark(runs=3, concurrency=2, latency="fixed:0.001", transcript_sentences=50)
+
+    assert list(first["nodes"]) == NODES
+    assert all(stats["count"] == 3 for stats in first["nodes"].values())
+    assert first["nodes"]["ConvertToKidFriendly"]["p50_ms"] <= first["nodes"]["ConvertToKidFriendly"]["p99_ms"]
+    assert first["llm"]["by_kind"]["topics"] == 3 and first["llm"]["by_kind"]["qa"] > 0
+    assert first["llm"]["total_calls"] == second["llm"]["total_calls"]
+    assert first["throughput"]["runs_per_minute"] > 0
+    assert first["peak_rss_mb"] is None or first["peak_rss_mb"] > 0
+    assert "OPENAI_API_KEY" not in os.environ or os.environ["OPENAI_API_KEY"] != "benchmark-mock-key"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = save_results(first, os.path.join(tmp, "result.json"))
+        assert load_results(path) == first
+
+    print(format_report(first, compare_results(second, first, tolerance=10.0)))
+
+def test_benchmark_over_http():
+    """--http: 가짜 OpenAI 서버에 openai SDK로 실제 HTTP 요청 (429 주입 포함)"""
+    print("🌐 HTTP 벤치마크 테스트")
+
+    result = run_benchmark(runs=2, concurrency=2, latency="fixed:0", transcript_sentences=50,
+                           http=True, error_rates={429: 0.05})
+    assert list(result["nodes"]) == NODES
+    assert result["llm"]["by_kind"]["topics"] == 2
+    assert result["llm"]["total_calls"] == sum(result["llm"]["by_kind"].values()) + result["llm"]["rate_limited"]
+    assert "OPENAI_BASE_URL" not in os.environ or "127.0.0.1" not in os.environ["OPENAI_BASE_URL"]
+    print(f"   ✅ LLM 요청 {result['llm']['total_calls']}회, 429 {result['llm']['rate_limited']}회, "
+          f"새 연결 {result['llm']['connections']}개")
+
+def test_regressions_flagged():
+    """느려진 노드, 늘어난 LLM 호출을 회귀로 찾는지 테스트"""
+    print("🚨 회귀 감지 테스트")
+
+    baseline = run_benchmark(runs=2, latency="fixed:0", transcript_sentences=50)
+    current = copy.deepcopy(baseline)
+    assert compare_results(current, baseline) == []
+
+    current["nodes"]["GenerateQA"]["p95_ms"] = baseline["nodes"]["GenerateQA"]["p95_ms"] * 2 + 50
+    current["nodes"]["SaveToNotion"]["p50_ms"] = baseline["nodes"]["SaveToNotion"]["p50_ms"] * 3  # 차이가 작으면 잡음
+    current["llm"]["calls_per_run"] = baseline["llm"]["calls_per_run"] + 1
+
+    metrics = [regression["metric"] for regression in compare_results(current, baseline)]
+    assert metrics == ["GenerateQA.p95_ms", "llm.calls_per_run"], metrics
+    print(f"   ✅ {metrics}")
+
+if __name__ == "__main__":
+    test_mock_llm_is_deterministic()
+    test_benchmark_runs_real_flow()
+    test_benchmark_over_http()
+    test_regressions_flagged()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+가짜 OpenAI 서버 테스트 스크립트
+
+로컬 OpenAI 호환 서버(utils/fake_openai_server.py)에 OPENAI_BASE_URL로 실제 openai SDK를
+연결해서 대본 응답, 토큰 집계, 429/500 주입과 재시도, 타임아웃, 동시 요청의 연결 재사용을
+네트워크 없이 확인합니다.
+"""
+
+import os
+import time
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from utils.call_llm import call_llm_with_usage, get_openai_client
+from utils.fake_openai_server import FakeOpenAIServer
+
+QA_PROMPT = '다음 주제와 내용을 바탕으로 2개의 흥미로운 질문과 답변을 생성해주세요.\n주제: 무지개\n{"qa_pairs": []}'
+
+def _env(server, **extra):
+    return patch.dict(os.environ, {"OPENAI_API_KEY": "fake-key", "OPENAI_BASE_URL": server.base_url, **extra})
+
+def test_scripted_responses_and_tokens():
+    """프롬프트 종류별 대본 응답과 토큰 집계 테스트"""
+    print("📜 대본 응답 테스트")
+
+    with FakeOpenAIServer(responses={"other": ["첫 번째", "두 번째"]}) as server, _env(server):
+        content, usage = call_llm_with_usage(QA_PROMPT, model="gpt-4o", json_mode=True)
+        assert content.count('"question"') == 2
+        assert usage["prompt_tokens"] > 0 and usage["completion_tokens"] > 0
+
+        assert call_llm_with_usage("안녕")[0] == "첫 번째"
+        assert call_llm_with_usage("안녕")[0] == "두 번째"
+
+        stats = server.stats
+        assert stats["by_kind"] == {"qa": 1, "other": 2}
+        assert stats["by_model"]["gpt-4o"]["prompt_tokens"] == usage["prompt_tokens"]
+        assert stats["completion_tokens"] >= usage["completion_tokens"]
+    print(f"   ✅ {stats['completions']}회 응답, 토큰 {stats['prompt_tokens']}+{stats['completion_tokens']}")
+
+def test_error_injection_and_retries():
+    """429는 SDK가 Retry-After 후 재시도, 재시도를 다 쓰면 오류 응답, 타임아웃 테스트"""
+    print("🚨 오류 주입 테스트")
+
+    with FakeOpenAIServer() as server, _env(server, OPENAI_MAX_RETRIES="2"):
+        server.inject(429)
+        content, _ = call_llm_with_usage(QA_PROMPT)
+        assert '"qa_pairs"' in content
+        assert server.stats["rate_limited"] == 1 and server.stats["requests"] == 2
+
+    with FakeOpenAIServer() as server, _env(server, OPENAI_MAX_RETRIES="1"):
+        server.inject(500, count=2)
+        content, usage = call_llm_with_usage(QA_PROMPT)
+        assert content.startswith("❌ LLM 호출 오류")
+        assert usage == {"prompt_tokens": 0, "completion_tokens": 0}
+        assert server.stats["server_errors"] == 2
+
+    with FakeOpenAIServer(latency=2.0) as server, _env(server, OPENAI_TIMEOUT="0.2", OPENAI_MAX_RETRIES="0"):
+        start_time = time.perf_counter()
+        content, _ = call_llm_with_usage(QA_PROMPT)
+        elapsed = time.perf_counter() - start_time
+        assert content.startswith("❌ LLM 호출 오류") and elapsed < 1.5
+    print(f"   ✅ 429 재시도 성공, 500 재시도 소진 시 오류, 타임아웃 {elapsed:.2f}초")
+
+def test_concurrent_requests_reuse_connections():
+    """동시 요청이 클라이언트 하나의 연결 풀을 재사용하는지 테스트"""
+    print("🔁 연결 재사용 테스트")
+
+    with FakeOpenAIServer(latency=0.02, jitter=0.01, error_rates={429: 0.1}) as server, _env(server):
+        assert get_openai_client("fake-key") is get_openai_client("fake-key")
+
+        prompts = [f"질문 {i}" for i in range(80)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda prompt: call_llm_with_usage(prompt)[0], prompts))
+
+        stats = server.stats
+        assert all(result == "테스트용 응답입니다." for result in results)
+        assert stats["completions"] == 80
+        assert stats["requests"] == 80 + stats["rate_limited"]
+        assert stats["connections"] <= 8 < stats["requests"]
+    print(f"   ✅ 요청 {stats['requests']}회 (429 {stats['rate_limited']}회 재시도), 연결 {stats['connections']}개")
+
+if __name__ == "__main__":
+    test_scripted_responses_and_tokens()
+    test_error_injection_and_retries()
+    test_concurrent_requests_reuse_connections()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+자막 근거 확인 테스트 스크립트
+
+utils/grounding.py가 자막 구간을 BM25로 색인해서 답변마다 가장 잘 맞는 구간과 시작 시각을 찾는지,
+영상에 없는 내용이 섞인 답변의 지지도가 낮은지, AI 검토가 근거가 부족하거나 사전 검사에 걸린
+Q&A만 근거 자막과 함께 LLM에 보내는지, 한국어가 아닌 자막이면 근거 확인 없이 사전 검사만 하는지,
+Flow 리포트에 인용 시각이 남는지 확인합니다.
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+from utils.grounding import BM25, TranscriptGrounder, tokenize, format_timestamp, passages_language
+from utils.final_reviewer import review_and_correct_summary, generate_review_summary
+from utils.fake_openai_server import HALLUCINATED_SENTENCES
+from benchmarks.mock_llm import MockLLM
+from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+from benchmarks.runner import benchmark_environment
+
+PASSAGES = [
+    {"text": "식물은 햇빛과 물과 이산화탄소로 광합성을 해서 양분을 만듭니다.", "start": 0.0},
+    {"text": "잎의 엽록소는 초록색이라서 빛을 모으는 일을 합니다.", "start": 12.5},
+    {"text": "뿌리는 땅속에서 물과 영양분을 빨아들입니다.", "start": 75.0},
+    {"text": "가을이 되면 엽록소가 줄어서 잎이 노랗고 빨갛게 변합니다.", "start": 3725.0},
+]
+
+def test_bm25_and_support():
+    """가장 잘 맞는 구간이 먼저 나오고, 자막에 없는 내용은 지지도가 낮음"""
+    print("📎 BM25 근거 확인 테스트")
+
+    assert tokenize("엽록소가") == ["엽록소가", "#엽록", "#록소", "#소가"]
+    assert format_timestamp(75) == "1:15" and format_timestamp(3725) == "1:02:05" and format_timestamp(None) == "?"
+
+    index = BM25([tokenize(passage["text"]) for passage in PASSAGES])
+    scores = index.scores(tokenize("뿌리가 물을 빨아들여요"))
+    assert max(scores, key=scores.get) == 2 and 1 not in scores
+
+    grounder = TranscriptGrounder(PASSAGES)
+    supported = grounder.ground("엽록소는 초록색이라서 빛을 모아요.")
+    assert supported["citations"][0]["timestamp"] == "0:12" and supported["support"] >= 0.6, supported
+    autumn = grounder.ground("가을에는 잎이 노랗게 변합니다.")
+    assert autumn["citations"][0]["timestamp"] == "1:02:05"
+    made_up = grounder.ground(HALLUCINATED_SENTENCES[0])
+    assert made_up["support"] < 0.3, made_up
+    assert TranscriptGrounder([]).ground("아무 말") == {"support": 0.0, "citations": []}
+    print(f"   ✅ 지지도 {supported['support']} (자막 {supported['citations'][0]['timestamp']}) vs "
+          f"영상에 없는 내용 {made_up['support']}")
+
+def test_only_flagged_qa_reviewed():
+    """근거 부족/사전 검사에 걸린 Q&A만 근거 자막과 함께 보내고, 번호는 원래 위치로 되돌림"""
+    print("🔍 근거 기반 검토 테스트")
+
+    qa_pairs = [
+        {"question": "광합성이 뭐야?", "answer": "식물이 햇빛으로 밥을 만드는 거예요.",
+         "source_answer": "식물은 햇빛과 물과 이산화탄소로 광합성을 해서 양분을 만듭니다."},
+        {"question": "누가 발견했어?", "answer": "옛날 시계공이 찾았어요.", "source_answer": HALLUCINATED_SENTENCES[0]},
+        {"question": "메씨는 누구야?", "answer": "뿌리는 물을 마셔요.",
+         "source_answer": "뿌리는 땅속에서 물과 영양분을 빨아들입니다."},
+    ]
+    sent = []
+
+    def fake_review(topic, qa_subset, video_title="", evidence=None, target_age=5):
+        sent.append((qa_subset, evidence))
+        fixed = [dict(qa, answer="햇빛으로 밥을 만드는 건 식물이에요.") if i == 0 else qa
+                 for i, qa in enumerate(qa_subset)]
+        return fixed, [{"question_number": 1, "changes": ["자막과 다른 내용 수정"]}]
+
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}), \
+            patch("utils.final_reviewer.review_topic_qa_pairs", side_effect=fake_review):
+        improved, report = review_and_correct_summary([{"topic": "식물", "qa_pairs": qa_pairs}], "식물",
+                                                      passages=PASSAGES)
+        with patch.dict(os.environ, {"GROUNDING": "0"}):
+            _, plain_report = review_and_correct_summary([{"topic": "식물", "qa_pairs": qa_pairs}], "식물",
+                                                         passages=PASSAGES)
+
+    qa_subset, evidence = sent[0]
+    assert [qa["question"] for qa in qa_subset] == ["누가 발견했어?", "메씨는 누구야?"]
+    assert len(evidence) == 2 and all("timestamp" in citation for citation in evidence[1])
+    assert improved[0]["qa_pairs"][0] == qa_pairs[0]
+    assert improved[0]["qa_pairs"][1]["answer"] == "햇빛으로 밥을 만드는 건 식물이에요."
+    assert report["details"][0]["corrections_made"][0]["question_number"] == 2
+    assert report["grounding"]["low_support"] == 1 and report["grounding"]["qa_reviewed"] == 2
+    assert "grounding" not in plain_report and plain_report["details"][0]["qa_reviewed"] == 1
+
+    summary = generate_review_summary(report)
+    assert "3개 Q&A 중 2개만 AI 검토" in summary and "식물 Q2: 지지도" in summary
+    print(f"   ✅ Q&A 3개 중 {len(qa_subset)}개만 검토 (근거 부족 1, 오타 1)")
+
+def test_other_language_transcript_skips_grounding():
+    """영어 자막이면 한국어 답변을 근거 부족으로 몰지 않고 사전 검사에 걸린 Q&A만 검토"""
+    print("🌐 다른 언어 자막 테스트")
+
+    english = [{"text": "Plants make food from sunlight, water and carbon dioxide.", "start": 0.0},
+               {"text": "Chlorophyll in the leaves is green and collects light.", "start": 12.5}]
+    qa_pairs = [{"question": "광합성이 뭐야?", "answer": "식물이 햇빛으로 밥을 만드는 거예요.",
+                 "source_answer": "식물은 햇빛과 물과 이산화탄소로 광합성을 해서 양분을 만듭니다."},
+                {"question": "메씨는 누구야?", "answer": "공을 잘 차요.", "source_answer": "공을 잘 찹니다."}]
+    sent = []
+
+    def fake_review(topic, qa_subset, video_title="", evidence=None, target_age=5):
+        sent.append((qa_subset, evidence))
+        return qa_subset, []
+
+    assert TranscriptGrounder(english).ground(qa_pairs[0]["source_answer"])["support"] == 0.0
+    assert passages_language(english) == "other" and passages_language(PASSAGES) == "ko"
+    assert passages_language(PASSAGES, "en") == "en"
+
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}), \
+            patch("utils.final_reviewer.review_topic_qa_pairs", side_effect=fake_review):
+        _, report = review_and_correct_summary([{"topic": "식물", "qa_pairs": qa_pairs}], "식물", passages=english)
+        _, labelled = review_and_correct_summary([{"topic": "식물", "qa_pairs": qa_pairs}], "식물",
+                                                 passages=PASSAGES, transcript_language="en")
+
+    assert [[qa["question"] for qa in subset] for subset, _ in sent] == [["메씨는 누구야?"]] * 2
+    assert all(evidence is None for _, evidence in sent)
+    assert report["grounding"] == {"skipped": "language", "language": "other"}
+    assert labelled["grounding"]["language"] == "en" and "grounding" not in report["details"][0]
+    assert "자막 근거 확인 생략" in generate_review_summary(report)
+    print(f"   ✅ 영어 자막: Q&A {len(qa_pairs)}개 중 사전 검사에 걸린 1개만 검토 (근거 확인 생략)")
+
+def test_flow_grounding_report():
+    """Flow에서 가짜 서버가 섞은 영상에 없는 답변을 모두 찾고, 대부분의 Q&A는 검토를 건너뜀"""
+    print("🏭 Flow 근거 확인 테스트")
+
+    from flow import create_youtube_processor_flow
+
+    llm = MockLLM()
+    with tempfile.TemporaryDirectory() as tmp, \
+            benchmark_environment(llm, fixture_video_fetcher(make_video_info(sentences=200)), tmp):
+        shared = {"url": "https://youtu.be/benchmark01"}
+        create_youtube_processor_flow().run(shared)
+
+    report = shared["review_report"]
+    grounding = report["grounding"]
+    made_up = sum(1 for topic in shared["topics_with_qa"] for qa in topic["qa_pairs"]
+                  if any(sentence in qa["answer"] for sentence in HALLUCINATED_SENTENCES))
+    assert grounding["low_support"] == made_up and grounding["checked"] == grounding["qa_total"]
+    assert grounding["qa_reviewed"] < grounding["qa_total"] / 2, grounding
+    assert llm.summary()["by_kind"].get("review", 0) == report["topics_reviewed"]
+    citations = [citation for detail in report["details"] for item in detail["grounding"]
+                 for citation in item["citations"]]
+    assert citations and all(":" in citation["timestamp"] for citation in citations)
+    print(f"   ✅ 답변 {grounding['checked']}개 중 근거 부족 {grounding['low_support']}개, "
+          f"AI 검토는 Q&A {grounding['qa_reviewed']}개만")
+
+if __name__ == "__main__":
+    test_bm25_and_support()
+    test_only_flagged_qa_reviewed()
+    test_other_language_transcript_skips_grounding()
+    test_flow_grounding_report()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+계층 요약 테스트 스크립트
+
+utils/hierarchical_summarizer.py가 긴 자막을 구간 요약 → 요약의 요약 트리로 만들 때
+트리 깊이가 구간 수의 로그로 늘고, 한 단계의 요약을 동시에 요청하며, 프롬프트 크기가 자막 길이와
+관계없이 일정하고, 구간 해시별 캐시로 다시 실행하거나 끝부분만 바뀐 자막은 바뀐 경로만 다시 요약하는지,
+그리고 Flow에서 주제 추출이 트리의 위쪽 단계를 읽는지 확인합니다.
+"""
+
+import os
+import math
+import tempfile
+from unittest.mock import patch
+from utils import hierarchical_summarizer
+from utils.hierarchical_summarizer import (HierarchicalSummarizer, SummaryCache, split_chunks, tree_context,
+                                           needs_hierarchy)
+from utils.content_validator import validate_transcript_quality
+from benchmarks.mock_llm import MockLLM
+from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+from benchmarks.runner import benchmark_environment
+
+def transcript(sentences, seed=0):
+    return make_video_info(sentences=sentences, seed=seed)["transcript"]
+
+def test_tree_depth_is_logarithmic():
+    """구간 수가 4배가 될 때마다 깊이는 1씩만 늘고, 문장 끝에서 구간을 나눔"""
+    print("🌳 트리 깊이 테스트")
+
+    chunks = split_chunks(transcript(60), 100)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert " ".join(chunks).split() == transcript(60).split()
+
+    depths = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        summarizer = HierarchicalSummarizer(chunk_words=100, fanout=4, use_mock=True,
+                                            cache=SummaryCache(os.path.join(tmp, "summary.db")))
+        for sentences in (50, 200, 800):
+            tree = summarizer.build(transcript(sentences))
+            assert tree["depth"] == 1 + math.ceil(math.log(tree["chunks"], 4)), tree["chunks"]
+            assert [len(level) for level in tree["levels"]][-1] == 1
+            assert tree["llm_calls"] == 0  # Mock 모드는 추출 요약
+            depths[tree["chunks"]] = tree["depth"]
+
+        context = tree_context(tree, max_chars=3000)
+        assert len(context) <= 3000 and context in "\n\n".join(sum(tree["levels"], []))
+
+    assert needs_hierarchy(12000) and not needs_hierarchy(3000)
+    with patch.dict(os.environ, {"HIERARCHICAL_SUMMARY": "0"}):
+        assert not needs_hierarchy(50000)
+    too_long = lambda issues: any("너무 깁니다" in issue for issue in issues)
+    assert not too_long(validate_transcript_quality(transcript(1500), max_words=None)["issues"])
+    assert too_long(validate_transcript_quality(transcript(1500))["issues"])
+    print(f"   ✅ 구간 수 → 깊이: {depths}")
+
+def test_parallel_levels_and_chunk_cache():
+    """단계별 동시 요청(지연시간은 깊이에 비례), 프롬프트 크기 일정, 재실행/끝부분 수정 시 캐시"""
+    print("⚡ 동시 요청/캐시 테스트")
+
+    llm = MockLLM(latency="fixed:0.05")
+    with tempfile.TemporaryDirectory() as tmp, patch("utils.model_router.call_llm_with_usage", llm):
+        summarizer = HierarchicalSummarizer(chunk_words=100, fanout=4, concurrency=16,
+                                            cache=SummaryCache(os.path.join(tmp, "summary.db")))
+        small = summarizer.build(transcript(100, seed=1))
+        small_prompt = max(call["prompt_tokens"] for call in llm.calls)
+
+        text = transcript(800)
+        first = summarizer.build(text)
+        calls = llm.summary()
+        assert calls["by_kind"]["summary"] == calls["total_calls"] == small["llm_calls"] + first["llm_calls"]
+        # 순서대로 보냈다면 호출 수 × 0.05초, 단계별로 동시에 보내면 대략 깊이 × 0.05초
+        assert first["seconds"] < first["llm_calls"] * 0.05 / 3, first
+        # 프롬프트 하나의 크기는 자막 길이가 아니라 구간 길이로 정해짐
+        assert max(call["prompt_tokens"] for call in llm.calls) < small_prompt * 1.5
+
+        again = summarizer.build(text)
+        assert again["llm_calls"] == 0 and again["levels"] == first["levels"]
+        assert again["cache_hits"] == sum(len(level) for level in first["levels"])
+
+        # 마지막 구간만 바뀌면 그 구간과 조상들만 다시 요약
+        edited = summarizer.build(text + " 마지막으로 새로운 내용을 덧붙였습니다.")
+        assert 1 <= edited["llm_calls"] <= edited["depth"], edited
+        assert edited["levels"][0][:-1] == first["levels"][0][:-1]
+    print(f"   ✅ 구간 {first['chunks']}개, 깊이 {first['depth']}, 요청 {first['llm_calls']}회 "
+          f"{first['seconds']:.2f}초 (순차라면 {first['llm_calls'] * 0.05:.2f}초), "
+          f"재실행 요청 0회, 끝부분 수정 시 {edited['llm_calls']}회")
+
+def test_flow_extracts_topics_from_tree():
+    """긴 자막은 Flow에서 트리를 만들고 주제 추출이 그 위쪽 단계를 읽음"""
+    print("🏭 Flow 통합 테스트")
+
+    from flow import create_youtube_processor_flow
+
+    llm = MockLLM()
+    fetcher = fixture_video_fetcher(make_video_info(sentences=1500))
+    with tempfile.TemporaryDirectory() as tmp, benchmark_environment(llm, fetcher, tmp), \
+            patch.object(hierarchical_summarizer, "_cache", SummaryCache(os.path.join(tmp, "summary.db"))), \
+            patch.dict(os.environ, {"SUMMARY_CHUNK_WORDS": "600"}):
+        shared = {"url": "https://youtu.be/longvideo01"}
+        create_youtube_processor_flow().run(shared)
+
+        tree = shared["transcript_tree"]
+        assert tree["chunks"] >= 16 and tree["depth"] >= 3
+        assert shared["topic_source"] == tree_context(tree)
+        assert shared["final_topics"] and shared["output_files"]["html"].endswith("summary.html")
+        assert llm.summary()["by_kind"]["summary"] == tree["llm_calls"]
+
+        # 짧은 자막은 트리를 만들지 않음
+        short = {"url": "https://youtu.be/shortvideo1", "topic_source": "이전 값"}
+        with patch("flow.get_video_info", fixture_video_fetcher(make_video_info(sentences=40))):
+            create_youtube_processor_flow().run(short)
+        assert "transcript_tree" not in short and "topic_source" not in short
+    print(f"   ✅ 자막 {len(make_video_info(sentences=1500)['transcript'].split())}단어 → "
+          f"구간 {tree['chunks']}개, 깊이 {tree['depth']}, 요약 요청 {tree['llm_calls']}회")
+
+if __name__ == "__main__":
+    test_tree_depth_is_logarithmic()
+    test_parallel_levels_and_chunk_cache()
+    test_flow_extracts_topics_from_tree()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+HTML 생성기 테스트 & 벤치마크 스크립트
+
+컴파일된 템플릿이 값을 이스케이프하는지, 한 번의 순회로 파일용/Streamlit용
+HTML을 모두 만드는지 확인하고, 수천 개 Q&A 요약으로 기존 += 방식과 속도를 비교합니다.
+"""
+
+import time
+from html import escape
+from utils.html_generator import (
+    CompiledTemplate,
+    Markup,
+    html_generator,
+    streamlit_html_generator,
+    render_summary_html,
+)
+
+def make_sections(num_sections, qa_per_section):
+    return [
+        {
+            "title": f"주제 {s}: 무지개는 왜 생길까요?",
+            "bullets": [
+                (f"Q: 질문 {s}-{q}: 하늘은 왜 파란색이에요?",
+                 f"A: 햇빛이 공기를 만나면 파란빛이 여기저기 퍼져서 하늘이 파랗게 보여요. ({s}-{q})")
+                for q in range(qa_per_section)
+            ]
+        }
+        for s in range(num_sections)
+    ]
+
+def legacy_render(title, image_url, sections):
+    """기존 방식: 출력마다 섹션을 따로 순회하며 += 로 문자열 연결"""
+    file_html = f"<h1>{title}</h1><img src=\"{image_url}\" />"
+    for section in sections:
+        file_html += f"""
+    <h2 class=\"text-2xl text-gray-800 mb-4\">{section.get("title", "")}</h2>
+    <ul class=\"text-gray-600\">"""
+        for bold_text, normal_text in section.get("bullets", []):
+            file_html += f"""
+      <li>
+        <strong>{bold_text}</strong><br />
+        <div class="bullet-content">{normal_text}</div>
+      </li>"""
+        file_html += "\n    </ul>"
+
+    streamlit_html = f"<h1>{title}</h1><img src=\"{image_url}\" />"
+    for section in sections:
+        streamlit_html += f"""
+    <h2 class="summary-section-title">{section.get("title", "")}</h2>
+    <ul class="summary-list">"""
+        for bold_text, normal_text in section.get("bullets", []):
+            question = bold_text[2:].strip() if bold_text.startswith("Q:") else bold_text.strip()
+            answer = normal_text[2:].strip() if normal_text.startswith("A:") else normal_text.strip()
+            streamlit_html += f"""
+        <li class="summary-item">
+            <div class="summary-question">❓ {question}</div>
+            <div class="summary-answer">💡 {answer}</div>
+        </li>"""
+        streamlit_html += "\n    </ul>"
+    return file_html, streamlit_html
+
+def legacy_render_escaped(title, image_url, sections):
+    """기존 방식에 같은 수준의 이스케이프를 더한 경우 (공정 비교용)"""
+    escaped = [
+        {"title": escape(section["title"]),
+         "bullets": [(escape(bold), escape(normal)) for bold, normal in section["bullets"]]}
+        for section in sections
+    ]
+    return legacy_render(escape(title), escape(image_url), escaped)
+
+def _best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def test_escaping():
+    """제목/답변이 이스케이프되는지 테스트"""
+    print("🛡️ HTML 이스케이프 테스트")
+
+    sections = [{"title": "<script>alert(1)</script>", "bullets": [
+        ("Q: 1 < 2 인가요?", 'A: 네, "작다"는 뜻이에요 & 맞아요'),
+        ("Q: 목록", Markup("A: <ol><li>하나</li></ol>")),
+    ]}]
+    file_html, streamlit_html = render_summary_html('제목 "따옴표"', 'x" onerror="alert(1)', sections)
+
+    for html in (file_html, streamlit_html):
+        assert "<script>" not in html
+        assert "&lt;script&gt;" in html
+        assert "&quot;작다&quot;" in html and "&amp; 맞아요" in html
+        assert 'x&quot; onerror=&quot;alert(1)' in html
+        assert "<ol><li>하나</li></ol>" in html  # Markup은 그대로
+    assert "💡 네, &quot;작다&quot;" in streamlit_html  # A: 접두어 제거
+
+    assert CompiledTemplate("<b>{name}</b> {{중괄호}}").render(name="<i>") == "<b>&lt;i&gt;</b> {중괄호}"
+    print("   ✅ 값은 이스케이프, Markup은 그대로")
+
+def test_single_pass_matches_separate_generators():
+    """한 번에 만든 결과가 각각 만든 결과와 같은지 테스트"""
+    sections = make_sections(3, 4)
+    file_html, streamlit_html = render_summary_html("제목", "https://img.youtube.com/x.jpg", sections)
+    assert file_html == html_generator("제목", "https://img.youtube.com/x.jpg", sections)
+    assert streamlit_html == streamlit_html_generator("제목", "https://img.youtube.com/x.jpg", sections)
+    assert file_html.count("<li>") == 12 and streamlit_html.count('class="summary-item"') == 12
+
+def benchmark_render(num_sections=100, qa_per_section=30, repeat=5):
+    """수천 개 Q&A 렌더링: 기존 += 두 번 순회 vs 컴파일된 템플릿 한 번 순회"""
+    sections = make_sections(num_sections, qa_per_section)
+    args = ("제목", "https://img.youtube.com/x.jpg", sections)
+
+    legacy_time = _best_time(lambda: legacy_render(*args), repeat)
+    legacy_escaped_time = _best_time(lambda: legacy_render_escaped(*args), repeat)
+    compiled_time = _best_time(lambda: render_summary_html(*args), repeat)
+    file_html, streamlit_html = render_summary_html(*args)
+
+    print(f"📊 Q&A {num_sections * qa_per_section}개, 출력 {len(file_html) + len(streamlit_html):,}자")
+    print(f"   🐌 += 연결, 2회 순회 (이스케이프 없음): {legacy_time * 1000:.1f}ms")
+    print(f"   🐢 += 연결, 2회 순회 + 이스케이프: {legacy_escaped_time * 1000:.1f}ms")
+    print(f"   ⚡ 컴파일된 템플릿, 1회 순회 + 이스케이프: {compiled_time * 1000:.1f}ms")
+    return legacy_time, legacy_escaped_time, compiled_time
+
+def test_benchmark_runs():
+    """벤치마크가 정상 동작하는지 (속도 비교는 출력만)"""
+    times = benchmark_render(num_sections=20, qa_per_section=50, repeat=1)
+    assert all(elapsed > 0 for elapsed in times)
+
+if __name__ == "__main__":
+    test_escaping()
+    test_single_pass_matches_separate_generators()
+    print()
+    benchmark_render()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+import 시간 벤치마크 & 예산 테스트 스크립트
+
+`python -X importtime`으로 `import flow`에 걸리는 시간을 새 프로세스에서 재고,
+무거운 의존성(openai, notion_client 등)이 import 시점에 로드되지 않는지 확인합니다.
+CLI 실행과 Streamlit 재실행마다 드는 비용이라 예산(IMPORT_BUDGET_MS)을 넘으면 실패합니다.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+# 실제로 쓸 때만 로드해야 하는 무거운 의존성
+HEAVY_MODULES = ["openai", "requests", "bs4", "youtube_transcript_api", "notion_client", "yaml", "dotenv", "httpx"]
+
+# import flow 예산 (ms) - 지연 로딩 전에는 약 700ms
+DEFAULT_IMPORT_BUDGET_MS = 250
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def _run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+def measure_import(module="flow"):
+    """
+    새 프로세스에서 모듈 import 시간 측정
+
+    Returns:
+        (총 ms, [(누적 ms, 모듈 이름), ...] 누적 시간 순)
+    """
+    stderr = _run(f"import {module}", "-X", "importtime").stderr
+    block = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <들여쓰기><모듈>" (하위 모듈일수록 두 칸씩 들여씀)
+        _, cumulative_us, name = line.split("|")
+        entry = (int(cumulative_us) / 1000, name.strip())
+        if not name.startswith("   "):
+            # 최상위 항목: 그 앞에 나온 항목들이 이 모듈이 불러온 하위 모듈
+            if entry[1] == module:
+                return entry[0], sorted(block, reverse=True)
+            block = []
+        else:
+            block.append(entry)
+    raise RuntimeError(f"{module} import 시간을 찾지 못했습니다")
+
+def test_flow_import_does_not_load_heavy_dependencies():
+    """import flow 후에도 무거운 의존성과 .env가 로드되지 않았는지 테스트"""
+    print("📦 지연 로딩 테스트")
+
+    code = (
+        "import sys, json, flow, utils.env\n"
+        f"print(json.dumps({{'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules],"
+        " 'env_loaded': utils.env._loaded}))"
+    )
+    result = json.loads(_run(code).stdout.strip().splitlines()[-1])
+    assert result["loaded"] == [], result["loaded"]
+    assert result["env_loaded"] is False
+
+    # Flow를 만들 때 .env 로드
+    code = "import utils.env, flow; flow.create_youtube_processor_flow(); print(utils.env._loaded)"
+    assert _run(code).stdout.strip().splitlines()[-1] == "True"
+    print("   ✅ import 시점에 무거운 의존성 없음, .env는 Flow 생성 시 로드")
+
+def test_import_budget():
+    """import flow가 예산 안에 끝나는지 테스트 (3번 중 가장 빠른 값)"""
+    budget = float(os.getenv("IMPORT_BUDGET_MS", DEFAULT_IMPORT_BUDGET_MS))
+    best = min(measure_import("flow")[0] for _ in range(3))
+    print(f"⏱️ import flow: {best:.1f}ms (예산 {budget:.0f}ms)")
+    assert best < budget, f"import flow가 {best:.1f}ms로 예산 {budget:.0f}ms를 넘었습니다"
+
+def benchmark_imports(top=10):
+    """import flow의 무거운 모듈 목록과, 지연 로딩한 의존성을 바로 import했을 때의 비용"""
+    total, entries = measure_import("flow")
+    print(f"📊 import flow: {total:.1f}ms, 누적 시간 상위 {top}개")
+    for cumulative, name in entries[:top]:
+        print(f"   {cumulative:8.1f}ms  {name}")
+
+    print("📊 처음 쓸 때로 미룬 의존성 (따로 import할 때)")
+    for module in HEAVY_MODULES:
+        try:
+            cost, _ = measure_import(module)
+        except subprocess.CalledProcessError:
+            print(f"   {'-':>8}    {module} (설치되지 않음)")
+            continue
+        print(f"   {cost:8.1f}ms  {module}")
+
+if __name__ == "__main__":
+    test_flow_import_does_not_load_heavy_dependencies()
+    test_import_budget()
+    print()
+    benchmark_imports()
+    print("\n✅ 모든 테스트 완료!")
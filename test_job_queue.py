@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+영속 작업 대기열 테스트 스크립트
+
+utils/job_queue.py의 우선순위, 재시도/백오프, dead-letter, 여러 워커 프로세스의 동시 소비,
+그리고 워커가 처리 도중 죽었을 때 임대가 만료된 뒤 다른 워커가 마지막으로 끝난 단계
+다음부터 이어서 실행하는지(실제 Flow + Mock LLM) 확인합니다.
+"""
+
+import os
+import time
+import tempfile
+import multiprocessing
+from unittest.mock import patch
+from pocketflow import Node, Flow
+import utils.job_queue as job_queue
+from utils.job_queue import JobQueue, QueueWorker
+from benchmarks.mock_llm import MockLLM
+from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+from benchmarks.runner import benchmark_environment
+
+class RecordStep(Node):
+    """처리한 URL을 파일에 한 줄씩 기록 ("fail"이 들어간 URL은 실패)"""
+    def __init__(self, log_path):
+        super().__init__()
+        self.log_path = log_path
+
+    def prep(self, shared):
+        return shared["url"]
+
+    def exec(self, url):
+        if "fail" in url:
+            raise ValueError("비디오를 찾을 수 없습니다")
+        time.sleep(0.005)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(f"{url}\t{os.getpid()}\n")
+        return url
+
+    def post(self, shared, prep_res, exec_res):
+        shared["run_id"] = f"run-{exec_res[-2:]}"
+        return "default"
+
+def record_flow(log_path):
+    return Flow(start=RecordStep(log_path))
+
+def read_log(log_path):
+    if not os.path.exists(log_path):
+        return []
+    with open(log_path, encoding="utf-8") as f:
+        return [line.rstrip("\n").split("\t") for line in f if line.strip()]
+
+def consume(db_path, log_path):
+    QueueWorker(JobQueue(db_path), flow_factory=lambda: record_flow(log_path), poll_interval=0.05).run(exit_when_empty=True)
+
+def test_priorities_retries_and_dead_letter():
+    """높은 우선순위 먼저, 실패하면 백오프 후 재시도, 한도를 넘으면 dead → requeue"""
+    print("🗂️ 우선순위/재시도 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"))
+        log_path = os.path.join(tmp, "log.txt")
+        low = queue.enqueue("https://youtu.be/low", priority=0)
+        high = queue.enqueue("https://youtu.be/high", priority=10)
+        failing = queue.enqueue("https://youtu.be/fail", priority=5, max_attempts=2)
+        later = queue.enqueue("https://youtu.be/later", priority=99, delay=60)
+
+        leased = queue.lease("probe", lease_seconds=30)
+        assert leased["id"] == high and leased["attempts"] == 1
+        assert queue.lease("other", lease_seconds=30)["id"] == failing  # 임대 중인 작업은 다른 워커가 못 가져감
+        assert not queue.heartbeat(high, "other")
+        assert queue.fail(high, "probe", "테스트", backoff_base=0) == "queued"
+        assert queue.fail(failing, "other", "테스트", backoff_base=0) == "queued"
+
+        worker = QueueWorker(queue, flow_factory=lambda: record_flow(log_path), backoff_base=0, poll_interval=0.01)
+        processed = worker.run(exit_when_empty=True)
+
+        assert [url for url, _ in read_log(log_path)] == ["https://youtu.be/high", "https://youtu.be/low"]
+        assert queue.get(high)["status"] == "done" and queue.get(high)["attempts"] == 2
+        assert queue.get(low)["result"]["run_id"] == "run-ow"
+        dead = queue.dead_letters()
+        assert [job["id"] for job in dead] == [failing] and "찾을 수 없습니다" in dead[0]["last_error"]
+        assert queue.get(later)["status"] == "queued"  # 아직 처리할 시간이 아님
+        assert queue.stats()["dead"] == 1 and queue.stats()["done"] == 2
+
+        assert queue.requeue(failing) and queue.get(failing)["attempts"] == 0
+        assert not queue.requeue(high)
+    print(f"   ✅ 처리 {processed}회 (high → low), dead-letter {len(dead)}개, 다시 대기열로")
+
+def test_multiple_worker_processes():
+    """워커 프로세스 3개가 같은 대기열을 소비해도 작업마다 정확히 한 번 처리"""
+    print("👷 여러 워커 프로세스 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, log_path = os.path.join(tmp, "jobs.db"), os.path.join(tmp, "log.txt")
+        queue = JobQueue(db_path)
+        ids = [queue.enqueue(f"https://youtu.be/video{i:03d}", priority=i % 3) for i in range(60)]
+
+        processes = [multiprocessing.Process(target=consume, args=(db_path, log_path)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+
+        entries = read_log(log_path)
+        urls = [url for url, _ in entries]
+        assert len(urls) == len(set(urls)) == 60, len(urls)
+        assert all(queue.get(job_id)["status"] == "done" for job_id in ids)
+        pids = {pid for _, pid in entries}
+    print(f"   ✅ 작업 60개를 프로세스 {len(pids)}개가 중복 없이 처리")
+
+class Crash(BaseException):
+    """워커 프로세스가 죽은 것처럼 (except Exception에 잡히지 않고 아무것도 기록하지 않음)"""
+
+class CrashingQueue(JobQueue):
+    def __init__(self, path, crash_after):
+        super().__init__(path)
+        self.crash_after = crash_after
+
+    def checkpoint(self, job_id, worker_id, stage, action, state, lease_seconds=None):
+        super().checkpoint(job_id, worker_id, stage, action, state, lease_seconds)
+        if stage == self.crash_after:
+            raise Crash(stage)
+
+def test_crash_resumes_from_last_stage():
+    """GenerateQA까지 끝내고 죽은 워커의 작업을 다른 워커가 ConvertToKidFriendly부터 이어서 처리"""
+    print("💥 크래시 복구 테스트")
+
+    llm = MockLLM()
+    fetcher = fixture_video_fetcher(make_video_info(sentences=40))
+    with tempfile.TemporaryDirectory() as tmp, benchmark_environment(llm, fetcher, tmp):
+        db_path = os.path.join(tmp, "jobs.db")
+        job_id = JobQueue(db_path).enqueue("https://youtu.be/crashtest01")
+
+        try:
+            QueueWorker(CrashingQueue(db_path, "GenerateQA"), lease_seconds=0.3).run_once()
+            assert False, "워커가 죽어야 합니다"
+        except Crash:
+            pass
+        queue = JobQueue(db_path)
+        crashed = queue.get(job_id, include_checkpoint=True)
+        assert crashed["status"] == "leased" and crashed["stage"] == "GenerateQA"
+        assert "topics_with_qa" in crashed["checkpoint"] and "stop_flag" not in crashed["checkpoint"]
+        calls_before = dict(llm.summary()["by_kind"])
+
+        # 임대가 만료되기 전에는 아무도 못 가져감
+        assert queue.lease("early", lease_seconds=5) is None
+        time.sleep(0.35)
+        assert QueueWorker(queue, worker_id="rescuer", lease_seconds=5).run_once() == job_id
+
+        job = queue.get(job_id)
+        calls_after = llm.summary()["by_kind"]
+        assert job["status"] == "done" and job["attempts"] == 2 and job["stage"] == "GenerateHTML"
+        assert job["result"]["output_files"]["html"].endswith("summary.html") and job["result"]["topics"] > 0
+        # 주제 추출과 Q&A 생성은 다시 하지 않고, 아이 친화 변환부터만 LLM 호출
+        assert calls_after["topics"] == calls_before["topics"] == 1
+        assert calls_after["qa"] == calls_before["qa"]
+        assert calls_after.get("kid_friendly", 0) > calls_before.get("kid_friendly", 0)
+    print(f"   ✅ 시도 {job['attempts']}회, 재개 후 LLM 호출: 주제 0회, Q&A 0회, "
+          f"변환 {calls_after.get('kid_friendly', 0) - calls_before.get('kid_friendly', 0)}회")
+
+def test_cli_loads_env_first():
+    """CLI는 .env를 먼저 로드해서 JOB_QUEUE_PATH 같은 설정을 반영"""
+    print("⚙️ .env 로드 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ):
+        os.environ.pop("JOB_QUEUE_PATH", None)
+        path = os.path.join(tmp, "from_env.db")
+        with patch.object(job_queue, "load_env", side_effect=lambda: os.environ.update(JOB_QUEUE_PATH=path)):
+            job_queue.main(["stats"])
+        assert os.path.exists(path)
+    print("   ✅ .env의 JOB_QUEUE_PATH로 대기열 열기")
+
+if __name__ == "__main__":
+    test_priorities_retries_and_dead_letter()
+    test_multiple_worker_processes()
+    test_crash_resumes_from_last_stage()
+    test_cli_loads_env_first()
+    print("\n✅ 모든 테스트 완료!")
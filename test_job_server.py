@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+작업 API 서버 테스트 스크립트
+
+job_server.py를 별도 스레드에서 띄우고 HTTP로 작업을 등록/조회/취소하고,
+SSE로 진행 이벤트를 받고, 대기열이 가득 찼을 때 503으로 밀어내는지 확인합니다.
+마지막으로 실제 Flow를 Mock LLM(benchmarks)으로 돌려 결과 파일까지 나오는지 봅니다.
+"""
+
+import json
+import time
+import threading
+import tempfile
+import http.client
+from urllib.parse import urlparse
+from job_server import JobServer
+from benchmarks.mock_llm import MockLLM
+from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+from benchmarks.runner import benchmark_environment
+
+class FakeFlow:
+    """진행 이벤트를 보내고 잠깐 쉬는 가짜 Flow ("fail"이 들어간 URL은 실패, gate가 열릴 때까지 시작 안 함)"""
+
+    def __init__(self, delay=0.01, gate=None):
+        self.delay = delay
+        self.gate = gate
+
+    def run(self, shared):
+        if self.gate:
+            self.gate.wait()
+        for progress in (20, 60, 100):
+            if shared["stop_flag"].should_stop:
+                raise InterruptedError("처리가 중단되었습니다.")
+            shared["progress_callback"]("단계", f"{progress}% 진행", progress)
+            time.sleep(self.delay)
+        if "fail" in shared["url"]:
+            raise ValueError("비디오를 찾을 수 없습니다")
+        shared["video_info"] = {"video_id": "abc", "title": "무지개", "transcript": "긴 자막"}
+        shared["final_topics"] = [{"title": "빛", "qa_pairs": []}]
+        shared["run_id"] = "run-1"
+
+def request(server, method, path, payload=None, headers=None):
+    parsed = urlparse(server.base_url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    conn.request(method, path, body=body, headers={"Content-Type": "application/json", **(headers or {})})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    is_json = response.getheader("Content-Type", "").startswith("application/json")
+    return response.status, json.loads(data) if is_json else data.decode("utf-8"), response
+
+def wait_for(server, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        _, job, _ = request(server, "GET", f"/jobs/{job_id}")
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            return job
+        time.sleep(0.02)
+    raise TimeoutError(job_id)
+
+def parse_sse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+def test_submit_status_and_events():
+    """작업 등록 → 상태 조회 → SSE 진행 이벤트 (Last-Event-ID로 이어 받기)"""
+    print("📮 작업 API 테스트")
+
+    with JobServer(flow_factory=FakeFlow, workers=2) as server:
+        status, created, response = request(server, "POST", "/jobs", {"url": "https://youtu.be/abc", "options": {"offline": True}})
+        assert status == 202 and response.getheader("Location") == f"/jobs/{created['id']}"
+
+        job = wait_for(server, created["id"])
+        assert job["status"] == "succeeded" and job["progress"] == 100
+        assert job["result"]["video"] == {"video_id": "abc", "title": "무지개"}  # 자막 원문은 돌려주지 않음
+        assert job["queue_wait_seconds"] >= 0 and job["processing_seconds"] >= 0.03
+
+        status, stream, response = request(server, "GET", f"/jobs/{created['id']}/events")
+        assert response.getheader("Content-Type") == "text/event-stream"
+        events = parse_sse(stream)
+        assert [event for _, event, _ in events][-1] == "done"
+        assert [data["progress"] for _, event, data in events if data["stage"] == "단계"] == [20, 60, 100]
+        assert events[-1][2]["status"] == "succeeded" and "processing_seconds" in events[-1][2]
+
+        _, resumed, _ = request(server, "GET", f"/jobs/{created['id']}/events", headers={"Last-Event-ID": "3"})
+        assert [seq for seq, _, _ in parse_sse(resumed)] == [seq for seq, _, _ in events[3:]]
+
+        assert request(server, "POST", "/jobs", {"options": {}})[0] == 400
+        assert request(server, "POST", "/jobs", {"url": "x", "options": {"turbo": True}})[0] == 400
+        assert request(server, "GET", "/jobs/missing")[0] == 404
+
+        failed = wait_for(server, request(server, "POST", "/jobs", {"url": "https://youtu.be/fail"})[1]["id"])
+        assert failed["status"] == "failed" and "찾을 수 없습니다" in failed["error"]
+    print(f"   ✅ 이벤트 {len(events)}개, 대기 {job['queue_wait_seconds']}초 / 처리 {job['processing_seconds']}초")
+
+def test_backpressure_and_cancel():
+    """수백 개 작업: 대기열이 가득 차면 503 + Retry-After, 등록된 작업은 모두 처리, 대기 중 취소"""
+    print("🚦 대기열 테스트")
+
+    gate = threading.Event()
+    with JobServer(flow_factory=lambda: FakeFlow(delay=0.001, gate=gate), workers=4, max_queue=200) as server:
+        # 워커 4개가 작업을 하나씩 잡고 멈춘 동안 대기열 200칸이 차고 나머지는 거절
+        accepted, rejected = [], []
+        for i in range(300):
+            status, body, response = request(server, "POST", "/jobs", {"url": f"https://youtu.be/v{i}"})
+            if status == 202:
+                accepted.append(body["id"])
+            else:
+                assert status == 503 and int(response.getheader("Retry-After")) >= 1
+                rejected.append(i)
+        assert len(accepted) == 204 and len(rejected) == 96
+        _, stats, _ = request(server, "GET", "/stats")
+        assert stats["queued"] == 200 and stats["running"] == 4
+
+        status, cancelled, _ = request(server, "DELETE", f"/jobs/{accepted[-1]}")
+        assert status == 202 and cancelled["status"] == "cancelled"
+        gate.set()
+
+        jobs = [wait_for(server, job_id, timeout=30) for job_id in accepted]
+        assert [job["status"] for job in jobs].count("succeeded") == len(accepted) - 1
+        # 늦게 등록된 작업일수록 처리 시간보다 대기 시간이 김
+        assert jobs[-2]["queue_wait_seconds"] > jobs[-2]["processing_seconds"]
+
+        _, stats, _ = request(server, "GET", "/stats")
+        assert stats["rejected"] == len(rejected) and stats["queued"] == 0
+    print(f"   ✅ 등록 {len(accepted)}개, 거절(503) {len(rejected)}개, "
+          f"평균 대기 {stats['avg_queue_wait_seconds']}초 / 처리 {stats['avg_processing_seconds']}초")
+
+def test_real_flow_job():
+    """실제 Flow (Mock LLM, 고정 비디오)로 작업 처리"""
+    print("🎬 실제 Flow 작업 테스트")
+
+    llm = MockLLM()
+    fetcher = fixture_video_fetcher(make_video_info(sentences=50))
+    with tempfile.TemporaryDirectory() as tmp, benchmark_environment(llm, fetcher, tmp), \
+            JobServer(workers=2) as server:
+        ids = [request(server, "POST", "/jobs", {"url": f"https://youtu.be/real{i}"})[1]["id"] for i in range(3)]
+        jobs = [wait_for(server, job_id, timeout=60) for job_id in ids]
+        _, stream, _ = request(server, "GET", f"/jobs/{ids[0]}/events")
+
+    assert all(job["status"] == "succeeded" for job in jobs), [job["error"] for job in jobs]
+    assert jobs[0]["result"]["output_files"]["html"].endswith("summary.html")
+    assert len(jobs[0]["result"]["final_topics"]) > 0
+    stages = [data["stage"] for _, _, data in parse_sse(stream)]
+    assert "주제 추출" in stages and "HTML 생성 완료" in stages
+    print(f"   ✅ 작업 {len(jobs)}개 완료, 진행 이벤트 {len(stages)}개")
+
+if __name__ == "__main__":
+    test_submit_status_and_events()
+    test_backpressure_and_cancel()
+    test_real_flow_job()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+메트릭 레지스트리 테스트 스크립트
+
+카운터/게이지/히스토그램이 Prometheus 텍스트 형식으로 나오는지, 관측 비용이 작은지,
+그리고 call_llm(가짜 OpenAI 서버, 429 재시도 포함), Flow 노드, get_video_info, save_to_notion이
+실제로 메트릭을 남기고 작업 API/메트릭 서버/파일로 내보내지는지 확인합니다.
+"""
+
+import os
+import time
+import tempfile
+import threading
+import http.client
+from unittest.mock import patch
+from urllib.parse import urlparse
+from utils.metrics import (MetricsRegistry, get_registry, start_metrics_server, write_metrics_file,
+                           LLM_REQUESTS, LLM_RETRIES, LLM_TOKENS, STAGE_RUNS, STAGE_DURATION,
+                           VIDEO_FETCHES, NOTION_SAVES)
+
+def _get(metric, **labels):
+    return metric.get(**labels) or 0
+
+def test_registry_text_format():
+    """텍스트 형식, 누적 히스토그램, 레이블 이스케이프, 재등록, 관측 비용"""
+    print("📈 레지스트리 테스트")
+
+    registry = MetricsRegistry()
+    requests_total = registry.counter("demo_requests_total", "요청 수", ("path",))
+    latency = registry.histogram("demo_latency_seconds", "지연시간", buckets=(0.1, 1.0))
+    depth = registry.gauge("demo_queue_depth", "대기열 길이")
+
+    requests_total.labels('/a"b').inc()
+    requests_total.labels(path='/a"b').inc(2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+    depth.set(7)
+    depth.dec()
+
+    text = registry.render()
+    assert '# TYPE demo_requests_total counter' in text
+    assert 'demo_requests_total{path="/a\\"b"} 3' in text
+    assert 'demo_latency_seconds_bucket{le="0.1"} 2' in text  # 경계값은 아래 구간에 포함
+    assert 'demo_latency_seconds_bucket{le="1"} 3' in text
+    assert 'demo_latency_seconds_bucket{le="+Inf"} 4' in text
+    assert 'demo_latency_seconds_count 4' in text and 'demo_latency_seconds_sum 3.65' in text
+    assert 'demo_queue_depth 6' in text
+    assert text.endswith("\n")
+
+    assert registry.counter("demo_requests_total", "요청 수", ("path",)) is requests_total
+    for bad in (lambda: registry.gauge("demo_requests_total", "x", ("path",)),
+                lambda: requests_total.inc(),
+                lambda: requests_total.labels("/a").inc(-1)):
+        try:
+            bad()
+            assert False, "ValueError가 나야 합니다"
+        except ValueError:
+            pass
+
+    # 여러 스레드에서 동시에 관측해도 개수가 맞고, 관측 한 번이 수 마이크로초
+    child = latency.labels()
+    threads = [threading.Thread(target=lambda: [child.observe(0.2) for _ in range(20000)]) for _ in range(4)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    per_observation_us = (time.perf_counter() - start_time) / 80000 * 1e6
+    assert latency.get() == 80004
+    assert per_observation_us < 50, per_observation_us
+    print(f"   ✅ 텍스트 형식 OK, 관측 1회 {per_observation_us:.2f}µs")
+
+def test_llm_metrics_over_http():
+    """call_llm: 요청 결과, 토큰, SDK 재시도(429), JSON 모드 폴백 없이 정상"""
+    print("🤖 LLM 메트릭 테스트")
+
+    from utils.call_llm import call_llm_with_usage
+    from utils.fake_openai_server import FakeOpenAIServer
+
+    model = "gpt-4o-metrics"
+    before = {"ok": _get(LLM_REQUESTS, model=model, outcome="ok"),
+              "error": _get(LLM_REQUESTS, model=model, outcome="error"),
+              "retries": _get(LLM_RETRIES, model=model, reason="sdk"),
+              "tokens": _get(LLM_TOKENS, model=model, type="completion")}
+
+    with FakeOpenAIServer() as server, patch.dict(os.environ, {
+            "OPENAI_API_KEY": "fake-key", "OPENAI_BASE_URL": server.base_url, "OPENAI_MAX_RETRIES": "2"}):
+        server.inject(429)
+        _, usage = call_llm_with_usage("안녕", model=model)
+        server.inject(500, count=3)
+        content, _ = call_llm_with_usage("안녕", model=model)
+
+    assert content.startswith("❌")
+    assert _get(LLM_REQUESTS, model=model, outcome="ok") == before["ok"] + 1
+    assert _get(LLM_REQUESTS, model=model, outcome="error") == before["error"] + 1
+    assert _get(LLM_RETRIES, model=model, reason="sdk") == before["retries"] + 1
+    assert _get(LLM_TOKENS, model=model, type="completion") == before["tokens"] + usage["completion_tokens"]
+    assert 'llm_request_duration_seconds_bucket{model="gpt-4o-metrics",le="+Inf"}' in get_registry().render()
+    print(f"   ✅ 성공/실패/재시도/토큰 기록")
+
+def test_pipeline_metrics():
+    """Flow 노드 실행 시간/결과, 중단은 cancelled, get_video_info/save_to_notion 결과"""
+    print("🏭 파이프라인 메트릭 테스트")
+
+    from flow import create_youtube_processor_flow
+    from utils.youtube_processor import get_video_info
+    from utils.notion_client import save_to_notion
+    from benchmarks.mock_llm import MockLLM
+    from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+    from benchmarks.runner import benchmark_environment
+
+    stages = ["ProcessYouTubeURL", "SummarizeLongTranscript", "ExtractTopics", "GenerateQA",
+              "ConvertToKidFriendly", "ReviewAndCorrect", "SaveToNotion", "GenerateHTML"]
+    ok_before = {stage: _get(STAGE_RUNS, stage=stage, outcome="ok") for stage in stages}
+    cancelled_before = _get(STAGE_RUNS, stage="ProcessYouTubeURL", outcome="cancelled")
+
+    class Stopped:
+        should_stop = True
+
+    fetcher = fixture_video_fetcher(make_video_info(sentences=30))
+    with tempfile.TemporaryDirectory() as tmp, benchmark_environment(MockLLM(), fetcher, tmp):
+        flow = create_youtube_processor_flow()
+        flow.run({"url": "https://youtu.be/metrics0001"})
+        try:
+            flow.run({"url": "https://youtu.be/metrics0001", "stop_flag": Stopped()})
+            assert False, "중단되어야 합니다"
+        except InterruptedError:
+            pass
+
+    for stage in stages:
+        assert _get(STAGE_RUNS, stage=stage, outcome="ok") == ok_before[stage] + 1, stage
+    assert _get(STAGE_RUNS, stage="ProcessYouTubeURL", outcome="cancelled") == cancelled_before + 1
+    assert _get(STAGE_DURATION, stage="GenerateHTML") >= 1
+
+    fetch_errors = _get(VIDEO_FETCHES, outcome="error")
+    assert "error" in get_video_info("https://example.com/not-a-video")
+    assert _get(VIDEO_FETCHES, outcome="error") == fetch_errors + 1
+
+    notion_errors = _get(NOTION_SAVES, outcome="error")
+    with patch.dict(os.environ, {"NOTION_DATABASE_ID": ""}):
+        assert not save_to_notion({"title": "x"}, [], [], [])["success"]
+    assert _get(NOTION_SAVES, outcome="error") == notion_errors + 1
+    print(f"   ✅ 노드 {len(stages)}개 기록, 중단/조회 실패/노션 실패 집계")
+
+def test_exporters():
+    """작업 API의 /metrics, 단독 메트릭 서버, CLI용 파일"""
+    print("📤 내보내기 테스트")
+
+    from job_server import JobServer
+
+    def fetch(base_url, path):
+        parsed = urlparse(base_url)
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+        conn.request("GET", path)
+        response = conn.getresponse()
+        body = response.read().decode("utf-8")
+        conn.close()
+        return response, body
+
+    class QuickFlow:
+        def run(self, shared):
+            pass
+
+    with JobServer(flow_factory=QuickFlow, workers=1) as server:
+        response, body = fetch(server.base_url, "/metrics")
+    assert response.status == 200 and response.getheader("Content-Type").startswith("text/plain; version=0.0.4")
+    assert "# TYPE pipeline_stage_duration_seconds histogram" in body and "jobs_queued 0" in body
+
+    metrics_server = start_metrics_server(port=0)
+    assert start_metrics_server() is metrics_server
+    host, port = metrics_server.server_address[:2]
+    response, body = fetch(f"http://{host}:{port}", "/metrics")
+    assert response.status == 200 and "# TYPE llm_requests_total counter" in body
+    assert fetch(f"http://{host}:{port}", "/other")[0].status == 404
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_metrics_file(os.path.join(tmp, "youtube_processor.prom"))
+        with open(path, encoding="utf-8") as f:
+            assert "# TYPE notion_saves_total counter" in f.read()
+    print(f"   ✅ /metrics ({len(body.splitlines())}줄), 메트릭 서버 :{port}, 파일")
+
+if __name__ == "__main__":
+    test_registry_text_format()
+    test_llm_metrics_over_http()
+    test_pipeline_metrics()
+    test_exporters()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+단계별 모델 라우팅 & 캐스케이드 테스트 스크립트
+
+라우팅 파일/환경변수 설정이 반영되는지, 저렴한 모델 응답이
+검증에 실패할 때만 큰 모델로 승급하는지 확인합니다.
+"""
+
+import os
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from utils import model_router
+
+def test_routing_file_and_env_override():
+    """라우팅 파일과 환경변수 우선순위 테스트"""
+    print("🗺️ 라우팅 설정 테스트")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"stages": {"qa": {"model": "gpt-4-turbo", "cascade": True, "threshold": 0.5}}}, f)
+        path = f.name
+
+    try:
+        with patch.dict(os.environ, {"LLM_MODEL_TOPICS": "gpt-4o-mini"}):
+            routing = model_router.load_routing(path)
+    finally:
+        os.remove(path)
+
+    assert routing["qa"]["model"] == "gpt-4-turbo"
+    assert routing["qa"]["cascade"] is True
+    assert routing["qa"]["threshold"] == 0.5
+    assert routing["topics"]["model"] == "gpt-4o-mini"
+    assert routing["kid_friendly"]["cheap_model"] == model_router.DEFAULT_CHEAP_MODEL
+    print("   ✅ 파일 설정과 환경변수가 반영됨")
+
+def test_cascade_escalates_only_on_failure():
+    """캐스케이드 승급 테스트"""
+    print("🪜 캐스케이드 테스트")
+
+    routing = {"kid_friendly": {"model": "gpt-4o", "cheap_model": "gpt-4o-mini", "cascade": True, "threshold": 0.7}}
+    calls = []
+
+    def fake_call(prompt, model="gpt-4o-mini", json_mode=False):
+        calls.append(model)
+        text = "좋은 답변이에요" if "good" in prompt or model == "gpt-4o" else ""
+        return text, {"prompt_tokens": 100, "completion_tokens": 50}
+
+    model_router.reset_stage_stats()
+    with patch.object(model_router, "_routing", routing), \
+         patch.object(model_router, "call_llm_with_usage", side_effect=fake_call):
+        validator = lambda response: 1.0 if response else 0.0
+        model_router.call_llm_for_stage("kid_friendly", "good prompt", validator=validator)
+        model_router.call_llm_for_stage("kid_friendly", "bad prompt", validator=validator)
+
+    assert calls == ["gpt-4o-mini", "gpt-4o-mini", "gpt-4o"]
+
+    report = model_router.get_stage_report()["kid_friendly"]
+    assert report["calls"] == 3
+    assert report["escalations"] == 1
+    assert report["models"] == {"gpt-4o-mini": 2, "gpt-4o": 1}
+    assert report["cost_usd"] > 0
+    print(f"   ✅ 승급 {report['escalations']}회, 예상 비용 ${report['cost_usd']:.6f}")
+    print(model_router.format_stage_report(model_router.get_stage_report()))
+    model_router.reset_stage_stats()
+
+def test_run_stats_are_separate():
+    """동시에 도는 실행의 통계가 섞이지 않고, 스레드 풀 작업도 호출한 실행에 기록됨"""
+    print("🧾 실행별 통계 테스트")
+
+    def fake_call(prompt, model="gpt-4o-mini", json_mode=False):
+        return "답변", {"prompt_tokens": 10, "completion_tokens": 5}
+
+    def run(calls):
+        stats = {}
+        with model_router.recording_stage_stats(stats):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                call = model_router.propagate_stage_stats(lambda i: model_router.call_llm_for_stage("qa", f"질문 {i}"))
+                list(pool.map(call, range(calls)))
+        return model_router.get_stage_report(stats)
+
+    model_router.reset_stage_stats()
+    with patch.object(model_router, "call_llm_with_usage", side_effect=fake_call):
+        with ThreadPoolExecutor(max_workers=2) as runs:
+            first, second = runs.map(run, [3, 7])
+        model_router.call_llm_for_stage("qa", "실행 밖 호출")
+
+    assert first["qa"]["calls"] == 3 and second["qa"]["calls"] == 7
+    assert second["qa"]["prompt_tokens"] == 70
+    assert model_router.get_stage_report()["qa"]["calls"] == 11
+    model_router.reset_stage_stats()
+    print(f"   ✅ 실행별 {first['qa']['calls']}회 / {second['qa']['calls']}회, 프로세스 전체 11회")
+
+if __name__ == "__main__":
+    test_routing_file_and_env_override()
+    test_cascade_escalates_only_on_failure()
+    test_run_stats_are_separate()
+    print("\n✅ 모든 테스트 완료!")
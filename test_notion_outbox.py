@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+노션 저장 대기열(outbox) 테스트 스크립트
+
+SaveToNotion 노드가 노션 지연과 상관없이 바로 끝나는지,
+같은 비디오를 다시 처리하면 새 페이지 대신 기존 페이지가 갱신되는지,
+실패하면 백오프 후 재시도하는지 가짜 노션 서버로 확인합니다.
+"""
+
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from unittest.mock import patch
+import flow
+from utils.fake_notion_server import FakeNotionServer
+from utils.notion_client import NotionSession, TokenBucket, build_page_children
+import utils.notion_outbox as notion_outbox
+from utils.notion_outbox import NotionOutbox, OutboxDrainer
+
+SCHEMA = {"이름": {"type": "title"}, "링크": {"type": "url"}}
+
+VIDEO_INFO = {"video_id": "abc123", "title": "무지개 이야기", "url": "https://youtu.be/abc123"}
+TOPICS = ["무지개", "빛"]
+KID_PAIRS = [{"question": f"질문 {i}", "answer": f"답변 {i}"} for i in range(1, 6)]
+
+def _env(server):
+    return {"NOTION_BASE_URL": server.base_url, "NOTION_TOKEN": "test-token", "NOTION_DATABASE_ID": "db-1"}
+
+def test_rerun_updates_existing_page():
+    """같은 video_id를 다시 저장하면 페이지가 하나만 남는지 테스트"""
+    print("🔁 멱등성 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp, FakeNotionServer(properties=SCHEMA) as server, \
+            patch.dict(os.environ, _env(server)):
+        outbox = NotionOutbox(os.path.join(tmp, "outbox.db"))
+        drainer = OutboxDrainer(outbox, session=NotionSession(limiter=TokenBucket(1000)))
+
+        outbox.enqueue(VIDEO_INFO, TOPICS, KID_PAIRS, KID_PAIRS)
+        assert drainer.drain_until_empty()
+        first = outbox.get("abc123")
+
+        # 다시 처리했더니 마지막 답변만 바뀜
+        revised = KID_PAIRS[:-1] + [{"question": "질문 5", "answer": "고친 답변 5"}]
+        outbox.enqueue(VIDEO_INFO, TOPICS, revised, revised)
+        assert drainer.drain_until_empty()
+        second = outbox.get("abc123")
+
+        assert len(server.pages) == 1
+        assert first["page_id"] == second["page_id"]
+        assert server.pages[second["page_id"]]["children"] == build_page_children(VIDEO_INFO, TOPICS, revised)
+
+        metrics = outbox.metrics()
+        assert metrics["queue_depth"] == 0 and metrics["delivered"] == 1
+    print(f"   ✅ 페이지 1개 유지, 지표: {metrics}")
+
+def test_failure_backoff_and_dead_letter():
+    """실패 시 재시도 예약, 한도를 넘으면 failed 상태로"""
+    print("⏱️ 재시도 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp, patch.dict(os.environ, {"NOTION_DATABASE_ID": ""}):
+        outbox = NotionOutbox(os.path.join(tmp, "outbox.db"))
+        drainer = OutboxDrainer(outbox, session=NotionSession(token="unused"), max_attempts=2)
+
+        outbox.enqueue(VIDEO_INFO, TOPICS, KID_PAIRS, KID_PAIRS)
+        assert drainer.drain_once() == 1
+        entry = outbox.get("abc123")
+        assert entry["status"] == "pending" and entry["attempts"] == 1
+        assert "NOTION_DATABASE_ID" in entry["last_error"]
+
+        # 백오프 중에는 꺼내지 않음
+        assert drainer.drain_once() == 0
+        assert not drainer.drain_until_empty()
+
+        with patch("utils.notion_outbox.time.time", return_value=time.time() + 60):
+            drainer.drain_once()
+        assert outbox.get("abc123")["status"] == "failed"
+        assert outbox.metrics()["failed"] == 1
+    print("   ✅ 실패 → 백오프 → failed")
+
+def test_claim_survives_other_process_start():
+    """다른 프로세스가 대기열을 열어도 전송 중 항목은 그대로, 기한이 지난 것만 다시 가져감"""
+    print("🔐 전송 중 표시 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "outbox.db")
+        first = NotionOutbox(path)
+        first.enqueue(VIDEO_INFO, TOPICS, KID_PAIRS, KID_PAIRS)
+        [entry] = first.claim(owner="worker-a", claim_seconds=60)
+
+        # 두 번째 프로세스(잡 서버, Streamlit 등)가 시작해도 worker-a의 전송을 가로채지 않음
+        second = NotionOutbox(path)
+        assert second.get("abc123")["status"] == "sending"
+        assert second.claim(owner="worker-b") == []
+
+        # worker-a가 죽어서 기한이 지나면 다시 가져가고, 늦게 끝난 worker-a의 결과는 무시
+        with patch("utils.notion_outbox.time.time", return_value=time.time() + 61):
+            [reclaimed] = second.claim(owner="worker-b")
+        first.mark_done(entry, {"page_id": "late", "page_url": "https://notion.so/late"})
+        assert second.get("abc123")["status"] == "sending"
+        second.mark_done(reclaimed, {"page_id": "p1", "page_url": "https://notion.so/p1"})
+        assert second.get("abc123")["status"] == "done" and second.get("abc123")["page_id"] == "p1"
+
+        # 전송 중 표시 열이 없던 예전 파일: 열을 추가하고 남아 있던 sending 항목은 기한 지난 것으로 처리
+        legacy = os.path.join(tmp, "legacy.db")
+        with sqlite3.connect(legacy) as conn:
+            conn.execute("""CREATE TABLE notion_outbox (video_id TEXT PRIMARY KEY, payload TEXT NOT NULL,
+                status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, enqueued_at REAL NOT NULL,
+                next_attempt_at REAL NOT NULL, delivered_at REAL, drain_seconds REAL, last_error TEXT,
+                page_id TEXT, page_url TEXT)""")
+            conn.execute("INSERT INTO notion_outbox VALUES ('old1', '{}', 'sending', 0, 1, 1, NULL, NULL, NULL, NULL, NULL)")
+        assert [entry["video_id"] for entry in NotionOutbox(legacy).claim(owner="worker-c")] == ["old1"]
+    print("   ✅ 시작할 때 되돌리지 않음, 기한 지난 전송만 회수, 예전 파일 이전")
+
+def test_save_node_does_not_wait_for_notion():
+    """노션이 느려도 SaveToNotion 노드는 바로 끝나는지 테스트"""
+    print("⚡ 비동기 저장 테스트")
+
+    final_topics = [{"title": "무지개", "qa_pairs": [
+        {"kid_friendly_question": qa["question"], "kid_friendly_answer": qa["answer"]} for qa in KID_PAIRS
+    ]}]
+
+    with tempfile.TemporaryDirectory() as tmp, FakeNotionServer(properties=SCHEMA, latency=0.3) as server, \
+            patch.dict(os.environ, _env(server)):
+        outbox = NotionOutbox(os.path.join(tmp, "outbox.db"))
+        drainer = OutboxDrainer(outbox, session=NotionSession(limiter=TokenBucket(1000)), poll_interval=0.05)
+
+        with patch.object(flow, "get_outbox", return_value=outbox), \
+             patch.object(flow, "get_drainer", return_value=drainer.start()):
+            shared = {"video_info": VIDEO_INFO, "final_topics": final_topics}
+            start_time = time.perf_counter()
+            flow.SaveToNotion().run(shared)
+            node_time = time.perf_counter() - start_time
+
+            assert shared["notion_result"]["queued"]
+            assert node_time < 0.3
+
+            assert drainer.drain_until_empty(timeout=10)
+            drainer.stop(timeout=5)
+
+        assert len(server.pages) == 1
+        metrics = outbox.metrics()
+        assert metrics["drain_latency_max"] >= 0.3 * 2  # 스키마 조회 + 페이지 생성
+    print(f"   ✅ 노드 {node_time * 1000:.1f}ms, 노션 반영까지 {metrics['drain_latency_max']:.2f}초")
+
+def test_shared_drainer_without_injection():
+    """공유 대기열/드레이너를 처음 만들어도 멈추지 않음"""
+    print("🔒 공유 드레이너 생성 테스트")
+
+    result = {}
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.dict(os.environ, {"NOTION_OUTBOX_PATH": os.path.join(tmp, "outbox.db")}), \
+            patch.object(notion_outbox, "_outbox", None), patch.object(notion_outbox, "_drainer", None):
+        worker = threading.Thread(target=lambda: result.update(drainer=notion_outbox.get_drainer()), daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+        assert not worker.is_alive(), "get_drainer()가 멈춤 (락 교착)"
+        assert result["drainer"].outbox is notion_outbox.get_outbox()
+        result["drainer"].stop(timeout=5)
+    print("   ✅ 대기열과 드레이너를 한 번씩만 생성")
+
+def test_flush_returns_on_timeout():
+    """노션 호출이 멈춰도 flush()는 timeout 뒤에 돌아오고, 빈 대기열은 세션을 만들지 않음"""
+    print("⏱️ 종료 대기 테스트")
+
+    release = threading.Event()
+
+    def stuck_save(*args, **kwargs):
+        release.wait(5)
+        return {"success": True, "page_id": "p1", "page_url": "https://notion.so/p1"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = NotionOutbox(os.path.join(tmp, "outbox.db"))
+        drainer = OutboxDrainer(outbox, poll_interval=0.05)
+        with patch.object(notion_outbox, "get_notion_session", side_effect=AssertionError("세션 불필요")):
+            assert drainer.drain_once() == 0
+
+        outbox.enqueue(VIDEO_INFO, TOPICS, KID_PAIRS, KID_PAIRS)
+        with patch.object(notion_outbox, "get_notion_session", return_value=object()), \
+             patch.object(notion_outbox, "save_to_notion", side_effect=stuck_save):
+            start_time = time.perf_counter()
+            assert not drainer.flush(timeout=0.3)
+            waited = time.perf_counter() - start_time
+            release.set()
+            assert drainer.flush(timeout=5)
+            drainer.stop(timeout=5)
+    assert waited < 1.0
+    print(f"   ✅ 멈춘 전송을 {waited:.2f}초만 기다리고 반환")
+
+if __name__ == "__main__":
+    test_rerun_updates_existing_page()
+    test_failure_backoff_and_dead_letter()
+    test_claim_survives_other_process_start()
+    test_save_node_does_not_wait_for_notion()
+    test_shared_drainer_without_injection()
+    test_flush_returns_on_timeout()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+노션 세션 & 스키마 캐시 테스트 스크립트
+
+여러 비디오를 저장할 때 Client와 데이터베이스 스키마를 재사용하는지,
+속성 불일치 오류가 나면 스키마를 다시 읽고 재시도하는지 확인합니다.
+(실제 노션 API 대신 가짜 클라이언트 사용)
+"""
+
+import os
+import types
+import threading
+import dataclasses
+import httpx
+from unittest.mock import patch
+from notion_client import APIResponseError, APIErrorCode
+import utils.notion_client as notion_client
+from utils.notion_client import NotionSession, PropertyMapping, TokenBucket, save_to_notion
+
+SCHEMA = {
+    "이름": {"type": "title"},
+    "링크": {"type": "url"},
+    "주제 수": {"type": "number"},
+    "Q&A 수": {"type": "number"},
+    "영상 길이": {"type": "number"},
+    "카테고리": {"type": "select"},
+    "태그": {"type": "multi_select"},
+}
+
+class FakeNotionClient:
+    """databases.retrieve / pages.create 호출을 기록하는 가짜 클라이언트"""
+
+    def __init__(self, schema):
+        self.schema = dict(schema)
+        self.retrieve_calls = 0
+        self.created = []
+        self.databases = self
+        self.pages = self
+
+    def retrieve(self, database_id):
+        self.retrieve_calls += 1
+        return {"properties": self.schema}
+
+    def create(self, parent, properties, children):
+        missing = [name for name in properties if name not in self.schema]
+        if missing:
+            raise APIResponseError(
+                APIErrorCode.ValidationError, 400,
+                f"{missing[0]} is not a property that exists.",
+                httpx.Headers(), ""
+            )
+        self.created.append(properties)
+        page_id = f"page-{len(self.created)}"
+        return {"id": page_id, "url": f"https://notion.so/{page_id}"}
+
+VIDEO_INFO = {"title": "AI 축구 분석", "url": "https://youtu.be/test123", "duration": "12:30"}
+TOPICS = ["주제 1", "주제 2", "주제 3"]
+QA_PAIRS = [{"question": "질문", "answer": "답변"}] * 6
+
+def test_property_mapping_precomputed():
+    """속성 매핑 규칙이 스키마에서 한 번에 계산되는지 테스트"""
+    print("🗂️ 속성 매핑 테스트")
+
+    mapping = PropertyMapping({
+        'title': '이름', 'url': '링크', 'date': None,
+        'numbers': ['주제 수', 'Q&A 수', '영상 길이'],
+        'selects': ['카테고리'], 'multiselects': ['태그']
+    })
+    assert ('영상 길이', 'number', 'duration') in mapping.rules
+
+    properties = mapping.build_properties(VIDEO_INFO, TOPICS, QA_PAIRS, "📺 AI 축구 분석")
+    assert properties["주제 수"] == {"number": 3}
+    assert properties["Q&A 수"] == {"number": 6}
+    assert properties["영상 길이"] == {"number": 12.5}
+    assert properties["카테고리"] == {"select": {"name": "기술"}}
+    assert properties["태그"] == {"multi_select": [{"name": "AI"}, {"name": "축구"}]}
+    print("   ✅ 규칙은 미리 계산, 저장 시에는 값만 채움")
+
+def test_session_reuses_schema():
+    """배치 저장 시 스키마 조회가 한 번뿐인지 테스트"""
+    print("♻️ 스키마 캐시 테스트")
+
+    client = FakeNotionClient(SCHEMA)
+    session = NotionSession(client=client, schema_ttl=300, limiter=TokenBucket(1000))
+
+    with patch.dict(os.environ, {"NOTION_DATABASE_ID": "db-1"}):
+        results = [save_to_notion(VIDEO_INFO, TOPICS, QA_PAIRS, QA_PAIRS, session=session) for _ in range(5)]
+
+    assert all(result["success"] for result in results)
+    assert client.retrieve_calls == 1
+    assert len(client.created) == 5
+
+    # TTL이 지나면 다시 조회
+    expired = NotionSession(client=client, schema_ttl=0, limiter=TokenBucket(1000))
+    with patch.dict(os.environ, {"NOTION_DATABASE_ID": "db-1"}):
+        save_to_notion(VIDEO_INFO, TOPICS, QA_PAIRS, QA_PAIRS, session=expired)
+        save_to_notion(VIDEO_INFO, TOPICS, QA_PAIRS, QA_PAIRS, session=expired)
+    assert client.retrieve_calls == 3
+    print(f"   ✅ 5개 저장에 스키마 조회 1회")
+
+def test_property_mismatch_invalidates_schema():
+    """속성이 삭제되면 캐시를 비우고 재시도하는지 테스트"""
+    print("🔄 스키마 무효화 테스트")
+
+    client = FakeNotionClient(SCHEMA)
+    session = NotionSession(client=client, schema_ttl=300, limiter=TokenBucket(1000))
+
+    with patch.dict(os.environ, {"NOTION_DATABASE_ID": "db-1"}):
+        assert save_to_notion(VIDEO_INFO, TOPICS, QA_PAIRS, QA_PAIRS, session=session)["success"]
+
+        # 누군가 데이터베이스에서 '태그' 속성을 지움
+        del client.schema["태그"]
+        result = save_to_notion(VIDEO_INFO, TOPICS, QA_PAIRS, QA_PAIRS, session=session)
+
+    assert result["success"]
+    assert client.retrieve_calls == 2
+    assert "태그" not in client.created[-1]
+    print("   ✅ 스키마를 다시 읽고 저장 성공")
+
+def test_shared_session_without_injection():
+    """주입 없이 공유 세션을 처음 만들어도 멈추지 않고 공유 제한기를 씀"""
+    print("🔒 공유 세션 생성 테스트")
+
+    result = {}
+    with patch.object(notion_client, "_session", None), patch.object(notion_client, "_rate_limiter", None):
+        worker = threading.Thread(target=lambda: result.update(session=notion_client.get_notion_session()),
+                                  daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+        assert not worker.is_alive(), "get_notion_session()이 멈춤 (락 교착)"
+        assert result["session"] is notion_client.get_notion_session()
+        assert result["session"].limiter is notion_client.get_rate_limiter()
+    print("   ✅ 세션과 제한기를 한 번씩만 생성")
+
+def test_client_options_by_sdk_version():
+    """SDK 재시도 끄기(retry=False)는 ClientOptions에 retry가 있는 3.x에서만 넘김 (2.x는 TypeError)"""
+    print("🧩 SDK 버전별 Client 옵션 테스트")
+
+    @dataclasses.dataclass
+    class OptionsV2:
+        auth: str = None
+        base_url: str = "https://api.notion.com"
+
+    @dataclasses.dataclass
+    class OptionsV3(OptionsV2):
+        retry: bool = True
+
+    def fake_sdk(options_class):
+        return types.SimpleNamespace(client=types.SimpleNamespace(ClientOptions=options_class),
+                                     Client=lambda **options: options_class(**options))
+
+    with patch.dict(os.environ, {"NOTION_BASE_URL": "http://127.0.0.1:9/"}):
+        with patch.object(notion_client, "_sdk", return_value=fake_sdk(OptionsV2)):
+            v2 = notion_client._create_client("token")
+        with patch.object(notion_client, "_sdk", return_value=fake_sdk(OptionsV3)):
+            v3 = notion_client._create_client("token")
+    assert v2 == OptionsV2(auth="token", base_url="http://127.0.0.1:9")
+    assert v3.retry is False and notion_client._create_client("token").options.retry is False
+    print("   ✅ 2.x: retry 없이, 3.x: retry=False")
+
+if __name__ == "__main__":
+    test_property_mapping_precomputed()
+    test_session_reuses_schema()
+    test_property_mismatch_invalidates_schema()
+    test_shared_session_without_injection()
+    test_client_options_by_sdk_version()
+    print("\n✅ 모든 테스트 완료!")
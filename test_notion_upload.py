@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+노션 블록 분할 업로드 테스트 스크립트
+
+로컬 가짜 노션 서버(utils/fake_notion_server.py)에 실제 notion_client로 접속해서
+블록이 100개를 넘는 긴 요약도 순서대로 모두 저장되는지,
+429 응답을 받으면 기다렸다가 재시도하는지 확인하고 처리량을 측정합니다.
+"""
+
+import os
+import time
+from unittest.mock import patch
+from utils.fake_notion_server import FakeNotionServer, MAX_CHILDREN
+from utils.notion_client import NotionSession, TokenBucket, build_page_children, save_to_notion
+
+SCHEMA = {"이름": {"type": "title"}, "링크": {"type": "url"}, "주제 수": {"type": "number"}}
+
+VIDEO_INFO = {"title": "긴 강의 요약", "url": "https://youtu.be/long123"}
+TOPICS = [f"주제 {i}" for i in range(1, 11)]
+KID_PAIRS = [{"question": f"질문 {i}", "answer": f"답변 {i}"} for i in range(1, 81)]
+
+def _save(server, session, count=1):
+    env = {"NOTION_BASE_URL": server.base_url, "NOTION_DATABASE_ID": "db-1"}
+    with patch.dict(os.environ, env):
+        return [save_to_notion(VIDEO_INFO, TOPICS, KID_PAIRS, KID_PAIRS, session=session) for _ in range(count)]
+
+def test_long_summary_is_chunked():
+    """100개 넘는 블록이 나눠서 모두 저장되는지 테스트"""
+    print("🧱 블록 분할 업로드 테스트")
+
+    expected = build_page_children(VIDEO_INFO, TOPICS, KID_PAIRS)
+    assert len(expected) > 2 * MAX_CHILDREN
+
+    with FakeNotionServer(properties=SCHEMA) as server:
+        session = NotionSession(token="test-token", limiter=TokenBucket(1000))
+        with patch.dict(os.environ, {"NOTION_BASE_URL": server.base_url}):
+            result = _save(server, session)[0]
+
+        assert result["success"], result
+        page = server.pages[result["page_id"]]
+        assert page["children"] == expected
+        assert server.stats["rejected"] == 0
+        # 스키마 1회 + 페이지 생성 1회 + 나머지 블록 추가
+        assert session.requests_made == 2 + (len(expected) - 1) // MAX_CHILDREN
+    print(f"   ✅ 블록 {len(expected)}개를 {session.requests_made - 1}번에 나눠 저장")
+
+def test_rate_limited_retry():
+    """서버가 429를 돌려줘도 재시도로 모두 저장되는지 테스트"""
+    print("⏳ 429 재시도 테스트")
+
+    with FakeNotionServer(properties=SCHEMA, rate_limit=20, burst=2, retry_after=0.05) as server:
+        # 클라이언트 제한을 서버보다 느슨하게 둬서 일부러 429 유발
+        session = NotionSession(token="test-token", limiter=TokenBucket(200), max_retries=10)
+        with patch.dict(os.environ, {"NOTION_BASE_URL": server.base_url}):
+            results = _save(server, session, count=3)
+
+        assert all(result["success"] for result in results)
+        assert server.stats["rate_limited"] > 0
+        assert session.rate_limited_retries == server.stats["rate_limited"]
+        assert all(len(page["children"]) == len(build_page_children(VIDEO_INFO, TOPICS, KID_PAIRS))
+                   for page in server.pages.values())
+    print(f"   ✅ 429 {server.stats['rate_limited']}회를 재시도로 극복")
+
+def test_token_bucket_throughput():
+    """공유 토큰 버킷이 초당 요청 수를 지키는지 측정"""
+    print("📊 처리량 측정")
+
+    with FakeNotionServer(properties=SCHEMA, rate_limit=10, burst=3) as server:
+        session = NotionSession(token="test-token", limiter=TokenBucket(10, capacity=1))
+        start_time = time.perf_counter()
+        with patch.dict(os.environ, {"NOTION_BASE_URL": server.base_url}):
+            results = _save(server, session, count=2)
+        elapsed = time.perf_counter() - start_time
+
+        assert all(result["success"] for result in results)
+        # 클라이언트가 초당 10회로 고르게 보내므로 서버 제한(초당 10회)에 걸리지 않음
+        assert elapsed >= (session.requests_made - 1) / 10 * 0.9
+        assert server.stats["rate_limited"] == 0
+    print(f"   ✅ 요청 {session.requests_made}회 / {elapsed:.2f}초 ({session.requests_made / elapsed:.1f} req/s), 429 없음")
+
+if __name__ == "__main__":
+    test_long_summary_is_chunked()
+    test_rate_limited_retry()
+    test_token_bucket_throughput()
+    print("\n✅ 모든 테스트 완료!")
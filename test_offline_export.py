@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+오프라인 HTML 내보내기 테스트 스크립트
+
+CDN 링크 없이 열리는 단일 파일을 만드는지, 마크업에 쓰인 CSS 규칙만 남기는지,
+폰트 임베드와 미리 압축한 파일이 동작하는지 확인하고 단계별 크기를 출력합니다.
+"""
+
+import os
+import sys
+import gzip
+import types
+import tempfile
+from unittest.mock import patch
+from utils.html_generator import html_generator
+from utils.offline_export import make_offline_html, write_offline_html, purge_css, format_size_report
+from test_html_generator import make_sections
+
+def test_purge_keeps_only_used_rules():
+    """쓰인 클래스/태그 규칙만 남는지 테스트"""
+    css = """
+    /* 주석 */
+    h1, h6 { margin: 0 }
+    .p-4 { padding: 1rem }
+    .p-8 { padding: 2rem }
+    .hover\\:text-gray-700:hover { color: gray }
+    [type='button'] { -webkit-appearance: button }
+    @media (min-width: 640px) { .sm\\:p-8 { padding: 2rem } .p-4 { padding: 1.5rem } }
+    @media (min-width: 768px) { .md\\:flex { display: flex } }
+    """
+    html = '<h1 class="p-4 hover:text-gray-700">제목</h1>'
+    purged = purge_css(css, html)
+
+    assert purged == (
+        "h1{margin:0}.p-4{padding:1rem}.hover\\:text-gray-700:hover{color:gray}"
+        "@media (min-width:640px){.p-4{padding:1.5rem}}"
+    )
+    print(f"   ✅ {purged}")
+
+def test_offline_html_is_self_contained():
+    """생성된 HTML에서 외부 CSS/폰트 링크가 사라지는지 테스트"""
+    print("📦 오프라인 HTML 테스트")
+
+    html = html_generator("무지개", "https://img.youtube.com/x.jpg", make_sections(3, 4))
+    offline, report = make_offline_html(html)
+
+    assert "<link" not in offline and "fonts.googleapis" not in offline
+    assert ".shadow-lg{" in offline and ".text-4xl{" in offline  # 쓰인 유틸리티
+    assert ".text-5xl" not in offline and "textarea" not in offline  # 안 쓰인 규칙
+    assert offline.count("<li>") == 12
+    assert report["external_links_removed"] == 3
+    assert report["css_inlined_bytes"] < report["css_source_bytes"] / 2
+    assert html_generator("무지개", "https://img.youtube.com/x.jpg", make_sections(3, 4), offline=True) == offline
+    print(format_size_report(report))
+
+def test_font_embed_and_compressed_variants():
+    """폰트 임베드 + .gz 파일 테스트"""
+    print("🔤 폰트 임베드 / 압축 테스트")
+
+    html = html_generator("무지개", "https://img.youtube.com/x.jpg", make_sections(10, 10))
+    with tempfile.TemporaryDirectory() as tmp:
+        font_path = os.path.join(tmp, "hand.woff2")
+        with open(font_path, "wb") as f:
+            f.write(b"wOF2" + bytes(range(256)) * 4)
+
+        output_path = os.path.join(tmp, "output.offline.html")
+        report = write_offline_html(html, output_path, font_path=font_path)
+
+        with open(output_path, encoding="utf-8") as f:
+            offline = f.read()
+        assert "@font-face{font-family:'Patrick Hand'" in offline
+        assert "data:font/woff2;base64," in offline
+        assert report["font_bytes"] > 0
+
+        with gzip.open(output_path + ".gz", "rt", encoding="utf-8") as f:
+            assert f.read() == offline
+        assert report["gzip_bytes"] < report["offline_html_bytes"]
+        assert os.path.exists(output_path + ".br") == (report["brotli_bytes"] is not None)
+    print(format_size_report(report))
+
+def test_font_subset_flavor_and_failure():
+    """fontTools로 입력과 같은 형식(woff2)으로 서브셋하고, 서브셋이 실패하면 원본 폰트를 임베드"""
+    print("✂️ 폰트 서브셋 테스트")
+
+    calls = {}
+
+    def save_font(font, out, options):
+        calls["flavor"] = options.flavor
+        out.write(b"wOF2subset")
+
+    class Subsetter:
+        def __init__(self, options=None):
+            pass
+
+        def populate(self, text):
+            calls["text"] = text
+
+        def subset(self, font):
+            pass
+
+    working = types.SimpleNamespace(Options=types.SimpleNamespace, Subsetter=Subsetter, save_font=save_font,
+                                    load_font=lambda data, options: object())
+
+    def broken_load(data, options):
+        raise RuntimeError("brotli가 없어 WOFF2를 읽을 수 없음")
+    broken = types.SimpleNamespace(**{**vars(working), "load_font": broken_load})
+
+    html = html_generator("무지개", "https://img.youtube.com/x.jpg", make_sections(2, 2))
+    with tempfile.TemporaryDirectory() as tmp:
+        font_path = os.path.join(tmp, "hand.woff2")
+        original = b"wOF2" + bytes(range(256))
+        with open(font_path, "wb") as f:
+            f.write(original)
+
+        for module, expected in ((working, b"wOF2subset"), (broken, original)):
+            with patch.dict(sys.modules, {"fontTools": types.SimpleNamespace(subset=module), "fontTools.subset": module}):
+                offline, report = make_offline_html(html, font_path=font_path)
+            assert report["font_bytes"] == len(expected) and "data:font/woff2;base64," in offline
+        assert calls["flavor"] == "woff2" and "무" in calls["text"]
+
+        output_path = os.path.join(tmp, "output.offline.html")
+        with patch.dict(sys.modules, {"fontTools": types.SimpleNamespace(subset=broken), "fontTools.subset": broken}):
+            write_offline_html(html, output_path, font_path=font_path)
+        assert os.path.exists(output_path)
+    print("   ✅ woff2 → woff2로 서브셋, 서브셋 실패 시 원본 폰트 임베드")
+
+if __name__ == "__main__":
+    test_purge_keeps_only_used_rules()
+    test_offline_html_is_self_contained()
+    test_font_embed_and_compressed_variants()
+    test_font_subset_flavor_and_failure()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+비디오별 결과 저장소 테스트 스크립트
+
+동시에 실행된 결과가 서로 덮어쓰지 않는지, 원자적 쓰기 중에 읽는 쪽이
+반쯤 쓰인 파일을 보지 않는지, 매니페스트로 최신 결과를 바로 찾는지 확인합니다.
+"""
+
+import os
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import flow
+from utils.output_store import OutputStore, atomic_write
+
+FINAL_TOPICS = [{"title": "무지개", "qa_pairs": [
+    {"kid_friendly_question": "무지개는 왜 생겨요?", "kid_friendly_answer": "햇빛이 물방울을 지나며 나뉘어서 생겨요."}
+]}]
+
+def _video(video_id):
+    return {"video_id": video_id, "title": f"비디오 {video_id}", "url": f"https://youtu.be/{video_id}",
+            "thumbnail_url": "https://img.youtube.com/x.jpg", "transcript": "긴 자막 " * 100}
+
+def test_atomic_write_never_exposes_partial_file():
+    """쓰는 도중에 읽어도 항상 완성된 내용만 보이는지 테스트"""
+    print("🧱 원자적 쓰기 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "summary.html")
+        versions = [(str(i) * 200_000) for i in range(10)]
+        atomic_write(path, versions[0])
+        done = threading.Event()
+        seen = set()
+
+        def reader():
+            while not done.is_set():
+                with open(path, encoding="utf-8") as f:
+                    seen.add(f.read())
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda content: atomic_write(path, content), versions))
+        done.set()
+        thread.join()
+
+        assert seen <= set(versions)
+        assert [name for name in os.listdir(tmp) if name.startswith(".tmp-")] == []
+    print(f"   ✅ 읽은 버전 {len(seen)}개 모두 완성본, 임시 파일 없음")
+
+def test_concurrent_runs_do_not_overwrite():
+    """동시에 끝난 두 실행이 각자의 경로에 저장되고 매니페스트는 최신 실행을 가리키는지 테스트"""
+    print("🗂️ 비디오별 경로 + 매니페스트 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OutputStore(tmp)
+
+        def run(video_id):
+            shared = {"video_info": _video(video_id), "final_topics": FINAL_TOPICS}
+            flow.GenerateHTML().run(shared)
+            return shared
+
+        with patch.object(flow, "get_output_store", return_value=store):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(run, ["aaaaaaaaaaa", "bbbbbbbbbbb", "aaaaaaaaaaa", "bbbbbbbbbbb"]))
+
+        html_paths = {shared["output_files"]["html"] for shared in results}
+        assert len(html_paths) == 4  # 실행마다 다른 파일
+
+        latest = store.latest("aaaaaaaaaaa")
+        assert latest["run_id"] in {results[0]["run_id"], results[2]["run_id"]}
+        with open(latest["files"]["json"], encoding="utf-8") as f:
+            summary = json.load(f)
+        assert summary["video_info"]["video_id"] == "aaaaaaaaaaa"
+        assert "transcript" not in summary["video_info"]
+        assert store.latest("ccccccccccc") is None
+        assert len(store.entries()) == 2
+    print(f"   ✅ 실행 4개 → 파일 4개, 최신: {latest['files']['html']}")
+
+if __name__ == "__main__":
+    test_atomic_write_never_exposes_partial_file()
+    test_concurrent_runs_do_not_overwrite()
+    print("\n✅ 모든 테스트 완료!")
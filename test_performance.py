@@ -1,195 +0,0 @@
-import time
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from utils.call_llm import call_llm
-from utils.qa_generator import generate_qa_pairs
-from utils.kid_friendly_converter import convert_to_kid_friendly
-
-# Mock 데이터
-test_topics = [
-    {"title": "인공지능", "content": "AI 기술의 발전과 미래 전망"},
-    {"title": "로봇 기술", "content": "자동화와 로봇의 일상 침투"},
-    {"title": "미래 사회", "content": "기술이 바꾸는 사회의 모습"},
-    {"title": "교육 혁신", "content": "온라인 교육과 개인화 학습"},
-    {"title": "환경 기술", "content": "친환경 기술과 지속가능성"}
-]
-
-def sequential_processing():
-    """순차 처리 방식"""
-    print("🐌 순차 처리 시작...")
-    start_time = time.time()
-    
-    results = []
-    api_calls = 0
-    
-    for topic in test_topics:
-        # Q&A 생성
-        qa_pairs = generate_qa_pairs(
-            topic["title"], 
-            topic["content"], 
-            num_questions=3, 
-            use_mock=True
-        )
-        api_calls += 3  # 3개 Q&A 생성
-        
-        # 친화적 변환
-        for qa in qa_pairs:
-            # qa는 {"question": "...", "answer": "..."} 형식
-            if isinstance(qa, dict) and "question" in qa and "answer" in qa:
-                kid_question = convert_to_kid_friendly(qa["question"], use_mock=True)
-                kid_answer = convert_to_kid_friendly(qa["answer"], use_mock=True)
-                api_calls += 2  # 질문 + 답변 변환
-        
-        results.append({
-            "topic": topic["title"],
-            "qa_count": len(qa_pairs)
-        })
-    
-    end_time = time.time()
-    processing_time = end_time - start_time
-    
-    print(f"   ⏱️  처리 시간: {processing_time:.2f}초")
-    print(f"   📞 API 호출: {api_calls}회")
-    print(f"   📊 처리 결과: {len(results)}개 주제")
-    
-    return processing_time, api_calls, results
-
-def mapreduce_processing():
-    """MapReduce 병렬 처리 방식"""
-    print("🚀 MapReduce 처리 시작...")
-    start_time = time.time()
-    
-    # Map Phase 1: Q&A 생성 (병렬)
-    def generate_qa_for_topic(topic):
-        return generate_qa_pairs(
-            topic["title"], 
-            topic["content"], 
-            num_questions=3, 
-            use_mock=True
-        )
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        qa_results = list(executor.map(generate_qa_for_topic, test_topics))
-    
-    # Map Phase 2: 친화적 변환 (병렬)
-    all_qa_pairs = []
-    for i, topic in enumerate(test_topics):
-        for qa in qa_results[i]:
-            if isinstance(qa, dict) and "question" in qa and "answer" in qa:
-                all_qa_pairs.append({
-                    "topic": topic["title"],
-                    "question": qa["question"],
-                    "answer": qa["answer"]
-                })
-    
-    def convert_qa_to_kid_friendly(qa_item):
-        kid_question = convert_to_kid_friendly(qa_item["question"], use_mock=True)
-        kid_answer = convert_to_kid_friendly(qa_item["answer"], use_mock=True)
-        return {
-            "topic": qa_item["topic"],
-            "kid_question": kid_question,
-            "kid_answer": kid_answer
-        }
-    
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        converted_results = list(executor.map(convert_qa_to_kid_friendly, all_qa_pairs))
-    
-    end_time = time.time()
-    processing_time = end_time - start_time
-    
-    # API 호출 수는 동일 (병렬 처리해도 호출 횟수는 같음)
-    api_calls = len(test_topics) * 3 + len(all_qa_pairs) * 2
-    
-    print(f"   ⏱️  처리 시간: {processing_time:.2f}초")
-    print(f"   📞 API 호출: {api_calls}회")
-    print(f"   📊 처리 결과: {len(converted_results)}개 Q&A")
-    
-    return processing_time, api_calls, converted_results
-
-def compare_performance():
-    """성능 비교 실행"""
-    print("🔥 MapReduce vs 순차 처리 성능 비교")
-    print("=" * 50)
-    
-    # 순차 처리
-    seq_time, seq_calls, seq_results = sequential_processing()
-    
-    print("\n" + "-" * 30 + "\n")
-    
-    # MapReduce 처리
-    mr_time, mr_calls, mr_results = mapreduce_processing()
-    
-    print("\n" + "=" * 50)
-    print("📈 성능 비교 결과:")
-    print(f"   ⚡ 속도 개선: {((seq_time - mr_time) / seq_time * 100):.1f}% 단축")
-    print(f"   💰 API 호출: {mr_calls}회 (동일)")
-    print(f"   🎯 처리량: {len(mr_results)}개 Q&A 변환 완료")
-    
-    if mr_time < seq_time:
-        speedup = seq_time / mr_time
-        print(f"   🚀 {speedup:.1f}배 더 빠름!")
-    
-    return {
-        "sequential": {"time": seq_time, "calls": seq_calls},
-        "mapreduce": {"time": mr_time, "calls": mr_calls},
-        "speedup": seq_time / mr_time if mr_time > 0 else 0
-    }
-
-def demo_gpu_analogy():
-    """GPU vs MapReduce 유사성 시각적 데모"""
-    print("\n🎮 GPU vs MapReduce 유사성 데모")
-    print("=" * 50)
-    
-    print("1️⃣ GPU 병렬 처리 (예시: 이미지 처리)")
-    print("   Core 1: pixel(1,1) 처리 ⚡")
-    print("   Core 2: pixel(1,2) 처리 ⚡")  
-    print("   Core 3: pixel(1,3) 처리 ⚡")
-    print("   ...")
-    print("   Core N: pixel(m,n) 처리 ⚡")
-    print("   → 모든 픽셀을 동시에 처리!")
-    
-    print("\n2️⃣ MapReduce 병렬 처리 (YouTube 요약)")
-    print("   Thread 1: '인공지능' 주제 → Q&A 생성 ⚡")
-    print("   Thread 2: '로봇 기술' 주제 → Q&A 생성 ⚡")
-    print("   Thread 3: '미래 사회' 주제 → Q&A 생성 ⚡")
-    print("   Thread 4: '교육 혁신' 주제 → Q&A 생성 ⚡")
-    print("   Thread 5: '환경 기술' 주제 → Q&A 생성 ⚡")
-    print("   → 모든 주제를 동시에 처리!")
-
-def demo_api_cost_analysis():
-    """API 비용 분석 데모"""
-    print("\n💰 API 비용 분석")
-    print("=" * 50)
-    
-    # 가상의 비용 계산
-    cost_per_call = 0.02  # $0.02 per API call
-    topics = 5
-    qa_per_topic = 3
-    conversions = topics * qa_per_topic * 2  # question + answer
-    
-    total_calls = topics * qa_per_topic + conversions
-    total_cost = total_calls * cost_per_call
-    
-    print(f"📊 기본 비용 구조:")
-    print(f"   - 주제별 Q&A 생성: {topics}개 주제 × {qa_per_topic}개 Q&A = {topics * qa_per_topic}회 호출")
-    print(f"   - 아이 친화적 변환: {topics * qa_per_topic}개 Q&A × 2(질문+답변) = {conversions}회 호출")
-    print(f"   - 총 API 호출: {total_calls}회")
-    print(f"   - 총 비용: ${total_cost:.2f}")
-    
-    print(f"\n💡 MapReduce 효과:")
-    print(f"   ✅ 직접적 비용 절약: 없음 (호출 수 동일)")
-    print(f"   ✅ 간접적 효과:")
-    print(f"      - 개발 시간 80% 단축 → 시간당 생산성 5배 증가")
-    print(f"      - 실패 시 개별 재시도 → 불필요한 재호출 25% 절약")
-    print(f"      - 배치 API 활용 가능 → 50% 비용 할인 가능")
-
-if __name__ == "__main__":
-    results = compare_performance()
-    
-    demo_gpu_analogy()
-    demo_api_cost_analysis()
-    
-    print(f"\n🎯 최종 결론:")
-    print(f"   🚀 성능: GPU처럼 병렬 처리로 {results['speedup']:.1f}배 성능 향상")
-    print(f"   💰 비용: 직접적 절약 없지만 효율성 크게 증대")
-    print(f"   ⭐ 핵심: 분할 정복으로 확장성과 안정성 확보") 
\ No newline at end of file
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+LLM 응답 파서 테스트 스크립트
+
+코드 펜스, 후행 쉼표, 잘린 응답이 복구되는지와
+빠진 항목만 다시 요청하는지 확인합니다.
+"""
+
+from unittest.mock import patch
+from utils.response_parser import (
+    JSONStreamExtractor,
+    extract_json,
+    extract_json_list,
+    validate_items,
+    call_llm_for_items,
+)
+
+def test_repairs():
+    """펜스/후행 쉼표/잘림 복구 테스트"""
+    print("🔧 JSON 복구 테스트")
+
+    fenced = '설명입니다.\n```json\n[{"title": "주제", "content": "내용"}]\n```\n끝'
+    assert extract_json(fenced) == [{"title": "주제", "content": "내용"}]
+
+    trailing = '[{"question": "질문", "answer": "답변",},]'
+    assert extract_json(trailing) == [{"question": "질문", "answer": "답변"}]
+
+    # 문자열 안의 쉼표와 괄호는 건드리지 않아야 함
+    tricky = '{"topics": [{"title": "a, ]b", "content": "c \\"d\\""}]}'
+    assert extract_json_list(tricky, "topics") == [{"title": "a, ]b", "content": 'c "d"'}]
+
+    truncated = '```json\n{"qa_pairs": [{"question": "Q1", "answer": "A1"}, {"question": "Q2", "answer": "잘린 답'
+    assert extract_json_list(truncated, "qa_pairs") == [{"question": "Q1", "answer": "A1"}]
+
+    assert extract_json("JSON이 없는 응답") is None
+    print("   ✅ 모든 복구 케이스 통과")
+
+def test_streaming():
+    """스트리밍 추출 테스트"""
+    print("🌊 스트리밍 추출 테스트")
+
+    extractor = JSONStreamExtractor()
+    chunks = ['```json\n[{"title": "첫', ' 번째"}, {"ti', 'tle": "두 번째"}', ']\n```']
+    items = []
+    for chunk in chunks:
+        items.extend(extractor.feed(chunk))
+
+    assert items == [{"title": "첫 번째"}, {"title": "두 번째"}]
+    assert extractor.close() == items
+    print("   ✅ 항목이 닫히는 즉시 반환됨")
+
+def test_validation():
+    """스키마 검증 테스트"""
+    items = [
+        {"question": "Q1", "answer": "A1"},
+        {"question": "Q2", "answer": ""},
+        {"title": "다른 스키마"},
+        "문자열",
+    ]
+    valid, incomplete = validate_items(items, ["question", "answer"])
+    assert valid == [{"question": "Q1", "answer": "A1"}]
+    assert incomplete == [{"question": "Q2", "answer": ""}]
+
+def test_repair_request_only_asks_missing():
+    """검증 실패 시 빠진 항목만 다시 요청하는지 테스트"""
+    print("🔁 부분 재요청 테스트")
+
+    responses = [
+        '{"qa_pairs": [{"question": "Q1", "answer": "A1"}, {"question": "Q2"}]}',
+        '{"qa_pairs": [{"question": "Q2", "answer": "A2"}, {"question": "Q3", "answer": "A3"}]}',
+    ]
+    prompts = []
+
+    def fake_call_llm_for_stage(stage, prompt, json_mode=False, validator=None, use_mock=False):
+        prompts.append(prompt)
+        return responses[len(prompts) - 1]
+
+    with patch("utils.response_parser.call_llm_for_stage", side_effect=fake_call_llm_for_stage):
+        items = call_llm_for_items(
+            "원래 프롬프트", ["question", "answer"], expected_count=3, list_key="qa_pairs"
+        )
+
+    assert [item["question"] for item in items] == ["Q1", "Q2", "Q3"]
+    assert len(prompts) == 2
+    assert "부족한 항목 2개만" in prompts[1]
+    assert '"Q2"' in prompts[1]  # 불완전한 항목을 채우도록 요청
+    print(f"   ✅ 총 {len(prompts)}회 호출로 {len(items)}개 항목 확보")
+
+if __name__ == "__main__":
+    test_repairs()
+    test_streaming()
+    test_validation()
+    test_repair_request_only_asks_missing()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+처리 결과 캐시 테스트 스크립트
+
+(video_id, 파이프라인 설정)으로 저장한 결과를 다시 꺼내는지, 설정이 바뀌면
+재사용하지 않는지, Streamlit 앱이 저장된 결과를 LLM/YouTube 호출 없이
+바로 보여주는지 (강제 새로고침이면 다시 처리하는지) 확인합니다.
+"""
+
+import os
+import time
+import tempfile
+from unittest.mock import patch
+import utils.result_cache as result_cache
+import utils.output_store as output_store
+from utils.result_cache import ResultCache, config_key, pipeline_config
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+def make_shared():
+    return {
+        "video_info": {"video_id": VIDEO_ID, "title": "무지개 이야기", "transcript": "아주 긴 자막 " * 10000},
+        "final_topics": [{"title": "무지개", "qa_pairs": [
+            {"kid_friendly_question": f"질문 {i}", "kid_friendly_answer": f"답변 {i}"} for i in range(30)
+        ]}],
+        "html_output": "<div class=\"summary-container\">무지개 요약</div>" * 200,
+        "file_html": "<html>무지개</html>",
+        "progress_callback": print,
+    }
+
+def test_roundtrip_and_config_key():
+    """저장/조회, 설정별 분리, 자막 제외 테스트"""
+    print("🗄️ 결과 캐시 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, "cache.db"))
+        cache.put(VIDEO_ID, make_shared())
+
+        start_time = time.perf_counter()
+        cached = cache.get(VIDEO_ID)
+        elapsed = time.perf_counter() - start_time
+
+        assert cached["html_output"] == make_shared()["html_output"]
+        assert "transcript" not in cached["video_info"]
+        assert "progress_callback" not in cached
+        assert elapsed < 0.1
+
+        # 설정(모델 라우팅 등)이 바뀌면 다른 키
+        config = pipeline_config()
+        changed = dict(config, routing={**config["routing"], "qa": {**config["routing"]["qa"], "model": "gpt-4o-mini"}})
+        assert config_key(config) != config_key(changed)
+        assert cache.get(VIDEO_ID, config_key(changed)) is None
+
+        cache.invalidate(VIDEO_ID)
+        assert cache.get(VIDEO_ID) is None
+    print(f"   ✅ 조회 {elapsed * 1000:.2f}ms")
+
+def _run_app(tmp, force_refresh):
+    """저장된 결과가 있는 상태에서 앱을 열고 요약 버튼 클릭 (Flow 실행은 가로채서 기록)"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    import flow
+
+    st.cache_resource.clear()  # 이전 테스트의 Flow/캐시 객체를 재사용하지 않도록
+
+    cache = ResultCache(os.path.join(tmp, "cache.db"))
+    cache.put(VIDEO_ID, make_shared())
+    flow_runs = []
+
+    class RecordingFlow:
+        def run(self, shared):
+            flow_runs.append(shared["url"])
+
+    with patch.object(result_cache, "_cache", cache), \
+         patch.object(flow, "create_youtube_processor_flow", return_value=RecordingFlow()), \
+         patch.object(output_store, "_store", output_store.OutputStore(os.path.join(tmp, "outputs"))):
+        app = AppTest.from_file("streamlit_app.py", default_timeout=30)
+        app.run()
+        app.text_input[0].set_value(f"https://youtu.be/{VIDEO_ID}").run()
+        if force_refresh:
+            app.checkbox[0].check().run()
+        start_time = time.perf_counter()
+        app.button[0].click().run()
+        elapsed = time.perf_counter() - start_time
+    return app, flow_runs, elapsed
+
+def test_streamlit_uses_cached_result():
+    """저장된 결과는 Flow 없이 표시, 강제 새로고침이면 Flow 실행"""
+    print("⚡ Streamlit 캐시 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, flow_runs, elapsed = _run_app(tmp, force_refresh=False)
+        assert flow_runs == []
+        assert any("저장된 결과" in info.value for info in app.info)
+        assert any("무지개 요약" in markdown.value for markdown in app.markdown)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, flow_runs, _ = _run_app(tmp, force_refresh=True)
+        assert flow_runs == [f"https://youtu.be/{VIDEO_ID}"]
+    print(f"   ✅ 캐시 적중 시 Flow 호출 없음 (앱 재실행 {elapsed * 1000:.0f}ms), 새로고침 시 Flow 실행")
+
+if __name__ == "__main__":
+    test_roundtrip_and_config_key()
+    test_streamlit_uses_cached_result()
+    print("\n✅ 모든 테스트 완료!")
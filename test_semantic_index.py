@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+의미 검색 색인 테스트 스크립트
+
+utils/semantic_index.py가 자막 구간과 Q&A를 임베딩해서 메모리 매핑 float32 행렬 + id 사이드카에 저장하고,
+NumPy 블록 행렬곱으로 top-k 코사인 검색 결과가 정확히 전체 정렬과 같은지, IVF 분할이 재현율을 지키면서
+더 빠른지, "X를 설명하는 영상" 검색과 재색인, Flow/결과 저장소 연동, OpenAI 임베더(가짜 서버)를 확인합니다.
+"""
+
+import os
+import json
+import tempfile
+import threading
+from unittest.mock import patch
+import numpy as np
+import utils.semantic_index as semantic_index
+from utils.semantic_index import (HashingEmbedder, OpenAIEmbedder, VectorStore, SemanticIndex, benchmark_search,
+                                  index_output_store)
+from utils.output_store import OutputStore
+from utils.fake_openai_server import FakeOpenAIServer
+from benchmarks.mock_llm import MockLLM
+from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+from benchmarks.runner import benchmark_environment
+
+VIDEOS = {
+    "plants00001": ("식물은 어떻게 밥을 먹을까",
+                    "식물은 햇빛과 물과 이산화탄소로 광합성을 해서 양분을 만듭니다. 잎의 엽록소가 빛을 모읍니다."),
+    "volcano0001": ("화산은 왜 폭발할까",
+                    "땅속 깊은 곳의 마그마가 압력을 받아 화산 밖으로 분출합니다. 용암은 식으면서 암석이 됩니다."),
+}
+
+def video_info(video_id):
+    title, transcript = VIDEOS[video_id]
+    return {"video_id": video_id, "title": title, "url": f"https://youtu.be/{video_id}",
+            "transcript": transcript, "duration": 120}
+
+def topics(question, answer):
+    return [{"title": "주제", "qa_pairs": [{"kid_friendly_question": question, "kid_friendly_answer": answer}]}]
+
+def test_store_matches_exact_search():
+    """용량을 넘겨도 늘어나고, 다시 열어도 같고, top-k가 전체 정렬과 같고, 삭제한 행은 빠짐"""
+    print("🧮 벡터 저장소 테스트")
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((3000, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = vectors[[5, 1500, 2999]] + 0.01
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index")
+        store = VectorStore(path, dim=32, embedder="test")
+        store.add([{"id": f"r{i}"} for i in range(1000)], vectors[:1000])
+        store.add([{"id": f"r{i}"} for i in range(1000, 3000)], vectors[1000:])
+        assert store.count == 3000 and store.meta["capacity"] >= 3000
+
+        reopened = VectorStore(path, dim=32, embedder="test")
+        assert reopened.count == 3000 and reopened.get_records([2999])[0]["id"] == "r2999"
+        scores, rows = reopened.search_vectors(queries, k=10)
+        expected = np.argsort(-(queries @ vectors.T), axis=1, kind="stable")[:, :10]
+        assert (rows == expected).all() and scores.shape == (3, 10)
+
+        reopened.remove([rows[0][0]])
+        assert rows[0][0] not in reopened.search_vectors(queries[:1], k=10)[1][0]
+        try:
+            VectorStore(path, dim=64, embedder="test")
+            assert False, "ValueError가 나야 합니다"
+        except ValueError:
+            pass
+    print("   ✅ 3000행 (용량 자동 증가), 다시 열기, top-10 = 전체 정렬, 삭제 반영, 차원 불일치 거부")
+
+def test_two_writers_share_index():
+    """같은 경로를 연 두 저장소(다른 프로세스처럼)가 번갈아/동시에 써도 행이 겹치지 않고 서로의 행을 봄"""
+    print("✍️ 여러 작성자 테스트")
+
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((1403, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = VectorStore(tmp, dim=16), VectorStore(tmp, dim=16)
+        assert first.add([{"id": "a0"}], vectors[:1]) == [0]
+        assert second.add([{"id": "b0"}], vectors[1:2]) == [1]
+        assert first.add([{"id": "a1"}], vectors[2:3]) == [2] and [r["id"] for r in first.get_records(range(3))] == ["a0", "b0", "a1"]
+
+        # 두 저장소가 동시에 추가하면서 용량(1024)도 넘김
+        def write(store, prefix, offset):
+            for i in range(0, 700, 50):
+                store.add([{"id": f"{prefix}{i + j}", "row": offset + i + j} for j in range(50)],
+                          vectors[offset + i:offset + i + 50])
+        threads = [threading.Thread(target=write, args=(first, "x", 3)),
+                   threading.Thread(target=write, args=(second, "y", 703))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reopened = VectorStore(tmp, dim=16)
+        records = reopened.get_records(range(reopened.count))
+        assert reopened.count == 1403 and len({r["id"] for r in records}) == 1403
+        rows = [row for row, record in enumerate(records) if "row" in record]
+        expected = vectors[[records[row]["row"] for row in rows]]
+        assert np.allclose(reopened.vectors[rows], expected), "행과 사이드카 레코드가 어긋남"
+        second.refresh()
+        assert second.count == 1403 and second.search_vectors(vectors[:1], k=1)[1][0][0] == 0
+    print("   ✅ 두 저장소가 1403행을 겹치지 않게 추가 (용량 증가 포함), 서로의 행 검색 가능")
+
+def test_row_index_without_loading_records():
+    """레코드는 메모리에 올리지 않고 줄 위치로 읽고, 비디오의 행은 비디오 번호로 찾음 (예전 색인은 열 때 변환)"""
+    print("🗂️ 행 색인 테스트")
+
+    vectors = np.eye(8, dtype=np.float32)[[i % 8 for i in range(12)]]
+    records = [{"id": f"r{i}", "video_id": ["vidA", "vidB", None][i % 3], "text": "가" * (i + 1)} for i in range(12)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(tmp, dim=8)
+        store.add(records[:5], vectors[:5])
+        store.add([], np.zeros((0, 8), dtype=np.float32))
+        store.add(records[5:], vectors[5:])
+        store.remove([3])
+        assert not hasattr(store, "records") and store.meta["videos"] == 3
+        assert store.video_rows("vidA") == [0, 6, 9] and store.video_rows(None) == [2, 5, 8, 11]
+        assert store.video_rows("없는 영상") == []
+        assert store.get_records([11, 0, 7]) == [records[11], records[0], records[7]]
+
+        # 줄 위치/비디오 번호 파일이 없는 예전 색인도 그대로 열림
+        for name in ("offsets.i64", "video.u32", "videos.jsonl"):
+            os.remove(os.path.join(tmp, name))
+        with open(os.path.join(tmp, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({key: meta[key] for key in ("dim", "count", "capacity", "embedder", "ivf")}, f)
+        upgraded = VectorStore(tmp, dim=8)
+        assert upgraded.meta["sidecar_bytes"] == meta["sidecar_bytes"] and upgraded.video_rows("vidB") == [1, 4, 7, 10]
+        assert upgraded.add([{"id": "new", "video_id": "vidB"}], vectors[:1]) == [12]
+        assert upgraded.get_records([12, 4]) == [{"id": "new", "video_id": "vidB"}, records[4]]
+        assert VectorStore(tmp, dim=8).video_rows("vidB") == [1, 4, 7, 10, 12]
+    print("   ✅ 12행: 비디오별 행, 필요한 줄만 읽기, 예전 형식 변환")
+
+def test_ivf_recall_and_speed():
+    """IVF는 재현율을 지키면서 전체 검색보다 빠르고, IVF 이후에 추가한 행도 찾음"""
+    print("⚡ IVF 테스트")
+
+    result = benchmark_search(rows=100_000, dim=64, queries=20, clusters=500)
+    assert result["recall"] >= 0.9 and result["ivf_ms"] < result["flat_ms"], result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((2000, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store = VectorStore(tmp, dim=16)
+        store.add([{"id": i} for i in range(2000)], vectors)
+        store.build_ivf(nlist=20, nprobe=4)
+        late = -vectors[0:1]
+        store.add([{"id": "late"}], late)
+        assert store.search_vectors(late, k=1)[1][0][0] == 2000
+    print(f"   ✅ {result['rows']}행: 전체 {result['flat_ms']}ms → IVF {result['ivf_ms']}ms, 재현율 {result['recall']}")
+
+def test_videos_and_reindex():
+    """"X를 설명하는 영상" 검색, 같은 실행은 건너뛰고 새 실행은 예전 행을 바꿈"""
+    print("🔎 영상 검색 테스트")
+
+    embedder = HashingEmbedder(dim=128)
+    similar = embedder.embed(["광합성은 무엇인가요", "광합성이란 무엇일까", "화산이 폭발해요"])
+    assert similar[0] @ similar[1] > similar[0] @ similar[2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SemanticIndex(os.path.join(tmp, "index"), embedder)
+        index.index_video(video_info("plants00001"), "run-1", topics("엽록소는 무엇인가요?", "빛을 모으는 초록 색소예요."))
+        first = index.index_video(video_info("volcano0001"), "run-1", topics("용암은 뜨거운가요?", "아주 뜨거워요."))
+        assert first["added"] == 2 and not first["skipped"]
+
+        videos = index.videos("마그마와 용암이 분출하는 화산")
+        assert [video["video_id"] for video in videos] == ["volcano0001", "plants00001"]
+        batch = index.search(["광합성 엽록소", "화산 용암"], k=1)
+        assert batch[0][0]["video_id"] == "plants00001" and batch[1][0]["video_id"] == "volcano0001"
+        assert batch[1][0]["start"] == 0.0 or batch[1][0]["kind"] == "qa"
+
+        assert index.index_video(video_info("volcano0001"), "run-1", [])["skipped"]
+        again = index.index_video(video_info("volcano0001"), "run-2", topics("화산재는 어디로 가요?", "바람을 타고 날아가요."))
+        assert again["removed"] == 2 and index.store.count == 6
+        assert all(result["run_id"] == "run-2" for result in index.search("화산", k=10)
+                   if result["video_id"] == "volcano0001")
+    print(f"   ✅ '화산' → {videos[0]['title']}, 재색인 시 예전 행 {again['removed']}개 교체")
+
+def test_flow_and_output_store():
+    """SEMANTIC_INDEX=1이면 Flow가 실행마다 색인하고, 결과 저장소에서 다시 만들 수 있음"""
+    print("🏭 Flow/결과 저장소 테스트")
+
+    from flow import create_youtube_processor_flow
+
+    llm = MockLLM()
+    with tempfile.TemporaryDirectory() as tmp, \
+            benchmark_environment(llm, fixture_video_fetcher(make_video_info(sentences=200)), tmp):
+        index = SemanticIndex(os.path.join(tmp, "index"), HashingEmbedder(dim=64))
+        with patch.object(semantic_index, "_index", index), patch.dict(os.environ, {"SEMANTIC_INDEX": "1"}):
+            shared = {"url": "https://youtu.be/benchmark01"}
+            create_youtube_processor_flow().run(shared)
+        records = index.store.get_records(range(index.store.count))
+        kinds = [record["kind"] for record in records]
+        assert "transcript" in kinds and "qa" in kinds
+        assert all(record["run_id"] == shared["run_id"] for record in records)
+
+        rebuilt = SemanticIndex(os.path.join(tmp, "rebuilt"), HashingEmbedder(dim=64))
+        totals = index_output_store(rebuilt, OutputStore(os.path.join(tmp, "outputs")))
+        assert totals["videos"] == 1 and totals["added"] == index.store.count
+        assert index_output_store(rebuilt, OutputStore(os.path.join(tmp, "outputs")))["skipped"] == 1
+    print(f"   ✅ 실행 1회 → 행 {index.store.count}개 (자막 {kinds.count('transcript')}, Q&A {kinds.count('qa')}), "
+          "저장소에서 재구성 동일")
+
+def test_openai_embedder():
+    """OpenAI 임베더는 가짜 서버의 /v1/embeddings로 배치 요청"""
+    print("🌐 OpenAI 임베더 테스트")
+
+    with FakeOpenAIServer() as server, \
+            patch.dict(os.environ, {"OPENAI_API_KEY": "test", "OPENAI_BASE_URL": server.base_url}):
+        vectors = OpenAIEmbedder(dim=64, batch_size=2).embed(["광합성", "화산 폭발", "광합성"])
+        assert vectors.shape == (3, 64) and np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+        assert np.allclose(vectors[0], vectors[2]) and server.stats["embeddings"] == 3
+    print("   ✅ 3개를 배치 2개로 임베딩")
+
+if __name__ == "__main__":
+    test_store_matches_exact_search()
+    test_two_writers_share_index()
+    test_row_index_without_loading_records()
+    test_ivf_recall_and_speed()
+    test_videos_and_reindex()
+    test_flow_and_output_store()
+    test_openai_embedder()
+    print("\n✅ 모든 테스트 완료!")
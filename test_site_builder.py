@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+정적 사이트 생성기 테스트 & 벤치마크 스크립트
+
+저장된 요약과 examples/의 예전 HTML로 사이트를 만들고, 다시 빌드할 때
+내용이 바뀐 비디오 페이지만 렌더링하는지 확인합니다. 큰 아카이브에서
+전체 빌드와 "비디오 하나 추가 후" 빌드 시간을 비교합니다.
+"""
+
+import os
+import json
+import time
+import tempfile
+from utils.output_store import OutputStore
+from utils.site_builder import SiteBuilder, load_store_summaries, load_legacy_summaries
+
+def make_record(number):
+    return {
+        "id": f"vid{number:08d}",
+        "title": f"비디오 {number}: {'축구 이야기' if number % 3 == 0 else 'AI 기술 이야기'}",
+        "url": f"https://youtu.be/vid{number:08d}",
+        "thumbnail_url": f"https://img.youtube.com/vi/vid{number:08d}/hqdefault.jpg",
+        "sections": [{"title": f"주제 {s}", "bullets": [
+            (f"Q: 질문 {number}-{s}-{q}: 무지개는 왜 생겨요?", f"A: 햇빛이 물방울에서 나뉘어요 <{number}>")
+            for q in range(3)
+        ]} for s in range(3)],
+        "sort_key": float(number),
+    }
+
+def test_incremental_build():
+    """추가/수정/삭제한 비디오 페이지만 다시 만드는지 테스트"""
+    print("🏗️ 증분 빌드 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        builder = SiteBuilder(tmp, page_size=10)
+        records = [make_record(i) for i in range(45)]
+
+        first = builder.build(records)
+        assert first["videos_rendered"] == 45
+        assert os.path.exists(os.path.join(tmp, "index.html"))
+        assert os.path.exists(os.path.join(tmp, "page", "5.html"))
+        assert not os.path.exists(os.path.join(tmp, "page", "6.html"))
+        assert os.path.exists(os.path.join(tmp, "tags", "스포츠.html"))
+
+        assert builder.build(records)["videos_rendered"] == 0
+
+        records.append(make_record(45))
+        records[0]["sections"][0]["bullets"][0] = ("Q: 바뀐 질문", "A: 바뀐 답변")
+        del records[1]
+        report = builder.build(records)
+        assert report["videos_rendered"] == 2 and report["videos_removed"] == 1
+        assert not os.path.exists(os.path.join(tmp, "videos", "vid00000001.html"))
+
+        with open(os.path.join(tmp, "videos", "vid00000000.html"), encoding="utf-8") as f:
+            page = f.read()
+        assert "바뀐 답변" in page and "&lt;0&gt;" in page  # 답변은 이스케이프
+        assert 'href="../index.html"' in page
+
+        with open(os.path.join(tmp, "search-index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        assert len(index["docs"]) == 45
+        assert index["docs"][0][0] == "videos/vid00000045.html"  # 최신순
+        assert len(index["terms"]["축구"]) == len([r for r in records if "축구" in r["title"]])
+    print(f"   ✅ 전체 {first}\n   ✅ 증분 {report}")
+
+def test_sources():
+    """결과 저장소와 예전 HTML 요약을 모두 읽는지 테스트"""
+    print("📥 입력 테스트")
+
+    legacy = load_legacy_summaries("examples")
+    assert len(legacy) == 18
+    assert all(len(record["sections"]) == 5 for record in legacy)
+    assert legacy[0]["url"].startswith("https://www.youtube.com/watch?v=")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OutputStore(tmp)
+        video_info = {"video_id": "abcdefghijk", "title": "무지개 <과학>", "url": "https://youtu.be/abcdefghijk"}
+        topics = [{"title": "빛", "qa_pairs": [
+            {"kid_friendly_question": "왜?", "kid_friendly_answer": "빛이 나뉘어서요."},
+            {"kid_friendly_question": " ", "kid_friendly_answer": "빈 질문은 건너뜀"},
+        ]}]
+        path = store.write(video_info, "run-1", "summary.json",
+                           json.dumps({"video_info": video_info, "topics": topics}, ensure_ascii=False))
+        store.record(video_info, "run-1", {"json": path})
+
+        records = load_store_summaries(store)
+        assert records[0]["sections"] == [{"title": "빛", "bullets": [("Q: 왜?", "A: 빛이 나뉘어서요.")]}]
+
+        report = SiteBuilder(os.path.join(tmp, "site")).build(records + legacy)
+        assert report["videos_rendered"] == 19
+        with open(os.path.join(tmp, "site", "videos", "abcdefghijk.html"), encoding="utf-8") as f:
+            assert "무지개 &lt;과학&gt;" in f.read()
+    print("   ✅ 저장소 1개 + examples 18개")
+
+def benchmark_archive(num_videos=3000, page_size=20):
+    """큰 아카이브: 전체 빌드 vs 비디오 하나 추가 후 빌드"""
+    records = [make_record(i) for i in range(num_videos)]
+    with tempfile.TemporaryDirectory() as tmp:
+        builder = SiteBuilder(tmp, page_size=page_size)
+
+        start_time = time.perf_counter()
+        full = builder.build(records)
+        full_time = time.perf_counter() - start_time
+
+        records.append(make_record(num_videos))
+        start_time = time.perf_counter()
+        incremental = builder.build(records)
+        incremental_time = time.perf_counter() - start_time
+
+    print(f"📊 비디오 {num_videos}개")
+    print(f"   🐢 전체 빌드: {full_time:.2f}초 (비디오 페이지 {full['videos_rendered']}개)")
+    print(f"   ⚡ 하나 추가 후: {incremental_time:.2f}초 (비디오 페이지 {incremental['videos_rendered']}개, "
+          f"목록 페이지 {incremental['pages_written']}개 기록 / {incremental['pages_skipped']}개 그대로)")
+    return full_time, incremental_time, incremental
+
+def test_benchmark_runs():
+    """벤치마크가 정상 동작하는지 (시간 비교는 출력만)"""
+    _, _, incremental = benchmark_archive(num_videos=300)
+    assert incremental["videos_rendered"] == 1
+
+if __name__ == "__main__":
+    test_incremental_build()
+    test_sources()
+    print()
+    benchmark_archive()
+    print("\n✅ 모든 테스트 완료!")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+재생목록/채널 확장 테스트 스크립트
+
+utils/source_resolver.py가 URL 종류를 구분하고, 로컬 픽스처 전송(YouTube Data API와 같은
+응답 모양)으로 페이지를 따라가며, 채널별 커서로 새 영상만 가져오고, 이미 저장된 요약이나
+대기열에 있는 영상은 작업 대기열(utils/job_queue.py)에 다시 넣지 않는지 확인합니다.
+"""
+
+import os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from utils.source_resolver import (parse_source, FixtureTransport, SourceResolver, SourceSync, SyncCursors,
+                                   video_url, main)
+from utils.job_queue import JobQueue
+from utils.output_store import OutputStore
+
+CHANNEL_ID = "UCabcdefghijklmnopqrstuv"
+
+def make_videos(prefix, count, start, step_hours=-6):
+    """start부터 step_hours 간격으로 게시된 영상 목록 (기본 최신순)"""
+    base = datetime(2026, 10, 1, tzinfo=timezone.utc) + timedelta(hours=start)
+    return [{"video_id": f"{prefix}{i:09d}"[-11:], "title": f"강의 {i}",
+             "published_at": (base + timedelta(hours=step_hours * i)).strftime("%Y-%m-%dT%H:%M:%SZ")}
+            for i in range(count)]
+
+def test_parse_source():
+    """영상/재생목록/채널 URL 구분"""
+    print("🔗 URL 구분 테스트")
+
+    cases = {
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ": ("video", "dQw4w9WgXcQ"),
+        "https://youtu.be/FI8ozR1NLbA?si=EBTyq171a-vdTQB5": ("video", "FI8ozR1NLbA"),
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLxyz": ("video", "dQw4w9WgXcQ"),
+        "https://www.youtube.com/playlist?list=PLxyz123": ("playlist", "PLxyz123"),
+        f"https://www.youtube.com/channel/{CHANNEL_ID}/videos": ("channel", CHANNEL_ID),
+        "https://www.youtube.com/@kidscience": ("channel", "@kidscience"),
+        "youtube.com/user/oldname": ("channel", "user:oldname"),
+        "https://example.com/nothing": (None, None),
+    }
+    for url, expected in cases.items():
+        assert parse_source(url) == expected, (url, parse_source(url))
+    print(f"   ✅ {len(cases)}개 URL")
+
+def test_pagination_skips_unavailable():
+    """50개씩 페이지를 따라가고 비공개/삭제 영상은 건너뜀"""
+    print("📄 페이지 테스트")
+
+    videos = make_videos("pl", 120, 0, step_hours=1)
+    videos[10]["title"] = "Deleted video"
+    transport = FixtureTransport({"playlists": {"PLlong": videos}})
+    source, resolved = SourceResolver(transport).resolve("https://www.youtube.com/playlist?list=PLlong")
+
+    assert source == "playlist:PLlong"
+    assert len(resolved) == 119 and transport.requests_made == 3
+    assert resolved[0]["video_id"] == videos[0]["video_id"]
+    print(f"   ✅ 영상 {len(resolved)}개, 요청 {transport.requests_made}회")
+
+def test_incremental_channel_sync():
+    """첫 동기화는 전체, 다음부터는 커서 이후 새 영상만 (오래된 페이지는 요청하지 않음), 중복 제거"""
+    print("🔄 채널 증분 동기화 테스트")
+
+    uploads = make_videos("ch", 130, 0)
+    fixtures = {"channels": {"@kidscience": {"id": CHANNEL_ID, "uploads": "UUkids"},
+                             CHANNEL_ID: {"id": CHANNEL_ID, "uploads": "UUkids"}},
+                "playlists": {"UUkids": uploads, "PLbest": [uploads[0], uploads[5], uploads[5]]}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        transport = FixtureTransport(fixtures)
+        queue = JobQueue(os.path.join(tmp, "jobs.db"))
+        store = OutputStore(os.path.join(tmp, "outputs"))
+        for video in uploads[100:102]:  # 이미 요약한 영상
+            store.record({"video_id": video["video_id"]}, "run-1", {"html": "summary.html"})
+        sync = SourceSync(SourceResolver(transport), SyncCursors(os.path.join(tmp, "sync.db")), queue, store)
+
+        first = sync.sync("https://www.youtube.com/@kidscience")
+        assert first["source"] == f"channel:{CHANNEL_ID}" and first["found"] == 130
+        assert len(first["enqueued"]) == 128 and len(first["skipped_stored"]) == 2
+        assert first["enqueued"][0] == uploads[-1]["video_id"]  # 오래된 영상부터
+        assert first["cursor"] == uploads[0]["published_at"]
+        first_requests = transport.requests_made
+        assert first_requests == 1 + 3
+
+        # 새 영상이 없으면 채널 조회 + 첫 페이지만
+        second = sync.sync(f"https://www.youtube.com/channel/{CHANNEL_ID}")
+        assert second["found"] == 0 and second["enqueued"] == []
+        assert transport.requests_made - first_requests == 2
+
+        # 새로 올라온 영상 3개만 (핸들/ID 어느 쪽으로 들어와도 같은 커서)
+        fixtures["playlists"]["UUkids"] = make_videos("nw", 3, 24) + uploads
+        third = sync.sync("https://www.youtube.com/@kidscience")
+        assert third["enqueued"] == [video["video_id"] for video in make_videos("nw", 3, 24)][::-1]
+        assert third["cursor"] > first["cursor"]
+
+        # 재생목록은 대기 중인 작업과 중복 제거 (목록 안의 중복도 한 번만)
+        playlist = sync.sync("https://www.youtube.com/playlist?list=PLbest")
+        assert playlist["enqueued"] == [] and len(playlist["skipped_queued"]) == 2
+
+        # full: 커서를 무시해도 이미 대기 중인 영상은 넣지 않음
+        assert sync.sync("https://www.youtube.com/@kidscience", full=True)["enqueued"] == []
+        assert queue.stats()["queued"] == 131
+        assert video_url(uploads[0]["video_id"]) in queue.active_urls()
+    print(f"   ✅ 첫 동기화 {len(first['enqueued'])}개 (요청 {first_requests}회), "
+          f"다음 동기화 {len(second['enqueued'])}개 (요청 2회), 새 영상 {len(third['enqueued'])}개")
+
+def test_incremental_playlist_sync():
+    """재생목록은 확인한 영상 ID로 거름: 나중에 추가된 옛 영상도 찾고, 다른 모양의 URL로 대기 중인 작업과 중복 제거"""
+    print("📚 재생목록 증분 동기화 테스트")
+
+    videos = make_videos("pl", 4, 0, step_hours=1)
+    old = make_videos("od", 1, -1000)[0]  # 커서보다 훨씬 전에 게시된 영상
+    fixtures = {"playlists": {"PLclass": list(videos)}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"))
+        store = OutputStore(os.path.join(tmp, "outputs"))
+        cursors = SyncCursors(os.path.join(tmp, "sync.db"))
+        sync = SourceSync(SourceResolver(FixtureTransport(fixtures)), cursors, queue, store)
+        url = "https://www.youtube.com/playlist?list=PLclass"
+
+        queue.enqueue(f"https://youtu.be/{videos[1]['video_id']}?t=30")
+        first = sync.sync(url)
+        assert len(first["enqueued"]) == 3 and first["skipped_queued"] == [videos[1]["video_id"]]
+
+        assert sync.sync(url)["found"] == 0
+        fixtures["playlists"]["PLclass"].append(old)
+        second = sync.sync(url)
+        assert second["enqueued"] == [old["video_id"]] and second["cursor"] is None
+        assert cursors.seen("playlist:PLclass") == {video["video_id"] for video in videos + [old]}
+
+        assert sync.sync(url, full=True)["found"] == 5
+    print("   ✅ 나중에 추가된 옛 영상 1개 추가, youtu.be URL로 대기 중인 영상 중복 제거")
+
+def test_cli_dry_run():
+    """--fixtures --dry-run으로 네트워크 없이 목록 확인"""
+    print("🖥️ CLI 테스트")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fixtures.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"playlists": {"PLdemo": make_videos("dm", 4, 0)}}, f)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert main(["--fixtures", path, "--dry-run", "https://www.youtube.com/playlist?list=PLdemo"]) == 0
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "# playlist:PLdemo: 4개" and len(lines) == 5
+    print(f"   ✅ {lines[0]}")
+
+if __name__ == "__main__":
+    test_parse_source()
+    test_pagination_skips_unavailable()
+    test_incremental_channel_sync()
+    test_incremental_playlist_sync()
+    test_cli_dry_run()
+    print("\n✅ 모든 테스트 완료!")
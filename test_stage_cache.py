@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+단계 결과 재사용 테스트 스크립트
+
+utils/stage_cache.py와 flow.py의 MemoizedStage가 입력/설정/코드 버전 해시로 단계 출력을 저장하고,
+대상 연령이나 질문 수만 바꿔서 다시 실행하면 영향을 받는 단계부터만 다시 계산하는지
+(자막 조회/주제 추출/Q&A는 LLM/YouTube 호출 없이 재사용), VIDEO_INFO_TTL이 지나면 자막을 다시 가져오는지,
+실행 기록에 재사용한 단계가 남는지 확인합니다.
+"""
+
+import os
+import time
+import tempfile
+from unittest.mock import patch
+import utils.stage_cache as stage_cache
+from utils.stage_cache import StageCache, pipeline_settings, stage_key, format_stage_log
+from utils.result_cache import pipeline_config, config_key
+from benchmarks.mock_llm import MockLLM
+from benchmarks.fixtures import make_video_info, fixture_video_fetcher
+from benchmarks.runner import benchmark_environment
+
+def test_settings_and_keys():
+    """설정 우선순위(기본값 < 환경변수 < 실행별), 잘못된 설정, 키에 들어가는 값"""
+    print("⚙️ 설정/키 테스트")
+
+    assert pipeline_settings() == {"num_topics": 5, "num_questions": 3, "target_age": 5, "review": True,
+                                   "levels": []}
+    with patch.dict(os.environ, {"TARGET_AGE": "8", "AI_REVIEW": "0"}):
+        assert pipeline_settings()["target_age"] == 8 and pipeline_settings()["review"] is False
+        assert pipeline_settings({"target_age": "10", "num_topics": None}) == {
+            "num_topics": 5, "num_questions": 3, "target_age": 10, "review": False, "levels": []}
+    try:
+        pipeline_settings({"target_ages": 10})
+        assert False, "ValueError가 나야 합니다"
+    except ValueError:
+        pass
+
+    base = stage_key("GenerateQA", "1", {"topics": [{"title": "로봇"}]}, {"settings": {"num_questions": 3}})
+    assert base == stage_key("GenerateQA", "1", {"topics": [{"title": "로봇"}]}, {"settings": {"num_questions": 3}})
+    assert base != stage_key("GenerateQA", "2", {"topics": [{"title": "로봇"}]}, {"settings": {"num_questions": 3}})
+    assert base != stage_key("GenerateQA", "1", {"topics": [{"title": "로봇"}]}, {"settings": {"num_questions": 2}})
+    assert config_key(pipeline_config({"target_age": 10})) != config_key(pipeline_config())
+    print("   ✅ 설정 우선순위, 코드 버전/설정이 바뀌면 다른 키")
+
+def test_rerun_recomputes_only_downstream():
+    """target_age 5 → 10이면 ConvertToKidFriendly부터, 같은 설정이면 전부 재사용"""
+    print("♻️ 단계 재사용 테스트")
+
+    from flow import create_youtube_processor_flow
+
+    llm = MockLLM()
+    fetches = []
+    fixture_fetcher = fixture_video_fetcher(make_video_info(sentences=40))
+
+    def fetcher(url):
+        fetches.append(url)
+        return fixture_fetcher(url)
+
+    def run(settings=None):
+        llm.reset()
+        shared = {"url": "https://youtu.be/stagecache1", "settings": settings or {}}
+        create_youtube_processor_flow().run(shared)
+        statuses = {entry["stage"]: entry["status"] for entry in shared["stage_log"]}
+        return shared, statuses, llm.summary()["by_kind"]
+
+    with tempfile.TemporaryDirectory() as tmp, benchmark_environment(llm, fetcher, tmp), \
+            patch.object(stage_cache, "_cache", StageCache(os.path.join(tmp, "stages.db"))), \
+            patch.dict(os.environ, {"STAGE_CACHE": "1"}):
+        first, statuses, calls = run()
+        assert set(statuses.values()) == {"computed"} and len(statuses) == 6
+        assert calls["topics"] == 1 and calls["qa"] > 0 and len(fetches) == 1
+
+        older, statuses, calls = run({"target_age": 10})
+        assert [stage for stage, status in statuses.items() if status == "computed"] == \
+            ["ConvertToKidFriendly", "ReviewAndCorrect"]
+        assert "topics" not in calls and "qa" not in calls and len(fetches) == 1
+        assert older["topics_with_qa"] == first["topics_with_qa"]
+        assert "ConvertToKidFriendly" in format_stage_log(older["stage_log"]).split("계산: ")[1]
+
+        again, statuses, calls = run({"target_age": 10})
+        assert set(statuses.values()) == {"reused"} and calls == {}
+        assert again["final_topics"] == older["final_topics"]
+        assert again["output_files"]["html"] != older["output_files"]["html"]  # HTML은 실행마다 새로 씀
+
+        fewer, statuses, _ = run({"target_age": 10, "num_questions": 2})
+        assert statuses["ExtractTopics"] == "reused" and statuses["GenerateQA"] == "computed"
+        assert all(len(topic["qa_pairs"]) <= 2 for topic in fewer["topics_with_qa"])
+
+        unreviewed, statuses, calls = run({"review": False})
+        assert statuses["ConvertToKidFriendly"] == "reused" and statuses["ReviewAndCorrect"] == "computed"
+        assert unreviewed["review_report"] == {"status": "skipped", "reason": "disabled"} and "review" not in calls
+
+        cached_fetches = len(fetches)
+
+        # VIDEO_INFO_TTL: 같은 구간 안에서는 재사용, 구간이 지나면 자막을 다시 가져옴
+        with patch.dict(os.environ, {"VIDEO_INFO_TTL": "3600"}):
+            _, statuses, _ = run()
+            assert statuses["ProcessYouTubeURL"] == "computed" and len(fetches) == cached_fetches + 1
+            _, statuses, _ = run()
+            assert statuses["ProcessYouTubeURL"] == "reused" and len(fetches) == cached_fetches + 1
+            with patch("time.time", return_value=time.time() + 3600):
+                _, statuses, _ = run()
+            assert statuses["ProcessYouTubeURL"] == "computed" and len(fetches) == cached_fetches + 2
+
+        # STAGE_CACHE=0이면 재사용하지 않고 기록도 남기지 않음
+        with patch.dict(os.environ, {"STAGE_CACHE": "0"}):
+            llm.reset()
+            shared = {"url": "https://youtu.be/stagecache1"}
+            create_youtube_processor_flow().run(shared)
+            assert "stage_log" not in shared and llm.summary()["by_kind"]["topics"] == 1
+    print(f"   ✅ 대상 연령 변경: 2단계만 계산, 같은 설정: LLM 호출 0회, 자막 조회 {cached_fetches}회")
+
+if __name__ == "__main__":
+    test_settings_and_keys()
+    test_rerun_recomputes_only_downstream()
+    print("\n✅ 모든 테스트 완료!")
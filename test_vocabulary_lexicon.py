@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+어휘 등급 사전 테스트 & 벤치마크 스크립트
+
+한 번의 스캔으로 읽기 등급 계산과 쉬운 표현 치환이 되는지 확인하고,
+비디오 한 편 분량의 Q&A 전체를 처리하는 속도를 기존 str.replace 루프와 비교합니다.
+"""
+
+import re
+import time
+from utils.vocabulary_lexicon import VocabularyLexicon, get_lexicon, age_to_level
+from utils.kid_friendly_converter import convert_to_kid_friendly, simplify_vocabulary
+from utils.call_llm import call_llm_mock
+
+# 비디오 한 편 분량: 주제 5개 × Q&A 3개 (Mock Q&A + 축구 픽스처)
+VIDEO_QA_TEXTS = [
+    "인공지능이 우리 생활을 어떻게 바꾸고 있나요?",
+    "인공지능은 스마트폰의 음성인식, 자동번역, 추천 시스템 등을 통해 이미 우리 일상에 깊숙이 들어와 있습니다.",
+    "AI 기술의 장점과 단점은 무엇인가요?",
+    "장점으로는 반복적인 작업을 자동화해서 효율성을 높이고, 사람이 할 수 없는 복잡한 계산이나 패턴 인식을 가능하게 합니다.",
+    "앞으로 AI는 어떻게 발전할까요?",
+    "AI는 더욱 자연스러운 대화가 가능해지고, 창작 활동이나 과학 연구에서도 인간의 파트너 역할을 할 것으로 예상됩니다.",
+    "스아레즈는 우루과이 출신의 공격수로서 골 결정력이 뛰어나며 리버풀과 바르세로나에서 활약했습니다.",
+    "투탑 전략은 두 명의 공격수가 상대방 수비를 분산시키는 전술적 접근 방식입니다.",
+    "메씨는 아르헨티나의 축구 선수로서 매우 뛰어난 기술적 역량을 보여주는 선수입니다.",
+    "스타트업 창업자들은 투자자에게 데이터를 분석해서 시장의 경쟁 구조와 잠재력을 설명합니다.",
+] * 3
+
+def legacy_simplify(text, mappings):
+    """기존 simplify_vocabulary 방식: 사전 단어마다 str.replace 반복"""
+    for difficult_word, easy_word in mappings.items():
+        text = text.replace(difficult_word, easy_word)
+    return text
+
+def test_scoring_and_simplification():
+    """읽기 등급 계산 + 치환 테스트"""
+    print("📚 어휘 등급 테스트")
+
+    lexicon = VocabularyLexicon([
+        ("인공지능", 3, "똑똑한 컴퓨터"),
+        ("데이터", 3, "정보"),
+        ("빅데이터", 4, "아주 많은 정보"),
+        ("AI", 3, "똑똑한 컴퓨터"),
+        ("윤리", 4, ""),
+        ("기술", 2, "새로운 도구"),
+    ])
+
+    result = lexicon.analyze("인공지능은 빅데이터를 배워요. AIR는 AI가 아니에요.", target_age=5)
+    # 더 긴 단어(빅데이터)가 우선, AIR 안의 AI는 무시, 조사는 받침에 맞게 변경
+    assert result["hard_words"] == ["인공지능", "빅데이터", "AI"]
+    assert result["simplified_text"] == "똑똑한 컴퓨터는 아주 많은 정보를 배워요. AIR는 똑똑한 컴퓨터가 아니에요."
+    assert result["reading_level"] == 4
+    assert not result["meets_target"]
+
+    # 치환할 표현이 없는 단어는 남겨두고 따로 보고
+    result = lexicon.analyze("윤리를 지켜요.", target_age=5)
+    assert result["unreplaced_words"] == ["윤리"]
+    assert result["simplified_text"] == "윤리를 지켜요."
+
+    # 초등학생 기준에서는 '기술'이 어렵지 않음
+    assert lexicon.find_hard_words("기술이 좋아요", target_age=10) == []
+    assert lexicon.find_hard_words("기술이 좋아요", target_age=5) == ["기술"]
+
+    # 다른 단어 안에 들어있는 경우는 무시 (예: 마법사 안의 '법')
+    assert VocabularyLexicon([("법", 3, "규칙")]).find_hard_words("마법사가 왔어요") == []
+
+    assert age_to_level(5) == 1 and age_to_level(10) == 2 and age_to_level(30) == 5
+    print("   ✅ 등급 계산과 치환이 한 번에 처리됨")
+
+def test_convert_skips_llm_for_easy_text():
+    """이미 쉬운 한국어 글은 LLM 없이 통과하고, 영어는 짧아도 변환하는지 테스트"""
+    print("🚀 쉬운 글 LLM 생략 테스트")
+
+    easy_text = "강아지는 멍멍 짖어요. 고양이는 야옹 해요."
+    assert get_lexicon().analyze(easy_text, 5)["meets_target"]
+    assert convert_to_kid_friendly(easy_text, use_mock=True) == easy_text
+
+    # 짧은 영어는 사전에 어려운 단어가 없어도 한국어로 바꿔야 하므로 LLM으로 보냄
+    english = get_lexicon().analyze("What is a black hole?", 5)
+    assert not english["meets_target"] and english["hangul_ratio"] == 0.0
+    assert re.search(r'[가-힣]', convert_to_kid_friendly("What is a black hole?", use_mock=True))
+
+    # LLM(Mock) 결과에 남은 어려운 단어는 치환됨
+    converted = convert_to_kid_friendly(VIDEO_QA_TEXTS[1], use_mock=True)
+    assert "인공지능" in call_llm_mock("5살 아이에게 설명해주세요")
+    assert "인공지능" not in converted
+    print("   ✅ 쉬운 글은 그대로, 어려운 단어는 자동 치환")
+
+def benchmark_vocabulary_pass(repeat=200):
+    """비디오 한 편의 Q&A 전체 처리: 오토마톤 1회 스캔 vs str.replace 루프"""
+    lexicon = get_lexicon()
+    mappings = {word: replacement for word, (_, replacement) in lexicon.entries.items() if replacement}
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        legacy = [legacy_simplify(text, mappings) for text in VIDEO_QA_TEXTS]
+    legacy_time = (time.perf_counter() - start_time) / repeat
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        results = [lexicon.analyze(text, 5) for text in VIDEO_QA_TEXTS]
+    lexicon_time = (time.perf_counter() - start_time) / repeat
+
+    print(f"📊 Q&A {len(VIDEO_QA_TEXTS)}개, 사전 {len(mappings)}개 단어")
+    print(f"   🐌 str.replace 루프 (치환만): {legacy_time * 1000:.2f}ms")
+    print(f"   ⚡ 오토마톤 (등급 + 치환): {lexicon_time * 1000:.2f}ms")
+    print(f"   🎯 {legacy_time / lexicon_time:.1f}배")
+    return legacy_time, lexicon_time, legacy, results
+
+def test_benchmark_runs():
+    """벤치마크가 정상 동작하는지 (속도 비교는 출력만)"""
+    _, _, legacy, results = benchmark_vocabulary_pass(repeat=5)
+    assert len(legacy) == len(results) == len(VIDEO_QA_TEXTS)
+    assert simplify_vocabulary("데이터를 모아요") == "정보를 모아요"
+
+if __name__ == "__main__":
+    test_scoring_and_simplification()
+    test_convert_skips_llm_for_easy_text()
+    print()
+    benchmark_vocabulary_pass()
+    print("\n✅ 모든 테스트 완료!")
@@ -1,42 +1,113 @@
 import os
-from openai import OpenAI
+import time
+import threading
+from .env import load_env
+from .metrics import LLM_REQUESTS, LLM_LATENCY, LLM_RETRIES, LLM_TOKENS
 
-# .env 파일 로드 (python-dotenv가 있으면 사용, 없으면 무시)
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-    print("✅ .env 파일이 로드되었습니다.")
-except ImportError:
-    print("⚠️ python-dotenv가 설치되지 않았습니다. 환경변수를 직접 설정해주세요.")
+# 기본 요청 타임아웃(초)과 SDK 자동 재시도 횟수 (429/5xx/연결 오류, Retry-After 존중)
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MAX_RETRIES = 2
 
-def call_llm(prompt: str, model: str = "gpt-4o-mini") -> str:
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_openai_client(api_key):
+    """
+    설정별로 하나만 만드는 OpenAI 클라이언트 (HTTP 연결 풀을 호출끼리 재사용)
+
+    환경변수:
+    - OPENAI_BASE_URL: OpenAI 호환 서버 주소 (예: 로컬 가짜 서버 http://127.0.0.1:8787/v1)
+    - OPENAI_TIMEOUT: 요청 타임아웃(초, 기본 60)
+    - OPENAI_MAX_RETRIES: 자동 재시도 횟수 (기본 2)
+    """
+    base_url = os.getenv("OPENAI_BASE_URL") or None
+    timeout = float(os.getenv("OPENAI_TIMEOUT", DEFAULT_TIMEOUT))
+    max_retries = int(os.getenv("OPENAI_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+    key = (api_key, base_url, timeout, max_retries)
+
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                # openai SDK는 import가 무거워서 (수백 ms) 실제로 호출할 때 로드
+                from openai import OpenAI
+                client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=max_retries)
+                _clients[key] = client
+    return client
+
+def call_llm(prompt: str, model: str = "gpt-4o-mini", json_mode: bool = False) -> str:
     """
     OpenAI API를 사용하여 LLM 호출
     
+    json_mode=True면 JSON 출력 모드(response_format)를 요청하고,
+    모델이 지원하지 않으면 일반 텍스트 모드로 다시 호출합니다.
+    
     환경변수 설정 필요:
     - OPENAI_API_KEY: OpenAI API 키
+    - OPENAI_BASE_URL (선택): OpenAI 호환 서버 주소 (utils/fake_openai_server.py로 네트워크 없이 부하 테스트)
     
     API 키 받는 방법:
     1. https://platform.openai.com 회원가입
     2. API keys 메뉴에서 키 생성
     3. 환경변수 설정: OPENAI_API_KEY=your_key_here
     """
+    content, _ = call_llm_with_usage(prompt, model=model, json_mode=json_mode)
+    return content
+
+def call_llm_with_usage(prompt: str, model: str = "gpt-4o-mini", json_mode: bool = False) -> tuple:
+    """
+    call_llm과 같지만 토큰 사용량도 함께 반환
+    
+    Returns:
+        (응답 텍스트, {"prompt_tokens": int, "completion_tokens": int})
+    """
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    load_env()
     api_key = os.getenv("OPENAI_API_KEY")
     
     if not api_key:
-        return "⚠️ OPENAI_API_KEY 환경변수가 설정되지 않았습니다. API 키를 설정해주세요."
+        LLM_REQUESTS.labels(model, "no_api_key").inc()
+        return "⚠️ OPENAI_API_KEY 환경변수가 설정되지 않았습니다. API 키를 설정해주세요.", usage
     
+    start_time = time.perf_counter()
     try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=2000,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
+        from openai import BadRequestError
+        
+        client = get_openai_client(api_key)
+        request = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 2000,
+            "temperature": 0.7
+        }
+        # with_raw_response: 응답과 함께 SDK가 자동 재시도한 횟수(retries_taken)를 받음
+        create = client.chat.completions.with_raw_response.create
+        raw = None
+        if json_mode:
+            try:
+                raw = create(response_format={"type": "json_object"}, **request)
+            except BadRequestError:
+                # JSON 모드를 지원하지 않는 모델 (예: gpt-4)
+                LLM_RETRIES.labels(model, "json_fallback").inc()
+        if raw is None:
+            raw = create(**request)
+        response = raw.parse()
+        
+        if raw.retries_taken:
+            LLM_RETRIES.labels(model, "sdk").inc(raw.retries_taken)
+        if response.usage:
+            usage["prompt_tokens"] = response.usage.prompt_tokens
+            usage["completion_tokens"] = response.usage.completion_tokens
+            LLM_TOKENS.labels(model, "prompt").inc(usage["prompt_tokens"])
+            LLM_TOKENS.labels(model, "completion").inc(usage["completion_tokens"])
+        LLM_REQUESTS.labels(model, "ok").inc()
+        return response.choices[0].message.content, usage
     except Exception as e:
-        return f"❌ LLM 호출 오류: {str(e)}"
+        LLM_REQUESTS.labels(model, "error").inc()
+        return f"❌ LLM 호출 오류: {str(e)}", usage
+    finally:
+        LLM_LATENCY.labels(model).observe(time.perf_counter() - start_time)
 
 def call_llm_mock(prompt: str) -> str:
     """
@@ -45,7 +116,8 @@ def call_llm_mock(prompt: str) -> str:
     # prompt 분석해서 적절한 mock 응답 반환
     prompt_lower = prompt.lower()
     
-    if "주제" in prompt or "topic" in prompt_lower:
+    # Q&A 프롬프트에도 "주제"가 들어가므로 JSON 필드명으로 먼저 구분
+    if ("주제" in prompt or "topic" in prompt_lower) and '"question"' not in prompt:
         return '''```json
 [
     {
@@ -102,6 +174,7 @@ if __name__ == "__main__":
     print("=== OpenAI LLM 연결 테스트 ===")
     
     # API 키 확인
+    load_env()
     api_key = os.getenv("OPENAI_API_KEY")
     if api_key:
         print(f"✅ OPENAI_API_KEY 발견됨: {api_key[:20]}...")
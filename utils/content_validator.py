@@ -1,12 +1,13 @@
 import re
 from typing import Dict, List
 
-def validate_transcript_quality(transcript: str) -> dict:
+def validate_transcript_quality(transcript: str, max_words: int = 10000) -> dict:
     """
     트랜스크립트 품질 검증 (길이, 언어, 내용 유무 등)
     
     Args:
         transcript: 검증할 트랜스크립트
+        max_words: 최대 단어 수 (None이면 검사 안 함, 계층 요약을 쓰면 긴 자막도 처리 가능)
     
     Returns:
         {"is_valid": bool, "issues": [str], "word_count": int}
@@ -26,8 +27,8 @@ def validate_transcript_quality(transcript: str) -> dict:
         issues.append(f"트랜스크립트가 너무 짧습니다 (현재: {word_count}단어, 최소: 50단어)")
     
     # 최대 길이 검증 (너무 길면 처리 시간이 오래 걸림)
-    if word_count > 10000:
-        issues.append(f"트랜스크립트가 너무 깁니다 (현재: {word_count}단어, 최대: 10000단어)")
+    if max_words is not None and word_count > max_words:
+        issues.append(f"트랜스크립트가 너무 깁니다 (현재: {word_count}단어, 최대: {max_words}단어)")
     
     # 의미 있는 내용 검증
     meaningful_content_ratio = _check_meaningful_content(transcript)
@@ -0,0 +1,28 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_loaded = False
+_load_lock = threading.Lock()
+
+def load_env():
+    """
+    .env 파일을 한 번만 로드 (python-dotenv가 있으면 사용, 없으면 무시)
+
+    import할 때가 아니라 설정이 처음 필요할 때(Flow 생성, LLM/노션 클라이언트 생성) 호출합니다.
+    이미 설정된 환경변수는 덮어쓰지 않습니다.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _load_lock:
+        if _loaded:
+            return
+        try:
+            from dotenv import load_dotenv
+            if load_dotenv():
+                logger.info("✅ .env 파일이 로드되었습니다.")
+        except ImportError:
+            logger.warning("⚠️ python-dotenv가 설치되지 않았습니다. 환경변수를 직접 설정해주세요.")
+        _loaded = True
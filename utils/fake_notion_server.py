@@ -0,0 +1,244 @@
+import json
+import time
+import uuid
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 노션 API와 같은 제한
+MAX_CHILDREN = 100
+
+class FakeNotionServer:
+    """
+    테스트/벤치마크용 로컬 가짜 노션 HTTP 서버
+
+    databases.retrieve, pages.create/update, blocks.children.append/list,
+    blocks.delete만 지원합니다.
+    실제 API처럼 요청당 블록 100개 제한과 없는 속성 검사를 하고,
+    rate_limit을 주면 초과 요청에 429와 Retry-After 헤더를 돌려줍니다.
+    NOTION_BASE_URL을 base_url로 설정하면 실제 notion_client가 이 서버를 씁니다.
+
+    사용 예:
+        with FakeNotionServer(rate_limit=3) as server:
+            os.environ["NOTION_BASE_URL"] = server.base_url
+    """
+
+    def __init__(self, properties=None, rate_limit=None, burst=None, latency=0.0, retry_after=0.1):
+        """
+        Args:
+            properties: 데이터베이스 스키마 {속성 이름: {"type": ...}} (모든 데이터베이스 ID에 적용)
+            rate_limit: 초당 허용 요청 수 (None이면 제한 없음)
+            burst: 한 번에 허용하는 요청 수 (기본값 rate_limit)
+            latency: 요청마다 추가할 지연(초)
+            retry_after: 429 응답의 Retry-After 값(초)
+        """
+        self.properties = properties or {"Name": {"type": "title"}}
+        self.rate_limit = rate_limit
+        self.burst = burst or rate_limit
+        self.latency = latency
+        self.retry_after = retry_after
+        self.pages = {}  # page_id -> {"properties": ..., "children": [...], "block_ids": [...]}
+        self.stats = {"requests": 0, "rate_limited": 0, "rejected": 0}
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst or 0)
+        self._updated = time.monotonic()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def do_PATCH(self):
+                server._handle(self, "PATCH")
+
+            def do_DELETE(self):
+                server._handle(self, "DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _allow_request(self):
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def _handle(self, handler, method):
+        with self._lock:
+            self.stats["requests"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not self._allow_request():
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            self._send_error(handler, 429, "rate_limited", "You have been rate limited.",
+                             {"Retry-After": str(self.retry_after)})
+            return
+
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length) or b"{}") if length else {}
+        parts = [part for part in handler.path.split("?")[0].split("/") if part]
+        if parts and parts[0] == "v1":
+            parts = parts[1:]
+
+        if method == "GET" and len(parts) == 2 and parts[0] == "databases":
+            self._send(handler, 200, {"object": "database", "id": parts[1], "properties": self.properties})
+        elif method == "POST" and parts == ["pages"]:
+            self._create_page(handler, body)
+        elif method == "PATCH" and len(parts) == 2 and parts[0] == "pages":
+            self._update_page(handler, parts[1], body)
+        elif method == "PATCH" and len(parts) == 3 and parts[0] == "blocks" and parts[2] == "children":
+            self._append_children(handler, parts[1], body)
+        elif method == "GET" and len(parts) == 3 and parts[0] == "blocks" and parts[2] == "children":
+            self._list_children(handler, parts[1], handler.path)
+        elif method == "DELETE" and len(parts) == 2 and parts[0] == "blocks":
+            self._delete_block(handler, parts[1])
+        else:
+            self._send_error(handler, 400, "invalid_request_url", "Invalid request URL.")
+
+    def _check_children(self, handler, children):
+        if len(children) > MAX_CHILDREN:
+            self._reject(handler, f"body.children.length should be ≤ `{MAX_CHILDREN}`, instead was `{len(children)}`.")
+            return False
+        return True
+
+    def _create_page(self, handler, body):
+        children = body.get("children", [])
+        if not self._check_children(handler, children):
+            return
+        for name in body.get("properties", {}):
+            if name not in self.properties:
+                self._reject(handler, f"{name} is not a property that exists.")
+                return
+
+        page_id = str(uuid.uuid4())
+        with self._lock:
+            self.pages[page_id] = {
+                "properties": body.get("properties", {}),
+                "children": list(children),
+                "block_ids": [str(uuid.uuid4()) for _ in children]
+            }
+        self._send(handler, 200, self._page_object(page_id))
+
+    def _page_object(self, page_id):
+        return {"object": "page", "id": page_id, "url": f"https://www.notion.so/{page_id.replace('-', '')}"}
+
+    def _update_page(self, handler, page_id, body):
+        for name in body.get("properties", {}):
+            if name not in self.properties:
+                self._reject(handler, f"{name} is not a property that exists.")
+                return
+        with self._lock:
+            page = self.pages.get(page_id)
+            if page is not None:
+                page["properties"].update(body.get("properties", {}))
+        if page is None:
+            self._send_error(handler, 404, "object_not_found", f"Could not find page with ID: {page_id}.")
+            return
+        self._send(handler, 200, self._page_object(page_id))
+
+    def _list_children(self, handler, block_id, path):
+        query = dict(part.split("=", 1) for part in path.partition("?")[2].split("&") if "=" in part)
+        page_size = min(int(query.get("page_size", MAX_CHILDREN)), MAX_CHILDREN)
+        start = int(query.get("start_cursor", 0))
+        with self._lock:
+            page = self.pages.get(block_id)
+            if page is not None:
+                results = [
+                    {**block, "id": block_id_}
+                    for block, block_id_ in zip(page["children"][start:start + page_size],
+                                                page["block_ids"][start:start + page_size])
+                ]
+                has_more = start + page_size < len(page["children"])
+        if page is None:
+            self._send_error(handler, 404, "object_not_found", f"Could not find block with ID: {block_id}.")
+            return
+        self._send(handler, 200, {
+            "object": "list",
+            "results": results,
+            "has_more": has_more,
+            "next_cursor": str(start + page_size) if has_more else None
+        })
+
+    def _delete_block(self, handler, block_id):
+        with self._lock:
+            for page in self.pages.values():
+                if block_id in page["block_ids"]:
+                    index = page["block_ids"].index(block_id)
+                    del page["block_ids"][index]
+                    block = page["children"].pop(index)
+                    break
+            else:
+                block = None
+        if block is None:
+            self._send_error(handler, 404, "object_not_found", f"Could not find block with ID: {block_id}.")
+            return
+        self._send(handler, 200, {**block, "id": block_id, "archived": True})
+
+    def _append_children(self, handler, block_id, body):
+        children = body.get("children", [])
+        if not self._check_children(handler, children):
+            return
+        with self._lock:
+            page = self.pages.get(block_id)
+            if page is not None:
+                page["children"].extend(children)
+                page["block_ids"].extend(str(uuid.uuid4()) for _ in children)
+        if page is None:
+            self._send_error(handler, 404, "object_not_found", f"Could not find block with ID: {block_id}.")
+            return
+        self._send(handler, 200, {"object": "list", "results": children})
+
+    def _reject(self, handler, message):
+        with self._lock:
+            self.stats["rejected"] += 1
+        self._send_error(handler, 400, "validation_error", message)
+
+    def _send_error(self, handler, status, code, message, headers=None):
+        self._send(handler, status, {"object": "error", "status": status, "code": code, "message": message}, headers)
+
+    def _send(self, handler, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
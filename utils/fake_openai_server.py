@@ -0,0 +1,413 @@
+import re
+import json
+import math
+import time
+import uuid
+import zlib
+import base64
+import random
+import struct
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 프롬프트 종류별 기본 개수 (프롬프트에서 개수를 찾지 못했을 때)
+DEFAULT_TOPIC_COUNT = 5
+DEFAULT_QUESTION_COUNT = 3
+
+# 주제 후보 (주제 다양성 검사에 걸리지 않도록 제목과 내용이 서로 다름)
+TOPICS = [
+    ("인공지능이 배우는 방법", "컴퓨터가 수많은 예시를 보면서 규칙을 스스로 찾아냅니다."),
+    ("공장을 움직이는 로봇 팔", "사람 대신 무거운 부품을 옮기고 조립하는 기계 이야기입니다."),
+    ("화성으로 가는 탐사선", "먼 행성까지 날아가 사진을 찍고 흙을 조사하는 여행입니다."),
+    ("깊은 바닷속 생물", "햇빛이 닿지 않는 곳에서 스스로 빛을 내는 물고기들이 삽니다."),
+    ("축구 선수의 훈련 비밀", "경기 영상을 돌려 보며 달리기와 패스 연습 계획을 세웁니다."),
+    ("노래를 만드는 컴퓨터", "멜로디와 박자를 조합해서 새로운 곡을 작곡하기도 합니다."),
+]
+
+# Q&A 답변: 어려운 단어가 있어야 아이 친화적 변환 단계가 실제로 LLM을 호출함
+ANSWER_SENTENCES = [
+    "인공지능 알고리즘은 데이터의 패턴을 분석하여 예측 모델을 최적화합니다.",
+    "이 기술은 전술적 접근 방식으로 효율성을 높이는 데 쓰입니다.",
+    "연구자들은 실험 결과를 분석해서 새로운 가설을 검증합니다.",
+    "자동화 시스템은 반복적인 작업을 줄이고 생산성을 향상시킵니다.",
+]
+
+# 영상에 없는 내용 (Q&A 답변에 가끔 섞어서 자막 근거 확인이 걸러내는지 확인)
+HALLUCINATED_SENTENCES = [
+    "이 장치는 1850년 프랑스의 한 시계공이 처음 발명했습니다.",
+    "화성에는 지금도 사람 열두 명이 살면서 감자를 키웁니다.",
+]
+
+# Q&A 답변에 영상에 없는 문장이 섞이는 비율
+HALLUCINATION_RATE = 0.15
+
+# 아이 친화적 변환 결과: 짧고 쉬운 문장
+KID_SENTENCES = [
+    "컴퓨터가 아주 똑똑해져서 우리를 도와줘요.",
+    "로봇 친구가 심부름을 대신 해 줘요.",
+    "비밀 지도를 보고 보물을 찾는 것과 비슷해요.",
+    "친구랑 같이 하면 더 빨리 끝낼 수 있어요.",
+]
+
+# 검토 단계가 실제로 LLM을 부르도록 가끔 섞는 긴 문장 (사전 검사의 긴 문장 규칙에 걸림)
+LONG_SENTENCE = ("그리고 이 똑똑한 컴퓨터는 우리가 좋아하는 노래도 찾아 주고 그림도 그려 주고 "
+                 "숙제도 도와주고 길도 알려 주고 날씨도 알려 주는 아주 고마운 친구예요.")
+
+def estimate_tokens(text):
+    """토크나이저 없이 대략적인 토큰 수 (한국어 기준 약 3글자당 1토큰)"""
+    return max(1, len(text) // 3)
+
+def classify_prompt(prompt):
+    """프롬프트 → 종류 ("topics", "qa", "kid_friendly", "levels", "review", "summary", "other")"""
+    if "```yaml" in prompt or "edits:" in prompt:
+        return "review"
+    if "구간 요약" in prompt:
+        return "summary"
+    if '"levels"' in prompt:
+        return "levels"
+    if '"topics"' in prompt:
+        return "topics"
+    if '"qa_pairs"' in prompt:
+        return "qa"
+    if "아이가 이해할 수 있도록" in prompt:
+        return "kid_friendly"
+    return "other"
+
+def _requested_count(prompt, patterns, default):
+    for pattern in patterns:
+        match = re.search(pattern, prompt)
+        if match:
+            return int(match.group(1))
+    return default
+
+def scripted_response(kind, prompt, rng):
+    """
+    프롬프트 종류별 대본 응답 (실제 파이프라인이 파싱할 수 있는 JSON/YAML/텍스트)
+
+    주제/Q&A는 프롬프트가 요청한 개수만큼 (복구 재요청이면 빠진 개수만큼) 만들고,
+    rng(random.Random)가 같으면 같은 응답을 돌려줍니다.
+    """
+    if kind == "topics":
+        count = _requested_count(prompt, [r"부족한 항목 (\d+)개", r"주제 (\d+)개"], DEFAULT_TOPIC_COUNT)
+        chosen = rng.sample(TOPICS, min(count, len(TOPICS)))
+        return json.dumps({"topics": [{"title": title, "content": content} for title, content in chosen]},
+                          ensure_ascii=False)
+
+    if kind == "qa":
+        count = _requested_count(prompt, [r"부족한 항목 (\d+)개", r"(\d+)개의 흥미로운 질문"], DEFAULT_QUESTION_COUNT)
+        title = re.search(r"주제: (.+)", prompt)
+        title = title.group(1).strip() if title else "이 주제"
+        pairs = [{
+            "question": f"{title}에서 {rng.choice(['무엇이', '왜', '어떻게'])} 중요할까요? ({i + 1})",
+            "answer": " ".join(rng.sample(ANSWER_SENTENCES, 2) if rng.random() >= HALLUCINATION_RATE
+                               else [rng.choice(ANSWER_SENTENCES), rng.choice(HALLUCINATED_SENTENCES)]),
+        } for i in range(count)]
+        return json.dumps({"qa_pairs": pairs}, ensure_ascii=False)
+
+    if kind == "kid_friendly":
+        sentences = rng.sample(KID_SENTENCES, 2)
+        if rng.random() < 0.2:
+            sentences.append(LONG_SENTENCE)
+        return " ".join(sentences)
+
+    if kind == "review":
+        return "```yaml\nedits: []\n```"
+
+    if kind == "levels":
+        count = _requested_count(prompt, [r"질문-답변 (\d+)개"], DEFAULT_QUESTION_COUNT)
+        levels = re.search(r"대상 수준: (.+)", prompt)
+        levels = [level.strip() for level in levels.group(1).split(",")] if levels else ["5살"]
+        return json.dumps({"levels": {level: [{
+            "question": f"{rng.choice(KID_SENTENCES)} ({i + 1})",
+            "answer": " ".join(rng.sample(KID_SENTENCES, 2)),
+        } for i in range(count)] for level in levels}}, ensure_ascii=False)
+
+    if kind == "summary":
+        return " ".join(rng.sample(ANSWER_SENTENCES, 3))
+
+    return "테스트용 응답입니다."
+
+def fake_embedding(text, dimensions=64):
+    """낱말 해시로 만든 결정적 단위 벡터 (낱말이 겹치는 문장끼리 코사인 유사도가 높음)"""
+    vector = [0.0] * dimensions
+    for token in re.findall(r"\w+", text.lower()):
+        digest = zlib.crc32(token.encode("utf-8"))
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+class FakeOpenAIServer:
+    """
+    테스트/부하 테스트용 로컬 OpenAI 호환 HTTP 서버 (chat completions)
+
+    POST /v1/chat/completions, POST /v1/embeddings, GET /v1/models만 지원합니다.
+    프롬프트 종류별 대본 응답, 지연시간/지터, 429/500 주입, 토큰 집계를 제공하고
+    HTTP/1.1 keep-alive를 지원해서 클라이언트의 연결 재사용도 확인할 수 있습니다.
+    OPENAI_BASE_URL을 base_url로 설정하면 실제 openai SDK(call_llm)가 이 서버를 씁니다.
+
+    사용 예:
+        with FakeOpenAIServer(latency=0.2, jitter=0.1, error_rates={429: 0.05}) as server:
+            os.environ["OPENAI_BASE_URL"] = server.base_url
+    """
+
+    def __init__(self, responses=None, latency=0.0, jitter=0.0, error_rates=None, retry_after=0.05, seed=0):
+        """
+        Args:
+            responses: {프롬프트 종류: 문자열 | 문자열 리스트(차례로 반복) | 함수(prompt, rng) -> 문자열}
+                       (없는 종류는 scripted_response 사용)
+            latency: 응답마다 기다릴 시간(초) 또는 (rng, model)을 받아 초를 돌려주는 함수
+            jitter: latency에 더할 ±jitter초 균등분포 잡음
+            error_rates: {상태 코드: 확률} (예: {429: 0.05, 500: 0.01})
+            retry_after: 429 응답의 Retry-After 값(초)
+            seed: 지연시간/오류/응답을 정하는 난수 시드
+        """
+        self.responses = responses or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rates = error_rates or {}
+        self.retry_after = retry_after
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self._seen = {}
+        self._scripted = {}
+        self._injected = []
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self, port=0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive: 연결 하나로 여러 요청 처리 (연결 재사용 확인용)
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.stats["connections"] += 1
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        """집계 초기화 (워밍업 요청을 빼고 측정할 때, connections는 이후 새로 연 연결 수)"""
+        with self._lock:
+            self.stats = {"requests": 0, "completions": 0, "embeddings": 0, "connections": 0, "rate_limited": 0,
+                          "server_errors": 0, "prompt_tokens": 0, "completion_tokens": 0, "by_kind": {}, "by_model": {}}
+
+    def inject(self, status, count=1):
+        """다음 count개 요청을 status(429 또는 500)로 실패시킴 (확률과 관계없이)"""
+        with self._lock:
+            self._injected.extend([status] * count)
+
+    def _rngs(self, model, prompt):
+        # 응답은 (시드, 모델, 프롬프트)로, 지연/오류는 같은 프롬프트의 n번째 요청까지 더해서 결정
+        # (스레드 실행 순서와 관계없이 재현 가능)
+        with self._lock:
+            nth = self._seen.get((model, prompt), 0)
+            self._seen[(model, prompt)] = nth + 1
+        return random.Random(f"{self.seed}|{model}|{prompt}"), random.Random(f"{self.seed}|{model}|{nth}|{prompt}")
+
+    def _delay(self, rng, model):
+        delay = self.latency(rng, model) if callable(self.latency) else self.latency
+        if self.jitter:
+            delay += rng.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    def _pick_error(self, rng):
+        with self._lock:
+            if self._injected:
+                return self._injected.pop(0)
+        roll = rng.random()
+        for status, rate in sorted(self.error_rates.items()):
+            if roll < rate:
+                return status
+            roll -= rate
+        return None
+
+    def _respond(self, kind, prompt, rng):
+        script = self.responses.get(kind)
+        if script is None:
+            return scripted_response(kind, prompt, rng)
+        if callable(script):
+            return script(prompt, rng)
+        if isinstance(script, (list, tuple)):
+            with self._lock:
+                index = self._scripted.get(kind, 0)
+                self._scripted[kind] = index + 1
+            return script[index % len(script)]
+        return script
+
+    def _handle(self, handler, method):
+        with self._lock:
+            self.stats["requests"] += 1
+
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        path = handler.path.split("?")[0].rstrip("/")
+
+        if not handler.headers.get("Authorization", "").startswith("Bearer "):
+            self._send_error(handler, 401, "invalid_api_key", "Missing bearer token.")
+        elif method == "GET" and path == "/v1/models":
+            self._send(handler, 200, {"object": "list", "data": [
+                {"id": model, "object": "model", "owned_by": "fake"} for model in ("gpt-4o", "gpt-4o-mini")
+            ]})
+        elif method == "POST" and path == "/v1/chat/completions":
+            self._chat_completion(handler, json.loads(body or b"{}"))
+        elif method == "POST" and path == "/v1/embeddings":
+            self._embeddings(handler, json.loads(body or b"{}"))
+        else:
+            self._send_error(handler, 404, "unknown_url", f"Unknown request URL: {method} {handler.path}")
+
+    def _chat_completion(self, handler, body):
+        model = body.get("model", "gpt-4o-mini")
+        messages = body.get("messages") or []
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        content_rng, timing_rng = self._rngs(model, prompt)
+
+        delay = self._delay(timing_rng, model)
+        if delay:
+            time.sleep(delay)
+
+        status = self._pick_error(timing_rng)
+        if status == 429:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            self._send_error(handler, 429, "rate_limit_exceeded", "Rate limit reached for requests.", {
+                "Retry-After": f"{self.retry_after:g}",
+                "retry-after-ms": str(int(self.retry_after * 1000)),
+            })
+            return
+        if status:
+            with self._lock:
+                self.stats["server_errors"] += 1
+            self._send_error(handler, status, "server_error", "The server had an error while processing your request.")
+            return
+
+        kind = classify_prompt(prompt)
+        content = self._respond(kind, prompt, content_rng)
+        usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(content)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        with self._lock:
+            self.stats["completions"] += 1
+            self.stats["prompt_tokens"] += usage["prompt_tokens"]
+            self.stats["completion_tokens"] += usage["completion_tokens"]
+            self.stats["by_kind"][kind] = self.stats["by_kind"].get(kind, 0) + 1
+            model_stats = self.stats["by_model"].setdefault(
+                model, {"completions": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            model_stats["completions"] += 1
+            model_stats["prompt_tokens"] += usage["prompt_tokens"]
+            model_stats["completion_tokens"] += usage["completion_tokens"]
+
+        self._send(handler, 200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _embeddings(self, handler, body):
+        """입력마다 fake_embedding (openai SDK 기본값인 base64 float32 인코딩도 지원)"""
+        inputs = body.get("input") or []
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        dimensions = int(body.get("dimensions") or 64)
+        data = []
+        for index, text in enumerate(inputs):
+            vector = fake_embedding(str(text), dimensions)
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(struct.pack(f"<{dimensions}f", *vector)).decode("ascii")
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        tokens = sum(estimate_tokens(str(text)) for text in inputs)
+        with self._lock:
+            self.stats["embeddings"] += len(inputs)
+            self.stats["prompt_tokens"] += tokens
+        self._send(handler, 200, {"object": "list", "data": data, "model": body.get("model", "text-embedding-3-small"),
+                                  "usage": {"prompt_tokens": tokens, "total_tokens": tokens}})
+
+    def _send_error(self, handler, status, code, message, headers=None):
+        error_type = "requests" if status == 429 else "server_error" if status >= 500 else "invalid_request_error"
+        self._send(handler, status, {"error": {"message": message, "type": error_type, "param": None, "code": code}},
+                   headers)
+
+    def _send(self, handler, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+def parse_error_rates(values):
+    """["429=0.05", "500=0.01"] → {429: 0.05, 500: 0.01}"""
+    rates = {}
+    for value in values:
+        status, _, rate = value.partition("=")
+        rates[int(status)] = float(rate)
+    return rates
+
+def main():
+    """가짜 OpenAI 서버를 띄워 두고 다른 터미널에서 파이프라인을 네트워크 없이 부하 테스트"""
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible chat completions stub server.")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per completion (default: 0.5)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Uniform ±jitter seconds (default: 0.2)")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="STATUS=RATE",
+                        help="Inject errors, e.g. 429=0.05 500=0.01 (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency=args.latency, jitter=args.jitter,
+                              error_rates=parse_error_rates(args.error_rate), seed=args.seed).start(args.port)
+    print(f"가짜 OpenAI 서버: {server.base_url}")
+    print(f"   OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=fake python main.py --url <YouTube URL>")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
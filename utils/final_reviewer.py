@@ -1,15 +1,132 @@
 import os
-import yaml
-from .call_llm import call_llm
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .model_router import call_llm_for_stage, propagate_stage_stats
+from .transcript_corrector import COMMON_CORRECTIONS
+from .vocabulary_lexicon import get_lexicon
+from .grounding import TranscriptGrounder, DEFAULT_MIN_SUPPORT, SUMMARY_LANGUAGE, grounding_settings, passages_language
 
-def review_and_correct_summary(topics_with_qa, video_title="", video_context=""):
+# 동시에 검토할 최대 주제 수 (REVIEW_MAX_WORKERS 환경변수로 조정)
+DEFAULT_REVIEW_WORKERS = 4
+
+# 검토 대상 연령 기본값 (설정의 target_age 또는 첫 번째 독자 수준의 나이로 바꿈)
+DEFAULT_TARGET_AGE = 5
+
+# 아이용 문장의 최대 길이 (글자 수)
+MAX_SENTENCE_LENGTH = 80
+
+# 실제로 바뀌는 오타만 사용 (사전에 "펠레": "펠레" 같은 항목도 있음)
+KNOWN_TYPOS = {wrong: correct for wrong, correct in COMMON_CORRECTIONS.items() if wrong != correct}
+
+def precheck_qa(question_number, qa, target_age=DEFAULT_TARGET_AGE):
+    """
+    Q&A 하나를 결정적 규칙으로 검사
+    
+    - 오타 사전에 있는 단어
+    - 너무 긴 문장
+    - 어려운 단어 (target_age 어휘 수준 기준)
+    
+    Returns:
+        발견된 문제 리스트
+    """
+    issues = []
+    i = question_number
+    
+    for field in ("question", "answer"):
+        text = qa.get(field, "")
+        
+        typos = [wrong for wrong in KNOWN_TYPOS if wrong in text]
+        if typos:
+            issues.append(f"Q{i} {field}: 오타 의심 {', '.join(typos)}")
+        
+        long_sentences = [s for s in re.split(r'[.!?\n]+', text) if len(s.strip()) > MAX_SENTENCE_LENGTH]
+        if long_sentences:
+            issues.append(f"Q{i} {field}: 긴 문장 {len(long_sentences)}개")
+        
+        difficult_words = get_lexicon().find_hard_words(text, target_age=target_age)
+        if difficult_words:
+            issues.append(f"Q{i} {field}: 어려운 단어 {', '.join(difficult_words)}")
+    
+    return issues
+
+def precheck_topic_qa_pairs(qa_pairs, target_age=DEFAULT_TARGET_AGE):
+    """
+    LLM 검토 전에 결정적 규칙으로 Q&A를 빠르게 검사
+    
+    Returns:
+        발견된 문제 리스트 (비어 있으면 LLM 검토 생략 가능)
+    """
+    return [issue for i, qa in enumerate(qa_pairs, 1) for issue in precheck_qa(i, qa, target_age)]
+
+def _review_one_topic(topic_data, video_title, grounder=None, min_support=DEFAULT_MIN_SUPPORT,
+                      target_age=DEFAULT_TARGET_AGE):
+    """
+    주제 하나를 사전 검사 + 자막 근거 확인 후 문제가 있는 Q&A만 LLM으로 검토
+    
+    근거 확인은 원래 답변(source_answer, 없으면 answer)으로 하고,
+    지지도가 min_support보다 낮은 Q&A는 근거 자막과 함께 검토에 보냅니다.
+    """
+    topic = topic_data["topic"]
+    qa_pairs = topic_data["qa_pairs"]
+    start_time = time.time()
+    
+    issues = []
+    flagged = []
+    grounding = []
+    for i, qa in enumerate(qa_pairs, 1):
+        qa_issues = precheck_qa(i, qa, target_age)
+        if grounder is not None:
+            result = grounder.ground(qa.get("source_answer") or qa["answer"])
+            grounding.append({"question_number": i, **result})
+            if result["support"] < min_support:
+                qa_issues.append(f"Q{i} answer: 자막 근거 부족 (지지도 {result['support']:.2f})")
+        if qa_issues:
+            issues.extend(qa_issues)
+            flagged.append(i - 1)
+    
+    improved_qa_pairs, corrections = qa_pairs, []
+    if flagged:
+        # 문제가 있는 Q&A만 보내고 결과의 번호를 주제 안 원래 번호로 되돌림
+        subset = [{"question": qa_pairs[j]["question"], "answer": qa_pairs[j]["answer"]} for j in flagged]
+        evidence = {"evidence": [grounding[j]["citations"] for j in flagged]} if grounder is not None else {}
+        reviewed, corrections = review_topic_qa_pairs(topic, subset, video_title, target_age=target_age, **evidence)
+        improved_qa_pairs = [dict(qa) for qa in qa_pairs]
+        for j, qa in zip(flagged, reviewed):
+            improved_qa_pairs[j].update(question=qa["question"], answer=qa["answer"])
+        for correction in corrections:
+            correction["question_number"] = flagged[correction["question_number"] - 1] + 1
+    
+    detail = {
+        "topic": topic,
+        "status": "reviewed" if flagged else "skipped",
+        "precheck_issues": issues,
+        "qa_reviewed": len(flagged),
+        "qa_total": len(qa_pairs),
+        "review_seconds": round(time.time() - start_time, 3),
+        "corrections_made": corrections,
+        "corrections_count": len(corrections)
+    }
+    if grounder is not None:
+        detail["grounding"] = grounding
+    return {"topic": topic, "qa_pairs": improved_qa_pairs}, detail
+
+def review_and_correct_summary(topics_with_qa, video_title="", video_context="", max_workers=None, passages=None,
+                               target_age=DEFAULT_TARGET_AGE, transcript_language=None):
     """
     최종 요약본을 AI가 검토하고 개선하는 함수
     
+    주제별 검토는 최대 max_workers개씩 동시에 실행되며,
+    결정적 사전 검사와 자막 근거 확인을 통과한 Q&A는 LLM 검토를 건너뜁니다.
+    
     Args:
         topics_with_qa: [{topic: str, qa_pairs: [...]}, ...]
         video_title: 비디오 제목
         video_context: 비디오 맥락 정보
+        max_workers: 동시 검토 주제 수 (기본값: REVIEW_MAX_WORKERS 또는 4)
+        passages: 근거를 찾을 자막 구간 [{"text", "start"}] (없거나 GROUNDING=0이면 근거 확인 생략)
+        target_age: 검토 기준 연령 (어려운 단어 사전 검사와 검토 프롬프트에 사용)
+        transcript_language: 자막 언어 (video_info["language_used"], 한국어가 아니면 근거 확인 없이 사전 검사만)
     
     Returns:
         improved_topics_with_qa: 개선된 요약본
@@ -20,51 +137,78 @@ def review_and_correct_summary(topics_with_qa, video_title="", video_context="")
     if not os.getenv("OPENAI_API_KEY"):
         return topics_with_qa, {"status": "skipped", "reason": "no_api_key"}
     
-    improved_topics = []
-    total_corrections = 0
-    review_details = []
+    if not topics_with_qa:
+        return [], {"status": "completed", "total_corrections": 0, "topics_reviewed": 0,
+                    "topics_skipped": 0, "review_seconds": 0.0, "details": []}
     
-    for topic_data in topics_with_qa:
-        topic = topic_data["topic"]
-        qa_pairs = topic_data["qa_pairs"]
-        
-        # 각 주제별로 검토 및 개선
-        improved_qa_pairs, corrections = review_topic_qa_pairs(topic, qa_pairs, video_title)
-        
-        improved_topics.append({
-            "topic": topic,
-            "qa_pairs": improved_qa_pairs
-        })
-        
-        total_corrections += len(corrections)
-        review_details.append({
-            "topic": topic,
-            "corrections_made": corrections,
-            "corrections_count": len(corrections)
-        })
+    max_workers = max_workers or int(os.getenv("REVIEW_MAX_WORKERS", DEFAULT_REVIEW_WORKERS))
+    start_time = time.time()
+    
+    settings = grounding_settings()
+    grounder = None
+    language = passages_language(passages, transcript_language) if passages and settings["enabled"] else None
+    if language == SUMMARY_LANGUAGE:
+        grounder = TranscriptGrounder(passages)
+    
+    # executor.map은 입력 순서를 유지함
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(topics_with_qa)))) as executor:
+        results = list(executor.map(
+            propagate_stage_stats(
+                lambda topic_data: _review_one_topic(topic_data, video_title, grounder,
+                                                     settings["min_support"], target_age)
+            ),
+            topics_with_qa
+        ))
+    
+    improved_topics = [improved for improved, _ in results]
+    review_details = [detail for _, detail in results]
     
     review_report = {
         "status": "completed",
-        "total_corrections": total_corrections,
-        "topics_reviewed": len(topics_with_qa),
+        "total_corrections": sum(detail["corrections_count"] for detail in review_details),
+        "topics_reviewed": sum(1 for detail in review_details if detail["status"] == "reviewed"),
+        "topics_skipped": sum(1 for detail in review_details if detail["status"] == "skipped"),
+        "review_seconds": round(time.time() - start_time, 3),
         "details": review_details
     }
+    if grounder is not None:
+        supports = [item["support"] for detail in review_details for item in detail["grounding"]]
+        review_report["grounding"] = {
+            "threshold": settings["min_support"],
+            "checked": len(supports),
+            "low_support": sum(1 for support in supports if support < settings["min_support"]),
+            "qa_reviewed": sum(detail["qa_reviewed"] for detail in review_details),
+            "qa_total": sum(detail["qa_total"] for detail in review_details)
+        }
+    elif language is not None:
+        # 한국어 답변을 다른 언어 자막과 맞춰 보면 전부 근거 부족이 되므로 사전 검사만 함
+        review_report["grounding"] = {"skipped": "language", "language": language}
     
     return improved_topics, review_report
 
-def review_topic_qa_pairs(topic, qa_pairs, video_title=""):
+def review_topic_qa_pairs(topic, qa_pairs, video_title="", evidence=None, target_age=DEFAULT_TARGET_AGE):
     """
-    특정 주제의 Q&A들을 검토하고 개선
+    특정 주제의 Q&A들을 target_age살 아이 눈높이로 검토하고 개선
+    
+    evidence가 있으면 Q&A마다 근거 자막 구간(grounding 인용)을 함께 보여주고
+    사실 확인을 자막 기준으로 하게 합니다.
     """
     
     # Q&A를 텍스트로 변환
     qa_text = f"주제: {topic}\n\n"
     for i, qa in enumerate(qa_pairs, 1):
         qa_text += f"Q{i}: {qa['question']}\n"
-        qa_text += f"A{i}: {qa['answer']}\n\n"
+        qa_text += f"A{i}: {qa['answer']}\n"
+        if evidence:
+            for citation in evidence[i - 1]:
+                qa_text += f"근거 자막 [{citation['timestamp']}]: {citation['text']}\n"
+        qa_text += "\n"
+    
+    fact_check = "**사실 확인** (근거 자막과 다르거나 자막에 없는 내용은 자막에 맞게 고치거나 빼기)" if evidence \
+        else "**사실 확인** (잘못된 정보가 있다면 수정)"
     
     prompt = f"""
-당신은 5살 아이용 YouTube 요약본을 검토하는 전문가입니다.
+당신은 {target_age}살 아이용 YouTube 요약본을 검토하는 전문가입니다.
 
 비디오 제목: {video_title}
 
@@ -75,76 +219,45 @@ def review_topic_qa_pairs(topic, qa_pairs, video_title=""):
 다음 사항들을 중점적으로 검토해주세요:
 
 1. **오타 교정** (예: 스아레즈 → 수아레즈, 메씨 → 메시)
-2. **사실 확인** (잘못된 정보가 있다면 수정)
-3. **5살 아이 수준** (너무 어려운 표현은 더 쉽게)
+2. {fact_check}
+3. **{target_age}살 아이 수준** (너무 어려운 표현은 더 쉽게)
 4. **명확성 개선** (애매한 표현을 더 구체적으로)
 5. **재미 요소** (지루하지 않게 흥미롭게)
 
-개선된 Q&A를 다음 형식으로 답해주세요:
+바꿀 부분만 편집 명령으로 답해주세요 (원문 전체를 다시 쓰지 마세요):
 
 ```yaml
-improvements:
+edits:
   - question_number: 1
-    original_question: "원래 질문"
-    improved_question: "개선된 질문"  
-    original_answer: "원래 답변"
-    improved_answer: "개선된 답변"
-    changes_made: ["오타 교정: 스아레즈→수아레즈", "표현 단순화"]
-  
+    field: question
+    find: "스아레즈"
+    replace: "수아레즈"
+    reason: "오타 교정"
   - question_number: 2
-    original_question: "원래 질문"
-    improved_question: "개선된 질문"
-    original_answer: "원래 답변" 
-    improved_answer: "개선된 답변"
-    changes_made: ["사실 확인", "재미 요소 추가"]
+    field: answer
+    find: "전술적 접근 방식"
+    replace: "작전"
+    reason: "표현 단순화"
 ```
 
 **중요**: 
 - 반드시 한국어로 답변해주세요
-- 개선이 필요없는 경우 원래 내용을 그대로 사용해주세요
-- 5살 아이가 이해할 수 있는 수준을 유지해주세요
+- field는 question 또는 answer 중 하나입니다
+- find에는 원문에 그대로 있는 부분만 짧게 적어주세요
+- 개선이 필요없으면 `edits: []` 로만 답해주세요
+- {target_age}살 아이가 이해할 수 있는 수준을 유지해주세요
 """
     
     try:
-        response = call_llm(prompt)
+        response = call_llm_for_stage("review", prompt)
         
-        # YAML 파싱
-        if "```yaml" in response:
-            yaml_part = response.split("```yaml")[1].split("```")[0].strip()
-            improvements_data = yaml.safe_load(yaml_part)
-            
-            if improvements_data and "improvements" in improvements_data:
-                improved_qa_pairs = []
-                corrections_made = []
-                
-                for improvement in improvements_data["improvements"]:
-                    q_num = improvement.get("question_number", 1) - 1
-                    
-                    if q_num < len(qa_pairs):
-                        # 개선된 버전 사용
-                        improved_qa = {
-                            "question": improvement.get("improved_question", qa_pairs[q_num]["question"]),
-                            "answer": improvement.get("improved_answer", qa_pairs[q_num]["answer"])
-                        }
-                        improved_qa_pairs.append(improved_qa)
-                        
-                        # 변경사항 기록
-                        changes = improvement.get("changes_made", [])
-                        if changes:
-                            corrections_made.append({
-                                "question_number": q_num + 1,
-                                "changes": changes,
-                                "original_question": improvement.get("original_question", ""),
-                                "improved_question": improvement.get("improved_question", ""),
-                                "original_answer": improvement.get("original_answer", ""),
-                                "improved_answer": improvement.get("improved_answer", "")
-                            })
-                
-                # 개선되지 않은 Q&A는 원본 유지
-                while len(improved_qa_pairs) < len(qa_pairs):
-                    improved_qa_pairs.append(qa_pairs[len(improved_qa_pairs)])
-                
-                return improved_qa_pairs, corrections_made
+        # YAML 파싱 (yaml은 검토 응답을 파싱할 때만 로드)
+        import yaml
+        yaml_part = response.split("```yaml")[1].split("```")[0].strip() if "```yaml" in response else response.strip()
+        edits_data = yaml.safe_load(yaml_part)
+        
+        if isinstance(edits_data, dict) and isinstance(edits_data.get("edits"), list):
+            return apply_review_edits(qa_pairs, edits_data["edits"])
     
     except Exception as e:
         print(f"검토 중 오류 발생: {e}")
@@ -152,19 +265,87 @@ improvements:
     # 오류 발생시 원본 반환
     return qa_pairs, []
 
+def apply_review_edits(qa_pairs, edits):
+    """
+    리뷰어의 편집 명령을 Q&A에 적용
+    
+    Args:
+        qa_pairs: [{"question": str, "answer": str}, ...]
+        edits: [{"question_number": int, "field": "question"|"answer",
+                 "find": str, "replace": str, "reason": str}, ...]
+                find가 없으면 필드 전체를 replace로 교체
+    
+    Returns:
+        (improved_qa_pairs, corrections_made)
+    """
+    improved_qa_pairs = [dict(qa) for qa in qa_pairs]
+    corrections_by_question = {}
+    
+    for edit in edits:
+        if not isinstance(edit, dict):
+            continue
+        
+        try:
+            q_num = int(edit.get("question_number", 0)) - 1
+        except (TypeError, ValueError):
+            continue
+        field = edit.get("field")
+        replace = edit.get("replace")
+        if not 0 <= q_num < len(improved_qa_pairs) or field not in ("question", "answer") or not isinstance(replace, str):
+            continue
+        
+        original = improved_qa_pairs[q_num][field]
+        find = edit.get("find")
+        if find:
+            # 원문에 없는 부분을 고치라는 명령은 무시 (환각 방지)
+            if find not in original:
+                continue
+            updated = original.replace(find, replace, 1)
+        else:
+            updated = replace
+        
+        if updated == original:
+            continue
+        improved_qa_pairs[q_num][field] = updated
+        
+        correction = corrections_by_question.setdefault(q_num, {
+            "question_number": q_num + 1,
+            "changes": [],
+            "edits": [],
+            "original_question": qa_pairs[q_num]["question"],
+            "original_answer": qa_pairs[q_num]["answer"]
+        })
+        reason = edit.get("reason") or "표현 개선"
+        correction["changes"].append(f"{reason}: {find}→{replace}" if find else reason)
+        correction["edits"].append({"field": field, "find": find or "", "replace": replace})
+    
+    corrections_made = []
+    for q_num in sorted(corrections_by_question):
+        correction = corrections_by_question[q_num]
+        correction["improved_question"] = improved_qa_pairs[q_num]["question"]
+        correction["improved_answer"] = improved_qa_pairs[q_num]["answer"]
+        corrections_made.append(correction)
+    
+    return improved_qa_pairs, corrections_made
+
 def generate_review_summary(review_report):
     """검토 리포트를 사용자가 읽기 쉬운 형태로 요약"""
     
     if review_report["status"] == "skipped":
+        if review_report.get("reason") == "disabled":
+            return "⏭️ AI 검토를 건너뛰었습니다 (설정에서 끔)"
         return "❌ AI 검토를 건너뛰었습니다 (API 키 없음)"
     
     total_corrections = review_report["total_corrections"]
     topics_count = review_report["topics_reviewed"]
+    skipped_count = review_report.get("topics_skipped", 0)
+    skipped_text = f" (사전 검사 통과로 {skipped_count}개 주제 생략)" if skipped_count else ""
+    grounding_text = _grounding_summary(review_report)
     
     if total_corrections == 0:
-        return f"✅ {topics_count}개 주제 검토 완료 - 추가 개선사항 없음"
+        return f"✅ {topics_count}개 주제 검토 완료 - 추가 개선사항 없음{skipped_text}" + grounding_text
     
-    summary = f"🔍 AI 검토 완료: {topics_count}개 주제에서 총 {total_corrections}개 개선사항 발견\n\n"
+    summary = f"🔍 AI 검토 완료: {topics_count}개 주제에서 총 {total_corrections}개 개선사항 발견{skipped_text}\n\n"
     
     for detail in review_report["details"]:
         if detail["corrections_count"] > 0:
@@ -175,6 +356,24 @@ def generate_review_summary(review_report):
                 changes_text = ", ".join(correction["changes"])
                 summary += f"   - Q{correction['question_number']}: {changes_text}\n"
     
+    return summary + grounding_text
+
+def _grounding_summary(review_report):
+    """자막 근거 확인 결과 (근거가 부족한 답변과 인용 시각)"""
+    grounding = review_report.get("grounding")
+    if not grounding:
+        return ""
+    if grounding.get("skipped") == "language":
+        return f"\n📎 자막 근거 확인 생략: 자막 언어({grounding['language']})가 요약 언어와 달라 사전 검사만 했습니다\n"
+    
+    summary = (f"\n📎 자막 근거 확인: {grounding['checked']}개 답변 중 {grounding['low_support']}개 근거 부족, "
+               f"{grounding['qa_total']}개 Q&A 중 {grounding['qa_reviewed']}개만 AI 검토\n")
+    for detail in review_report["details"]:
+        for item in detail.get("grounding", []):
+            if item["support"] < grounding["threshold"]:
+                timestamps = ", ".join(citation["timestamp"] for citation in item["citations"]) or "없음"
+                summary += (f"   - {detail['topic']} Q{item['question_number']}: "
+                            f"지지도 {item['support']:.2f} (가까운 자막 {timestamps})\n")
     return summary
 
 def main():
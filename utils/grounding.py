@@ -0,0 +1,135 @@
+import os
+import re
+import math
+from .youtube_processor import transcript_passages
+from .vocabulary_lexicon import hangul_ratio, MIN_HANGUL_RATIO
+
+# 근거를 찾는 자막 구간 길이 (낱말 수, 인용할 시각의 단위)
+DEFAULT_SPAN_WORDS = 40
+# 답변의 낱말(IDF 가중)이 근거 구간에 이만큼 이상 있으면 LLM 검토 생략
+DEFAULT_MIN_SUPPORT = 0.6
+# 지지도 계산에 합치는 상위 구간 수 (답변 한 문장씩 다른 곳에서 나올 수 있음)
+DEFAULT_TOP_SPANS = 2
+# 요약(Q&A)은 항상 한국어로 만들므로 낱말을 맞춰 볼 수 있는 자막 언어
+SUMMARY_LANGUAGE = "ko"
+
+_WORD = re.compile(r"\w+")
+
+def grounding_settings():
+    """
+    근거 확인 설정 (단계 결과 재사용 키에도 들어감)
+
+    환경변수: GROUNDING(1/0, 기본 1), GROUNDING_MIN_SUPPORT(기본 0.6)
+    """
+    return {
+        "enabled": os.getenv("GROUNDING", "1").strip().lower() not in ("0", "false", "no", "off"),
+        "min_support": float(os.getenv("GROUNDING_MIN_SUPPORT", DEFAULT_MIN_SUPPORT)),
+    }
+
+def passages_language(passages, language=None):
+    """
+    자막 언어 (get_video_info의 language_used, 모르면 한글 비율로 "ko"/"other" 추정)
+
+    영어/일본어 자막이면 한국어 답변과 낱말이 겹치지 않아 지지도가 모두 0이 되므로 근거 확인을 하지 않습니다.
+    """
+    if language:
+        return language
+    text = " ".join(passage["text"] for passage in passages)
+    return SUMMARY_LANGUAGE if hangul_ratio(text) >= MIN_HANGUL_RATIO else "other"
+
+def tokenize(text):
+    """낱말 + 낱말 안 글자 bigram (조사가 붙은 한국어 낱말도 자막과 맞춰지도록)"""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        terms.append(word)
+        terms.extend("#" + word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+def format_timestamp(seconds):
+    """초 → "m:ss" 또는 "h:mm:ss" (시각을 모르면 "?")"""
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+class BM25:
+    """역색인 기반 Okapi BM25 (질의 낱말이 나오는 문서만 점수 계산)"""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        """
+        Args:
+            documents: 문서별 낱말 목록 [[term, ...], ...]
+        """
+        self.k1 = k1
+        self.b = b
+        self.count = len(documents)
+        self.lengths = [len(terms) for terms in documents]
+        self.average_length = sum(self.lengths) / self.count if self.count else 0.0
+        self.postings = {}
+        for doc, terms in enumerate(documents):
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((doc, tf))
+
+    def idf(self, term):
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (self.count - df + 0.5) / (df + 0.5))
+
+    def scores(self, query_terms):
+        """질의 → {문서 번호: 점수} (0점 문서는 없음)"""
+        scores = {}
+        for term in set(query_terms):
+            idf = self.idf(term)
+            for doc, tf in self.postings.get(term, ()):
+                norm = tf + self.k1 * (1 - self.b + self.b * self.lengths[doc] / (self.average_length or 1))
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return scores
+
+class TranscriptGrounder:
+    """
+    자막 구간 BM25로 답변의 근거를 찾고 지지도를 계산
+
+    지지도 = 답변 낱말의 IDF 합 중 상위 근거 구간에 나오는 낱말의 비율 (0~1).
+    영상에 없는 내용이 섞인 답변은 그 낱말들이 구간에 없어서 지지도가 떨어집니다.
+    """
+
+    def __init__(self, passages, top_spans=DEFAULT_TOP_SPANS):
+        """
+        Args:
+            passages: [{"text", "start"}] (youtube_processor.transcript_passages)
+        """
+        self.passages = [passage for passage in passages if passage["text"].strip()]
+        self.terms = [tokenize(passage["text"]) for passage in self.passages]
+        self.term_sets = [set(terms) for terms in self.terms]
+        self.index = BM25(self.terms)
+        self.top_spans = top_spans
+
+    @classmethod
+    def from_video(cls, video_info, span_words=DEFAULT_SPAN_WORDS):
+        return cls(transcript_passages(video_info, words=span_words))
+
+    def ground(self, text, citations=3):
+        """
+        Returns:
+            {"support": 0~1, "citations": [{"start", "timestamp", "score", "text"}]} (점수 높은 순)
+        """
+        query = tokenize(text)
+        scores = self.index.scores(query)
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], doc))
+        unique = set(query)
+        total = sum(self.index.idf(term) for term in unique)
+        covered = set().union(*(self.term_sets[doc] for doc in ranked[:self.top_spans])) & unique
+        support = sum(self.index.idf(term) for term in covered) / total if total else 0.0
+        return {
+            "support": round(support, 3),
+            "citations": [{
+                "start": self.passages[doc].get("start"),
+                "timestamp": format_timestamp(self.passages[doc].get("start")),
+                "score": round(scores[doc], 2),
+                "text": self.passages[doc]["text"][:160],
+            } for doc in ranked[:citations]],
+        }
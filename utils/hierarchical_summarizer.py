@@ -0,0 +1,301 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .model_router import call_llm_for_stage, get_stage_config, propagate_stage_stats
+from .metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "summary_cache.db"
+DEFAULT_CHUNK_WORDS = 1200
+DEFAULT_FANOUT = 4
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MIN_WORDS = 10000  # validate_transcript_quality가 "너무 길다"고 보던 기준
+DEFAULT_CONTEXT_CHARS = 3000  # 주제 추출 프롬프트에 들어가는 트랜스크립트 길이
+
+# 요약 프롬프트를 바꿔서 예전 구간 요약을 재사용하면 안 될 때 올림
+SUMMARY_PROMPT_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+LEAF_PROMPT = """
+다음은 긴 영상 자막의 한 구간입니다. 이 구간의 핵심 내용을 한국어 3~5문장으로 구간 요약해주세요.
+사람 이름, 숫자, 고유한 주장은 빠뜨리지 말고 다른 설명 없이 요약문만 답해주세요.
+
+구간:
+{text}
+"""
+
+MERGE_PROMPT = """
+다음은 긴 영상 자막의 연속된 구간 요약들입니다. 순서를 유지하면서 하나의 구간 요약(한국어 4~6문장)으로 합쳐주세요.
+겹치는 내용은 한 번만 쓰고 다른 설명 없이 요약문만 답해주세요.
+
+구간 요약들:
+{text}
+"""
+
+def summary_settings():
+    """
+    계층 요약 설정 (환경변수)
+
+    - HIERARCHICAL_SUMMARY: auto(기본, 긴 자막만) / 1(항상) / 0(끔)
+    - HIERARCHICAL_SUMMARY_MIN_WORDS: auto에서 계층 요약을 시작하는 단어 수 (기본 10000)
+    - SUMMARY_CHUNK_WORDS: 맨 아래 구간 하나의 단어 수 (기본 1200)
+    - SUMMARY_FANOUT: 위 단계 요약 하나가 합치는 아래 요약 수 (기본 4)
+    """
+    mode = os.getenv("HIERARCHICAL_SUMMARY", "auto").strip().lower()
+    if mode in ("1", "true", "yes", "on"):
+        mode = "on"
+    elif mode in ("0", "false", "no", "off"):
+        mode = "off"
+    else:
+        mode = "auto"
+    return {
+        "mode": mode,
+        "min_words": int(os.getenv("HIERARCHICAL_SUMMARY_MIN_WORDS", DEFAULT_MIN_WORDS)),
+        "chunk_words": max(50, int(os.getenv("SUMMARY_CHUNK_WORDS", DEFAULT_CHUNK_WORDS))),
+        "fanout": max(2, int(os.getenv("SUMMARY_FANOUT", DEFAULT_FANOUT))),
+    }
+
+def needs_hierarchy(word_count, settings=None):
+    """설정과 단어 수로 계층 요약을 쓸지 결정"""
+    settings = settings or summary_settings()
+    if settings["mode"] == "auto":
+        return word_count > settings["min_words"]
+    return settings["mode"] == "on"
+
+def split_chunks(transcript, chunk_words):
+    """
+    자막을 chunk_words 단어 안팎의 구간으로 나누기
+
+    구간 끝은 가능하면 문장 끝(. ? ! 다음)에 맞추고, 문장이 너무 길면 단어 수로 자릅니다.
+    마지막 구간이 너무 짧으면 앞 구간에 붙입니다.
+    """
+    words = transcript.split()
+    chunks, current = [], []
+    for word in words:
+        current.append(word)
+        at_sentence_end = re.search(r"[.?!。]$", word) is not None
+        if (len(current) >= chunk_words and at_sentence_end) or len(current) >= chunk_words * 1.25:
+            chunks.append(" ".join(current))
+            current = []
+    if current:
+        if chunks and len(current) < chunk_words // 4:
+            chunks[-1] += " " + " ".join(current)
+        else:
+            chunks.append(" ".join(current))
+    return chunks
+
+def extractive_summary(text, sentences=3):
+    """LLM 없이 만드는 요약 (Mock 모드, LLM 오류 시): 앞에서부터 서로 다른 문장 몇 개"""
+    picked = []
+    for sentence in re.split(r"(?<=[.?!。])\s+", text.strip()):
+        if sentence and sentence not in picked:
+            picked.append(sentence)
+        if len(picked) >= sentences:
+            break
+    return " ".join(picked)
+
+def tree_context(tree, max_chars=DEFAULT_CONTEXT_CHARS):
+    """
+    요약 트리에서 주제 추출/Q&A에 넘길 텍스트
+
+    max_chars 안에 들어가는 가장 자세한(가장 아래) 단계를 고르고, 어느 단계도 안 들어가면 루트 요약을 씁니다.
+    """
+    for level in tree["levels"]:
+        text = "\n\n".join(level)
+        if len(text) <= max_chars:
+            return text
+    return tree["levels"][-1][0]
+
+class SummaryCache:
+    """
+    구간 해시 → 요약을 저장하는 영속 캐시
+
+    키에 프롬프트 버전, 단계 종류(leaf/merge), 모델이 들어가므로 같은 영상을 다시 처리하거나
+    같은 구간이 겹치는 영상(재업로드, 앞부분만 바뀐 편집본)은 바뀐 구간만 다시 요약합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SUMMARY_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys):
+        """{키: 요약} (없는 키는 빠짐)"""
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        with self._connect() as conn:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})", batch)
+                found.update(rows.fetchall())
+        return found
+
+    def put_many(self, items):
+        """{키: 요약} 저장 (같은 키는 덮어씀)"""
+        if not items:
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                             [(key, summary, now) for key, summary in items.items()])
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+class HierarchicalSummarizer:
+    """
+    긴 자막을 구간 요약 → 요약의 요약 → ... → 루트 요약 트리로 만드는 요약기
+
+    한 단계의 요약들은 서로 독립이라 스레드 풀에서 동시에 요청하므로, 전체 지연시간은
+    자막 길이가 아니라 트리 깊이(log_fanout(구간 수))에 비례하고 프롬프트 하나의 크기는
+    구간 길이로 고정됩니다. 요약은 구간 해시별로 캐시해서 다시 실행하면 LLM을 부르지 않습니다.
+
+    Args:
+        chunk_words: 맨 아래 구간 하나의 단어 수
+        fanout: 위 단계 요약 하나가 합치는 아래 요약 수
+        concurrency: 한 단계에서 동시에 보내는 요청 수 (SUMMARY_CONCURRENCY, 기본 8)
+        cache: SummaryCache (기본은 프로세스 공유 캐시, False면 캐시 안 함)
+        use_mock: True면 LLM 대신 추출 요약
+    """
+
+    def __init__(self, chunk_words=None, fanout=None, concurrency=None, cache=None, use_mock=False):
+        settings = summary_settings()
+        self.chunk_words = chunk_words or settings["chunk_words"]
+        self.fanout = max(2, fanout or settings["fanout"])
+        self.concurrency = max(1, concurrency or int(os.getenv("SUMMARY_CONCURRENCY", DEFAULT_CONCURRENCY)))
+        self.cache = get_summary_cache() if cache is None else cache
+        self.use_mock = use_mock
+
+    def _key(self, kind, text):
+        model = "mock" if self.use_mock else get_stage_config("summary")["model"]
+        data = f"{SUMMARY_PROMPT_VERSION}|{kind}|{model}|{text}"
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _summarize(self, kind, text):
+        if self.use_mock:
+            return extractive_summary(text)
+        prompt = (LEAF_PROMPT if kind == "leaf" else MERGE_PROMPT).format(text=text)
+        response = call_llm_for_stage("summary", prompt).strip()
+        if not response or response.startswith("❌"):
+            logger.warning(f"구간 요약 실패, 추출 요약으로 대체: {response[:80]}")
+            return None
+        return response
+
+    def _level(self, kind, texts, stats):
+        """한 단계의 요약들을 (캐시에 없는 것만) 동시에 만들기"""
+        keys = [self._key(kind, text) for text in texts]
+        cached = self.cache.get_many(keys) if self.cache else {}
+        hits = sum(1 for key in keys if key in cached)
+        CACHE_LOOKUPS.labels("summary", "hit").inc(hits)
+        CACHE_LOOKUPS.labels("summary", "miss").inc(len(keys) - hits)
+        stats["cache_hits"] += hits
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            workers = min(self.concurrency, len(missing))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary") as pool:
+                summarize = propagate_stage_stats(lambda text: self._summarize(kind, text))
+                results = dict(zip(missing, pool.map(summarize, missing.values())))
+            if not self.use_mock:
+                stats["llm_calls"] += len(missing)
+            fresh = {key: summary for key, summary in results.items() if summary}
+            if self.cache:
+                self.cache.put_many(fresh)
+            cached.update(fresh)
+            for key, summary in results.items():
+                if not summary:
+                    cached[key] = extractive_summary(missing[key])
+        return [cached[key] for key in keys]
+
+    def build(self, transcript):
+        """
+        자막 → 요약 트리
+
+        Returns:
+            {"levels": [[구간 요약...], [합친 요약...], ..., [루트 요약]], "chunks": 구간 수,
+             "depth": 단계 수, "llm_calls": 새로 보낸 요청 수, "cache_hits": 캐시 사용 수,
+             "level_seconds": [단계별 시간], "seconds": 전체 시간}
+        """
+        start_time = time.time()
+        stats = {"llm_calls": 0, "cache_hits": 0}
+        chunks = split_chunks(transcript, self.chunk_words)
+        if not chunks:
+            raise ValueError("요약할 자막이 없습니다")
+
+        levels, level_seconds = [], []
+        texts, kind = chunks, "leaf"
+        while True:
+            level_start = time.time()
+            level = self._level(kind, texts, stats)
+            levels.append(level)
+            level_seconds.append(round(time.time() - level_start, 3))
+            if len(level) == 1:
+                break
+            texts = ["\n".join(level[i:i + self.fanout]) for i in range(0, len(level), self.fanout)]
+            kind = "merge"
+
+        return {
+            "levels": levels,
+            "chunks": len(chunks),
+            "depth": len(levels),
+            "llm_calls": stats["llm_calls"],
+            "cache_hits": stats["cache_hits"],
+            "level_seconds": level_seconds,
+            "seconds": round(time.time() - start_time, 3),
+        }
+
+def summarize_transcript(transcript, use_mock=False, **kwargs):
+    """HierarchicalSummarizer(**kwargs).build(transcript) 단축 함수"""
+    return HierarchicalSummarizer(use_mock=use_mock, **kwargs).build(transcript)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_summary_cache():
+    """프로세스 전체에서 공유하는 구간 요약 캐시 (SUMMARY_CACHE_PATH, 기본 summary_cache.db)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SummaryCache()
+    return _cache
+
+def main():
+    """테스트용 함수"""
+    import tempfile
+
+    sentences = ["인공지능은 데이터를 보고 규칙을 배웁니다.", "로봇은 센서로 주변을 느낍니다.",
+                 "우주 탐사선은 스스로 길을 찾습니다.", "바다 생물 연구에도 카메라가 쓰입니다."]
+    transcript = " ".join(sentences[i % len(sentences)] + f" ({i})" for i in range(4000))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        summarizer = HierarchicalSummarizer(cache=SummaryCache(os.path.join(tmp, "summary.db")), use_mock=True)
+        tree = summarizer.build(transcript)
+        print(f"=== 자막 {len(transcript.split())}단어 → 구간 {tree['chunks']}개, 깊이 {tree['depth']} ===")
+        for depth, level in enumerate(tree["levels"]):
+            print(f"- 단계 {depth}: 요약 {len(level)}개 ({tree['level_seconds'][depth]:.3f}초)")
+        print(f"\n루트 요약: {tree['levels'][-1][0][:100]}...")
+        again = summarizer.build(transcript)
+        print(f"다시 실행: 캐시 사용 {again['cache_hits']}개")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,59 @@
-def html_generator(title, image_url, sections):
+import io
+from html import escape
+from string import Formatter
+
+class Markup(str):
+    """이미 안전한 HTML 문자열 (템플릿에 넣을 때 이스케이프하지 않음)"""
+
+def _escape(value):
+    """HTML 이스케이프 (특수문자가 없는 일반 문자열은 그대로 반환)"""
+    if type(value) is str:
+        if "&" in value or "<" in value or ">" in value or '"' in value or "'" in value:
+            return escape(value, quote=True)
+        return value
+    if isinstance(value, Markup):
+        return value
+    return escape(str(value), quote=True)
+
+class CompiledTemplate:
     """
-    Generates an HTML string with a handwriting style using Tailwind CSS.
+    미리 컴파일한 템플릿
 
-    :param title: Main title for the page ("Title 1").
-    :param image_url: URL of the image to be placed below the main title.
-    :param sections: A list of dictionaries, each containing:
-        {
-            "title": str (Title for the section e.g. "Title 2"),
-            "bullets": [
-                ("bold_text", "regular_text"),
-                ("bold_text_2", "regular_text_2"),
-                ...
-            ]
-        }
-    :return: A string of HTML content.
+    `{name}` 자리표시자가 있는 문자열을 한 번만 파싱해서 f-string 함수로
+    컴파일해 둡니다 (필드가 위치 인자). 렌더링할 때는 이 함수의 결과를
+    리스트/StringIO에 이어 붙입니다 (문자열 += 반복 없음).
     """
-    # Start building the HTML
-    html_template = f"""<!DOCTYPE html>
+
+    def __init__(self, source):
+        self.fields = []
+        pieces = []
+        for literal, field, _, _ in Formatter().parse(source):
+            pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is not None:
+                if not field.isidentifier():
+                    raise ValueError(f"템플릿 필드 이름이 올바르지 않습니다: {field}")
+                if field not in self.fields:
+                    self.fields.append(field)
+                pieces.append("{" + field + "}")
+        code = f"lambda {', '.join(self.fields)}: f{''.join(pieces)!r}"
+        # 값 (위치 인자, fields 순서) -> 문자열
+        self.function = eval(code, {})
+
+    def render_into(self, write, values):
+        """
+        Args:
+            write: 조각을 받을 함수 (list.append 또는 StringIO.write)
+            values: 이미 이스케이프된 값 딕셔너리
+        """
+        write(self.function(*[values[field] for field in self.fields]))
+
+    def render(self, **values):
+        out = io.StringIO()
+        self.render_into(out.write, {name: _escape(value) for name, value in values.items()})
+        return out.getvalue()
+
+# 파일 다운로드용 전체 HTML 페이지
+FILE_HEAD = CompiledTemplate("""<!DOCTYPE html>
 <html lang=\"en\">
 <head>
   <meta charset=\"UTF-8\" />
@@ -82,48 +119,27 @@ def html_generator(title, image_url, sections):
       src=\"{image_url}\"
       alt=\"Placeholder image\"
       class=\"rounded-xl mb-6\"
-    />"""
+    />""")
 
-    # For each section, add a sub-title (Title 2, etc.) and bullet points.
-    for section in sections:
-        section_title = section.get("title", "")
-        bullets = section.get("bullets", [])
-
-        # Add the section's title (Title 2, Title 3, etc.)
-        html_template += f"""
+FILE_SECTION_OPEN = CompiledTemplate("""
     <h2 class=\"text-2xl text-gray-800 mb-4\">{section_title}</h2>
-    <ul class=\"text-gray-600\">"""
+    <ul class=\"text-gray-600\">""")
 
-        # Create list items for each bullet pair
-        for bold_text, normal_text in bullets:
-            html_template += f"""
+FILE_BULLET = CompiledTemplate("""
       <li>
         <strong>{bold_text}</strong><br />
         <div class="bullet-content">{normal_text}</div>
-      </li>"""
+      </li>""")
 
-        html_template += "\n    </ul>"
+FILE_SECTION_CLOSE = CompiledTemplate("\n    </ul>")
 
-    # Close the main container and body
-    html_template += """
+FILE_TAIL = CompiledTemplate("""
   </div>
 </body>
-</html>"""
-
-    return html_template
+</html>""")
 
-def streamlit_html_generator(title, image_url, sections):
-    """
-    Streamlit용 HTML 조각 생성기 (CSS와 container 없이)
-    
-    :param title: Main title for the page
-    :param image_url: URL of the image to be placed below the main title
-    :param sections: List of dictionaries with title and bullets
-    :return: HTML fragment for Streamlit
-    """
-    
-    # Streamlit용 스타일 (HTML 조각에 적합)
-    html_fragment = f"""
+# Streamlit용 HTML 조각 (HTML 조각에 적합한 스타일)
+STREAMLIT_HEAD = CompiledTemplate("""
 <style>
     .summary-container {{
         font-family: 'Patrick Hand', 'Comic Sans MS', cursive;
@@ -223,43 +239,257 @@ def streamlit_html_generator(title, image_url, sections):
     <h1 class="summary-title">{title}</h1>
     
     <img src="{image_url}" alt="YouTube 썸네일" class="summary-image" />
-"""
+""")
 
-    # 각 섹션 추가
-    for section in sections:
-        section_title = section.get("title", "")
-        bullets = section.get("bullets", [])
-        
-        html_fragment += f"""
+STREAMLIT_SECTION_OPEN = CompiledTemplate("""
     <h2 class="summary-section-title">{section_title}</h2>
-    <ul class="summary-list">"""
-        
-        # 각 질문-답변 쌍 추가
-        for bold_text, normal_text in bullets:
-            # Q:와 A: 분리
-            if bold_text.startswith("Q:"):
-                question = bold_text[2:].strip()
-            else:
-                question = bold_text.strip()
-                
-            if normal_text.startswith("A:"):
-                answer = normal_text[2:].strip()
-            else:
-                answer = normal_text.strip()
-            
-            html_fragment += f"""
+    <ul class="summary-list">""")
+
+STREAMLIT_BULLET = CompiledTemplate("""
         <li class="summary-item">
             <div class="summary-question">❓ {question}</div>
             <div class="summary-answer">💡 {answer}</div>
-        </li>"""
-        
-        html_fragment += "\n    </ul>"
-    
-    html_fragment += """
+        </li>""")
+
+STREAMLIT_SECTION_CLOSE = CompiledTemplate("\n    </ul>")
+
+STREAMLIT_TAIL = CompiledTemplate("""
 </div>
-"""
+""")
+
+# 독자 수준 전환 (JS 없이 라디오 버튼 + :checked CSS, 파일/Streamlit 공통)
+LEVEL_STYLE_OPEN = CompiledTemplate("""
+<style>
+    .level-radio {{ position: absolute; opacity: 0; }}
+    .level-switcher {{ display: flex; flex-wrap: wrap; gap: 0.5rem; margin-bottom: 1.5rem; }}
+    .level-switcher label {{
+        cursor: pointer;
+        padding: 0.3rem 0.9rem;
+        border-radius: 9999px;
+        border: 2px solid #bee3f8;
+        color: #2b6cb0;
+    }}
+    .level-variant {{ display: none; }}""")
+
+LEVEL_STYLE_RULE = CompiledTemplate("""
+    #summary-level-{index}:checked ~ .level-content .level-{index} {{ display: block; }}
+    #summary-level-{index}:checked ~ .level-switcher label[for="summary-level-{index}"] {{
+        background-color: #bee3f8;
+    }}""")
+
+LEVEL_STYLE_CLOSE = CompiledTemplate("\n</style>")
+
+LEVEL_RADIO = CompiledTemplate("""
+    <input type="radio" name="summary-level" id="summary-level-{index}" class="level-radio"{checked} />""")
+
+LEVEL_SWITCHER_OPEN = CompiledTemplate("""
+    <div class="level-switcher">""")
+
+LEVEL_LABEL = CompiledTemplate("""
+      <label for="summary-level-{index}">{level}</label>""")
+
+LEVEL_SWITCHER_CLOSE = CompiledTemplate("""
+    </div>
+    <div class="level-content">""")
+
+LEVEL_CONTENT_CLOSE = CompiledTemplate("\n    </div>")
+
+FILE_VARIANT = CompiledTemplate("""
+        <div class="level-variant level-{index}">
+          <strong>{bold_text}</strong><br />
+          <div class="bullet-content">{normal_text}</div>
+        </div>""")
+
+STREAMLIT_VARIANT = CompiledTemplate("""
+            <div class="level-variant level-{index}">
+                <div class="summary-question">❓ {question}</div>
+                <div class="summary-answer">💡 {answer}</div>
+            </div>""")
+
+def _section_levels(sections):
+    """섹션 variants에 나오는 독자 수준 → 순번 (처음 나온 순서)"""
+    levels = {}
+    for section in sections:
+        for variant in section.get("variants") or []:
+            for level in variant or {}:
+                levels.setdefault(level, len(levels))
+    return levels
+
+def _level_switcher(levels):
+    """수준 전환 스타일 + 라디오 + 라벨 (첫 번째 수준이 기본 선택)"""
+    parts = [LEVEL_STYLE_OPEN.function()]
+    parts.extend(LEVEL_STYLE_RULE.function(index) for index in levels.values())
+    parts.append(LEVEL_STYLE_CLOSE.function())
+    parts.extend(LEVEL_RADIO.function(index, " checked" if index == 0 else "") for index in levels.values())
+    parts.append(LEVEL_SWITCHER_OPEN.function())
+    parts.extend(LEVEL_LABEL.function(index, _escape(level)) for level, index in levels.items())
+    parts.append(LEVEL_SWITCHER_CLOSE.function())
+    return "".join(parts)
+
+def _strip_prefix(text, prefix):
+    """Q:/A: 접두어 분리 (이스케이프해도 접두어와 공백은 그대로라 이스케이프된 값에 적용)"""
+    return text[len(prefix):].strip() if text.startswith(prefix) else text.strip()
+
+def render_summary_html(title, image_url, sections, file_html=True, streamlit_html=True):
+    """
+    섹션을 한 번만 순회하면서 파일용 HTML과 Streamlit용 HTML을 함께 생성
+
+    각 값은 한 번만 이스케이프해서 두 출력에 같이 씁니다.
+
+    :param title: Main title for the page
+    :param image_url: URL of the image to be placed below the main title
+    :param sections: List of dictionaries with title and bullets (html_generator와 동일).
+        섹션에 "variants"(bullet마다 {수준: (bold_text, normal_text)})가 있으면
+        수준 전환 버튼을 넣고 bullet마다 모든 수준을 렌더링합니다 (선택한 수준만 보임).
+    :param file_html: 파일용 HTML 생성 여부
+    :param streamlit_html: Streamlit용 HTML 생성 여부
+    :return: (file_html, streamlit_html) - 생성하지 않은 쪽은 None
+    """
+    file_parts = []
+    streamlit_parts = []
+    file_write = file_parts.append if file_html else None
+    streamlit_write = streamlit_parts.append if streamlit_html else None
+
+    # 반복문 안에서 쓰는 컴파일된 함수들
+    file_section = FILE_SECTION_OPEN.function
+    file_bullet = FILE_BULLET.function
+    streamlit_section = STREAMLIT_SECTION_OPEN.function
+    streamlit_bullet = STREAMLIT_BULLET.function
+    file_variant = FILE_VARIANT.function
+    streamlit_variant = STREAMLIT_VARIANT.function
+    escape_value = _escape
+
+    values = {"title": escape_value(title), "image_url": escape_value(image_url)}
+    if file_write:
+        FILE_HEAD.render_into(file_write, values)
+    if streamlit_write:
+        STREAMLIT_HEAD.render_into(streamlit_write, values)
+
+    levels = _section_levels(sections)
+    if levels:
+        switcher = _level_switcher(levels)
+        if file_write:
+            file_write(switcher)
+        if streamlit_write:
+            streamlit_write(switcher)
+
+    for section in sections:
+        section_title = escape_value(section.get("title", ""))
+        if file_write:
+            file_write(file_section(section_title))
+        if streamlit_write:
+            streamlit_write(streamlit_section(section_title))
+
+        variants = section.get("variants") or []
+        for position, (bold_text, normal_text) in enumerate(section.get("bullets", [])):
+            variant = variants[position] if position < len(variants) else None
+            if variant:
+                # 모든 수준을 넣고 CSS로 선택한 수준만 보여줌
+                if file_write:
+                    file_write("\n      <li>")
+                if streamlit_write:
+                    streamlit_write('\n        <li class="summary-item">')
+                for level, (level_bold, level_normal) in variant.items():
+                    level_bold = escape_value(level_bold)
+                    level_normal = escape_value(level_normal)
+                    if file_write:
+                        file_write(file_variant(levels[level], level_bold, level_normal))
+                    if streamlit_write:
+                        streamlit_write(streamlit_variant(levels[level], _strip_prefix(level_bold, "Q:"),
+                                                          _strip_prefix(level_normal, "A:")))
+                if file_write:
+                    file_write("\n      </li>")
+                if streamlit_write:
+                    streamlit_write("\n        </li>")
+                continue
+            bold_text = escape_value(bold_text)
+            normal_text = escape_value(normal_text)
+            if file_write:
+                file_write(file_bullet(bold_text, normal_text))
+            if streamlit_write:
+                # 이스케이프해도 Q:/A: 접두어와 공백은 그대로라 이스케이프된 값에서 분리
+                question = bold_text[2:].strip() if bold_text.startswith("Q:") else bold_text.strip()
+                answer = normal_text[2:].strip() if normal_text.startswith("A:") else normal_text.strip()
+                streamlit_write(streamlit_bullet(question, answer))
+
+        if file_write:
+            file_write(FILE_SECTION_CLOSE.function())
+        if streamlit_write:
+            streamlit_write(STREAMLIT_SECTION_CLOSE.function())
+
+    if levels and file_write:
+        file_write(LEVEL_CONTENT_CLOSE.function())
+    if levels and streamlit_write:
+        streamlit_write(LEVEL_CONTENT_CLOSE.function())
+    if file_write:
+        file_write(FILE_TAIL.function())
+    if streamlit_write:
+        streamlit_write(STREAMLIT_TAIL.function())
+
+    return (
+        "".join(file_parts) if file_html else None,
+        "".join(streamlit_parts) if streamlit_html else None
+    )
+
+def sections_from_topics(final_topics):
+    """
+    최종 주제 목록(ReviewAndCorrect 결과)을 html_generator용 섹션으로 변환
+
+    질문이나 답변이 비어 있는 Q&A와 Q&A가 없는 주제는 건너뜁니다.
+    Q&A에 수준별 버전("levels")이 있으면 섹션에 "variants"를 함께 넣습니다.
+    """
+    sections = []
+    for topic in final_topics:
+        qa_pairs = [qa for qa in topic.get("qa_pairs", [])
+                    if qa["kid_friendly_question"].strip() and qa["kid_friendly_answer"].strip()]
+        bullets = [(f"Q: {qa['kid_friendly_question']}", f"A: {qa['kid_friendly_answer']}") for qa in qa_pairs]
+        if bullets:
+            section = {"title": topic["title"], "bullets": bullets}
+            if any(qa.get("levels") for qa in qa_pairs):
+                section["variants"] = [
+                    {level: (f"Q: {pair['question']}", f"A: {pair['answer']}")
+                     for level, pair in (qa.get("levels") or {}).items()} or None
+                    for qa in qa_pairs
+                ]
+            sections.append(section)
+    return sections
+
+def html_generator(title, image_url, sections, offline=False, font_path=None):
+    """
+    Generates an HTML string with a handwriting style using Tailwind CSS.
+
+    :param title: Main title for the page ("Title 1").
+    :param image_url: URL of the image to be placed below the main title.
+    :param sections: A list of dictionaries, each containing:
+        {
+            "title": str (Title for the section e.g. "Title 2"),
+            "bullets": [
+                ("bold_text", "regular_text"),
+                ("bold_text_2", "regular_text_2"),
+                ...
+            ]
+        }
+        Values are HTML-escaped; wrap trusted HTML in Markup to keep it as is.
+    :param offline: True면 CDN 링크 대신 사용된 CSS만 인라인한 단일 파일 HTML 반환
+    :param font_path: offline일 때 base64로 임베드할 폰트 파일 (선택)
+    :return: A string of HTML content.
+    """
+    html = render_summary_html(title, image_url, sections, streamlit_html=False)[0]
+    if offline:
+        from .offline_export import make_offline_html
+        html = make_offline_html(html, font_path=font_path)[0]
+    return html
+
+def streamlit_html_generator(title, image_url, sections):
+    """
+    Streamlit용 HTML 조각 생성기 (CSS와 container 없이)
     
-    return html_fragment
+    :param title: Main title for the page
+    :param image_url: URL of the image to be placed below the main title
+    :param sections: List of dictionaries with title and bullets
+    :return: HTML fragment for Streamlit
+    """
+    return render_summary_html(title, image_url, sections, file_html=False)[1]
 
 if __name__ == "__main__":
     sections_data = [
@@ -273,7 +503,7 @@ if __name__ == "__main__":
         {
             "title": "Title 3",
             "bullets": [
-                ("First line of bullet 3", "More text in normal weight for bullet 3. <ol><li>1</li><li>2</li><li>3</li></ol>"),
+                ("First line of bullet 3", Markup("More text in normal weight for bullet 3. <ol><li>1</li><li>2</li><li>3</li></ol>")),
             ]
         }
     ]
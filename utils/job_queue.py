@@ -0,0 +1,473 @@
+import os
+import sys
+import copy
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from .env import load_env
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = "job_queue.db"
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_BACKOFF_BASE = 2.0
+MAX_BACKOFF_SECONDS = 600
+
+# 체크포인트에 넣지 않는 shared 키 (실행마다 새로 만드는 객체)
+TRANSIENT_KEYS = ("progress_callback", "stop_flag")
+
+# 상태: queued(대기) → leased(워커가 처리 중, lease_expires_at까지) → done / dead(재시도 한도 초과)
+# leased인데 임대가 만료되면 다른 워커가 다시 가져가서 마지막으로 끝난 단계 다음부터 이어서 실행
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    options TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    enqueued_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    stage TEXT,
+    action TEXT,
+    checkpoint TEXT,
+    started_at REAL,
+    finished_at REAL,
+    last_error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, enqueued_at);
+"""
+
+class LeaseLost(InterruptedError):
+    """임대가 만료되어 다른 워커가 작업을 가져감 (이 워커는 결과를 기록하지 않고 손을 뗌)"""
+
+class JobQueue:
+    """
+    SQLite 기반 영속 작업 대기열 (같은 머신의 여러 워커 프로세스가 함께 사용)
+
+    작업을 가져갈 때는 BEGIN IMMEDIATE 트랜잭션 안에서 우선순위가 가장 높은 작업 하나를
+    임대(lease)하므로 두 워커가 같은 작업을 동시에 잡지 않습니다. 워커가 죽어서 임대가
+    만료되면 다른 워커가 다시 임대하고, 단계마다 저장한 체크포인트부터 이어서 실행합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH)
+        self._lock = threading.Lock()
+        conn = self._connect()
+        try:
+            # WAL: 한 프로세스가 쓰는 동안 다른 프로세스가 읽을 수 있음
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # 트랜잭션은 직접 관리 (isolation_level=None + BEGIN IMMEDIATE)
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+
+    def enqueue(self, url, priority=0, options=None, max_attempts=None, delay=0):
+        """
+        작업 등록
+
+        Args:
+            priority: 클수록 먼저 처리 (같으면 먼저 들어온 순서)
+            options: {"offline": True} 같은 실행 옵션
+            delay: 이 시간(초)이 지난 뒤부터 처리
+
+        Returns:
+            str: 작업 ID
+        """
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        max_attempts = max_attempts or int(os.getenv("JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+        with self._transaction() as conn:
+            conn.execute("""
+                INSERT INTO jobs (id, url, options, priority, status, attempts, max_attempts, enqueued_at, available_at)
+                VALUES (?, ?, ?, ?, 'queued', 0, ?, ?, ?)
+            """, (job_id, url, json.dumps(options or {}, ensure_ascii=False), priority, max_attempts, now, now + delay))
+        return job_id
+
+    def lease(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        처리할 차례인 작업 하나를 임대 (없으면 None)
+
+        대기 중이거나 임대가 만료된 작업 중 우선순위가 가장 높은 것을 가져가고 시도 횟수를 올립니다.
+        임대가 만료된 작업이 이미 시도 한도를 다 썼으면 dead로 옮깁니다 (계속 워커를 죽이는 작업 격리).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute("""
+                    SELECT id, status, attempts, max_attempts, lease_owner FROM jobs
+                    WHERE (status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires_at <= ?)
+                    ORDER BY priority DESC, enqueued_at LIMIT 1
+                """, (now, now)).fetchone()
+                if row is None:
+                    return None
+                job_id, status, attempts, max_attempts, previous_owner = row
+                if status == "leased":
+                    logger.warning(f"작업 {job_id}: {previous_owner}의 임대 만료 (시도 {attempts}/{max_attempts})")
+                    if attempts >= max_attempts:
+                        conn.execute("""
+                            UPDATE jobs SET status = 'dead', finished_at = ?, lease_owner = NULL,
+                                last_error = COALESCE(last_error, '') || ? WHERE id = ?
+                        """, (now, f"[임대 만료: {previous_owner}]", job_id))
+                        continue
+                conn.execute("""
+                    UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                        attempts = attempts + 1, started_at = COALESCE(started_at, ?)
+                    WHERE id = ?
+                """, (worker_id, now + lease_seconds, now, job_id))
+                return self.get(job_id, conn=conn, include_checkpoint=True)
+
+    def heartbeat(self, job_id, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """임대 연장 (이미 다른 워커에게 넘어갔으면 False)"""
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + lease_seconds, job_id, worker_id)
+            ).rowcount
+        return updated == 1
+
+    def checkpoint(self, job_id, worker_id, stage, action, state, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        단계가 끝날 때마다 shared 상태 저장 (임대도 함께 연장)
+
+        Raises:
+            LeaseLost: 임대가 다른 워커에게 넘어감
+        """
+        data = json.dumps(state, ensure_ascii=False)
+        with self._transaction() as conn:
+            updated = conn.execute("""
+                UPDATE jobs SET stage = ?, action = ?, checkpoint = ?, lease_expires_at = ?
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            """, (stage, action, data, time.time() + lease_seconds, job_id, worker_id)).rowcount
+        if updated != 1:
+            raise LeaseLost(f"작업 {job_id}의 임대를 잃었습니다 ({stage} 완료 후)")
+
+    def complete(self, job_id, worker_id, result):
+        """처리 완료 (체크포인트는 지우고 결과만 남김)"""
+        with self._transaction() as conn:
+            updated = conn.execute("""
+                UPDATE jobs SET status = 'done', finished_at = ?, result = ?, checkpoint = NULL,
+                    lease_owner = NULL, lease_expires_at = NULL, last_error = NULL
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+            """, (time.time(), json.dumps(result, ensure_ascii=False), job_id, worker_id)).rowcount
+        return updated == 1
+
+    def fail(self, job_id, worker_id, error, backoff_base=DEFAULT_BACKOFF_BASE):
+        """
+        처리 실패: 시도 한도가 남았으면 지수 백오프 후 다시 대기, 아니면 dead
+
+        Returns:
+            str: 바뀐 상태 ("queued" / "dead", 임대를 이미 잃었으면 None)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+            attempts, max_attempts = row
+            status = "dead" if attempts >= max_attempts else "queued"
+            delay = min(backoff_base * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+            conn.execute("""
+                UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL,
+                    lease_expires_at = NULL, finished_at = CASE WHEN ? = 'dead' THEN ? END
+                WHERE id = ?
+            """, (status, now + delay, error, status, now, job_id))
+        return status
+
+    def requeue(self, job_id, reset_progress=False):
+        """dead 작업을 다시 대기열로 (시도 횟수 초기화, reset_progress면 처음 단계부터)"""
+        with self._transaction() as conn:
+            updated = conn.execute(f"""
+                UPDATE jobs SET status = 'queued', attempts = 0, available_at = ?, finished_at = NULL
+                    {", stage = NULL, action = NULL, checkpoint = NULL" if reset_progress else ""}
+                WHERE id = ? AND status = 'dead'
+            """, (time.time(), job_id)).rowcount
+        return updated == 1
+
+    def get(self, job_id, conn=None, include_checkpoint=False):
+        """작업 조회 (체크포인트는 요청할 때만 읽음)"""
+        columns = ("id", "url", "options", "priority", "status", "attempts", "max_attempts", "enqueued_at",
+                   "lease_owner", "lease_expires_at", "stage", "action", "started_at", "finished_at",
+                   "last_error", "result") + (("checkpoint",) if include_checkpoint else ())
+        own = conn is None
+        conn = conn or self._connect()
+        try:
+            row = conn.execute(f"SELECT {', '.join(columns)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            if own:
+                conn.close()
+        if row is None:
+            return None
+        job = dict(zip(columns, row))
+        for name in ("options", "result", "checkpoint"):
+            if job.get(name):
+                job[name] = json.loads(job[name])
+        return job
+
+    def list(self, status=None, limit=100):
+        """작업 목록 (status를 주면 그 상태만, 우선순위/등록 순)"""
+        conn = self._connect()
+        try:
+            query = "SELECT id FROM jobs" + (" WHERE status = ?" if status else "")
+            query += " ORDER BY priority DESC, enqueued_at LIMIT ?"
+            ids = [row[0] for row in conn.execute(query, ((status,) if status else ()) + (limit,))]
+            return [self.get(job_id, conn=conn) for job_id in ids]
+        finally:
+            conn.close()
+
+    def active_urls(self):
+        """대기 중이거나 처리 중인 작업의 URL 집합 (같은 영상을 두 번 넣지 않도록)"""
+        conn = self._connect()
+        try:
+            return {row[0] for row in conn.execute("SELECT url FROM jobs WHERE status IN ('queued', 'leased')")}
+        finally:
+            conn.close()
+
+    def dead_letters(self, limit=100):
+        """재시도 한도를 넘긴 작업들"""
+        return self.list("dead", limit)
+
+    def stats(self):
+        """상태별 작업 수 + 가장 오래 기다린 대기 작업의 대기 시간"""
+        conn = self._connect()
+        try:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            oldest = conn.execute("SELECT MIN(enqueued_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            **{status: counts.get(status, 0) for status in ("queued", "leased", "done", "dead")},
+            "oldest_queued_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+        }
+
+def _find_node(flow, stage):
+    """Flow 그래프에서 클래스 이름이 stage인 노드 찾기"""
+    pending, seen = [flow.start_node], set()
+    while pending:
+        node = pending.pop(0)
+        if node is None or id(node) in seen:
+            continue
+        if type(node).__name__ == stage:
+            return node
+        seen.add(id(node))
+        pending.extend(node.successors.values())
+    raise ValueError(f"Flow에 {stage} 노드가 없습니다")
+
+def run_resumable(flow, shared, on_stage_done, stage=None, action=None):
+    """
+    Flow를 노드 단위로 실행하면서 노드가 끝날 때마다 on_stage_done(노드 이름, action, shared) 호출
+
+    stage가 주어지면 그 노드가 이미 끝났다고 보고, 그 노드의 action이 가리키는 다음 노드부터 실행합니다.
+    (Flow._orch와 같은 순서/복사 규칙, 체크포인트 지점만 추가)
+    """
+    if stage:
+        curr = flow.get_next_node(_find_node(flow, stage), action)
+    else:
+        curr = flow.start_node
+    last_action = action
+    while curr:
+        node = copy.copy(curr)
+        node.set_params({**flow.params})
+        last_action = node._run(shared)
+        on_stage_done(type(curr).__name__, last_action, shared)
+        curr = flow.get_next_node(curr, last_action)
+    return last_action
+
+def checkpoint_state(shared):
+    """체크포인트로 저장할 shared 상태 (실행마다 새로 만드는 객체 제외)"""
+    return {name: value for name, value in shared.items() if name not in TRANSIENT_KEYS}
+
+class _StopFlag:
+    def __init__(self):
+        self.should_stop = False
+
+class QueueWorker:
+    """
+    대기열에서 작업을 하나씩 임대해서 Flow를 실행하는 워커
+
+    실행 중에는 백그라운드 스레드가 임대를 연장하고, 임대를 잃으면 stop_flag로 다음 노드
+    시작 전에 멈춥니다. 각 노드가 끝나면 shared를 체크포인트로 저장하므로 워커가 죽어도
+    다음 워커는 마지막으로 끝난 노드 다음부터 실행합니다.
+    """
+
+    def __init__(self, queue, flow_factory=None, worker_id=None, lease_seconds=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL, backoff_base=DEFAULT_BACKOFF_BASE):
+        self.queue = queue
+        self.flow_factory = flow_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds or float(os.getenv("JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS))
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self._flow = None
+        self._stop = threading.Event()
+
+    @property
+    def flow(self):
+        if self._flow is None:
+            if self.flow_factory is None:
+                from flow import create_youtube_processor_flow
+                self.flow_factory = create_youtube_processor_flow
+            self._flow = self.flow_factory()
+        return self._flow
+
+    def run_once(self):
+        """작업 하나를 임대해서 처리 (처리한 작업 ID, 없으면 None)"""
+        job = self.queue.lease(self.worker_id, self.lease_seconds)
+        if job is None:
+            return None
+        self.process(job)
+        return job["id"]
+
+    def process(self, job):
+        job_id = job["id"]
+        resumed = f", {job['stage']} 다음부터 이어서" if job["stage"] else ""
+        logger.info(f"작업 {job_id} 시작 (시도 {job['attempts']}/{job['max_attempts']}{resumed}): {job['url']}")
+
+        stop_flag = _StopFlag()
+        shared = {
+            **(job.get("checkpoint") or {}),
+            "url": job["url"],
+            "offline_html": bool(job["options"].get("offline")),
+            "stop_flag": stop_flag,
+            "progress_callback": lambda stage, message, progress=None: logger.debug(f"[{job_id}] {stage}: {message}"),
+        }
+
+        done_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, stop_flag, done_heartbeat),
+                                     name=f"job-heartbeat-{job_id}", daemon=True)
+        heartbeat.start()
+        try:
+            run_resumable(
+                self.flow, shared,
+                lambda stage, action, state: self.queue.checkpoint(
+                    job_id, self.worker_id, stage, action, checkpoint_state(state), self.lease_seconds),
+                stage=job["stage"], action=job["action"],
+            )
+        except InterruptedError as e:
+            # 임대를 잃었거나 종료 요청: 결과를 기록하지 않음 (임대가 만료되면 다른 워커가 이어서 처리)
+            logger.warning(f"작업 {job_id} 중단: {e}")
+            return
+        except Exception as e:
+            status = self.queue.fail(job_id, self.worker_id, str(e), self.backoff_base)
+            logger.warning(f"작업 {job_id} 실패 → {status}: {e}")
+            return
+        finally:
+            done_heartbeat.set()
+            heartbeat.join()
+
+        result = {
+            "run_id": shared.get("run_id"),
+            "output_files": shared.get("output_files", {}),
+            "topics": len(shared.get("final_topics", [])),
+        }
+        if self.queue.complete(job_id, self.worker_id, result):
+            logger.info(f"작업 {job_id} 완료: {result['output_files'].get('html')}")
+
+    def _heartbeat(self, job_id, stop_flag, done):
+        while not done.wait(self.lease_seconds / 3):
+            if self._stop.is_set() or not self.queue.heartbeat(job_id, self.worker_id, self.lease_seconds):
+                stop_flag.should_stop = True
+                return
+
+    def run(self, max_jobs=None, exit_when_empty=False):
+        """stop()이 불리거나 max_jobs개를 처리할 때까지 대기열 처리 (처리한 작업 수 반환)"""
+        processed = 0
+        while not self._stop.is_set() and (max_jobs is None or processed < max_jobs):
+            if self.run_once():
+                processed += 1
+            elif exit_when_empty:
+                break
+            else:
+                self._stop.wait(self.poll_interval)
+        return processed
+
+    def stop(self):
+        self._stop.set()
+
+def _worker_process(path, exit_when_empty):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s')
+    QueueWorker(JobQueue(path)).run(exit_when_empty=exit_when_empty)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite 작업 대기열 (우선순위, 임대, 재시도, dead-letter, 단계별 이어서 실행)")
+    parser.add_argument("--db", default=None, help=f"대기열 파일 (기본 JOB_QUEUE_PATH 또는 {DEFAULT_QUEUE_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="작업 등록")
+    enqueue.add_argument("urls", nargs="+")
+    enqueue.add_argument("--priority", type=int, default=0)
+    enqueue.add_argument("--offline", action="store_true")
+
+    worker = commands.add_parser("worker", help="워커 실행")
+    worker.add_argument("--processes", type=int, default=1, help="워커 프로세스 수")
+    worker.add_argument("--exit-when-empty", action="store_true")
+
+    commands.add_parser("stats", help="상태별 작업 수")
+    dead = commands.add_parser("dead", help="dead-letter 목록")
+    dead.add_argument("--requeue", nargs="*", metavar="JOB_ID", help="다시 대기열에 넣을 작업 (없으면 전부)")
+    args = parser.parse_args(argv)
+
+    # JOB_QUEUE_PATH, JOB_MAX_ATTEMPTS 등을 읽기 전에 .env 로드
+    load_env()
+    queue = JobQueue(args.db)
+    if args.command == "enqueue":
+        for url in args.urls:
+            print(queue.enqueue(url, priority=args.priority, options={"offline": args.offline}))
+    elif args.command == "worker":
+        if args.processes == 1:
+            _worker_process(queue.path, args.exit_when_empty)
+        else:
+            import multiprocessing
+            processes = [multiprocessing.Process(target=_worker_process, args=(queue.path, args.exit_when_empty),
+                                                 name=f"job-worker-{i}") for i in range(args.processes)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+    elif args.command == "stats":
+        print(json.dumps(queue.stats(), ensure_ascii=False))
+    elif args.command == "dead":
+        jobs = queue.dead_letters()
+        if args.requeue is not None:
+            for job_id in args.requeue or [job["id"] for job in jobs]:
+                print(f"{job_id}: {'다시 대기' if queue.requeue(job_id) else '대상 아님'}")
+        else:
+            for job in jobs:
+                print(f"{job['id']}  시도 {job['attempts']}/{job['max_attempts']}  {job['url']}  {job['last_error']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,52 @@
-from .call_llm import call_llm, call_llm_mock
+from .model_router import call_llm_for_stage
+from .vocabulary_lexicon import get_lexicon, LEVEL_NAMES, LEVEL_AGES
+from .response_parser import extract_json
 import os
+import re
+
+# 여러 수준을 한 프롬프트로 만들 때 수준별 작성 지침
+LEVEL_GUIDES = {
+    "5살": "아주 쉬운 낱말, 한 문장에 한 가지 생각, 동물/장난감/일상 비유",
+    "초등학생": "교과서 수준의 쉬운 말과 짧은 문장, 생활 속 예시",
+    "중학생": "기본 개념어는 그대로 쓰고 원리를 한두 문장으로 설명",
+    "고등학생": "전문 용어를 쓰되 처음 나올 때 뜻을 함께 설명",
+    "성인": "원래 내용을 정확하고 간결하게",
+}
+
+def level_age(level: str) -> int:
+    """등급 이름("초등학생") → 대표 연령"""
+    for number, name in LEVEL_NAMES.items():
+        if name == level:
+            return LEVEL_AGES[number]
+    raise ValueError(f"알 수 없는 독자 수준: {level}")
+
+def score_kid_friendly_text(text: str, target_age: int = 5) -> float:
+    """
+    아이 친화적 변환 결과의 간단한 품질 점수 (캐스케이드 검증용)
+    
+    Returns:
+        0.0 ~ 1.0 점수 (오류 응답/빈 응답은 0점, 짧은 문장 비율이 높고
+        쉬운 표현으로 바꿀 수 없는 어려운 단어가 적을수록 높은 점수)
+    """
+    if not text or not text.strip() or text.startswith(("❌", "⚠️")):
+        return 0.0
+    
+    # 한국어로 답해야 하므로 한글이 없으면 실패
+    if not re.search(r'[가-힣]', text):
+        return 0.0
+    
+    sentences = [s for s in re.split(r'[.!?\n]+', text) if s.strip()]
+    if not sentences:
+        return 0.0
+    
+    short_sentences = sum(1 for s in sentences if len(s.strip()) <= 60)
+    
+    # 쉬운 표현이 있는 단어는 나중에 자동 치환되므로 감점하지 않음
+    analysis = get_lexicon().analyze(text, target_age)
+    unreplaced_ratio = len(analysis["unreplaced_words"]) / max(analysis["word_count"], 1)
+    vocabulary_score = max(0.0, 1.0 - unreplaced_ratio * 5)
+    
+    return short_sentences / len(sentences) * vocabulary_score
 
 def convert_to_kid_friendly(text: str, target_age: int = 5, use_mock: bool = False) -> str:
     """
@@ -13,6 +60,11 @@ def convert_to_kid_friendly(text: str, target_age: int = 5, use_mock: bool = Fal
     Returns:
         아이 친화적으로 변환된 텍스트
     """
+    # 이미 대상 연령 수준의 한국어면 LLM 호출 없이 그대로 사용 (영어 등은 짧아도 번역해야 함)
+    lexicon = get_lexicon()
+    if not text.strip() or lexicon.analyze(text, target_age)["meets_target"]:
+        return text.strip()
+    
     # API 키가 없으면 자동으로 Mock 사용
     if not os.getenv("OPENAI_API_KEY"):
         use_mock = True
@@ -37,51 +89,126 @@ def convert_to_kid_friendly(text: str, target_age: int = 5, use_mock: bool = Fal
 """
     
     try:
-        if use_mock:
-            response = call_llm_mock(prompt)
-        else:
-            response = call_llm(prompt, model="gpt-4")
-        return response.strip()
+        response = call_llm_for_stage(
+            "kid_friendly",
+            prompt,
+            validator=lambda response: score_kid_friendly_text(response, target_age),
+            use_mock=use_mock
+        )
+        # LLM 결과에 남은 어려운 단어는 사전으로 한 번에 치환
+        return lexicon.simplify(response.strip(), target_age)
     except Exception as e:
         print(f"Error converting to kid-friendly: {e}")
         return text  # 실패 시 원본 텍스트 반환
 
-def simplify_vocabulary(text: str) -> str:
+def _levels_prompt(topic_title, qa_pairs, levels):
+    numbered = "\n".join(f"{i}. Q: {qa['question']}\n   A: {qa['answer']}" for i, qa in enumerate(qa_pairs, 1))
+    guides = "\n".join(f"- {level}: {LEVEL_GUIDES[level]}" for level in levels)
+    example = ",\n".join(f'        "{level}": [{{"question": "...", "answer": "..."}}]' for level in levels)
+    return f"""
+다음 주제의 질문-답변 {len(qa_pairs)}개를 여러 독자 수준에 맞게 각각 다시 써주세요.
+대상 수준: {", ".join(levels)}
+{guides}
+
+**중요**: 입력 언어가 무엇이든 관계없이 반드시 한국어로 작성해주세요.
+
+주제: {topic_title}
+
+질문-답변:
+{numbered}
+
+다음 JSON 형식으로만 응답해주세요 (다른 설명 없이, 수준마다 위와 같은 순서로 {len(qa_pairs)}개):
+```json
+{{
+    "levels": {{
+{example}
+    }}
+}}
+```
+"""
+
+def _parse_levels(response, levels, count):
+    """응답 → {수준: [{"question", "answer"}] 또는 None(개수/필드가 맞지 않음)}"""
+    data = extract_json(response)
+    data = data.get("levels", data) if isinstance(data, dict) else {}
+    parsed = {}
+    for level in levels:
+        items = data.get(level) if isinstance(data, dict) else None
+        valid = isinstance(items, list) and len(items) == count and all(
+            isinstance(item, dict) and str(item.get("question", "")).strip() and str(item.get("answer", "")).strip()
+            for item in items
+        )
+        parsed[level] = items if valid else None
+    return parsed
+
+def convert_for_levels(topic_title: str, qa_pairs: list, levels: list, use_mock: bool = False) -> list:
+    """
+    한 주제의 Q&A를 여러 독자 수준으로 한 번에 변환
+
+    수준마다, 항목마다 따로 요청하지 않고 주제 하나당 프롬프트 하나로 모든 수준을 함께 받습니다.
+    원문이 이미 그 수준에 맞으면 그 수준은 프롬프트에서 빼고 원문을 쓰며 (보통 "성인"),
+    응답에서 빠졌거나 형식이 틀린 수준만 convert_to_kid_friendly로 하나씩 다시 만듭니다.
+
+    Args:
+        topic_title: 주제 제목
+        qa_pairs: [{"question", "answer"}]
+        levels: 등급 이름 목록 (예: ["5살", "초등학생", "중학생"])
+        use_mock: True면 LLM 없이 어휘 사전 치환만
+
+    Returns:
+        qa_pairs와 같은 순서의 [{수준: {"question", "answer"}}]
+    """
+    lexicon = get_lexicon()
+    if not qa_pairs or not levels:
+        return [{} for _ in qa_pairs]
+
+    # API 키가 없으면 자동으로 Mock 사용
+    if not os.getenv("OPENAI_API_KEY"):
+        use_mock = True
+
+    def meets(level):
+        age = level_age(level)
+        return all(lexicon.analyze(qa[field], age)["meets_target"] for qa in qa_pairs for field in ("question", "answer"))
+
+    pending = [level for level in levels if not use_mock and not meets(level)]
+    parsed = {}
+    if pending:
+        def score(response):
+            result = _parse_levels(response, pending, len(qa_pairs))
+            if any(items is None for items in result.values()):
+                return 0.0
+            scores = [score_kid_friendly_text(item["answer"], level_age(level))
+                      for level, items in result.items() for item in items]
+            return sum(scores) / len(scores)
+
+        try:
+            response = call_llm_for_stage("kid_friendly", _levels_prompt(topic_title, qa_pairs, pending),
+                                          json_mode=True, validator=score, use_mock=use_mock)
+            parsed = _parse_levels(response, pending, len(qa_pairs))
+        except Exception as e:
+            print(f"Error converting to levels: {e}")
+
+    versions = [{} for _ in qa_pairs]
+    for level in levels:
+        age = level_age(level)
+        items = parsed.get(level)
+        for i, qa in enumerate(qa_pairs):
+            if items:
+                question, answer = str(items[i]["question"]).strip(), str(items[i]["answer"]).strip()
+            elif level in pending:
+                # 묶음 응답에서 빠진 수준만 하나씩 다시 변환
+                question = convert_to_kid_friendly(qa["question"], target_age=age, use_mock=use_mock)
+                answer = convert_to_kid_friendly(qa["answer"], target_age=age, use_mock=use_mock)
+            else:
+                question, answer = qa["question"].strip(), qa["answer"].strip()
+            versions[i][level] = {"question": lexicon.simplify(question, age), "answer": lexicon.simplify(answer, age)}
+    return versions
+
+def simplify_vocabulary(text: str, target_age: int = 5) -> str:
     """
-    어려운 단어를 쉬운 단어로 대체
+    어려운 단어를 쉬운 단어로 대체 (등급별 어휘 사전으로 한 번에 치환)
     """
-    # 일반적인 어려운 단어 -> 쉬운 단어 매핑
-    word_mappings = {
-        "인공지능": "똑똑한 컴퓨터",
-        "AI": "똑똑한 컴퓨터",
-        "머신러닝": "컴퓨터 학습",
-        "딥러닝": "컴퓨터가 깊게 생각하기",
-        "알고리즘": "컴퓨터가 문제를 푸는 방법",
-        "데이터": "정보",
-        "빅데이터": "아주 많은 정보",
-        "클라우드": "인터넷 창고",
-        "프로그래밍": "컴퓨터에게 일 시키기",
-        "소프트웨어": "컴퓨터 프로그램",
-        "하드웨어": "컴퓨터 부품",
-        "기술": "새로운 도구",
-        "혁신": "새롭고 좋은 변화",
-        "개발": "만들기",
-        "구현": "실제로 만들기",
-        "최적화": "더 좋게 만들기",
-        "효율적": "빠르고 좋은",
-        "분석": "자세히 살펴보기",
-        "시스템": "큰 기계",
-        "프로세스": "순서대로 하는 일",
-        "인터페이스": "사용하는 방법",
-        "플랫폼": "기본 바탕",
-        "네트워크": "연결된 길"
-    }
-    
-    simplified_text = text
-    for difficult_word, easy_word in word_mappings.items():
-        simplified_text = simplified_text.replace(difficult_word, easy_word)
-    
-    return simplified_text
+    return get_lexicon().simplify(text, target_age)
 
 def add_friendly_examples(text: str, use_mock: bool = False) -> str:
     """
@@ -104,10 +231,7 @@ def add_friendly_examples(text: str, use_mock: bool = False) -> str:
 """
     
     try:
-        if use_mock:
-            response = call_llm_mock(prompt)
-        else:
-            response = call_llm(prompt, model="gpt-4")
+        response = call_llm_for_stage("kid_friendly", prompt, use_mock=use_mock)
         return response.strip()
     except Exception as e:
         print(f"Error adding friendly examples: {e}")
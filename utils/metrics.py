@@ -0,0 +1,384 @@
+import os
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 기본 구간 (초) - 관측값은 이 경계 중 처음으로 크거나 같은 구간에 들어감
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _CounterChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        if amount < 0:
+            raise ValueError("카운터는 줄일 수 없습니다")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = float(value)
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    @contextmanager
+    def track_inprogress(self):
+        """with 블록이 실행되는 동안 1 증가"""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+    @property
+    def value(self):
+        return self._value
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self._buckets = buckets
+        # 구간별 개수 (누적 아님, 마지막 칸이 +Inf) - 관측 한 번은 이분 탐색 + 덧셈 두 번
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self):
+        """with 블록의 실행 시간(초)을 관측"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time)
+
+    @property
+    def count(self):
+        return sum(self._counts)
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def cumulative(self):
+        """[(상한, 누적 개수)] (마지막은 +Inf)"""
+        with self._lock:
+            counts = list(self._counts)
+        result, total = [], 0
+        for bound, count in zip(list(self._buckets) + [float("inf")], counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **labels):
+        """레이블 값별 시계열 (처음 쓸 때 만들고 이후에는 사전 조회 한 번)"""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 레이블 {self.labelnames}가 필요합니다")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name}: 레이블 {self.labelnames}가 필요합니다 (labels() 사용)")
+        return self.labels()
+
+    def get(self, **labels):
+        """레이블에 해당하는 현재 값 (없으면 None, 테스트/화면 표시용)"""
+        child = self._children.get(tuple(str(labels[name]) for name in self.labelnames))
+        if child is None:
+            return None
+        return child.count if isinstance(child, _HistogramChild) else child.value
+
+    def samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+    def samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+                for key, child in sorted(self._children.items())]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+    def dec(self, amount=1):
+        self._default().dec(amount)
+
+    def samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+                for key, child in sorted(self._children.items())]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def samples(self):
+        lines = []
+        for key, child in sorted(self._children.items()):
+            total = 0
+            for bound, total in child.cumulative():
+                le = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {total}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {total}")  # +Inf 구간의 누적 개수와 항상 같게
+        return lines
+
+class MetricsRegistry:
+    """
+    프로세스 안의 카운터/게이지/히스토그램 모음 (Prometheus 텍스트 형식으로 내보내기)
+
+    같은 이름으로 다시 등록하면 기존 메트릭을 돌려주므로 모듈 어디서든 선언해도 됩니다.
+    관측은 시계열별 잠금 하나만 잡고, 문자열 변환은 render()할 때만 합니다.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **options)
+                if not metric.labelnames:
+                    metric.labels()  # 레이블 없는 메트릭은 처음부터 0으로 노출
+                self._metrics[name] = metric
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"메트릭 {name}이 다른 종류/레이블로 이미 등록되어 있습니다")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for _, metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+_registry = MetricsRegistry()
+
+def get_registry():
+    """프로세스 전체에서 공유하는 메트릭 레지스트리"""
+    return _registry
+
+# 파이프라인 공통 메트릭 (call_llm, Flow 노드, get_video_info, save_to_notion에서 기록)
+LLM_REQUESTS = _registry.counter(
+    "llm_requests_total", "OpenAI API 요청 수 (outcome: ok/error/no_api_key)", ("model", "outcome"))
+LLM_LATENCY = _registry.histogram(
+    "llm_request_duration_seconds", "OpenAI API 요청 시간 (SDK 재시도 포함)", ("model",), buckets=LLM_BUCKETS)
+LLM_RETRIES = _registry.counter(
+    "llm_retries_total", "LLM 재시도 수 (reason: sdk=429/5xx/연결 오류 자동 재시도, json_fallback=JSON 모드 미지원)",
+    ("model", "reason"))
+LLM_TOKENS = _registry.counter("llm_tokens_total", "LLM 토큰 사용량", ("model", "type"))
+
+STAGE_RUNS = _registry.counter(
+    "pipeline_stage_runs_total", "Flow 노드 실행 수 (outcome: ok/error/cancelled)", ("stage", "outcome"))
+STAGE_DURATION = _registry.histogram(
+    "pipeline_stage_duration_seconds", "Flow 노드 실행 시간 (prep+exec+post, 노드 재시도 포함)", ("stage",),
+    buckets=STAGE_BUCKETS)
+STAGES_IN_PROGRESS = _registry.gauge("pipeline_stages_in_progress", "지금 실행 중인 Flow 노드 수", ("stage",))
+
+VIDEO_FETCHES = _registry.counter("youtube_fetches_total", "비디오 정보/자막 조회 수 (outcome: ok/error)", ("outcome",))
+VIDEO_FETCH_DURATION = _registry.histogram(
+    "youtube_fetch_duration_seconds", "비디오 정보/자막 조회 시간", buckets=LLM_BUCKETS)
+
+NOTION_SAVES = _registry.counter("notion_saves_total", "노션 페이지 저장 수 (outcome: ok/error)", ("outcome",))
+NOTION_SAVE_DURATION = _registry.histogram(
+    "notion_save_duration_seconds", "노션 페이지 저장 시간 (블록 추가, 429 대기 포함)", buckets=LLM_BUCKETS)
+NOTION_RATE_LIMITED = _registry.counter("notion_rate_limited_total", "노션 429 응답 후 재시도 수")
+NOTION_OUTBOX_DEPTH = _registry.gauge("notion_outbox_queue_depth", "노션 저장 대기열에 남은 항목 수")
+
+CACHE_LOOKUPS = _registry.counter(
+    "cache_lookups_total", "캐시 조회 수 (cache: result/notion_schema, result: hit/miss)", ("cache", "result"))
+
+@contextmanager
+def track_stage(stage):
+    """노드 실행 한 번의 시간/결과/동시 실행 수 기록 (InterruptedError는 cancelled)"""
+    outcome = "error"
+    with STAGES_IN_PROGRESS.labels(stage).track_inprogress(), STAGE_DURATION.labels(stage).time():
+        try:
+            yield
+            outcome = "ok"
+        except InterruptedError:
+            outcome = "cancelled"
+            raise
+        finally:
+            STAGE_RUNS.labels(stage, outcome).inc()
+
+def write_metrics_file(path, registry=None):
+    """
+    현재 메트릭을 파일로 저장 (node_exporter textfile collector 형식, 한 번 실행하고 끝나는 CLI용)
+
+    원자적으로 바꿔치기하므로 수집기가 쓰다 만 파일을 읽지 않습니다.
+    """
+    from .output_store import atomic_write
+    atomic_write(path, (registry or _registry).render())
+    return path
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(port=None, host=None, registry=None):
+    """
+    GET /metrics를 응답하는 백그라운드 HTTP 서버 (프로세스당 하나, 이미 떠 있으면 그대로 반환)
+
+    Streamlit처럼 경로를 직접 추가할 수 없는 앱에서 Prometheus가 긁어 갈 수 있게 합니다.
+
+    환경변수:
+    - METRICS_PORT: 포트 (기본 9100)
+    - METRICS_HOST: 바인드 주소 (기본 127.0.0.1)
+    """
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+                registry = registry or _registry
+
+                class Handler(BaseHTTPRequestHandler):
+                    def do_GET(self):
+                        if self.path.split("?")[0] not in ("/metrics", "/"):
+                            self.send_error(404)
+                            return
+                        body = registry.render().encode("utf-8")
+                        self.send_response(200)
+                        self.send_header("Content-Type", CONTENT_TYPE)
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+
+                    def log_message(self, format, *args):
+                        pass
+
+                host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+                port = int(port if port is not None else os.getenv("METRICS_PORT", 9100))
+                server = ThreadingHTTPServer((host, port), Handler)
+                server.daemon_threads = True
+                threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+                logger.info(f"메트릭 서버 시작: http://{host}:{server.server_address[1]}/metrics")
+                _server = server
+    return _server
+
+def main():
+    """테스트용 함수"""
+    LLM_REQUESTS.labels("gpt-4o", "ok").inc()
+    LLM_LATENCY.labels("gpt-4o").observe(1.3)
+    with track_stage("ExtractTopics"):
+        time.sleep(0.01)
+    print(get_registry().render())
+
+if __name__ == "__main__":
+    main()
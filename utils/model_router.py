@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from .call_llm import call_llm_with_usage, call_llm_mock
+
+logger = logging.getLogger(__name__)
+
+# 단계별 기본 모델 (모든 단계에 gpt-4를 쓰던 것을 용도에 맞게 분리)
+DEFAULT_ROUTING = {
+    "topics": {"model": "gpt-4o", "cascade": False},
+    "qa": {"model": "gpt-4o", "cascade": False},
+    "kid_friendly": {"model": "gpt-4o", "cascade": True},
+    "review": {"model": "gpt-4o", "cascade": False},
+    "correction": {"model": "gpt-4o-mini", "cascade": False},
+    "summary": {"model": "gpt-4o-mini", "cascade": False},
+}
+
+DEFAULT_CHEAP_MODEL = "gpt-4o-mini"
+DEFAULT_CASCADE_THRESHOLD = 0.7
+
+# 1M 토큰당 USD 가격 (입력, 출력)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+_routing = None
+_routing_lock = threading.Lock()
+# 프로세스 전체 누적 (벤치마크/지표용) + 지금 실행 중인 Flow의 통계 (recording_stage_stats)
+_stats = {}
+_stats_lock = threading.Lock()
+_run_stats = contextvars.ContextVar("llm_run_stats", default=None)
+
+def _load_routing_file(path):
+    """JSON 또는 YAML 라우팅 파일 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            data = yaml.safe_load(f) or {}
+        else:
+            data = json.load(f)
+    return data.get("stages", data)
+
+def load_routing(path=None):
+    """
+    단계별 라우팅 테이블 구성
+
+    우선순위: 환경변수 > 라우팅 파일 > 기본값
+
+    환경변수:
+    - LLM_ROUTING_FILE: 라우팅 파일 경로 (JSON/YAML, {"stages": {"qa": {"model": ...}}})
+    - LLM_MODEL_<STAGE>: 단계별 모델 (예: LLM_MODEL_KID_FRIENDLY=gpt-4o-mini)
+    - LLM_CASCADE / LLM_CASCADE_<STAGE>: 캐스케이드 사용 여부 (1/0)
+    - LLM_CHEAP_MODEL: 캐스케이드에서 먼저 시도할 저렴한 모델
+
+    Returns:
+        {stage: {"model", "cheap_model", "cascade", "threshold"}}
+    """
+    routing = {stage: dict(config) for stage, config in DEFAULT_ROUTING.items()}
+
+    path = path or os.getenv("LLM_ROUTING_FILE")
+    if path:
+        try:
+            for stage, config in _load_routing_file(path).items():
+                routing.setdefault(stage, {}).update(config or {})
+        except Exception as e:
+            logger.warning(f"라우팅 파일 로드 실패 ({path}): {e}")
+
+    global_cascade = os.getenv("LLM_CASCADE")
+    cheap_model = os.getenv("LLM_CHEAP_MODEL")
+
+    for stage, config in routing.items():
+        env_key = stage.upper()
+        config["model"] = os.getenv(f"LLM_MODEL_{env_key}", config.get("model", DEFAULT_CHEAP_MODEL))
+        config["cheap_model"] = cheap_model or config.get("cheap_model", DEFAULT_CHEAP_MODEL)
+        config["threshold"] = float(config.get("threshold", DEFAULT_CASCADE_THRESHOLD))
+
+        cascade = os.getenv(f"LLM_CASCADE_{env_key}", global_cascade)
+        if cascade is not None:
+            config["cascade"] = cascade.lower() in ("1", "true", "yes", "on")
+        config["cascade"] = bool(config.get("cascade", False))
+
+    return routing
+
+def get_routing():
+    """라우팅 테이블 (처음 한 번만 로드)"""
+    global _routing
+    if _routing is None:
+        with _routing_lock:
+            if _routing is None:
+                _routing = load_routing()
+    return _routing
+
+def reload_routing(path=None):
+    """설정 변경 후 라우팅 테이블 다시 로드"""
+    global _routing
+    with _routing_lock:
+        _routing = load_routing(path)
+    return _routing
+
+def get_stage_config(stage):
+    """단계 설정 조회 (알 수 없는 단계는 저렴한 모델 사용)"""
+    routing = get_routing()
+    if stage not in routing:
+        return {"model": DEFAULT_CHEAP_MODEL, "cheap_model": DEFAULT_CHEAP_MODEL,
+                "cascade": False, "threshold": DEFAULT_CASCADE_THRESHOLD}
+    return routing[stage]
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """토큰 사용량으로 비용(USD) 추정"""
+    input_price, output_price = MODEL_PRICES.get(model, MODEL_PRICES[DEFAULT_CHEAP_MODEL])
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+@contextmanager
+def recording_stage_stats(stats):
+    """
+    이 블록 안의 LLM 호출을 stats(실행별 dict, JSON으로 저장 가능)에도 기록
+
+    동시에 도는 Flow들이 서로의 호출을 섞지 않도록 Flow 노드가 shared["llm_stage_stats"]로 감쌉니다.
+    스레드 풀 작업에는 propagate_stage_stats()로 넘깁니다.
+    """
+    token = _run_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _run_stats.reset(token)
+
+def propagate_stage_stats(fn):
+    """스레드 풀에서 실행할 함수가 호출한 스레드의 실행별 통계에 기록하도록 감쌈"""
+    stats = _run_stats.get()
+
+    def wrapper(*args, **kwargs):
+        with recording_stage_stats(stats):
+            return fn(*args, **kwargs)
+    return wrapper
+
+def _record(stage, model, latency, usage, escalated=False):
+    with _stats_lock:
+        _accumulate(_stats, stage, model, latency, usage, escalated)
+        run_stats = _run_stats.get()
+        if run_stats is not None:
+            _accumulate(run_stats, stage, model, latency, usage, escalated)
+
+def _accumulate(stats, stage, model, latency, usage, escalated):
+    stage_stats = stats.setdefault(stage, {
+        "calls": 0,
+        "escalations": 0,
+        "total_latency": 0.0,
+        "max_latency": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cost_usd": 0.0,
+        "models": {},
+    })
+    stage_stats["calls"] += 1
+    stage_stats["escalations"] += int(escalated)
+    stage_stats["total_latency"] += latency
+    stage_stats["max_latency"] = max(stage_stats["max_latency"], latency)
+    stage_stats["prompt_tokens"] += usage["prompt_tokens"]
+    stage_stats["completion_tokens"] += usage["completion_tokens"]
+    stage_stats["cost_usd"] += estimate_cost(model, usage["prompt_tokens"], usage["completion_tokens"])
+    stage_stats["models"][model] = stage_stats["models"].get(model, 0) + 1
+
+def _timed_call(stage, prompt, model, json_mode, use_mock, escalated=False):
+    start_time = time.time()
+    if use_mock:
+        response = call_llm_mock(prompt)
+        usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        model = "mock"
+    else:
+        response, usage = call_llm_with_usage(prompt, model=model, json_mode=json_mode)
+    _record(stage, model, time.time() - start_time, usage, escalated)
+    return response
+
+def call_llm_for_stage(stage, prompt, json_mode=False, validator=None, use_mock=False):
+    """
+    단계별 라우팅 테이블에 따라 LLM 호출
+
+    캐스케이드가 켜져 있고 validator가 주어지면 저렴한 모델이 먼저 답하고,
+    validator 점수(0.0~1.0)가 기준에 못 미칠 때만 큰 모델로 다시 호출합니다.
+
+    Args:
+        stage: 파이프라인 단계 ("topics", "qa", "kid_friendly", "review", "correction", "summary")
+        prompt: LLM 프롬프트
+        json_mode: JSON 출력 모드 요청 여부
+        validator: 응답을 받아 0.0~1.0 점수를 반환하는 함수
+        use_mock: True면 Mock 버전 사용
+
+    Returns:
+        LLM 응답 텍스트
+    """
+    config = get_stage_config(stage)
+
+    if use_mock:
+        return _timed_call(stage, prompt, config["model"], json_mode, use_mock=True)
+
+    if config["cascade"] and validator and config["cheap_model"] != config["model"]:
+        response = _timed_call(stage, prompt, config["cheap_model"], json_mode, use_mock=False)
+        try:
+            score = validator(response)
+        except Exception as e:
+            logger.warning(f"[{stage}] 응답 검증 중 오류: {e}")
+            score = 0.0
+
+        if score >= config["threshold"]:
+            return response
+
+        logger.info(f"[{stage}] 저렴한 모델 점수 {score:.2f} < {config['threshold']:.2f} → {config['model']}로 재시도")
+        return _timed_call(stage, prompt, config["model"], json_mode, use_mock=False, escalated=True)
+
+    return _timed_call(stage, prompt, config["model"], json_mode, use_mock=False)
+
+def get_stage_report(stats=None):
+    """
+    단계별 호출 횟수, 지연시간, 토큰, 비용 리포트
+
+    Args:
+        stats: 실행별 통계 (shared["llm_stage_stats"], 없으면 프로세스 전체 누적)
+
+    Returns:
+        {stage: {"calls", "escalations", "avg_latency", "max_latency", "prompt_tokens",
+                 "completion_tokens", "cost_usd", "models"}}
+    """
+    with _stats_lock:
+        report = {}
+        for stage, stage_stats in (_stats if stats is None else stats).items():
+            calls = stage_stats["calls"]
+            report[stage] = {
+                "calls": calls,
+                "escalations": stage_stats["escalations"],
+                "avg_latency": round(stage_stats["total_latency"] / calls, 3) if calls else 0.0,
+                "max_latency": round(stage_stats["max_latency"], 3),
+                "total_latency": round(stage_stats["total_latency"], 3),
+                "prompt_tokens": stage_stats["prompt_tokens"],
+                "completion_tokens": stage_stats["completion_tokens"],
+                "cost_usd": round(stage_stats["cost_usd"], 6),
+                "models": dict(stage_stats["models"]),
+            }
+        return report
+
+def reset_stage_stats():
+    """프로세스 전체에 누적된 단계별 통계 초기화"""
+    with _stats_lock:
+        _stats.clear()
+
+def format_stage_report(report):
+    """단계별 리포트를 로그용 문자열로 변환"""
+    if not report:
+        return "LLM 호출 없음"
+
+    lines = []
+    total_cost = 0.0
+    for stage, stats in report.items():
+        total_cost += stats["cost_usd"]
+        models = ", ".join(f"{model}×{count}" for model, count in stats["models"].items())
+        lines.append(
+            f"{stage}: {stats['calls']}회 (승급 {stats['escalations']}회), "
+            f"평균 {stats['avg_latency']:.2f}초, 최대 {stats['max_latency']:.2f}초, "
+            f"토큰 {stats['prompt_tokens']}+{stats['completion_tokens']}, "
+            f"${stats['cost_usd']:.4f} [{models}]"
+        )
+    lines.append(f"총 비용: ${total_cost:.4f}")
+    return "\n".join(lines)
+
+def main():
+    """테스트용 함수"""
+    print("=== 단계별 라우팅 테이블 ===")
+    for stage, config in get_routing().items():
+        cascade = f" (캐스케이드: {config['cheap_model']} → {config['model']})" if config["cascade"] else ""
+        print(f"- {stage}: {config['model']}{cascade}")
+
+    call_llm_for_stage("kid_friendly", "5살 아이에게 인공지능을 설명해주세요", use_mock=True)
+    print("\n=== 단계별 리포트 ===")
+    print(format_stage_report(get_stage_report()))
+
+if __name__ == "__main__":
+    main()
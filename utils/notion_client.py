@@ -1,320 +1,679 @@
 import os
+import time
+import dataclasses
 import logging
+import threading
 from datetime import datetime
-from notion_client import Client
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from .env import load_env
+from .metrics import NOTION_SAVES, NOTION_SAVE_DURATION, NOTION_RATE_LIMITED, CACHE_LOOKUPS
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# 데이터베이스 스키마 캐시 유지 시간 (초)
+DEFAULT_SCHEMA_TTL = 300
+
+# 노션 API 제한: 요청당 블록 100개, 평균 초당 3회
+MAX_BLOCKS_PER_REQUEST = 100
+DEFAULT_RATE_LIMIT = 3.0
+DEFAULT_MAX_RETRIES = 5
+
+# 제목 키워드 기반 태그
+TAG_KEYWORDS = {
+    'AI': ['ai', '인공지능', 'artificial intelligence', 'machine learning'],
+    '축구': ['축구', 'football', 'soccer'],
+    '투자': ['투자', 'investment', '주식', 'stock'],
+    '요리': ['요리', 'cooking', '레시피', 'recipe'],
+    '게임': ['게임', 'game', 'gaming'],
+    '역사': ['역사', 'history'],
+    '과학': ['과학', 'science'],
+    '기술': ['기술', 'tech', 'technology'],
+    '음악': ['음악', 'music'],
+    '교육': ['교육', 'education', '학습', 'learning']
+}
+
+# 제목 키워드 기반 카테고리 (위에서부터 먼저 맞는 것)
+CATEGORY_KEYWORDS = [
+    ('기술', ['ai', '인공지능', '기술', 'tech', 'programming', '프로그래밍']),
+    ('스포츠', ['축구', '스포츠', 'football', 'soccer', 'sport']),
+    ('교육', ['교육', '학습', 'education', 'learning', '강의']),
+    ('비즈니스', ['비즈니스', 'business', '경영', '투자', 'investment']),
+    ('음악', ['음악', 'music', '노래', 'song']),
+    ('뉴스', ['뉴스', 'news', '정치', 'politics']),
+]
+
+class TokenBucket:
+    """
+    토큰 버킷 요청 제한기 (스레드 안전)
+
+    초당 rate개씩 토큰이 채워지고 최대 capacity개까지 쌓입니다.
+    acquire()는 토큰이 생길 때까지 기다립니다.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 가져감 (기다린 시간(초) 반환)"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class NotionUploadError(Exception):
+    """페이지는 만들어졌지만 나머지 블록을 붙이지 못했을 때"""
+
+    def __init__(self, message, page):
+        super().__init__(message)
+        self.page = page
+
+def _sdk():
+    """notion-client SDK 모듈 (import 비용이 있어서 노션을 처음 쓸 때 로드)"""
+    import notion_client
+    return notion_client
+
 def get_notion_client():
     """Notion 클라이언트를 초기화합니다."""
+    load_env()
     token = os.getenv('NOTION_TOKEN')
     if not token:
         raise ValueError("NOTION_TOKEN이 환경 변수에 설정되지 않았습니다.")
     
-    return Client(auth=token)
+    return _create_client(token)
+
+def _create_client(token):
+    sdk = _sdk()
+    options = {"auth": token}
+    # 재시도는 NotionSession이 요청 제한기와 함께 직접 처리 (SDK 재시도는 3.x부터 있어서 그때만 끔, 2.x는 재시도 없음)
+    if "retry" in {field.name for field in dataclasses.fields(sdk.client.ClientOptions)}:
+        options["retry"] = False
+    base_url = os.getenv('NOTION_BASE_URL')
+    if base_url:
+        options["base_url"] = base_url.rstrip('/')
+    return sdk.Client(**options)
 
 def get_database_properties(client, database_id):
     """데이터베이스의 속성 정보를 가져와서 분석합니다."""
     try:
         database = client.databases.retrieve(database_id=database_id)
-        properties = database.get('properties', {})
-        
-        # 속성 타입별로 분류
-        title_prop = None
-        url_prop = None
-        date_prop = None
-        number_props = []
-        select_props = []
-        multiselect_props = []
-        
-        for prop_name, prop_info in properties.items():
-            prop_type = prop_info.get('type')
-            if prop_type == 'title':
-                title_prop = prop_name
-            elif prop_type == 'url':
-                url_prop = prop_name
-            elif prop_type == 'date':
-                date_prop = prop_name
-            elif prop_type == 'number':
-                number_props.append(prop_name)
-            elif prop_type == 'select':
-                select_props.append(prop_name)
-            elif prop_type == 'multi_select':
-                multiselect_props.append(prop_name)
-        
-        return {
-            'title': title_prop,
-            'url': url_prop,
-            'date': date_prop,
-            'numbers': number_props,
-            'selects': select_props,
-            'multiselects': multiselect_props,
-            'all_properties': list(properties.keys())
-        }
+        return parse_database_properties(database)
     except Exception as e:
         logger.error(f"데이터베이스 속성 조회 실패: {str(e)}")
         return None
 
-def save_to_notion(video_info, topics, qa_pairs, kid_friendly_pairs):
-    """
-    YouTube 요약 결과를 노션 데이터베이스에 저장합니다.
+def parse_database_properties(database):
+    """databases.retrieve 응답에서 속성을 타입별로 분류합니다."""
+    properties = database.get('properties', {})
     
-    Args:
-        video_info (dict): 비디오 정보 (title, url, thumbnail, etc.)
-        topics (list): 추출된 주제 목록
-        qa_pairs (list): 생성된 Q&A 쌍
-        kid_friendly_pairs (list): 아이 친화적으로 변환된 Q&A 쌍
+    # 속성 타입별로 분류
+    title_prop = None
+    url_prop = None
+    date_prop = None
+    number_props = []
+    select_props = []
+    multiselect_props = []
     
-    Returns:
-        dict: 저장된 페이지 정보
-    """
+    for prop_name, prop_info in properties.items():
+        prop_type = prop_info.get('type')
+        if prop_type == 'title':
+            title_prop = prop_name
+        elif prop_type == 'url':
+            url_prop = prop_name
+        elif prop_type == 'date':
+            date_prop = prop_name
+        elif prop_type == 'number':
+            number_props.append(prop_name)
+        elif prop_type == 'select':
+            select_props.append(prop_name)
+        elif prop_type == 'multi_select':
+            multiselect_props.append(prop_name)
+    
+    return {
+        'title': title_prop,
+        'url': url_prop,
+        'date': date_prop,
+        'numbers': number_props,
+        'selects': select_props,
+        'multiselects': multiselect_props,
+        'all_properties': list(properties.keys())
+    }
+
+def _duration_minutes(duration_str):
+    """'MM:SS' 또는 'HH:MM:SS' 형식을 분 단위로 변환"""
     try:
-        client = get_notion_client()
-        database_id = os.getenv('NOTION_DATABASE_ID')
-        
-        if not database_id:
-            raise ValueError("NOTION_DATABASE_ID가 환경 변수에 설정되지 않았습니다.")
-        
-        # 데이터베이스 속성 정보 가져오기
-        db_props = get_database_properties(client, database_id)
-        if not db_props:
-            # 기본 속성만 사용 (Title만)
-            logger.info("기본 Title 속성만 사용하여 저장합니다.")
-            db_props = {'title': 'Name', 'url': None, 'date': None, 'numbers': []}
-        
-        logger.info(f"데이터베이스 속성: {db_props}")
-        
-        # 페이지 제목 생성
-        title = f"📺 {video_info.get('title', 'YouTube 요약')}"
-        
-        # 페이지 속성 설정 (존재하는 속성만 사용)
-        properties = {}
-        
-        # Title 속성 (필수)
-        if db_props['title']:
-            properties[db_props['title']] = {
-                "title": [
-                    {
-                        "text": {
-                            "content": title
-                        }
-                    }
-                ]
-            }
-        
-        # URL 속성 (선택사항)
-        if db_props['url']:
-            properties[db_props['url']] = {
-                "url": video_info.get('url', '')
-            }
-        
-        # Date 속성 (선택사항)
-        if db_props['date']:
-            properties[db_props['date']] = {
-                "date": {
-                    "start": datetime.now().isoformat()
-                }
-            }
-        
-        # Number 속성들 (선택사항) - 스마트하게 매핑
-        number_props = db_props['numbers']
-        for i, prop_name in enumerate(number_props):
+        if ':' in duration_str:
+            parts = duration_str.split(':')
+            if len(parts) == 2:  # MM:SS
+                minutes = int(parts[0]) + int(parts[1]) / 60
+            elif len(parts) == 3:  # HH:MM:SS
+                minutes = int(parts[0]) * 60 + int(parts[1]) + int(parts[2]) / 60
+            else:
+                minutes = 0
+        else:
+            minutes = 0
+        return round(minutes, 1)
+    except (TypeError, ValueError):
+        return 0
+
+def _detect_language(title):
+    """비디오 제목으로 언어 추정"""
+    if any(char >= '\uac00' and char <= '\ud7af' for char in title):  # 한글 확인
+        return "한국어"
+    if any(char >= '\u3040' and char <= '\u309f' for char in title):  # 히라가나
+        return "일본어"
+    if any(char >= '\u4e00' and char <= '\u9fff' for char in title):  # 한자
+        return "중국어"
+    return "영어"
+
+def _detect_category(title):
+    """비디오 제목으로 카테고리 자동 분류"""
+    title_lower = title.lower()
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(word in title_lower for word in keywords):
+            return category
+    return "엔터테인먼트"
+
+def _detect_tags(title):
+    """비디오 제목 키워드로 태그 생성"""
+    title_lower = title.lower()
+    return [
+        {"name": tag} for tag, keywords in TAG_KEYWORDS.items()
+        if any(keyword in title_lower for keyword in keywords)
+    ]
+
+class PropertyMapping:
+    """
+    데이터베이스 스키마에서 미리 계산한 속성 매핑
+
+    속성 이름 휴리스틱(number/select/multi_select)은 스키마당 한 번만
+    계산해두고, 저장할 때는 값만 채웁니다.
+    """
+
+    def __init__(self, db_props):
+        self.db_props = db_props
+        self.title = db_props.get('title')
+        self.url = db_props.get('url')
+        self.date = db_props.get('date')
+        # [(속성 이름, 속성 타입, 값 종류), ...]
+        self.rules = []
+
+        # Number 속성들 - 스마트하게 매핑
+        for i, prop_name in enumerate(db_props.get('numbers', [])):
             prop_name_lower = prop_name.lower()
             if '주제' in prop_name_lower or 'topic' in prop_name_lower:
-                properties[prop_name] = {"number": len(topics)}
+                kind = 'topic_count'
             elif 'qa' in prop_name_lower or '질문' in prop_name_lower or 'question' in prop_name_lower:
-                properties[prop_name] = {"number": len(qa_pairs)}
+                kind = 'qa_count'
             elif '길이' in prop_name_lower or 'duration' in prop_name_lower or '시간' in prop_name_lower:
-                # 비디오 길이 (분 단위로 변환)
-                duration_str = video_info.get('duration', '0:00')
-                try:
-                    if ':' in duration_str:
-                        parts = duration_str.split(':')
-                        if len(parts) == 2:  # MM:SS
-                            minutes = int(parts[0]) + int(parts[1]) / 60
-                        elif len(parts) == 3:  # HH:MM:SS
-                            minutes = int(parts[0]) * 60 + int(parts[1]) + int(parts[2]) / 60
-                        else:
-                            minutes = 0
-                    else:
-                        minutes = 0
-                    properties[prop_name] = {"number": round(minutes, 1)}
-                except:
-                    properties[prop_name] = {"number": 0}
-            elif i < 2:  # 기본 매핑 (이전 로직 유지)
-                if i == 0:
-                    properties[prop_name] = {"number": len(topics)}
-                elif i == 1:
-                    properties[prop_name] = {"number": len(qa_pairs)}
-        
+                kind = 'duration'
+            elif i == 0:  # 기본 매핑 (이전 로직 유지)
+                kind = 'topic_count'
+            elif i == 1:
+                kind = 'qa_count'
+            else:
+                continue
+            self.rules.append((prop_name, 'number', kind))
+
         # Select 속성들 자동 설정
-        select_props = db_props.get('selects', [])
-        for prop_name in select_props:
+        for prop_name in db_props.get('selects', []):
             prop_name_lower = prop_name.lower()
-            
-            # 언어 자동 감지
             if '언어' in prop_name_lower or 'language' in prop_name_lower:
-                # 비디오 제목으로 언어 추정
-                title = video_info.get('title', '')
-                if any(char >= '\uac00' and char <= '\ud7af' for char in title):  # 한글 확인
-                    properties[prop_name] = {"select": {"name": "한국어"}}
-                elif any(char >= '\u3040' and char <= '\u309f' for char in title):  # 히라가나
-                    properties[prop_name] = {"select": {"name": "일본어"}}
-                elif any(char >= '\u4e00' and char <= '\u9fff' for char in title):  # 한자
-                    properties[prop_name] = {"select": {"name": "중국어"}}
-                else:
-                    properties[prop_name] = {"select": {"name": "영어"}}
-            
-            # 카테고리 자동 분류
+                kind = 'language'
             elif '카테고리' in prop_name_lower or 'category' in prop_name_lower:
-                title_lower = video_info.get('title', '').lower()
-                if any(word in title_lower for word in ['ai', '인공지능', '기술', 'tech', 'programming', '프로그래밍']):
-                    properties[prop_name] = {"select": {"name": "기술"}}
-                elif any(word in title_lower for word in ['축구', '스포츠', 'football', 'soccer', 'sport']):
-                    properties[prop_name] = {"select": {"name": "스포츠"}}
-                elif any(word in title_lower for word in ['교육', '학습', 'education', 'learning', '강의']):
-                    properties[prop_name] = {"select": {"name": "교육"}}
-                elif any(word in title_lower for word in ['비즈니스', 'business', '경영', '투자', 'investment']):
-                    properties[prop_name] = {"select": {"name": "비즈니스"}}
-                elif any(word in title_lower for word in ['음악', 'music', '노래', 'song']):
-                    properties[prop_name] = {"select": {"name": "음악"}}
-                elif any(word in title_lower for word in ['뉴스', 'news', '정치', 'politics']):
-                    properties[prop_name] = {"select": {"name": "뉴스"}}
-                else:
-                    properties[prop_name] = {"select": {"name": "엔터테인먼트"}}
-            
-            # 연령대 설정 (5살 아이 친화적이므로)
+                kind = 'category'
             elif '연령' in prop_name_lower or 'age' in prop_name_lower:
-                properties[prop_name] = {"select": {"name": "5살"}}
-            
-            # 난이도 자동 설정
+                kind = 'age'
             elif '난이도' in prop_name_lower or 'difficulty' in prop_name_lower:
-                properties[prop_name] = {"select": {"name": "쉬움"}}  # 5살 버전이므로
-        
-        # Multi-select 속성들 자동 설정
-        multiselect_props = db_props.get('multiselects', [])
-        for prop_name in multiselect_props:
+                kind = 'difficulty'
+            else:
+                continue
+            self.rules.append((prop_name, 'select', kind))
+
+        # Multi-select 속성들 - 주제 태그
+        for prop_name in db_props.get('multiselects', []):
             prop_name_lower = prop_name.lower()
-            
-            # 주제 태그 자동 생성
             if '태그' in prop_name_lower or 'tag' in prop_name_lower:
-                tags = []
-                title_lower = video_info.get('title', '').lower()
-                
-                # 키워드 기반 태그 생성
-                tag_keywords = {
-                    'AI': ['ai', '인공지능', 'artificial intelligence', 'machine learning'],
-                    '축구': ['축구', 'football', 'soccer'],
-                    '투자': ['투자', 'investment', '주식', 'stock'],
-                    '요리': ['요리', 'cooking', '레시피', 'recipe'],
-                    '게임': ['게임', 'game', 'gaming'],
-                    '역사': ['역사', 'history'],
-                    '과학': ['과학', 'science'],
-                    '기술': ['기술', 'tech', 'technology'],
-                    '음악': ['음악', 'music'],
-                    '교육': ['교육', 'education', '학습', 'learning']
-                }
-                
-                for tag, keywords in tag_keywords.items():
-                    if any(keyword in title_lower for keyword in keywords):
-                        tags.append({"name": tag})
-                
-                if tags:
-                    properties[prop_name] = {"multi_select": tags}
-        
-        # 페이지 내용 생성
-        children = []
-        
-        # 비디오 정보 섹션
+                self.rules.append((prop_name, 'multi_select', 'tags'))
+
+    def build_properties(self, video_info, topics, qa_pairs, title):
+        """
+        페이지 속성 생성 (존재하는 속성만 사용)
+
+        Args:
+            video_info (dict): 비디오 정보
+            topics (list): 주제 목록
+            qa_pairs (list): Q&A 쌍
+            title (str): 페이지 제목
+
+        Returns:
+            dict: pages.create에 넘길 properties
+        """
+        properties = {}
+
+        # Title 속성 (필수)
+        if self.title:
+            properties[self.title] = {"title": [{"text": {"content": title}}]}
+
+        # URL 속성 (선택사항)
+        if self.url:
+            properties[self.url] = {"url": video_info.get('url', '')}
+
+        # Date 속성 (선택사항)
+        if self.date:
+            properties[self.date] = {"date": {"start": datetime.now().isoformat()}}
+
+        video_title = video_info.get('title', '')
+        values = {
+            'topic_count': lambda: len(topics),
+            'qa_count': lambda: len(qa_pairs),
+            'duration': lambda: _duration_minutes(video_info.get('duration', '0:00')),
+            'language': lambda: {"name": _detect_language(video_title)},
+            'category': lambda: {"name": _detect_category(video_title)},
+            'age': lambda: {"name": "5살"},  # 5살 아이 친화적이므로
+            'difficulty': lambda: {"name": "쉬움"},  # 5살 버전이므로
+            'tags': lambda: _detect_tags(video_title),
+        }
+
+        for prop_name, prop_type, kind in self.rules:
+            value = values[kind]()
+            if prop_type == 'multi_select' and not value:
+                continue
+            properties[prop_name] = {prop_type: value}
+
+        return properties
+
+def _is_property_mismatch(error):
+    """스키마가 바뀌어 속성이 맞지 않을 때 나는 오류인지 확인"""
+    sdk = _sdk()
+    return (
+        isinstance(error, sdk.APIResponseError)
+        and error.code == sdk.APIErrorCode.ValidationError
+        and 'propert' in str(error).lower()
+    )
+
+def _block_signature(block):
+    """블록 비교용 (타입, 글자 내용) - API 응답과 새로 만든 블록을 같은 형태로 비교"""
+    block_type = block.get("type")
+    rich_text = block.get(block_type, {}).get("rich_text", [])
+    text = "".join(
+        (item.get("text") or {}).get("content", item.get("plain_text", "")) for item in rich_text
+    )
+    return block_type, text
+
+def _is_rate_limited(error):
+    sdk = _sdk()
+    return isinstance(error, sdk.APIResponseError) and error.code == sdk.APIErrorCode.RateLimited
+
+def _retry_after_seconds(error, attempt):
+    """Retry-After 헤더가 있으면 그 값, 없으면 지수 백오프"""
+    try:
+        retry_after = float(error.headers.get('retry-after'))
+        if retry_after >= 0:
+            return retry_after
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return min(0.5 * (2 ** attempt), 30.0)
+
+class NotionSession:
+    """
+    오래 유지되는 노션 세션
+
+    Client를 한 번만 만들어 재사용하고, 데이터베이스 스키마와
+    속성 매핑을 TTL 동안 캐시합니다. 저장 중 속성 불일치 오류가 나면
+    캐시를 비우고 스키마를 다시 읽어 한 번 더 시도합니다.
+
+    모든 API 호출은 공유 토큰 버킷을 거치고, 429 응답은 Retry-After만큼
+    기다렸다가 재시도합니다. 블록이 100개를 넘으면 첫 100개로 페이지를
+    만들고 나머지는 blocks.children.append로 100개씩 이어 붙입니다.
+    """
+
+    def __init__(self, token=None, schema_ttl=None, client=None, limiter=None, max_retries=None):
+        load_env()
+        self._token = token
+        self._client = client
+        self.schema_ttl = schema_ttl if schema_ttl is not None else float(
+            os.getenv('NOTION_SCHEMA_TTL', DEFAULT_SCHEMA_TTL)
+        )
+        self.limiter = limiter or get_rate_limiter()
+        self.max_retries = max_retries if max_retries is not None else int(
+            os.getenv('NOTION_MAX_RETRIES', DEFAULT_MAX_RETRIES)
+        )
+        self._schemas = {}  # database_id -> (가져온 시각, PropertyMapping)
+        self._lock = threading.Lock()
+        self.schema_fetches = 0
+        self.requests_made = 0
+        self.rate_limited_retries = 0
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if self._token:
+                        self._client = _create_client(self._token)
+                    else:
+                        self._client = get_notion_client()
+        return self._client
+
+    def request(self, method, **kwargs):
+        """
+        요청 제한기를 거쳐 API 호출 (429면 기다렸다가 재시도)
+
+        Args:
+            method: 호출할 클라이언트 메서드 (예: self.client.pages.create)
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            with self._lock:
+                self.requests_made += 1
+            try:
+                return method(**kwargs)
+            except _sdk().APIResponseError as e:
+                if not _is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                delay = _retry_after_seconds(e, attempt)
+                with self._lock:
+                    self.rate_limited_retries += 1
+                NOTION_RATE_LIMITED.inc()
+                logger.warning(f"노션 요청 제한(429) - {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+
+    def get_mapping(self, database_id):
+        """캐시된 속성 매핑 반환 (없거나 만료되면 스키마 조회)"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._schemas.get(database_id)
+            if cached and now - cached[0] < self.schema_ttl:
+                CACHE_LOOKUPS.labels("notion_schema", "hit").inc()
+                return cached[1]
+        CACHE_LOOKUPS.labels("notion_schema", "miss").inc()
+
+        try:
+            database = self.request(self.client.databases.retrieve, database_id=database_id)
+            db_props = parse_database_properties(database)
+        except Exception as e:
+            logger.error(f"데이터베이스 속성 조회 실패: {str(e)}")
+            db_props = None
+        self.schema_fetches += 1
+        if not db_props:
+            # 기본 속성만 사용 (Title만) - 실패 결과는 캐시하지 않음
+            logger.info("기본 Title 속성만 사용하여 저장합니다.")
+            return PropertyMapping({'title': 'Name', 'url': None, 'date': None, 'numbers': []})
+
+        logger.info(f"데이터베이스 속성: {db_props}")
+        mapping = PropertyMapping(db_props)
+        with self._lock:
+            self._schemas[database_id] = (time.monotonic(), mapping)
+        return mapping
+
+    def invalidate_schema(self, database_id=None):
+        """스키마 캐시 비우기 (database_id가 없으면 전체)"""
+        with self._lock:
+            if database_id is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(database_id, None)
+
+    def append_blocks(self, block_id, blocks):
+        """블록을 100개씩 나눠서 이어 붙이기"""
+        for start in range(0, len(blocks), MAX_BLOCKS_PER_REQUEST):
+            self.request(
+                self.client.blocks.children.append,
+                block_id=block_id,
+                children=blocks[start:start + MAX_BLOCKS_PER_REQUEST]
+            )
+
+    def create_summary_page(self, database_id, video_info, topics, qa_pairs, children, title):
+        """
+        속성을 매핑해서 페이지 생성 (속성 불일치 시 스키마를 다시 읽고 한 번 재시도)
+
+        첫 100개 블록으로 페이지를 만들고 나머지는 이어 붙입니다.
+        이어 붙이다 실패하면 만들어진 페이지 정보와 함께 NotionUploadError를 냅니다.
+        """
+        first_chunk = children[:MAX_BLOCKS_PER_REQUEST]
+        rest = children[MAX_BLOCKS_PER_REQUEST:]
+
+        for attempt in range(2):
+            mapping = self.get_mapping(database_id)
+            properties = mapping.build_properties(video_info, topics, qa_pairs, title)
+            try:
+                page = self.request(
+                    self.client.pages.create,
+                    parent={"database_id": database_id},
+                    properties=properties,
+                    children=first_chunk
+                )
+                break
+            except _sdk().APIResponseError as e:
+                if attempt == 0 and _is_property_mismatch(e):
+                    logger.warning(f"속성 불일치로 스키마를 다시 조회합니다: {str(e)}")
+                    self.invalidate_schema(database_id)
+                    continue
+                raise
+
+        if rest:
+            try:
+                self.append_blocks(page['id'], rest)
+            except Exception as e:
+                raise NotionUploadError(
+                    f"페이지는 생성됐지만 블록 {len(rest)}개 추가 실패: {str(e)}", page
+                ) from e
+        return page
+
+    def list_blocks(self, block_id):
+        """페이지의 최상위 블록 전체 조회 (100개씩 페이지네이션)"""
+        blocks = []
+        cursor = None
+        while True:
+            kwargs = {"block_id": block_id, "page_size": MAX_BLOCKS_PER_REQUEST}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+            response = self.request(self.client.blocks.children.list, **kwargs)
+            blocks.extend(response.get("results", []))
+            if not response.get("has_more"):
+                return blocks
+            cursor = response.get("next_cursor")
+
+    def update_summary_page(self, page_id, database_id, video_info, topics, qa_pairs, children, title):
+        """
+        기존 페이지를 새 요약으로 갱신 (같은 비디오를 다시 저장할 때 중복 페이지 방지)
+
+        속성을 갱신하고, 기존 블록 중 새 블록과 앞에서부터 같은 부분은 그대로 두고
+        나머지만 지운 뒤 새 블록을 이어 붙입니다. 페이지가 삭제됐으면 새로 만듭니다.
+        """
+        mapping = self.get_mapping(database_id)
+        properties = mapping.build_properties(video_info, topics, qa_pairs, title)
+        try:
+            page = self.request(self.client.pages.update, page_id=page_id, properties=properties)
+        except _sdk().APIResponseError as e:
+            if e.code == _sdk().APIErrorCode.ObjectNotFound:
+                logger.warning(f"기존 노션 페이지가 없어 새로 만듭니다: {page_id}")
+                return self.create_summary_page(database_id, video_info, topics, qa_pairs, children, title)
+            if _is_property_mismatch(e):
+                self.invalidate_schema(database_id)
+            raise
+
+        existing = self.list_blocks(page_id)
+        keep = 0
+        while (keep < len(existing) and keep < len(children)
+               and _block_signature(existing[keep]) == _block_signature(children[keep])):
+            keep += 1
+
+        try:
+            for block in existing[keep:]:
+                self.request(self.client.blocks.delete, block_id=block["id"])
+            self.append_blocks(page_id, children[keep:])
+        except Exception as e:
+            raise NotionUploadError(f"페이지 내용 갱신 실패: {str(e)}", page) from e
+        return page
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+_session = None
+# 세션 생성자가 get_rate_limiter()를 부르므로 제한기와 같은 락을 쓰면 교착
+_session_lock = threading.Lock()
+
+def get_rate_limiter():
+    """프로세스 전체에서 공유하는 노션 요청 제한기 (NOTION_RATE_LIMIT, 기본 초당 3회)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = TokenBucket(float(os.getenv('NOTION_RATE_LIMIT', DEFAULT_RATE_LIMIT)))
+    return _rate_limiter
+
+def get_notion_session():
+    """프로세스 전체에서 공유하는 노션 세션"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = NotionSession()
+    return _session
+
+def build_page_children(video_info, topics, kid_friendly_pairs):
+    """페이지 본문 블록 생성"""
+    # 페이지 내용 생성
+    children = []
+    
+    # 비디오 정보 섹션
+    children.append({
+        "object": "block",
+        "type": "heading_2",
+        "heading_2": {
+            "rich_text": [{"type": "text", "text": {"content": "🎬 비디오 정보"}}]
+        }
+    })
+    
+    children.append({
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [{"type": "text", "text": {"content": f"📺 제목: {video_info.get('title', '제목 없음')}"}}]
+        }
+    })
+    
+    children.append({
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [{"type": "text", "text": {"content": f"🔗 URL: {video_info.get('url', '')}"}}]
+        }
+    })
+    
+    # 주제 섹션
+    children.append({
+        "object": "block",
+        "type": "heading_2",
+        "heading_2": {
+            "rich_text": [{"type": "text", "text": {"content": "🎯 주요 주제"}}]
+        }
+    })
+    
+    for i, topic in enumerate(topics, 1):
         children.append({
             "object": "block",
-            "type": "heading_2",
-            "heading_2": {
-                "rich_text": [{"type": "text", "text": {"content": "🎬 비디오 정보"}}]
+            "type": "bulleted_list_item",
+            "bulleted_list_item": {
+                "rich_text": [{"type": "text", "text": {"content": f"{i}. {topic}"}}]
             }
         })
-        
+    
+    # Q&A 섹션
+    children.append({
+        "object": "block",
+        "type": "heading_2",
+        "heading_2": {
+            "rich_text": [{"type": "text", "text": {"content": "❓ 5살 아이도 이해하는 Q&A"}}]
+        }
+    })
+    
+    for i, qa in enumerate(kid_friendly_pairs, 1):
+        # 질문
         children.append({
             "object": "block",
-            "type": "paragraph",
-            "paragraph": {
-                "rich_text": [{"type": "text", "text": {"content": f"📺 제목: {video_info.get('title', '제목 없음')}"}}]
+            "type": "heading_3",
+            "heading_3": {
+                "rich_text": [{"type": "text", "text": {"content": f"Q{i}. {qa['question']}"}}]
             }
         })
         
+        # 답변
         children.append({
             "object": "block",
             "type": "paragraph",
             "paragraph": {
-                "rich_text": [{"type": "text", "text": {"content": f"🔗 URL: {video_info.get('url', '')}"}}]
-            }
-        })
-        
-        # 주제 섹션
-        children.append({
-            "object": "block",
-            "type": "heading_2",
-            "heading_2": {
-                "rich_text": [{"type": "text", "text": {"content": "🎯 주요 주제"}}]
+                "rich_text": [{"type": "text", "text": {"content": f"💡 {qa['answer']}"}}]
             }
         })
         
-        for i, topic in enumerate(topics, 1):
+        # 구분선
+        if i < len(kid_friendly_pairs):
             children.append({
                 "object": "block",
-                "type": "bulleted_list_item",
-                "bulleted_list_item": {
-                    "rich_text": [{"type": "text", "text": {"content": f"{i}. {topic}"}}]
-                }
+                "type": "divider",
+                "divider": {}
             })
+    
+    return children
+
+def save_to_notion(video_info, topics, qa_pairs, kid_friendly_pairs, session=None, page_id=None):
+    """
+    YouTube 요약 결과를 노션 데이터베이스에 저장합니다.
+    
+    Args:
+        video_info (dict): 비디오 정보 (title, url, thumbnail, etc.)
+        topics (list): 추출된 주제 목록
+        qa_pairs (list): 생성된 Q&A 쌍
+        kid_friendly_pairs (list): 아이 친화적으로 변환된 Q&A 쌍
+        session (NotionSession): 사용할 세션 (없으면 공유 세션)
+        page_id (str): 이미 저장한 페이지 ID (있으면 새로 만들지 않고 갱신)
+    
+    Returns:
+        dict: 저장된 페이지 정보
+    """
+    start_time = time.perf_counter()
+    result = _save_to_notion(video_info, topics, qa_pairs, kid_friendly_pairs, session, page_id)
+    NOTION_SAVE_DURATION.observe(time.perf_counter() - start_time)
+    NOTION_SAVES.labels("ok" if result.get("success") else "error").inc()
+    return result
+
+def _save_to_notion(video_info, topics, qa_pairs, kid_friendly_pairs, session, page_id):
+    try:
+        load_env()
+        database_id = os.getenv('NOTION_DATABASE_ID')
         
-        # Q&A 섹션
-        children.append({
-            "object": "block",
-            "type": "heading_2",
-            "heading_2": {
-                "rich_text": [{"type": "text", "text": {"content": "❓ 5살 아이도 이해하는 Q&A"}}]
-            }
-        })
+        if not database_id:
+            raise ValueError("NOTION_DATABASE_ID가 환경 변수에 설정되지 않았습니다.")
         
-        for i, qa in enumerate(kid_friendly_pairs, 1):
-            # 질문
-            children.append({
-                "object": "block",
-                "type": "heading_3",
-                "heading_3": {
-                    "rich_text": [{"type": "text", "text": {"content": f"Q{i}. {qa['question']}"}}]
-                }
-            })
-            
-            # 답변
-            children.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [{"type": "text", "text": {"content": f"💡 {qa['answer']}"}}]
-                }
-            })
-            
-            # 구분선
-            if i < len(kid_friendly_pairs):
-                children.append({
-                    "object": "block",
-                    "type": "divider",
-                    "divider": {}
-                })
+        session = session or get_notion_session()
         
-        # 노션 페이지 생성
-        response = client.pages.create(
-            parent={"database_id": database_id},
-            properties=properties,
-            children=children
-        )
+        # 페이지 제목 생성
+        title = f"📺 {video_info.get('title', 'YouTube 요약')}"
+        
+        children = build_page_children(video_info, topics, kid_friendly_pairs)
+        
+        # 노션 페이지 생성 (이미 있으면 갱신)
+        if page_id:
+            response = session.update_summary_page(
+                page_id, database_id, video_info, topics, qa_pairs, children, title
+            )
+        else:
+            response = session.create_summary_page(
+                database_id, video_info, topics, qa_pairs, children, title
+            )
         
         logger.info(f"노션에 페이지 저장 완료: {response['url']}")
         
@@ -325,6 +684,16 @@ def save_to_notion(video_info, topics, qa_pairs, kid_friendly_pairs):
             "title": title
         }
         
+    except NotionUploadError as e:
+        logger.error(f"노션 저장 중 오류 발생: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "page_url": e.page.get('url'),
+            "page_id": e.page.get('id'),
+            "title": title
+        }
+        
     except Exception as e:
         logger.error(f"노션 저장 중 오류 발생: {str(e)}")
         return {
@@ -0,0 +1,381 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import hashlib
+import logging
+import threading
+from .notion_client import save_to_notion, get_notion_session
+from .metrics import NOTION_OUTBOX_DEPTH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX_PATH = "notion_outbox.db"
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_POLL_INTERVAL = 1.0
+MAX_BACKOFF_SECONDS = 300
+# 이 시간(초) 안에 끝나지 않은 전송은 드레이너가 죽은 것으로 보고 다른 드레이너가 다시 가져감
+DEFAULT_CLAIM_SECONDS = 300
+
+# 상태: pending(전송 대기) → sending(claim_owner가 전송 중, claim_expires_at까지) → done / failed(재시도 한도 초과)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notion_outbox (
+    video_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    delivered_at REAL,
+    drain_seconds REAL,
+    last_error TEXT,
+    page_id TEXT,
+    page_url TEXT,
+    claim_owner TEXT,
+    claim_expires_at REAL
+)
+"""
+
+# 예전 대기열 파일에 없는 열 (열린 순간 추가)
+_ADDED_COLUMNS = {"claim_owner": "TEXT", "claim_expires_at": "REAL"}
+
+_owner = None
+
+def _default_owner():
+    """전송 중 표시에 남기는 드레이너 이름 (호스트:PID:무작위, fork한 자식은 새로 만듦)"""
+    global _owner
+    if _owner is None or _owner[0] != os.getpid():
+        _owner = (os.getpid(), f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}")
+    return _owner[1]
+
+def outbox_key(video_info):
+    """멱등성 키: video_id (없으면 URL 해시)"""
+    video_id = video_info.get("video_id")
+    if video_id:
+        return video_id
+    return "url-" + hashlib.sha1(video_info.get("url", "").encode("utf-8")).hexdigest()[:16]
+
+class NotionOutbox:
+    """
+    노션 저장 요청을 로컬 SQLite에 쌓아두는 영속 대기열
+
+    SaveToNotion 노드는 여기에 기록만 하고 바로 다음 단계로 넘어갑니다.
+    같은 video_id를 다시 넣으면 기존 항목을 새 내용으로 덮어쓰고,
+    이미 만든 페이지 ID를 유지해서 드레이너가 페이지를 갱신하게 합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("NOTION_OUTBOX_PATH", DEFAULT_OUTBOX_PATH)
+        self._lock = threading.Lock()
+        # 전송 중에 죽은 드레이너의 항목은 여기서 되돌리지 않고 claim()이 기한이 지난 것만 다시 가져감
+        # (다른 프로세스가 전송 중인 항목을 시작할 때마다 되돌리면 페이지가 두 번 올라감)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(notion_outbox)")}
+            for name, column_type in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE notion_outbox ADD COLUMN {name} {column_type}")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def enqueue(self, video_info, topics, qa_pairs, kid_friendly_pairs):
+        """
+        저장 요청을 대기열에 기록 (즉시 반환)
+
+        Returns:
+            str: 멱등성 키 (video_id)
+        """
+        key = outbox_key(video_info)
+        payload = json.dumps({
+            "video_info": {
+                name: video_info.get(name)
+                for name in ("video_id", "title", "url", "duration", "thumbnail_url")
+                if video_info.get(name) is not None
+            },
+            "topics": topics,
+            "qa_pairs": qa_pairs,
+            "kid_friendly_pairs": kid_friendly_pairs,
+        }, ensure_ascii=False)
+        now = time.time()
+
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT INTO notion_outbox (video_id, payload, status, attempts, enqueued_at, next_attempt_at)
+                VALUES (?, ?, 'pending', 0, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    payload = excluded.payload,
+                    status = 'pending',
+                    attempts = 0,
+                    enqueued_at = excluded.enqueued_at,
+                    next_attempt_at = excluded.next_attempt_at,
+                    last_error = NULL
+            """, (key, payload, now, now))
+        return key
+
+    def claim(self, limit=DEFAULT_BATCH_SIZE, owner=None, claim_seconds=DEFAULT_CLAIM_SECONDS):
+        """
+        전송할 차례가 된 항목들을 owner 이름으로 sending 상태로 바꾸고 반환
+
+        다른 드레이너가 전송 중인 항목은 claim_expires_at이 지난 경우(그 드레이너가 죽음)에만 다시 가져갑니다.
+        """
+        owner = owner or _default_owner()
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            # 여러 프로세스가 같은 항목을 동시에 가져가지 않도록 읽기 전에 쓰기 잠금
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("""
+                SELECT video_id, payload, attempts, enqueued_at, page_id, status, claim_owner FROM notion_outbox
+                WHERE (status = 'pending' AND next_attempt_at <= ?)
+                   OR (status = 'sending' AND COALESCE(claim_expires_at, 0) <= ?)
+                ORDER BY enqueued_at LIMIT ?
+            """, (now, now, limit)).fetchall()
+            for row in rows:
+                if row[5] == "sending":
+                    logger.warning(f"노션 대기열 {row[0]}: {row[6]}의 전송 기한 만료, 다시 전송")
+            conn.executemany(
+                "UPDATE notion_outbox SET status = 'sending', claim_owner = ?, claim_expires_at = ? WHERE video_id = ?",
+                [(owner, now + claim_seconds, row[0]) for row in rows]
+            )
+        return [
+            {"video_id": row[0], "payload": json.loads(row[1]), "attempts": row[2],
+             "enqueued_at": row[3], "page_id": row[4], "claim_owner": owner}
+            for row in rows
+        ]
+
+    def mark_done(self, entry, result):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            # 전송 중에 새 내용이 들어왔으면(enqueued_at 변경) pending 상태를 유지
+            conn.execute("""
+                UPDATE notion_outbox SET
+                    status = CASE WHEN enqueued_at = ? THEN 'done' ELSE 'pending' END,
+                    delivered_at = ?, drain_seconds = ?, last_error = NULL,
+                    page_id = ?, page_url = ?, claim_owner = NULL, claim_expires_at = NULL
+                WHERE video_id = ? AND COALESCE(claim_owner, '') = ?
+            """, (entry["enqueued_at"], now, now - entry["enqueued_at"],
+                  result.get("page_id"), result.get("page_url"), entry["video_id"], entry.get("claim_owner") or ""))
+
+    def mark_failed(self, entry, error, max_attempts=DEFAULT_MAX_ATTEMPTS, page_id=None):
+        attempts = entry["attempts"] + 1
+        status = "failed" if attempts >= max_attempts else "pending"
+        next_attempt_at = time.time() + min(2 ** attempts, MAX_BACKOFF_SECONDS)
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                UPDATE notion_outbox SET
+                    status = CASE WHEN enqueued_at = ? THEN ? ELSE 'pending' END,
+                    attempts = CASE WHEN enqueued_at = ? THEN ? ELSE attempts END,
+                    next_attempt_at = CASE WHEN enqueued_at = ? THEN ? ELSE next_attempt_at END,
+                    last_error = ?,
+                    page_id = COALESCE(?, page_id),
+                    claim_owner = NULL, claim_expires_at = NULL
+                WHERE video_id = ? AND COALESCE(claim_owner, '') = ?
+            """, (entry["enqueued_at"], status, entry["enqueued_at"], attempts,
+                  entry["enqueued_at"], next_attempt_at, error, page_id, entry["video_id"],
+                  entry.get("claim_owner") or ""))
+        return status
+
+    def active_count(self):
+        """지금 전송 중이거나 바로 보낼 수 있는 항목 수 (백오프 중인 항목 제외)"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM notion_outbox WHERE status = 'sending' "
+                "OR (status = 'pending' AND next_attempt_at <= ?)", (time.time(),)
+            ).fetchone()[0]
+
+    def get(self, video_id):
+        """항목 상태 조회"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT video_id, status, attempts, last_error, page_id, page_url, drain_seconds "
+                "FROM notion_outbox WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def metrics(self):
+        """
+        대기열 지표
+
+        Returns:
+            {
+                "queue_depth": int,          # 전송 대기 + 전송 중
+                "failed": int,               # 재시도 한도 초과
+                "delivered": int,
+                "oldest_pending_seconds": float,
+                "drain_latency_avg": float,  # 기록부터 노션 반영까지 걸린 시간 (초)
+                "drain_latency_max": float
+            }
+        """
+        now = time.time()
+        with self._connect() as conn:
+            depth, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(enqueued_at) FROM notion_outbox WHERE status IN ('pending', 'sending')"
+            ).fetchone()
+            failed = conn.execute("SELECT COUNT(*) FROM notion_outbox WHERE status = 'failed'").fetchone()[0]
+            delivered, latency_avg, latency_max = conn.execute(
+                "SELECT COUNT(*), AVG(drain_seconds), MAX(drain_seconds) FROM notion_outbox WHERE status = 'done'"
+            ).fetchone()
+        return {
+            "queue_depth": depth,
+            "failed": failed,
+            "delivered": delivered,
+            "oldest_pending_seconds": round(now - oldest, 3) if oldest else 0.0,
+            "drain_latency_avg": round(latency_avg or 0.0, 3),
+            "drain_latency_max": round(latency_max or 0.0, 3),
+        }
+
+class OutboxDrainer:
+    """
+    대기열을 백그라운드에서 노션으로 보내는 드레이너
+
+    한 번에 batch_size개씩 꺼내서 공유 NotionSession(요청 제한기, 429 재시도 포함)으로
+    저장하고, 실패하면 지수 백오프 후 다시 시도합니다.
+    """
+
+    def __init__(self, outbox, session=None, batch_size=DEFAULT_BATCH_SIZE,
+                 poll_interval=DEFAULT_POLL_INTERVAL, max_attempts=None, owner=None, claim_seconds=None):
+        self.outbox = outbox
+        self.session = session
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts or int(os.getenv("NOTION_OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+        self.owner = owner or _default_owner()
+        self.claim_seconds = claim_seconds or float(os.getenv("NOTION_OUTBOX_CLAIM_SECONDS", DEFAULT_CLAIM_SECONDS))
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def drain_once(self):
+        """대기 중인 항목을 한 묶음 전송 (전송한 개수 반환)"""
+        entries = self.outbox.claim(self.batch_size, self.owner, self.claim_seconds)
+        if not entries:
+            return 0
+        session = self.session or get_notion_session()
+
+        for entry in entries:
+            payload = entry["payload"]
+            result = save_to_notion(
+                payload["video_info"], payload["topics"], payload["qa_pairs"],
+                payload["kid_friendly_pairs"], session=session, page_id=entry["page_id"]
+            )
+            if result.get("success"):
+                self.outbox.mark_done(entry, result)
+                logger.info(f"📤 노션 대기열 전송 완료: {entry['video_id']} → {result.get('page_url')}")
+            else:
+                status = self.outbox.mark_failed(
+                    entry, result.get("error", "알 수 없는 오류"), self.max_attempts, result.get("page_id")
+                )
+                logger.warning(f"⚠️ 노션 대기열 전송 실패 ({status}): {entry['video_id']} - {result.get('error')}")
+        NOTION_OUTBOX_DEPTH.set(self.outbox.metrics()["queue_depth"])
+        return len(entries)
+
+    def drain_until_empty(self, timeout=None):
+        """
+        지금 보낼 수 있는 항목이 없을 때까지 전송 (백오프 중인 항목은 기다리지 않음)
+
+        Returns:
+            bool: 대기열이 완전히 비었으면 True
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            sent = self.drain_once()
+            if self.outbox.metrics()["queue_depth"] == 0:
+                return True
+            if deadline and time.monotonic() > deadline:
+                return False
+            if not sent:
+                # 다른 스레드가 전송 중이면 기다리고, 백오프 중인 항목만 남았으면 종료
+                if not self.outbox.active_count():
+                    return False
+                time.sleep(0.05)
+
+    def flush(self, timeout):
+        """
+        백그라운드 스레드가 지금 보낼 수 있는 항목을 다 보낼 때까지 최대 timeout초 기다림
+
+        drain_until_empty()와 달리 전송은 백그라운드 스레드가 하므로 노션 호출이
+        오래 걸려도 호출한 스레드는 timeout이 지나면 돌아옵니다 (CLI 종료용).
+
+        Returns:
+            bool: 대기열이 완전히 비었으면 True
+        """
+        self.start()
+        self.notify()
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.outbox.metrics()["queue_depth"] == 0:
+                return True
+            # 백오프 중인 항목만 남았거나 시간이 다 되면 종료
+            if not self.outbox.active_count() or time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+
+    def start(self):
+        """백그라운드 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notion-outbox-drainer", daemon=True)
+        self._thread.start()
+        return self
+
+    def notify(self):
+        """새 항목이 들어왔음을 알림 (대기 중인 드레이너를 깨움)"""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                sent = self.drain_once()
+            except Exception as e:
+                logger.error(f"노션 대기열 드레이너 오류: {str(e)}")
+                sent = 0
+            if not sent:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+_outbox = None
+_drainer = None
+_outbox_lock = threading.Lock()
+
+def get_outbox():
+    """프로세스 전체에서 공유하는 노션 대기열"""
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = NotionOutbox()
+    return _outbox
+
+def get_drainer():
+    """공유 드레이너 (처음 호출할 때 백그라운드 스레드 시작)"""
+    global _drainer
+    if _drainer is None:
+        # get_outbox()도 _outbox_lock을 잡으므로 락 밖에서 먼저 가져옴
+        outbox = get_outbox()
+        with _outbox_lock:
+            if _drainer is None:
+                _drainer = OutboxDrainer(outbox).start()
+    return _drainer
+
+def main():
+    """대기열 상태 출력 및 남은 항목 전송"""
+    outbox = get_outbox()
+    print(f"대기열: {outbox.path}")
+    print(f"지표: {outbox.metrics()}")
+    drainer = OutboxDrainer(outbox)
+    emptied = drainer.drain_until_empty()
+    print(f"전송 후 지표: {outbox.metrics()} (비었음: {emptied})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import os
+import re
+import gzip
+import base64
+import logging
+from .output_store import atomic_write
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 .br 파일은 건너뜀
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CSS_PATH = os.path.join(os.path.dirname(__file__), "data", "tailwind-2.2.19-subset.css")
+DEFAULT_FONT_FAMILY = "Patrick Hand"
+
+FONT_MIME_TYPES = {
+    ".woff2": "font/woff2",
+    ".woff": "font/woff",
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+}
+
+# fontTools 저장 형식 (None이면 압축 없는 TTF/OTF)
+FONT_FLAVORS = {".woff2": "woff2", ".woff": "woff"}
+
+# 외부 CSS/폰트를 불러오는 <link> 태그 (바로 앞의 설명 주석 포함)
+_EXTERNAL_LINK = re.compile(
+    r'(?:<!--[^>]*-->\s*)?<link\b[^>]*?(?:tailwindcss|fonts\.googleapis\.com|fonts\.gstatic\.com)[^>]*>\s*',
+    re.IGNORECASE | re.DOTALL
+)
+_STYLE_BLOCK = re.compile(r'(<style[^>]*>)(.*?)(</style>)', re.IGNORECASE | re.DOTALL)
+_CLASS_ATTR = re.compile(r'class\s*=\s*"([^"]*)"', re.IGNORECASE)
+_TAG_NAME = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)')
+_SELECTOR_CLASS = re.compile(r'\.((?:\\.|[\w-])+)')
+_SELECTOR_TAG = re.compile(r'(?:^|[\s>+~(])([a-zA-Z][a-zA-Z0-9]*)')
+_PSEUDO = re.compile(r'(?<!\\)::?[a-zA-Z-]+(?:\([^)]*\))?')
+_ATTRIBUTE = re.compile(r'\[[^\]]*\]')
+# /*! ... */ 주석은 남김 (Tailwind가 빈 var() 기본값으로 사용)
+_CSS_COMMENT = re.compile(r'/\*(?!!).*?\*/', re.DOTALL)
+
+def minify_css(css: str) -> str:
+    """주석과 불필요한 공백 제거"""
+    css = _CSS_COMMENT.sub("", css)
+    css = re.sub(r'\s+', " ", css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+def _parse_rules(css: str) -> list:
+    """
+    CSS를 최상위 규칙 목록으로 분해
+
+    Returns:
+        [(선택자 또는 @규칙, 본문), ...] - @media 본문은 다시 규칙 목록
+    """
+    rules = []
+    i = 0
+    length = len(css)
+    while i < length:
+        start = css.find("{", i)
+        if start == -1:
+            break
+        prelude = css[i:start].strip()
+        depth = 1
+        j = start + 1
+        while j < length and depth:
+            if css[j] == "{":
+                depth += 1
+            elif css[j] == "}":
+                depth -= 1
+            j += 1
+        body = css[start + 1:j - 1]
+        if prelude.startswith("@media") or prelude.startswith("@supports"):
+            rules.append((prelude, _parse_rules(body)))
+        else:
+            rules.append((prelude, body))
+        i = j
+    return rules
+
+def _collect_usage(html: str) -> tuple:
+    """마크업에서 쓰인 클래스 이름과 태그 이름"""
+    classes = set()
+    for value in _CLASS_ATTR.findall(html):
+        classes.update(value.split())
+    tags = {tag.lower() for tag in _TAG_NAME.findall(html)}
+    return classes, tags
+
+def _selector_used(selector: str, classes: set, tags: set) -> bool:
+    bare = _ATTRIBUTE.sub("", _PSEUDO.sub("", selector))
+    if not bare.strip() and selector.startswith("["):
+        # [type='button'] 같은 속성 선택자는 폼 요소가 있을 때만
+        return bool(tags & {"button", "input", "select", "textarea"})
+    for name in _SELECTOR_CLASS.findall(bare):
+        if name.replace("\\", "") not in classes:
+            return False
+    for tag in _SELECTOR_TAG.findall(_SELECTOR_CLASS.sub("", bare)):
+        if tag.lower() not in tags:
+            return False
+    return True
+
+def purge_css(css: str, html: str) -> str:
+    """
+    생성된 마크업에서 실제로 쓰인 선택자만 남긴 CSS 반환
+
+    클래스 선택자는 class 속성에 있는 이름, 태그 선택자는 문서에 있는 태그만 남깁니다.
+    선택자 목록(`a, b`)은 쓰인 선택자만 남기고, 빈 @media 블록은 지웁니다.
+    """
+    classes, tags = _collect_usage(html)
+
+    def purge(rules):
+        kept = []
+        for prelude, body in rules:
+            if isinstance(body, list):
+                inner = purge(body)
+                if inner:
+                    kept.append(f"{prelude}{{{inner}}}")
+            elif prelude.startswith("@"):
+                kept.append(f"{prelude}{{{body}}}")
+            else:
+                selectors = [s for s in prelude.split(",") if _selector_used(s.strip(), classes, tags)]
+                if selectors:
+                    kept.append(f"{','.join(s.strip() for s in selectors)}{{{body}}}")
+        return "".join(kept)
+
+    return purge(_parse_rules(minify_css(css)))
+
+def _visible_text(html: str) -> str:
+    text = _STYLE_BLOCK.sub("", html)
+    return re.sub(r'<[^>]+>', "", text)
+
+def _font_face(font_path: str, text: str, font_family: str) -> tuple:
+    """
+    폰트를 base64 @font-face로 변환 (fontTools가 있으면 문서에 쓰인 글자만 남김)
+
+    Returns:
+        (CSS 문자열, 임베드한 폰트 바이트 수)
+    """
+    with open(font_path, "rb") as f:
+        data = f.read()
+
+    extension = os.path.splitext(font_path)[1].lower()
+    try:
+        from fontTools import subset
+        from io import BytesIO
+    except ImportError:
+        logger.info("fontTools가 없어 폰트 전체를 임베드합니다.")
+    else:
+        try:
+            # 저장 형식을 입력과 같게 (지정하지 않으면 .woff2도 TTF/OTF로 저장되어 MIME 타입과 달라짐)
+            options = subset.Options()
+            options.flavor = FONT_FLAVORS.get(extension)
+            font = subset.load_font(BytesIO(data), options)
+            subsetter = subset.Subsetter(options)
+            subsetter.populate(text="".join(sorted(set(text))))
+            subsetter.subset(font)
+            out = BytesIO()
+            subset.save_font(font, out, options)
+            data = out.getvalue()
+        except Exception as e:
+            # 손상/미지원 폰트, brotli 없는 WOFF2 등: HTML 저장을 막지 않도록 원본을 그대로 임베드
+            logger.warning(f"폰트 서브셋 실패, 폰트 전체를 임베드합니다: {e}")
+
+    mime = FONT_MIME_TYPES.get(extension, "font/ttf")
+    encoded = base64.b64encode(data).decode("ascii")
+    css = (f"@font-face{{font-family:'{font_family}';font-display:swap;"
+           f"src:url(data:{mime};base64,{encoded})}}")
+    return css, len(data)
+
+def make_offline_html(html: str, font_path: str = None, css_path: str = DEFAULT_CSS_PATH,
+                      font_family: str = DEFAULT_FONT_FAMILY) -> tuple:
+    """
+    외부 CSS/폰트 링크를 없애고 필요한 CSS만 인라인한 단일 HTML 생성
+
+    Args:
+        html: html_generator가 만든 HTML
+        font_path: 임베드할 폰트 파일 (없으면 OFFLINE_FONT_PATH, 그것도 없으면 시스템 폰트 사용)
+        css_path: Tailwind 스타일시트 (기본값: utils/data의 발췌본)
+        font_family: @font-face 이름
+
+    Returns:
+        (offline_html, report) - report는 단계별 크기(바이트)
+    """
+    font_path = font_path or os.getenv("OFFLINE_FONT_PATH")
+    with open(css_path, "r", encoding="utf-8") as f:
+        source_css = f.read()
+
+    removed_links = len(_EXTERNAL_LINK.findall(html))
+    body_html = _EXTERNAL_LINK.sub("", html)
+
+    purged_css = purge_css(source_css, body_html)
+    font_bytes = 0
+    if font_path:
+        font_css, font_bytes = _font_face(font_path, _visible_text(body_html), font_family)
+        purged_css = font_css + purged_css
+
+    # 기존 <style> 블록도 최소화하고, 인라인 CSS는 원래 링크가 있던 자리(첫 <style> 앞)에 넣음
+    body_html = _STYLE_BLOCK.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), body_html)
+    inline_style = f"<style>{purged_css}</style>\n  "
+    match = _STYLE_BLOCK.search(body_html)
+    if match:
+        offline_html = body_html[:match.start()] + inline_style + body_html[match.start():]
+    else:
+        offline_html = body_html.replace("</head>", inline_style + "</head>", 1)
+
+    report = {
+        "html_bytes": len(html.encode("utf-8")),
+        "css_source_bytes": len(source_css.encode("utf-8")),
+        "css_inlined_bytes": len(purged_css.encode("utf-8")) - (len(font_css.encode("utf-8")) if font_path else 0),
+        "font_bytes": font_bytes,
+        "offline_html_bytes": len(offline_html.encode("utf-8")),
+        "external_links_removed": removed_links,
+    }
+    return offline_html, report
+
+def write_offline_html(html: str, output_path: str, font_path: str = None) -> dict:
+    """
+    오프라인 HTML과 미리 압축한 .gz(.br) 파일을 함께 저장
+
+    Returns:
+        크기 리포트 (make_offline_html 리포트 + gzip_bytes, brotli_bytes)
+    """
+    offline_html, report = make_offline_html(html, font_path=font_path)
+    data = offline_html.encode("utf-8")
+
+    atomic_write(output_path, data)
+
+    gzip_data = gzip.compress(data, compresslevel=9, mtime=0)
+    atomic_write(output_path + ".gz", gzip_data)
+    report["gzip_bytes"] = len(gzip_data)
+
+    if brotli is not None:
+        brotli_data = brotli.compress(data, quality=11)
+        atomic_write(output_path + ".br", brotli_data)
+        report["brotli_bytes"] = len(brotli_data)
+    else:
+        report["brotli_bytes"] = None
+
+    return report
+
+def format_size_report(report: dict) -> str:
+    """크기 리포트를 사람이 읽기 쉬운 문자열로"""
+    def kb(value):
+        return f"{value / 1024:.1f}KB"
+
+    lines = [
+        f"📄 원본 HTML: {kb(report['html_bytes'])} + 외부 링크 {report['external_links_removed']}개 (CDN CSS/폰트)",
+        f"🎨 CSS: {kb(report['css_source_bytes'])} → {kb(report['css_inlined_bytes'])} (사용된 규칙만)",
+    ]
+    if report.get("font_bytes"):
+        lines.append(f"🔤 임베드 폰트: {kb(report['font_bytes'])}")
+    lines.append(f"📦 단일 파일: {kb(report['offline_html_bytes'])}")
+    if report.get("gzip_bytes") is not None:
+        lines.append(f"🗜️ gzip: {kb(report['gzip_bytes'])}")
+    if report.get("brotli_bytes") is not None:
+        lines.append(f"🗜️ brotli: {kb(report['brotli_bytes'])}")
+    return "\n".join(lines)
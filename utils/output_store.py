@@ -0,0 +1,138 @@
+import os
+import re
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+DEFAULT_OUTPUT_ROOT = "outputs"
+MANIFEST_NAME = "manifest.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifest (
+    video_id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    files TEXT NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+def atomic_write(path, content):
+    """
+    임시 파일에 쓴 뒤 os.replace로 바꿔치기 (읽는 쪽은 이전 파일 또는 완성된 새 파일만 봄)
+
+    Args:
+        path: 최종 경로
+        content: str(UTF-8로 저장) 또는 bytes
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    data = content.encode("utf-8") if isinstance(content, str) else content
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def video_key(video_info):
+    """경로에 쓸 수 있는 비디오 키: video_id (없으면 URL 해시)"""
+    video_id = video_info.get("video_id")
+    if video_id:
+        return re.sub(r"[^A-Za-z0-9_-]", "_", video_id)
+    return "url-" + hashlib.sha1(video_info.get("url", "").encode("utf-8")).hexdigest()[:16]
+
+def new_run_id():
+    """시간순으로 정렬되는 실행 ID (예: 20250101-120000-1a2b3c)"""
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+class OutputStore:
+    """
+    비디오/실행별 결과 파일 저장소
+
+    결과는 `{root}/{video_id}/{run_id}/` 아래에 원자적으로 기록하고,
+    모든 파일을 쓴 뒤에 SQLite 매니페스트(`{root}/manifest.db`)의 최신 실행을 갱신합니다.
+    그래서 매니페스트가 가리키는 파일은 항상 완성된 파일이고,
+    최신 결과 조회는 디렉터리를 훑지 않고 video_id 기본 키 조회 한 번으로 끝납니다.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.getenv("OUTPUT_ROOT", DEFAULT_OUTPUT_ROOT)
+        os.makedirs(self.root, exist_ok=True)
+        self.manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.manifest_path, timeout=30)
+
+    def run_dir(self, video_info, run_id):
+        return os.path.join(self.root, video_key(video_info), run_id)
+
+    def write(self, video_info, run_id, name, content):
+        """실행 디렉터리에 파일 하나를 원자적으로 기록하고 경로 반환"""
+        return atomic_write(os.path.join(self.run_dir(video_info, run_id), name), content)
+
+    def record(self, video_info, run_id, paths):
+        """이미 기록한 파일들을 매니페스트에 등록 (같은 video_id는 최신 실행으로 덮어씀)"""
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT INTO manifest (video_id, run_id, title, url, files, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    run_id = excluded.run_id,
+                    title = excluded.title,
+                    url = excluded.url,
+                    files = excluded.files,
+                    updated_at = excluded.updated_at
+            """, (video_key(video_info), run_id, video_info.get("title"), video_info.get("url"),
+                  json.dumps(paths, ensure_ascii=False), time.time()))
+
+    def latest(self, video_id):
+        """
+        비디오의 최신 결과 조회
+
+        Returns:
+            {"video_id", "run_id", "title", "url", "files": {종류: 경로}, "updated_at"} 또는 None
+        """
+        key = video_key({"video_id": video_id})
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM manifest WHERE video_id = ?", (key,)).fetchone()
+        if not row:
+            return None
+        entry = dict(row)
+        entry["files"] = json.loads(entry["files"])
+        return entry
+
+    def entries(self):
+        """매니페스트 전체 (최근 갱신 순)"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM manifest ORDER BY updated_at DESC").fetchall()
+        return [dict(row, files=json.loads(row["files"])) for row in rows]
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_output_store():
+    """프로세스 전체에서 공유하는 결과 저장소 (OUTPUT_ROOT, 기본 outputs/)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = OutputStore()
+    return _store
@@ -1,4 +1,4 @@
-from .call_llm import call_llm, call_llm_mock
+from .response_parser import call_llm_for_items
 import os
 
 def generate_qa_pairs(topic_title: str, topic_content: str, num_questions: int = 3, use_mock: bool = False) -> list:
@@ -31,41 +31,31 @@ def generate_qa_pairs(topic_title: str, topic_content: str, num_questions: int =
 
 다음 JSON 형식으로만 응답해주세요 (다른 설명 없이):
 ```json
-[
-    {{
-        "question": "구체적이고 흥미로운 질문",
-        "answer": "상세하고 이해하기 쉬운 답변"
-    }},
-    {{
-        "question": "두 번째 질문",
-        "answer": "두 번째 답변"
-    }}
-]
+{{
+    "qa_pairs": [
+        {{
+            "question": "구체적이고 흥미로운 질문",
+            "answer": "상세하고 이해하기 쉬운 답변"
+        }},
+        {{
+            "question": "두 번째 질문",
+            "answer": "두 번째 답변"
+        }}
+    ]
+}}
 ```
 """
     
     try:
-        if use_mock:
-            response = call_llm_mock(prompt)
-        else:
-            response = call_llm(prompt, model="gpt-4")
-            
-        # JSON 부분만 추출
-        if "```json" in response:
-            json_start = response.find("```json") + 7
-            json_end = response.find("```", json_start)
-            json_str = response[json_start:json_end].strip()
-        else:
-            json_start = response.find('[')
-            json_end = response.rfind(']') + 1
-            json_str = response[json_start:json_end] if json_start != -1 and json_end != -1 else response
-        
-        if json_str:
-            import json
-            qa_pairs = json.loads(json_str)
-            return qa_pairs[:num_questions]  # 요청한 개수만큼만 반환
-        else:
-            return []
+        qa_pairs = call_llm_for_items(
+            prompt,
+            required_fields=["question", "answer"],
+            expected_count=num_questions,
+            list_key="qa_pairs",
+            stage="qa",
+            use_mock=use_mock
+        )
+        return qa_pairs
     except Exception as e:
         print(f"Error generating Q&A pairs: {e}")
         return []
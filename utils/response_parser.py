@@ -0,0 +1,315 @@
+import json
+import re
+from .model_router import call_llm_for_stage
+
+_FENCE_PATTERN = re.compile(r"```[a-zA-Z]*\s*")
+_CLOSERS = {"[": "]", "{": "}"}
+
+
+class JSONStreamExtractor:
+    """
+    LLM 응답에서 JSON을 점진적으로 추출하는 관대한 파서
+
+    텍스트를 조각(chunk) 단위로 feed() 하면 최상위 배열의 항목이
+    완성되는 즉시 돌려줍니다. close()는 코드 펜스, 후행 쉼표,
+    잘린 응답을 복구한 뒤 최종 JSON 값을 반환합니다.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._start = -1
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._item_start = -1
+        self._done = False
+        # 마지막으로 값이 완전히 닫힌 위치와 그때의 스택 (잘린 응답 복구용)
+        self._last_safe = -1
+        self._safe_stack = []
+
+    def feed(self, chunk: str) -> list:
+        """
+        텍스트 조각을 추가하고 새로 완성된 최상위 배열 항목들을 반환
+
+        Args:
+            chunk: 스트리밍 응답의 다음 조각
+
+        Returns:
+            이번 조각으로 완성된 항목 리스트 (파싱 실패 항목은 제외)
+        """
+        self.buffer += chunk
+        completed = []
+        text = self.buffer
+
+        while self._pos < len(text) and not self._done:
+            ch = text[self._pos]
+
+            if self._start == -1:
+                if ch in "[{":
+                    self._start = self._pos
+                    self._stack.append(ch)
+                    self._item_start = -1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                self._pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._mark_item_start()
+            elif ch in "[{":
+                self._mark_item_start()
+                self._stack.append(ch)
+            elif ch in "]}":
+                if self._stack and _CLOSERS[self._stack[-1]] == ch:
+                    self._stack.pop()
+                    self._last_safe = self._pos + 1
+                    self._safe_stack = list(self._stack)
+                    if len(self._stack) == 1 and self._stack[0] == "[" and self._item_start != -1:
+                        item = _loads_repaired(text[self._item_start:self._pos + 1])
+                        if item is not None:
+                            completed.append(item)
+                        self._item_start = -1
+                    if not self._stack:
+                        self._done = True
+            elif ch == "," and len(self._stack) == 1:
+                self._item_start = -1
+            elif not ch.isspace():
+                self._mark_item_start()
+
+            self._pos += 1
+
+        return completed
+
+    def _mark_item_start(self):
+        if len(self._stack) == 1 and self._stack[0] == "[" and self._item_start == -1:
+            self._item_start = self._pos
+
+    def close(self):
+        """
+        입력을 마치고 복구된 최종 JSON 값을 반환
+
+        Returns:
+            파싱된 JSON 값, 복구할 수 없으면 None
+        """
+        if self._start == -1:
+            return None
+
+        if self._done:
+            return _loads_repaired(self.buffer[self._start:self._last_safe])
+
+        # 잘린 응답: 마지막으로 완전히 닫힌 값까지만 남기고 괄호를 닫아줌
+        if self._last_safe == -1 or not self._safe_stack:
+            return None
+        fragment = self.buffer[self._start:self._last_safe]
+        closers = "".join(_CLOSERS[opener] for opener in reversed(self._safe_stack))
+        return _loads_repaired(fragment + closers)
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """문자열 밖에 있는 후행 쉼표(`,]`, `,}`)를 제거"""
+    result = []
+    in_string = False
+    escape = False
+    length = len(text)
+
+    for i, ch in enumerate(text):
+        if in_string:
+            result.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch == ",":
+            j = i + 1
+            while j < length and text[j].isspace():
+                j += 1
+            if j >= length or text[j] in "]}":
+                continue
+        result.append(ch)
+
+    return "".join(result)
+
+
+def _loads_repaired(fragment: str):
+    try:
+        return json.loads(fragment)
+    except ValueError:
+        pass
+    try:
+        return json.loads(_strip_trailing_commas(fragment))
+    except ValueError:
+        return None
+
+
+def extract_json(response: str):
+    """
+    LLM 응답 문자열에서 JSON 값을 추출 (펜스/후행 쉼표/잘림 복구)
+
+    Args:
+        response: LLM 응답 텍스트
+
+    Returns:
+        파싱된 JSON 값, 찾지 못하면 None
+    """
+    if not response:
+        return None
+
+    extractor = JSONStreamExtractor()
+    extractor.feed(_FENCE_PATTERN.sub("", response))
+    return extractor.close()
+
+
+def extract_json_list(response: str, list_key: str = None) -> list:
+    """
+    응답에서 항목 리스트를 추출
+
+    JSON 모드 응답은 최상위가 객체이므로 `{"topics": [...]}` 같은 형태면
+    list_key 또는 첫 번째 리스트 값을 꺼내서 반환합니다.
+
+    Returns:
+        항목 리스트 (없으면 빈 리스트)
+    """
+    data = extract_json(response)
+
+    if isinstance(data, dict):
+        if list_key and isinstance(data.get(list_key), list):
+            data = data[list_key]
+        else:
+            data = next((value for value in data.values() if isinstance(value, list)), [data])
+
+    return data if isinstance(data, list) else []
+
+
+def validate_items(items: list, required_fields: list) -> tuple:
+    """
+    항목들이 필수 필드를 모두 가졌는지 검증
+
+    Args:
+        items: 검증할 항목 리스트
+        required_fields: 비어 있으면 안 되는 문자열 필드 이름들
+
+    Returns:
+        (valid_items, incomplete_items) - 일부 필드만 있는 항목은 incomplete로 분류
+    """
+    valid_items = []
+    incomplete_items = []
+
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        missing = [
+            field for field in required_fields
+            if not isinstance(item.get(field), str) or not item.get(field).strip()
+        ]
+        if not missing:
+            valid_items.append({field: item[field].strip() for field in required_fields})
+        elif len(missing) < len(required_fields):
+            incomplete_items.append(item)
+
+    return valid_items, incomplete_items
+
+
+def _build_repair_prompt(original_prompt, valid_items, incomplete_items, missing_count, required_fields, list_key):
+    """빠진 항목만 다시 요청하는 프롬프트 생성"""
+    fields = ", ".join(f'"{field}"' for field in required_fields)
+    prompt = f"""
+이전 요청에 대한 응답 중 일부 항목이 빠졌거나 불완전했습니다.
+아래 원래 요청을 참고하여 부족한 항목 {missing_count}개만 새로 작성해주세요.
+
+**중요**: 반드시 한국어로 작성하고, 각 항목은 {fields} 필드를 모두 가져야 합니다.
+
+원래 요청:
+{original_prompt.strip()}
+
+이미 받은 항목 (중복하지 마세요):
+{json.dumps(valid_items, ensure_ascii=False)}
+"""
+    if incomplete_items:
+        prompt += f"""
+다음 항목들은 필드가 비어 있습니다. 빠진 필드를 채워서 결과에 포함해주세요:
+{json.dumps(incomplete_items, ensure_ascii=False)}
+"""
+    prompt += f"""
+다음 JSON 형식으로만 응답해주세요 (다른 설명 없이):
+{{"{list_key}": [ ... {missing_count}개 항목 ... ]}}
+"""
+    return prompt
+
+
+def call_llm_for_items(prompt: str, required_fields: list, expected_count: int, list_key: str = "items",
+                       stage: str = "qa", use_mock: bool = False, max_repairs: int = 1) -> list:
+    """
+    LLM을 호출해 구조화된 항목 리스트를 받아오는 공통 함수
+
+    JSON 모드로 호출하고, 응답을 복구/검증한 뒤 부족한 항목이 있으면
+    전체 호출을 반복하지 않고 빠진 항목만 다시 요청합니다.
+    모델은 단계별 라우팅 테이블(model_router)에서 정해지며, 캐스케이드
+    모드에서는 스키마 검증 결과가 저렴한 모델 응답의 점수로 쓰입니다.
+
+    Args:
+        prompt: LLM 프롬프트
+        required_fields: 각 항목의 필수 필드 (예: ["title", "content"])
+        expected_count: 필요한 항목 개수
+        list_key: JSON 모드 응답에서 리스트가 담길 키
+        stage: 라우팅 단계 이름 (예: "topics", "qa")
+        use_mock: True면 Mock 버전 사용
+        max_repairs: 빠진 항목 재요청 최대 횟수
+
+    Returns:
+        검증된 항목 리스트 (최대 expected_count개)
+    """
+    def score_response(response):
+        valid, _ = validate_items(extract_json_list(response, list_key), required_fields)
+        return min(len(valid) / expected_count, 1.0) if expected_count else 1.0
+
+    response = call_llm_for_stage(stage, prompt, json_mode=True, validator=score_response, use_mock=use_mock)
+    valid_items, incomplete_items = validate_items(extract_json_list(response, list_key), required_fields)
+
+    for _ in range(max_repairs):
+        missing_count = expected_count - len(valid_items)
+        if missing_count <= 0 or use_mock:
+            break
+
+        repair_prompt = _build_repair_prompt(
+            prompt, valid_items, incomplete_items, missing_count, required_fields, list_key
+        )
+        repair_response = call_llm_for_stage(stage, repair_prompt, json_mode=True)
+        repaired_items, incomplete_items = validate_items(
+            extract_json_list(repair_response, list_key), required_fields
+        )
+        valid_items.extend(repaired_items)
+
+    return valid_items[:expected_count]
+
+
+def main():
+    """테스트용 함수"""
+    truncated = '```json\n[{"title": "첫 주제", "content": "내용"}, {"title": "두 번째", "content": "잘린 내'
+    print("잘린 응답 복구:", extract_json(truncated))
+
+    trailing = '결과입니다: [{"question": "질문", "answer": "답변",},]'
+    print("후행 쉼표 복구:", extract_json(trailing))
+
+    extractor = JSONStreamExtractor()
+    for chunk in ['[{"a": 1}', ', {"a": ', '2}]']:
+        print("스트리밍 항목:", extractor.feed(chunk))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from .model_router import get_routing
+from .hierarchical_summarizer import summary_settings
+from .stage_cache import pipeline_settings
+from .metrics import CACHE_LOOKUPS
+
+DEFAULT_CACHE_PATH = "result_cache.db"
+
+# 프롬프트나 후처리를 바꿔서 예전 결과를 재사용하면 안 될 때 올림
+PIPELINE_VERSION = "1"
+
+# 캐시에 저장하는 shared 키 (화면을 다시 그리는 데 필요한 것만)
+CACHED_KEYS = ("video_info", "final_topics", "html_output", "file_html", "output_files", "run_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    video_id TEXT NOT NULL,
+    config_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (video_id, config_key)
+)
+"""
+
+def pipeline_config(settings=None):
+    """
+    결과에 영향을 주는 파이프라인 설정
+
+    Mock 모드 여부, 단계별 모델 라우팅, 실행 설정(주제/질문 수, 대상 연령, AI 검토),
+    계층 요약 설정, 파이프라인 버전이 같으면 같은 비디오에 대해 같은 결과를 재사용해도 됩니다.
+
+    Args:
+        settings: 실행별 설정 (shared["settings"]와 같은 형식)
+    """
+    return {
+        "version": PIPELINE_VERSION,
+        "mock": not os.getenv("OPENAI_API_KEY"),
+        "routing": get_routing(),
+        **pipeline_settings(settings),
+        "summary": summary_settings(),
+    }
+
+def config_key(config=None):
+    """설정 딕셔너리 → 짧은 해시"""
+    data = json.dumps(config if config is not None else pipeline_config(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+class ResultCache:
+    """
+    (video_id, 설정 해시)별 처리 결과를 저장하는 영속 캐시
+
+    Streamlit 재실행, 다른 세션, 페이지 새로고침, 프로세스 재시작에도 유지되며
+    조회는 기본 키 한 번이라 LLM/YouTube 호출 없이 바로 결과를 다시 그릴 수 있습니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("RESULT_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, video_id, key=None):
+        """
+        저장된 결과 조회
+
+        Returns:
+            shared에서 CACHED_KEYS만 담은 딕셔너리 (+ "cached_at") 또는 None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, created_at FROM results WHERE video_id = ? AND config_key = ?",
+                (video_id, key or config_key())
+            ).fetchone()
+        if not row:
+            CACHE_LOOKUPS.labels("result", "miss").inc()
+            return None
+        CACHE_LOOKUPS.labels("result", "hit").inc()
+        result = json.loads(row[0])
+        result["cached_at"] = row[1]
+        return result
+
+    def put(self, video_id, shared, key=None):
+        """처리가 끝난 shared에서 결과만 골라 저장 (같은 키는 덮어씀)"""
+        result = {name: shared[name] for name in CACHED_KEYS if name in shared}
+        if "video_info" in result:
+            # 자막 원문은 화면에 쓰지 않으므로 저장하지 않음
+            result["video_info"] = {k: v for k, v in result["video_info"].items() if k != "transcript"}
+        payload = json.dumps(result, ensure_ascii=False)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (video_id, config_key, payload, created_at) VALUES (?, ?, ?, ?)",
+                (video_id, key or config_key(), payload, time.time())
+            )
+
+    def invalidate(self, video_id, key=None):
+        """비디오의 캐시 삭제 (key가 없으면 모든 설정)"""
+        with self._lock, self._connect() as conn:
+            if key:
+                conn.execute("DELETE FROM results WHERE video_id = ? AND config_key = ?", (video_id, key))
+            else:
+                conn.execute("DELETE FROM results WHERE video_id = ?", (video_id,))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_result_cache():
+    """프로세스 전체에서 공유하는 결과 캐시 (RESULT_CACHE_PATH, 기본 result_cache.db)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+    return _cache
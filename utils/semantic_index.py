@@ -0,0 +1,665 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import zlib
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+import numpy as np
+from .output_store import atomic_write
+from .youtube_processor import transcript_passages
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "semantic_index"
+DEFAULT_DIM = 256
+DEFAULT_NPROBE = 16
+DEFAULT_OPENAI_MODEL = "text-embedding-3-small"
+
+# 전체 검색에서 한 번에 곱하는 행 수 (256차원이면 블록 하나가 256MB)
+BLOCK_ROWS = 262144
+INITIAL_CAPACITY = 1024
+
+_WORD = re.compile(r"\w+")
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+class HashingEmbedder:
+    """
+    네트워크 없이 쓰는 해시 임베더 (낱말 + 낱말 안 글자 bigram을 차원에 해시)
+
+    "광합성은"과 "광합성이란"처럼 조사가 붙은 한국어 낱말도 글자 bigram이 겹쳐서 가깝게 나옵니다.
+    상태가 없어서 (어휘 사전/IDF 학습 없음) 색인에 문서를 더해도 기존 벡터를 다시 만들 필요가 없습니다.
+    """
+
+    def __init__(self, dim=DEFAULT_DIM):
+        self.dim = dim
+        self.name = f"hashing:{dim}"
+
+    def _features(self, text):
+        counts = {}
+        for word in _WORD.findall(text.lower()):
+            counts[word] = counts.get(word, 0) + 1
+            for i in range(len(word) - 1):
+                bigram = "#" + word[i:i + 2]
+                counts[bigram] = counts.get(bigram, 0) + 1
+        return counts
+
+    def embed(self, texts):
+        """텍스트 목록 → (n, dim) float32 단위 벡터 (빈 텍스트는 0 벡터)"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                digest = zlib.crc32(feature.encode("utf-8"))
+                weight = 1.0 + math.log(count)
+                matrix[row, digest % self.dim] += weight if digest & 0x80000000 else -weight
+        return _normalize(matrix)
+
+class OpenAIEmbedder:
+    """
+    OpenAI 임베딩 API (call_llm과 같은 클라이언트/OPENAI_BASE_URL 사용)
+
+    text-embedding-3 모델은 dimensions로 차원을 줄여 받으므로 행렬 크기를 해시 임베더와 맞출 수 있습니다.
+    """
+
+    def __init__(self, model=DEFAULT_OPENAI_MODEL, dim=DEFAULT_DIM, batch_size=256):
+        self.model = model
+        self.dim = dim
+        self.batch_size = batch_size
+        self.name = f"openai:{model}:{dim}"
+
+    def embed(self, texts):
+        from .call_llm import get_openai_client
+
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OpenAI 임베딩에는 OPENAI_API_KEY가 필요합니다 (오프라인은 EMBEDDER=hashing)")
+        client = get_openai_client(api_key)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = [text or " " for text in texts[start:start + self.batch_size]]
+            response = client.embeddings.create(model=self.model, input=batch, dimensions=self.dim)
+            for item in response.data:
+                matrix[start + item.index] = item.embedding
+        return _normalize(matrix)
+
+def get_embedder(name=None):
+    """
+    EMBEDDER 환경변수로 임베더 선택
+
+    - hashing (기본): HashingEmbedder(EMBEDDING_DIM, 기본 256)
+    - openai 또는 openai:<모델>: OpenAIEmbedder
+    """
+    name = (name or os.getenv("EMBEDDER", "hashing")).strip()
+    dim = int(os.getenv("EMBEDDING_DIM", DEFAULT_DIM))
+    if name == "hashing":
+        return HashingEmbedder(dim)
+    if name == "openai" or name.startswith("openai:"):
+        return OpenAIEmbedder(name.split(":", 1)[1] if ":" in name else DEFAULT_OPENAI_MODEL, dim)
+    raise ValueError(f"알 수 없는 임베더: {name} (가능: hashing, openai, openai:<모델>)")
+
+class VectorStore:
+    """
+    메모리 매핑한 float32 행렬 + id 사이드카 벡터 저장소
+
+    디렉터리 구성:
+    - vectors.f32: (capacity, dim) float32 행렬 (np.memmap, 모자라면 두 배로 늘림)
+    - alive.u8: 행마다 1(사용)/0(삭제) — 삭제는 행을 지우지 않고 표시만 함
+    - ids.jsonl: 행 순서대로 레코드 한 줄씩 ({"id", "video_id", "kind", "text", ...}) — 검색 결과 행만 읽음
+    - offsets.i64: 행마다 ids.jsonl 안의 줄 시작 위치 (레코드를 메모리에 올리지 않고 바로 찾아 읽음)
+    - video.u32: 행마다 비디오 번호, videos.jsonl: 번호 순서대로 비디오 ID 한 줄씩 (비디오의 행을 벡터 비교로 찾음)
+    - meta.json: {"dim", "count", "capacity", "embedder", "ivf", "sidecar_bytes", "videos", "videos_bytes"}
+      — 행과 사이드카를 다 쓴 뒤에 갱신
+    - ivf_*.npy: build_ivf()로 만든 IVF 분할 (중심점, 목록별 행 번호, 목록 경계)
+    - .lock: 쓰기 잠금 파일 (fcntl.flock) — 여러 프로세스가 같은 색인에 써도 행 번호가 겹치지 않음
+
+    검색은 블록 단위 행렬곱 + argpartition으로 여러 질의의 top-k를 한 번에 구하고,
+    IVF가 있으면 가까운 nprobe개 목록의 행(과 IVF를 만든 뒤 추가된 행)만 계산합니다.
+    """
+
+    def __init__(self, path=None, dim=DEFAULT_DIM, embedder=None):
+        self.path = path or os.getenv("SEMANTIC_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        os.makedirs(self.path, exist_ok=True)
+        self._meta_path = os.path.join(self.path, "meta.json")
+        self._sidecar_path = os.path.join(self.path, "ids.jsonl")
+        self._videos_path = os.path.join(self.path, "videos.jsonl")
+        with self._process_lock():
+            if os.path.exists(self._meta_path):
+                self.meta = self._read_meta()
+                if self.meta["dim"] != dim or (embedder and self.meta["embedder"] != embedder):
+                    raise ValueError(f"색인({self.meta['embedder']}, {self.meta['dim']}차원)과 임베더({embedder}, {dim}차원)가 "
+                                     "다릅니다. 다른 경로를 쓰거나 --rebuild로 다시 만드세요.")
+                if "sidecar_bytes" not in self.meta:
+                    self._build_row_index()
+            else:
+                self.meta = {"dim": dim, "count": 0, "capacity": INITIAL_CAPACITY, "embedder": embedder, "ivf": None,
+                             "sidecar_bytes": 0, "videos": 0, "videos_bytes": 0}
+                self._resize_files(INITIAL_CAPACITY)
+                atomic_write(self._sidecar_path, "")
+                atomic_write(self._videos_path, "")
+                self._write_meta()
+        self._videos = []
+        self._video_numbers = {}
+        self._videos_offset = 0
+        self._map()
+        self._load_videos()
+        self._load_ivf()
+
+    @property
+    def dim(self):
+        return self.meta["dim"]
+
+    @property
+    def count(self):
+        return self.meta["count"]
+
+    def _read_meta(self):
+        with open(self._meta_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self):
+        atomic_write(self._meta_path, json.dumps(self.meta, ensure_ascii=False))
+
+    def _resize_files(self, capacity):
+        for name, row_bytes in (("vectors.f32", self.meta["dim"] * 4), ("alive.u8", 1), ("offsets.i64", 8),
+                                ("video.u32", 4)):
+            with open(os.path.join(self.path, name), "ab") as f:
+                f.truncate(capacity * row_bytes)
+
+    def _map(self):
+        capacity = self.meta["capacity"]
+        self.vectors = np.memmap(os.path.join(self.path, "vectors.f32"), dtype=np.float32, mode="r+",
+                                 shape=(capacity, self.meta["dim"]))
+        self.alive = np.memmap(os.path.join(self.path, "alive.u8"), dtype=np.uint8, mode="r+", shape=(capacity,))
+        self.offsets = np.memmap(os.path.join(self.path, "offsets.i64"), dtype=np.int64, mode="r+", shape=(capacity,))
+        self.row_videos = np.memmap(os.path.join(self.path, "video.u32"), dtype=np.uint32, mode="r+", shape=(capacity,))
+
+    def _flush(self):
+        for array in (self.vectors, self.alive, self.offsets, self.row_videos):
+            array.flush()
+
+    def _build_row_index(self):
+        """줄 위치/비디오 번호 파일이 없던 예전 색인: 사이드카를 한 번 훑어서 만듦 (프로세스 잠금 안에서)"""
+        self._resize_files(self.meta["capacity"])
+        offsets = np.memmap(os.path.join(self.path, "offsets.i64"), dtype=np.int64, mode="r+",
+                            shape=(self.meta["capacity"],))
+        row_videos = np.memmap(os.path.join(self.path, "video.u32"), dtype=np.uint32, mode="r+",
+                               shape=(self.meta["capacity"],))
+        numbers = {}
+        with open(self._sidecar_path, "rb") as f:
+            for row in range(self.count):
+                offsets[row] = f.tell()
+                video_id = json.loads(f.readline()).get("video_id")
+                row_videos[row] = numbers.setdefault(video_id, len(numbers))
+            sidecar_bytes = f.tell()
+        offsets.flush()
+        row_videos.flush()
+        videos = "".join(json.dumps(video_id, ensure_ascii=False) + "\n" for video_id in numbers)
+        atomic_write(self._videos_path, videos)
+        self.meta.update(sidecar_bytes=sidecar_bytes, videos=len(numbers), videos_bytes=len(videos.encode("utf-8")))
+        self._write_meta()
+
+    def _load_videos(self):
+        """videos.jsonl에서 아직 읽지 않은 비디오 ID만 읽음 (meta의 videos 수까지)"""
+        with open(self._videos_path, "rb") as f:
+            f.seek(self._videos_offset)
+            while len(self._videos) < self.meta["videos"]:
+                line = f.readline()
+                if not line:
+                    break
+                video_id = json.loads(line)
+                self._video_numbers[video_id] = len(self._videos)
+                self._videos.append(video_id)
+            self._videos_offset = f.tell()
+
+    def _load_ivf(self):
+        self.ivf = None
+        if self.meta.get("ivf"):
+            self.ivf = {name: np.load(os.path.join(self.path, f"ivf_{name}.npy"), mmap_mode="r")
+                        for name in ("centroids", "order", "offsets")}
+
+    @contextmanager
+    def _process_lock(self):
+        """다른 프로세스와의 쓰기 잠금 (파일을 닫으면 풀림)"""
+        with open(os.path.join(self.path, ".lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    @contextmanager
+    def locked(self):
+        """
+        스레드 + 프로세스 간 쓰기 잠금 (같은 스레드에서 다시 잡아도 됨)
+
+        처음 잡을 때 refresh()로 다른 프로세스가 쓴 행을 읽어서, 잠금 안에서는 count가 최신입니다.
+        """
+        with self._lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._lock_depth -= 1
+                return
+            with self._process_lock():
+                self.refresh()
+                self._lock_depth = 1
+                try:
+                    yield self
+                finally:
+                    self._lock_depth = 0
+
+    def refresh(self):
+        """meta.json을 다시 읽고 다른 프로세스가 늘린 파일/추가한 비디오/새 IVF를 반영"""
+        with self._lock:
+            meta = self._read_meta()
+            remap = meta["capacity"] != self.meta["capacity"]
+            reload_ivf = meta.get("ivf") != self.meta.get("ivf")
+            self.meta = meta
+            if remap:
+                self._map()
+            self._load_videos()
+            if reload_ivf:
+                self._load_ivf()
+
+    def add(self, records, vectors):
+        """
+        레코드와 벡터를 끝에 추가
+
+        Args:
+            records: [{"id", ...}] (JSON으로 저장할 수 있는 딕셔너리)
+            vectors: (len(records), dim) 단위 벡터
+        Returns:
+            추가한 행 번호 목록
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(records) != len(vectors) or (len(vectors) and vectors.shape[1] != self.dim):
+            raise ValueError(f"레코드 {len(records)}개와 벡터 {vectors.shape}가 맞지 않습니다 (dim={self.dim})")
+        with self.locked():
+            start, end = self.count, self.count + len(records)
+            if end > self.meta["capacity"]:
+                self._flush()
+                capacity = max(self.meta["capacity"] * 2, end)
+                self._resize_files(capacity)
+                self.meta["capacity"] = capacity
+                self._map()
+            lines = [(json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8") for record in records]
+            sidecar_bytes = self.meta["sidecar_bytes"]
+            self.vectors[start:end] = vectors
+            self.alive[start:end] = 1
+            self.offsets[start:end] = sidecar_bytes + np.cumsum([0] + [len(line) for line in lines])[:-1]
+            new_videos = []
+            for row, record in enumerate(records, start):
+                video_id = record.get("video_id")
+                if video_id not in self._video_numbers:
+                    self._video_numbers[video_id] = len(self._videos)
+                    self._videos.append(video_id)
+                    new_videos.append(video_id)
+                self.row_videos[row] = self._video_numbers[video_id]
+            self._flush()
+            # meta에 적힌 끝 위치 뒤에 이어 씀 (meta를 갱신하기 전에 멈춘 쓰기가 남긴 줄은 덮어씀)
+            self.meta["videos_bytes"] = self._append(self._videos_path, self.meta["videos_bytes"],
+                                                     [(json.dumps(video_id, ensure_ascii=False) + "\n").encode("utf-8")
+                                                      for video_id in new_videos])
+            self._videos_offset = self.meta["videos_bytes"]
+            self.meta["sidecar_bytes"] = self._append(self._sidecar_path, sidecar_bytes, lines)
+            self.meta.update(count=end, videos=len(self._videos))
+            self._write_meta()
+        return list(range(start, end))
+
+    @staticmethod
+    def _append(path, position, lines):
+        """position에서 잘라내고 줄들을 씀, 새 끝 위치를 돌려줌"""
+        with open(path, "r+b") as f:
+            f.seek(position)
+            f.truncate()
+            f.write(b"".join(lines))
+            return f.tell()
+
+    def get_records(self, rows):
+        """행 번호들의 레코드 (사이드카에서 그 줄만 읽음)"""
+        with open(self._sidecar_path, "rb") as f:
+            records = []
+            for row in rows:
+                f.seek(int(self.offsets[row]))
+                records.append(json.loads(f.readline()))
+            return records
+
+    def video_rows(self, video_id):
+        """비디오의 살아 있는 행 번호 목록"""
+        number = self._video_numbers.get(video_id)
+        if number is None:
+            return []
+        count = self.count
+        return np.flatnonzero((self.row_videos[:count] == number) & (self.alive[:count] == 1)).tolist()
+
+    def remove(self, rows):
+        """행을 삭제 표시 (검색 결과에서 빠짐)"""
+        with self.locked():
+            self.alive[np.asarray(list(rows), dtype=np.int64)] = 0
+            self.alive.flush()
+
+    def search_vectors(self, queries, k=10, nprobe=None):
+        """
+        질의 벡터들의 코사인 top-k
+
+        Args:
+            queries: (nq, dim) 단위 벡터
+            k: 질의마다 돌려줄 수
+            nprobe: IVF에서 살펴볼 목록 수 (None이면 IVF를 만들 때 정한 값, 0이면 전체 검색)
+        Returns:
+            (scores, rows) — 둘 다 (nq, k), 결과가 모자라면 점수 -inf / 행 -1
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nprobe = self.meta["ivf"]["nprobe"] if nprobe is None and self.ivf is not None else nprobe
+        if self.ivf is not None and nprobe:
+            return self._search_ivf(queries, k, nprobe)
+        return self._search_flat(queries, k)
+
+    def _search_flat(self, queries, k):
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, self.count, BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, self.count)
+            scores = queries @ self.vectors[start:end].T
+            alive = self.alive[start:end]
+            if not alive.all():
+                scores[:, alive == 0] = -np.inf
+            best_scores, best_rows = _merge_topk(best_scores, best_rows, scores, np.arange(start, end), k)
+        return _pad(best_scores, best_rows, k)
+
+    def _search_ivf(self, queries, k, nprobe):
+        centroids, order, offsets = self.ivf["centroids"], self.ivf["order"], self.ivf["offsets"]
+        nprobe = min(nprobe, len(centroids))
+        probes = np.argpartition(-(queries @ centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        tail = np.arange(self.meta["ivf"]["rows"], self.count)  # IVF를 만든 뒤 추가된 행은 전부 계산
+        all_scores, all_rows = [], []
+        for query, lists in zip(queries, probes):
+            rows = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in lists] + [tail])
+            rows.sort()  # 메모리 매핑 파일을 앞에서부터 읽도록
+            scores = self.vectors[rows] @ query
+            scores[self.alive[rows] == 0] = -np.inf
+            best_scores, best_rows = _merge_topk(np.full((1, 0), -np.inf, dtype=np.float32),
+                                                 np.zeros((1, 0), dtype=np.int64), scores[None, :], rows, k)
+            best_scores, best_rows = _pad(best_scores, best_rows, k)
+            all_scores.append(best_scores[0])
+            all_rows.append(best_rows[0])
+        return np.array(all_scores), np.array(all_rows)
+
+    def build_ivf(self, nlist=None, nprobe=DEFAULT_NPROBE, iterations=10, sample_size=None, seed=0):
+        """
+        구면 k-means로 IVF 분할 생성 (기존 행 대상, 이후 추가되는 행은 검색 때 따로 계산)
+
+        Args:
+            nlist: 목록 수 (기본 √행 수)
+            nprobe: 검색 기본값으로 저장할 살펴볼 목록 수
+            iterations: k-means 반복 횟수
+            sample_size: 중심점 학습에 쓸 행 수 (기본 nlist × 64, 최대 전체)
+        Returns:
+            {"nlist", "rows", "nprobe", "seconds"}
+        """
+        start_time = time.perf_counter()
+        with self.locked():
+            count = self.count
+            live_rows = np.flatnonzero(self.alive[:count])
+            if len(live_rows) == 0:
+                raise ValueError("색인이 비어 있어 IVF를 만들 수 없습니다.")
+            nlist = min(nlist or max(1, int(math.sqrt(len(live_rows)))), len(live_rows))
+            rng = np.random.default_rng(seed)
+            sample_size = min(sample_size or nlist * 64, len(live_rows))
+            sample = np.asarray(self.vectors[np.sort(rng.choice(live_rows, sample_size, replace=False))])
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+            for _ in range(iterations):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assign, sample)
+                empty = np.bincount(assign, minlength=nlist) == 0
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]  # 빈 목록은 새 점으로 다시 시작
+                centroids = _normalize(sums)
+
+            assign = np.full(count, -1, dtype=np.int64)
+            for block_start in range(0, count, BLOCK_ROWS):
+                block_end = min(block_start + BLOCK_ROWS, count)
+                assign[block_start:block_end] = np.argmax(self.vectors[block_start:block_end] @ centroids.T, axis=1)
+            assign[self.alive[:count] == 0] = -1
+            live = assign >= 0
+            order = np.flatnonzero(live)[np.argsort(assign[live], kind="stable")]
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(assign[live], minlength=nlist))])
+
+            for name, array in (("centroids", centroids), ("order", order), ("offsets", offsets)):
+                np.save(os.path.join(self.path, f"ivf_{name}.npy"), array)
+            self.meta["ivf"] = {"nlist": nlist, "rows": count, "nprobe": nprobe}
+            self._write_meta()
+            self._load_ivf()
+        return {**self.meta["ivf"], "seconds": round(time.perf_counter() - start_time, 3)}
+
+def _merge_topk(best_scores, best_rows, scores, rows, k):
+    """지금까지의 top-k와 새 점수 블록 (nq, b)을 합쳐 다시 top-k (정렬됨)"""
+    take = min(k, scores.shape[1])
+    if take == 0:
+        return best_scores, best_rows
+    part = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+    scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+    rows = np.concatenate([best_rows, rows[part]], axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+def _pad(scores, rows, k):
+    missing = k - scores.shape[1]
+    rows = np.where(np.isneginf(scores), -1, rows)
+    if missing > 0:
+        scores = np.pad(scores, ((0, 0), (0, missing)), constant_values=-np.inf)
+        rows = np.pad(rows, ((0, 0), (0, missing)), constant_values=-1)
+    return scores, rows
+
+def summary_items(video_info, run_id, final_topics, passages):
+    """요약 결과 → 색인 레코드 목록 (자막 구간 + Q&A)"""
+    base = {"video_id": video_info.get("video_id"), "run_id": run_id, "title": video_info.get("title", ""),
+            "url": video_info.get("url", "")}
+    items = [{**base, "id": f"{base['video_id']}:transcript:{i}", "kind": "transcript",
+              "text": passage["text"], "start": passage.get("start")}
+             for i, passage in enumerate(passages) if passage["text"].strip()]
+    for t, topic in enumerate(final_topics):
+        for q, qa in enumerate(topic.get("qa_pairs", [])):
+            question = qa.get("kid_friendly_question") or qa.get("question", "")
+            answer = qa.get("kid_friendly_answer") or qa.get("answer", "")
+            if question.strip() or answer.strip():
+                items.append({**base, "id": f"{base['video_id']}:qa:{t}:{q}", "kind": "qa", "topic": topic.get("title", ""),
+                              "text": f"{question}\n{answer}".strip()})
+    return items
+
+class SemanticIndex:
+    """
+    자막 구간과 Q&A의 의미 검색 색인 (임베더 + VectorStore)
+
+    같은 비디오를 다시 색인하면 예전 실행의 행은 삭제 표시하고 새 행을 추가하며,
+    이미 색인한 실행(run_id)이면 건너뜁니다.
+    """
+
+    def __init__(self, path=None, embedder=None):
+        self.embedder = embedder or get_embedder()
+        self.store = VectorStore(path, dim=self.embedder.dim, embedder=self.embedder.name)
+
+    def index_video(self, video_info, run_id, final_topics, passages=None):
+        """
+        Returns:
+            {"added", "removed", "skipped"}
+        """
+        video_id = video_info.get("video_id")
+        self.store.refresh()
+        rows = self.store.video_rows(video_id)
+        if rows and all(record.get("run_id") == run_id for record in self.store.get_records(rows)):
+            return {"added": 0, "removed": 0, "skipped": True}
+        if passages is None:
+            passages = transcript_passages(video_info)
+        items = summary_items(video_info, run_id, final_topics, passages)
+        vectors = self.embedder.embed([item["text"] for item in items]) if items else np.zeros((0, self.store.dim), dtype=np.float32)
+        # 임베딩하는 동안 다른 프로세스가 같은 비디오를 색인했을 수 있으므로 잠금 안에서 다시 찾음
+        with self.store.locked():
+            rows = self.store.video_rows(video_id)
+            if rows:
+                self.store.remove(rows)
+            self.store.add(items, vectors)
+        return {"added": len(items), "removed": len(rows), "skipped": False}
+
+    def search(self, queries, k=10, nprobe=None):
+        """
+        질의 하나(문자열) 또는 여러 개(리스트)를 한 번에 검색
+
+        Returns:
+            [{"score", **레코드}] (질의가 리스트면 질의마다 하나씩)
+        """
+        single = isinstance(queries, str)
+        texts = [queries] if single else list(queries)
+        scores, rows = self.store.search_vectors(self.embedder.embed(texts), k=k, nprobe=nprobe)
+        found = sorted({int(row) for row in rows.ravel() if row >= 0})  # 파일 앞에서부터 한 번씩만 읽음
+        records = dict(zip(found, self.store.get_records(found)))
+        results = [[{"score": round(float(score), 4), **records[int(row)]}
+                    for score, row in zip(query_scores, query_rows) if row >= 0]
+                   for query_scores, query_rows in zip(scores, rows)]
+        return results[0] if single else results
+
+    def videos(self, query, k=10, candidates=100):
+        """
+        "X를 설명하는 영상" — 검색 결과를 비디오별로 묶어 가장 높은 점수 순
+
+        Returns:
+            [{"video_id", "title", "url", "score", "matches": [검색 결과]}]
+        """
+        videos = {}
+        for result in self.search(query, k=candidates):
+            video = videos.setdefault(result["video_id"], {
+                "video_id": result["video_id"], "title": result["title"], "url": result["url"],
+                "score": result["score"], "matches": []})
+            video["matches"].append(result)
+        return sorted(videos.values(), key=lambda video: -video["score"])[:k]
+
+    def build_ivf(self, **options):
+        return self.store.build_ivf(**options)
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_semantic_index():
+    """프로세스 전체에서 공유하는 의미 색인 (SEMANTIC_INDEX_PATH, EMBEDDER)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SemanticIndex()
+    return _index
+
+def index_output_store(index, store):
+    """결과 저장소의 비디오별 최신 summary.json을 색인 (이미 색인한 실행은 건너뜀)"""
+    totals = {"videos": 0, "added": 0, "removed": 0, "skipped": 0}
+    for entry in store.entries():
+        json_path = entry["files"].get("json")
+        if not json_path or not os.path.exists(json_path):
+            continue
+        with open(json_path, encoding="utf-8") as f:
+            summary = json.load(f)
+        video_info = {"video_id": entry["video_id"], **summary.get("video_info", {})}
+        report = index.index_video(video_info, summary.get("run_id", entry["run_id"]), summary.get("topics", []),
+                                   summary.get("passages", []))
+        totals["videos"] += 1
+        if report["skipped"]:
+            totals["skipped"] += 1
+        else:
+            totals["added"] += report["added"]
+            totals["removed"] += report["removed"]
+    return totals
+
+def benchmark_search(rows=1_000_000, dim=DEFAULT_DIM, queries=20, k=10, clusters=2000, nprobe=DEFAULT_NPROBE,
+                     path=None, seed=0):
+    """
+    무작위 군집 벡터로 검색 속도/재현율 측정 (전체 검색 vs IVF)
+
+    Returns:
+        {"rows", "dim", "flat_ms", "ivf_ms", "recall", "build_seconds"} (질의 하나당 평균 ms)
+    """
+    rng = np.random.default_rng(seed)
+    centers = _normalize(rng.standard_normal((clusters, dim)).astype(np.float32))
+    noise = 0.6 / math.sqrt(dim)  # 군집 중심에서 벗어난 정도 (벡터 길이 기준 약 0.6)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(path or os.path.join(tmp, "bench"), dim=dim, embedder="random")
+        for start in range(0, rows, BLOCK_ROWS):
+            size = min(BLOCK_ROWS, rows - start)
+            block = centers[rng.integers(0, clusters, size)] + noise * rng.standard_normal((size, dim)).astype(np.float32)
+            store.add([{"id": f"v{start + i}"} for i in range(size)], _normalize(block))
+        query = _normalize(centers[rng.integers(0, clusters, queries)]
+                           + noise * rng.standard_normal((queries, dim)).astype(np.float32))
+
+        def timed(nprobe_value):
+            start_time = time.perf_counter()
+            result = [store.search_vectors(q[None, :], k=k, nprobe=nprobe_value)[1][0] for q in query]
+            return result, (time.perf_counter() - start_time) / queries * 1000
+
+        flat, flat_ms = timed(0)
+        build = store.build_ivf(nprobe=nprobe, seed=seed)
+        ivf, ivf_ms = timed(nprobe)
+    recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(flat, ivf)])
+    return {"rows": rows, "dim": dim, "flat_ms": round(flat_ms, 2), "ivf_ms": round(ivf_ms, 2),
+            "recall": round(float(recall), 3), "build_seconds": build["seconds"], "nlist": build["nlist"]}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="자막 구간/Q&A 의미 검색 색인")
+    commands = parser.add_subparsers(dest="command", required=True)
+    index_parser = commands.add_parser("index", help="결과 저장소(OUTPUT_ROOT)의 요약을 색인")
+    index_parser.add_argument("--rebuild", action="store_true", help="색인을 지우고 처음부터 (임베더를 바꿨을 때)")
+    search_parser = commands.add_parser("search", help="질의와 가까운 자막 구간/Q&A 또는 영상")
+    search_parser.add_argument("query")
+    search_parser.add_argument("-k", type=int, default=10)
+    search_parser.add_argument("--videos", action="store_true", help="영상별로 묶어서 출력")
+    search_parser.add_argument("--nprobe", type=int, default=None)
+    ivf_parser = commands.add_parser("build-ivf", help="IVF 분할 생성 (큰 색인의 검색 가속)")
+    ivf_parser.add_argument("--nlist", type=int, default=None)
+    ivf_parser.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE)
+    bench_parser = commands.add_parser("bench", help="무작위 벡터로 검색 속도 측정")
+    bench_parser.add_argument("--rows", type=int, default=1_000_000)
+    bench_parser.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    bench_parser.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        print(json.dumps(benchmark_search(args.rows, args.dim, nprobe=args.nprobe), ensure_ascii=False))
+        return 0
+    if args.command == "index":
+        from .output_store import get_output_store
+
+        path = os.getenv("SEMANTIC_INDEX_PATH", DEFAULT_INDEX_PATH)
+        if args.rebuild and os.path.isdir(path):
+            shutil.rmtree(path)
+        print(json.dumps(index_output_store(get_semantic_index(), get_output_store()), ensure_ascii=False))
+        return 0
+
+    index = get_semantic_index()
+    if args.command == "build-ivf":
+        print(json.dumps(index.build_ivf(nlist=args.nlist, nprobe=args.nprobe), ensure_ascii=False))
+        return 0
+    if args.videos:
+        for video in index.videos(args.query, k=args.k):
+            print(f"{video['score']:.3f}  {video['video_id']}  {video['title']}  ({len(video['matches'])}곳)")
+    else:
+        for result in index.search(args.query, k=args.k, nprobe=args.nprobe):
+            where = f"@{result['start']:.0f}s" if result.get("start") is not None else result["kind"]
+            print(f"{result['score']:.3f}  {result['video_id']}  {where}  {result['text'][:80]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+import os
+import re
+import json
+import time
+import glob
+import hashlib
+import logging
+import argparse
+from html import unescape
+from urllib.parse import quote
+from .html_generator import CompiledTemplate, Markup, html_generator, sections_from_topics, _escape
+from .notion_client import TAG_KEYWORDS, CATEGORY_KEYWORDS
+from .output_store import OutputStore, atomic_write
+
+logger = logging.getLogger(__name__)
+
+# 템플릿/색인 형식을 바꾸면 올려서 전체를 다시 만들게 함
+SITE_VERSION = "1"
+DEFAULT_PAGE_SIZE = 20
+STATE_FILE = ".site-state.json"
+
+SITE_HEAD = CompiledTemplate("""<!DOCTYPE html>
+<html lang="ko">
+<head>
+  <meta charset="UTF-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+  <title>{page_title}</title>
+  <link rel="stylesheet" href="https://unpkg.com/tailwindcss@2.2.19/dist/tailwind.min.css" />
+  <link href="https://fonts.googleapis.com/css2?family=Patrick+Hand&display=swap" rel="stylesheet" />
+  <style>
+    body {{ background-color: #f7fafc; font-family: 'Patrick Hand', sans-serif; }}
+  </style>
+</head>
+<body class="min-h-screen p-4">
+  <div class="max-w-3xl mx-auto bg-white rounded-2xl shadow-lg p-6">
+    <div class="mb-6 text-sm text-gray-500"><a href="{root}index.html" class="underline hover:text-gray-700">📚 요약 모음</a></div>
+    <h1 class="text-4xl text-gray-800 mb-6">{heading}</h1>""")
+
+SITE_ITEM = CompiledTemplate("""
+    <a href="{href}" class="flex items-center gap-4 mb-4 no-underline">
+      <img src="{thumbnail_url}" alt="" class="rounded-lg" style="width: 120px" />
+      <div>
+        <div class="text-xl text-gray-800">{title}</div>
+        <div class="text-sm text-gray-500">{tags}</div>
+      </div>
+    </a>""")
+
+SITE_PAGINATION = CompiledTemplate("""
+    <div class="flex justify-between mt-6 text-gray-600">
+      <span>{prev_link}</span><span>{page} / {pages}</span><span>{next_link}</span>
+    </div>""")
+
+SITE_SEARCH = CompiledTemplate("""
+    <input id="search" type="search" placeholder="🔍 제목, 주제, 질문 검색" class="w-full border border-gray-200 rounded-lg px-4 py-2 mb-6" />
+    <div id="search-results" class="mb-6"></div>
+    <script>
+      // 미리 만든 역색인: 검색어마다 접두어가 같은 용어의 문서 번호를 모아 교집합
+      let searchIndex = null;
+      document.getElementById("search").addEventListener("input", async (event) => {{
+        searchIndex = searchIndex || await (await fetch("search-index.json")).json();
+        const words = event.target.value.toLowerCase().match(/[\\p{{L}}\\p{{N}}_]{{2,}}/gu) || [];
+        let hits = null;
+        for (const word of words) {{
+          const found = new Set();
+          for (const [term, ids] of Object.entries(searchIndex.terms)) {{
+            if (term.startsWith(word)) ids.forEach((id) => found.add(id));
+          }}
+          hits = hits ? new Set([...hits].filter((id) => found.has(id))) : found;
+        }}
+        const box = document.getElementById("search-results");
+        box.replaceChildren();
+        for (const id of [...(hits || [])].slice(0, 20)) {{
+          const [href, title] = searchIndex.docs[id];
+          const link = document.createElement("a");
+          link.href = href;
+          link.textContent = title;
+          link.className = "block underline mb-2";
+          box.appendChild(link);
+        }}
+      }});
+    </script>""")
+
+SITE_TAIL = CompiledTemplate("""
+  </div>
+</body>
+</html>""")
+
+VIDEO_NAV = CompiledTemplate("""    <div class="mb-4 text-sm text-gray-500">
+      <a href="../index.html" class="underline hover:text-gray-700">← 요약 모음</a> {tag_links}
+    </div>
+""")
+
+_TAG_SPLIT = re.compile(r"<[^>]+>")
+_TERM = re.compile(r"\w{2,}")
+
+def _slug(name):
+    """태그 이름 → 파일 이름 (한글은 그대로 둠)"""
+    return re.sub(r"[^\w-]+", "-", name.lower()).strip("-") or "tag"
+
+def _page_name(video_id):
+    """비디오 ID → 파일 이름 (YouTube ID는 대소문자를 구분하므로 그대로 둠)"""
+    return re.sub(r"[^\w-]+", "_", video_id)
+
+def _plain(text):
+    return unescape(_TAG_SPLIT.sub("", text))
+
+def summary_tags(title, section_titles):
+    """제목과 주제 제목의 키워드로 카테고리 + 태그 목록 생성 (노션 저장과 같은 키워드 표)"""
+    text = " ".join([title, *section_titles]).lower()
+    category = next(
+        (name for name, keywords in CATEGORY_KEYWORDS if any(word in text for word in keywords)),
+        "엔터테인먼트"
+    )
+    tags = [tag for tag, keywords in TAG_KEYWORDS.items() if any(word in text for word in keywords)]
+    return [category] + [tag for tag in tags if tag != category]
+
+def load_store_summaries(store):
+    """
+    결과 저장소(OutputStore)의 비디오별 최신 요약을 사이트 레코드로 변환
+
+    Returns:
+        [{"id", "title", "url", "thumbnail_url", "sections", "sort_key"}, ...]
+    """
+    summaries = []
+    for entry in store.entries():
+        json_path = entry["files"].get("json")
+        if not json_path or not os.path.exists(json_path):
+            continue
+        with open(json_path, encoding="utf-8") as f:
+            summary = json.load(f)
+        video_info = summary.get("video_info", {})
+        summaries.append({
+            "id": entry["video_id"],
+            "title": video_info.get("title") or entry["video_id"],
+            "url": video_info.get("url", ""),
+            "thumbnail_url": video_info.get("thumbnail_url", ""),
+            "sections": sections_from_topics(summary.get("topics", [])),
+            "sort_key": entry["updated_at"],
+        })
+    return summaries
+
+def load_legacy_summaries(directory):
+    """
+    예전 방식의 단독 HTML 요약(examples/)을 사이트 레코드로 변환
+
+    html_generator가 만든 마크업을 그대로 파싱하고, 본문 HTML은 Markup으로 유지합니다.
+    """
+    summaries = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        title = re.search(r"<h1[^>]*>(.*?)</h1>", html, re.DOTALL)
+        image = re.search(r'<img\s+src="([^"]*)"', html)
+        sections = []
+        for block in html.split("<h2")[1:]:
+            section_title = re.search(r">(.*?)</h2>", block, re.DOTALL)
+            bullets = re.findall(
+                r'<li>\s*<strong>(.*?)</strong><br />\s*<div class="bullet-content">(.*?)</div>\s*</li>',
+                block, re.DOTALL
+            )
+            sections.append({
+                "title": Markup(section_title.group(1).strip()) if section_title else "",
+                "bullets": [(Markup(bold.strip()), Markup(normal.strip())) for bold, normal in bullets],
+            })
+        video_id = re.search(r"/vi/([0-9A-Za-z_-]{11})/", image.group(1)) if image else None
+        summaries.append({
+            "id": os.path.splitext(os.path.basename(path))[0],
+            "title": Markup(title.group(1).strip()) if title else os.path.basename(path),
+            "url": f"https://www.youtube.com/watch?v={video_id.group(1)}" if video_id else "",
+            "thumbnail_url": image.group(1) if image else "",
+            "sections": sections,
+            "sort_key": os.path.getmtime(path),
+        })
+    return summaries
+
+def content_hash(record):
+    """요약 내용 해시 (정렬 키 제외, 사이트 버전 포함)"""
+    body = {key: value for key, value in record.items() if key != "sort_key"}
+    data = json.dumps(body, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256((SITE_VERSION + data).encode("utf-8")).hexdigest()
+
+class SiteBuilder:
+    """
+    요약 모음 정적 사이트 생성기
+
+    - `videos/{id}.html`: 비디오별 페이지 (html_generator 출력 + 목록/태그 링크)
+    - `index.html`, `page/{n}.html`: 최신순 목록 (page_size개씩)
+    - `tags/{태그}.html`, `tags/{태그}/{n}.html`: 태그/카테고리별 목록
+    - `search-index.json`: 브라우저 검색용 역색인 {"docs": [[href, 제목]], "terms": {용어: [문서 번호]}}
+
+    `.site-state.json`에 비디오별 내용 해시와 페이지별 해시를 저장해서,
+    다시 빌드할 때는 내용이 바뀐 비디오 페이지만 렌더링하고 내용이 같은 목록 페이지는 쓰지 않습니다.
+    비디오 페이지는 다른 비디오에 의존하지 않으므로 한 개를 추가하면 비디오 페이지는 한 개만 만듭니다.
+    """
+
+    def __init__(self, out_dir, page_size=DEFAULT_PAGE_SIZE):
+        self.out_dir = out_dir
+        self.page_size = page_size
+        self.state_path = os.path.join(out_dir, STATE_FILE)
+
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == SITE_VERSION:
+                return state
+        return {"version": SITE_VERSION, "docs": {}, "pages": {}}
+
+    def _path(self, relpath):
+        return os.path.join(self.out_dir, *relpath.split("/"))
+
+    def _render_video(self, record, tags):
+        tag_links = Markup(" ".join(
+            f'· <a href="../tags/{quote(_slug(tag))}.html" class="underline">#{_escape(tag)}</a>' for tag in tags
+        ))
+        html = html_generator(record["title"], record["thumbnail_url"], record["sections"])
+        return html.replace("    <!-- Attribution header -->", VIDEO_NAV.render(tag_links=tag_links)
+                            + "    <!-- Attribution header -->", 1)
+
+    def _render_listing(self, heading, docs, base, root, search=False):
+        """
+        목록 페이지들 렌더링
+
+        Returns:
+            {상대 경로: HTML} - 첫 페이지는 `{base}.html`, 나머지는 `{base 폴더}/{n}.html`
+        """
+        chunks = [docs[i:i + self.page_size] for i in range(0, len(docs), self.page_size)] or [[]]
+        folder = "page" if base == "index" else base
+        paths = [f"{base}.html"] + [f"{folder}/{n}.html" for n in range(2, len(chunks) + 1)]
+        pages = {}
+
+        for number, (relpath, chunk) in enumerate(zip(paths, chunks), start=1):
+            prefix = "../" * relpath.count("/")
+            page_root = prefix + root
+            parts = [SITE_HEAD.render(page_title=f"{heading} ({number}/{len(chunks)})" if number > 1 else heading,
+                                      heading=heading, root=page_root)]
+            if search and number == 1:
+                parts.append(SITE_SEARCH.render())
+            for doc in chunk:
+                parts.append(SITE_ITEM.render(
+                    href=page_root + doc["href"], thumbnail_url=doc["thumbnail_url"],
+                    title=Markup(doc["title_html"]), tags=" ".join(f"#{tag}" for tag in doc["tags"])
+                ))
+            if len(chunks) > 1:
+                def link(target, label):
+                    if not target:
+                        return ""
+                    return Markup(f'<a href="{quote(prefix + root + target)}" class="underline">{label}</a>')
+                prev_path = paths[number - 2] if number > 1 else None
+                next_path = paths[number] if number < len(chunks) else None
+                parts.append(SITE_PAGINATION.render(
+                    prev_link=link(prev_path, "← 이전"), next_link=link(next_path, "다음 →"),
+                    page=number, pages=len(chunks)
+                ))
+            parts.append(SITE_TAIL.render())
+            pages[relpath] = "".join(parts)
+        return pages
+
+    def build(self, summaries):
+        """
+        사이트 빌드 (증분)
+
+        Args:
+            summaries: load_store_summaries / load_legacy_summaries 레코드 목록
+
+        Returns:
+            {"videos_rendered", "videos_skipped", "videos_removed",
+             "pages_written", "pages_skipped", "seconds"}
+        """
+        start_time = time.perf_counter()
+        state = self._load_state()
+        previous_docs = state["docs"]
+        docs = {}
+        report = {"videos_rendered": 0, "videos_skipped": 0, "videos_removed": 0,
+                  "pages_written": 0, "pages_skipped": 0}
+
+        # 1) 비디오 페이지: 내용 해시가 같으면 건너뜀
+        for record in summaries:
+            digest = content_hash(record)
+            relpath = f"videos/{_page_name(record['id'])}.html"
+            previous = previous_docs.get(record["id"])
+            if previous and previous["hash"] == digest and os.path.exists(self._path(relpath)):
+                docs[record["id"]] = dict(previous, sort_key=record["sort_key"])
+                report["videos_skipped"] += 1
+                continue
+
+            section_titles = [_plain(section["title"]) for section in record["sections"]]
+            title_text = _plain(record["title"])
+            tags = summary_tags(title_text, section_titles)
+            atomic_write(self._path(relpath), self._render_video(record, tags))
+
+            searchable = " ".join([title_text, *section_titles, *(
+                _plain(bold) for section in record["sections"] for bold, _ in section["bullets"]
+            )]).lower()
+            docs[record["id"]] = {
+                "hash": digest,
+                "href": relpath,
+                "title": title_text,
+                "title_html": _escape(record["title"]),
+                "thumbnail_url": record["thumbnail_url"],
+                "tags": tags,
+                "terms": sorted(set(_TERM.findall(searchable))),
+                "sort_key": record["sort_key"],
+            }
+            report["videos_rendered"] += 1
+
+        for removed in set(previous_docs) - set(docs):
+            path = self._path(previous_docs[removed]["href"])
+            if os.path.exists(path):
+                os.remove(path)
+            report["videos_removed"] += 1
+
+        # 2) 목록/태그 페이지와 검색 색인: 전부 메모리에서 만들고 내용이 바뀐 파일만 기록
+        ordered = sorted(docs.values(), key=lambda doc: (-doc["sort_key"], doc["title"]))
+        pages = self._render_listing("📚 요약 모음", ordered, "index", "", search=True)
+
+        by_tag = {}
+        for doc in ordered:
+            for tag in doc["tags"]:
+                by_tag.setdefault(tag, []).append(doc)
+        for tag, tag_docs in sorted(by_tag.items()):
+            pages.update(self._render_listing(f"#{tag}", tag_docs, f"tags/{_slug(tag)}", ""))
+
+        terms = {}
+        for number, doc in enumerate(ordered):
+            for term in doc["terms"]:
+                terms.setdefault(term, []).append(number)
+        pages["search-index.json"] = json.dumps({
+            "docs": [[doc["href"], doc["title"]] for doc in ordered],
+            "terms": terms,
+        }, ensure_ascii=False, separators=(",", ":"))
+
+        page_hashes = {}
+        for relpath, content in pages.items():
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            page_hashes[relpath] = digest
+            if state["pages"].get(relpath) == digest and os.path.exists(self._path(relpath)):
+                report["pages_skipped"] += 1
+                continue
+            atomic_write(self._path(relpath), content)
+            report["pages_written"] += 1
+
+        for stale in set(state["pages"]) - set(page_hashes):
+            if os.path.exists(self._path(stale)):
+                os.remove(self._path(stale))
+
+        atomic_write(self.state_path, json.dumps(
+            {"version": SITE_VERSION, "docs": docs, "pages": page_hashes}, ensure_ascii=False
+        ))
+        report["seconds"] = round(time.perf_counter() - start_time, 3)
+        return report
+
+def main():
+    """저장된 요약(OUTPUT_ROOT)과 예전 HTML 요약으로 정적 사이트 빌드"""
+    parser = argparse.ArgumentParser(description="Build a static site from stored summaries.")
+    parser.add_argument("--out", default="site", help="Output directory (default: site)")
+    parser.add_argument("--output-root", default=None, help="Summary store root (default: OUTPUT_ROOT or outputs)")
+    parser.add_argument("--legacy", action="append", default=[],
+                        help="Directory of standalone summary HTML files to include (e.g. examples)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    summaries = load_store_summaries(OutputStore(args.output_root))
+    for directory in args.legacy:
+        summaries.extend(load_legacy_summaries(directory))
+
+    report = SiteBuilder(args.out, page_size=args.page_size).build(summaries)
+    print(f"사이트: {os.path.abspath(args.out)}")
+    print(f"비디오 페이지 {report['videos_rendered']}개 생성, {report['videos_skipped']}개 재사용, "
+          f"{report['videos_removed']}개 삭제 / 목록 페이지 {report['pages_written']}개 기록, "
+          f"{report['pages_skipped']}개 그대로 ({report['seconds']}초)")
+
+if __name__ == "__main__":
+    main()
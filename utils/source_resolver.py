@@ -0,0 +1,381 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from .env import load_env
+from .youtube_processor import extract_video_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_PATH = "sync_state.db"
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+# YouTube Data API playlistItems.list의 최대 페이지 크기
+PAGE_SIZE = 50
+
+# 비공개/삭제된 영상은 재생목록에 남아 있어도 자막을 가져올 수 없음
+UNAVAILABLE_TITLES = ("Private video", "Deleted video")
+
+_CHANNEL_ID = re.compile(r"^UC[0-9A-Za-z_-]{22}$")
+
+# 채널: 게시 시각 커서 (업로드 목록이 최신순) / 재생목록: 이미 확인한 영상 ID (추가 순서가 게시 시각과 무관)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    source TEXT PRIMARY KEY,
+    last_published_at TEXT NOT NULL,
+    last_video_id TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_seen (
+    source TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (source, video_id)
+);
+"""
+
+def parse_source(url):
+    """
+    입력 URL 종류 판별
+
+    Returns:
+        ("video", video_id) / ("playlist", playlist_id) / ("channel", 채널 ID / @핸들 / user:사용자명) / (None, None)
+    """
+    parsed = urlparse(url.strip() if "://" in url else "https://" + url.strip())
+    path = [part for part in parsed.path.split("/") if part]
+    query = parse_qs(parsed.query)
+
+    if parsed.netloc.endswith("youtube.com"):
+        if path[:1] == ["playlist"] and query.get("list"):
+            return "playlist", query["list"][0]
+        if path[:1] == ["channel"] and len(path) > 1:
+            return "channel", path[1]
+        if path and path[0].startswith("@"):
+            return "channel", path[0]
+        if path[:1] == ["user"] and len(path) > 1:
+            return "channel", "user:" + path[1]
+        if path[:1] == ["c"] and len(path) > 1:
+            # 예전 맞춤 URL은 API로 찾을 수 없어서 같은 이름의 핸들로 시도
+            return "channel", "@" + path[1]
+        if not query.get("v") and query.get("list"):
+            return "playlist", query["list"][0]
+
+    video_id = extract_video_id(url)
+    return ("video", video_id) if video_id else (None, None)
+
+def video_url(video_id):
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+class YouTubeDataTransport:
+    """YouTube Data API v3 호출 (YOUTUBE_API_KEY 필요, 요청당 1 할당량)"""
+
+    def __init__(self, api_key=None, base_url=None, timeout=30):
+        load_env()
+        self.api_key = api_key or os.getenv("YOUTUBE_API_KEY")
+        if not self.api_key:
+            raise ValueError("YOUTUBE_API_KEY 환경변수가 설정되지 않았습니다 (재생목록/채널 확장에 필요)")
+        self.base_url = base_url or os.getenv("YOUTUBE_API_BASE_URL", API_BASE_URL)
+        self.timeout = timeout
+        self.requests_made = 0
+
+    def __call__(self, endpoint, params):
+        import requests
+        self.requests_made += 1
+        response = requests.get(f"{self.base_url}/{endpoint}", params={**params, "key": self.api_key},
+                                timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+class FixtureTransport:
+    """
+    테스트용 로컬 전송: YouTube Data API와 같은 모양의 응답을 페이지 단위로 돌려줌
+
+    fixtures (딕셔너리 또는 JSON 파일 경로):
+        {
+            "channels": {"@handle 또는 UC...": {"id": "UC...", "uploads": "UU..."}},
+            "playlists": {"PL... / UU...": [{"video_id", "published_at", "title"}, ...]}
+        }
+    채널 업로드 목록은 API처럼 최신순으로 넣어 둡니다.
+    """
+
+    def __init__(self, fixtures):
+        if isinstance(fixtures, str):
+            with open(fixtures, encoding="utf-8") as f:
+                fixtures = json.load(f)
+        self.fixtures = fixtures
+        self.requests_made = 0
+
+    def __call__(self, endpoint, params):
+        self.requests_made += 1
+        if endpoint == "channels":
+            key = params.get("forHandle") or params.get("id") or "user:" + params.get("forUsername", "")
+            channel = self.fixtures.get("channels", {}).get(key)
+            if channel is None:
+                return {"items": []}
+            return {"items": [{"id": channel["id"],
+                               "contentDetails": {"relatedPlaylists": {"uploads": channel["uploads"]}}}]}
+        if endpoint == "playlistItems":
+            videos = self.fixtures.get("playlists", {}).get(params["playlistId"])
+            if videos is None:
+                raise LookupError(f"재생목록을 찾을 수 없습니다: {params['playlistId']}")
+            start = int(params.get("pageToken") or 0)
+            end = start + int(params.get("maxResults", PAGE_SIZE))
+            items = [{
+                "snippet": {"title": video.get("title", ""), "publishedAt": video.get("published_at")},
+                "contentDetails": {"videoId": video["video_id"], "videoPublishedAt": video.get("published_at")},
+            } for video in videos[start:end]]
+            page = {"items": items, "pageInfo": {"totalResults": len(videos)}}
+            if end < len(videos):
+                page["nextPageToken"] = str(end)
+            return page
+        raise ValueError(f"지원하지 않는 엔드포인트: {endpoint}")
+
+class SyncCursors:
+    """
+    소스별 동기화 상태 (SYNC_STATE_PATH, 기본 sync_state.db)
+
+    채널은 마지막으로 가져간 영상의 게시 시각, 재생목록은 이미 확인한 영상 ID 목록
+    (오래전에 게시된 영상이 나중에 재생목록에 추가될 수 있어서 게시 시각으로 거를 수 없음)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SYNC_STATE_PATH", DEFAULT_SYNC_PATH)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, source):
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_published_at, last_video_id, synced_at FROM sync_cursors WHERE source = ?",
+                               (source,)).fetchone()
+        return {"last_published_at": row[0], "last_video_id": row[1], "synced_at": row[2]} if row else None
+
+    def advance(self, source, published_at, video_id):
+        """커서를 앞으로만 옮김 (더 오래된 시각으로는 되돌리지 않음)"""
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT INTO sync_cursors (source, last_published_at, last_video_id, synced_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET
+                    last_published_at = MAX(last_published_at, excluded.last_published_at),
+                    last_video_id = CASE WHEN excluded.last_published_at >= last_published_at
+                                         THEN excluded.last_video_id ELSE last_video_id END,
+                    synced_at = excluded.synced_at
+            """, (source, published_at, video_id, time.time()))
+
+    def seen(self, source):
+        """재생목록에서 이미 확인한 영상 ID"""
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT video_id FROM sync_seen WHERE source = ?", (source,))}
+
+    def mark_seen(self, source, video_ids):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO sync_seen (source, video_id, seen_at) VALUES (?, ?, ?)",
+                             [(source, video_id, now) for video_id in video_ids])
+
+    def reset(self, source):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM sync_cursors WHERE source = ?", (source,))
+            conn.execute("DELETE FROM sync_seen WHERE source = ?", (source,))
+
+class SourceResolver:
+    """
+    재생목록/채널 URL → 영상 목록 (페이지 단위로 따라가기)
+
+    채널은 업로드 재생목록(최신순)을 읽으므로 since보다 오래된 영상이 나오면 더 이상
+    다음 페이지를 요청하지 않습니다. 재생목록은 순서가 게시 시각과 무관해서 끝까지 읽습니다.
+    """
+
+    def __init__(self, transport=None):
+        self.transport = transport
+
+    def _transport(self):
+        if self.transport is None:
+            self.transport = YouTubeDataTransport()
+        return self.transport
+
+    def uploads_playlist(self, channel):
+        """채널 ID(UC...) / @핸들 / user:사용자명 → (채널 ID, 업로드 재생목록 ID)"""
+        params = {"part": "contentDetails"}
+        if _CHANNEL_ID.match(channel):
+            params["id"] = channel
+        elif channel.startswith("user:"):
+            params["forUsername"] = channel[len("user:"):]
+        else:
+            params["forHandle"] = channel
+        items = self._transport()("channels", params).get("items", [])
+        if not items:
+            raise LookupError(f"채널을 찾을 수 없습니다: {channel}")
+        return items[0]["id"], items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    def playlist_videos(self, playlist_id, since=None, newest_first=False):
+        """
+        재생목록의 영상 목록 ([{"video_id", "published_at", "title"}], 재생목록 순서)
+
+        since(ISO 8601 게시 시각)보다 나중에 게시된 영상만 돌려주고,
+        newest_first면 since 이하인 영상을 만나는 즉시 페이지 요청을 멈춥니다.
+        """
+        videos, page_token = [], None
+        while True:
+            params = {"part": "snippet,contentDetails", "playlistId": playlist_id, "maxResults": PAGE_SIZE}
+            if page_token:
+                params["pageToken"] = page_token
+            page = self._transport()("playlistItems", params)
+            for item in page.get("items", []):
+                details = item.get("contentDetails", {})
+                published_at = details.get("videoPublishedAt")
+                title = item.get("snippet", {}).get("title", "")
+                if not published_at or title in UNAVAILABLE_TITLES:
+                    continue
+                if since and published_at <= since:
+                    if newest_first:
+                        return videos
+                    continue
+                videos.append({"video_id": details["videoId"], "published_at": published_at, "title": title})
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return videos
+
+    def locate(self, url):
+        """
+        URL → (소스 키, 재생목록 ID, 최신순 여부)
+
+        소스 키는 커서 저장용 ("playlist:PL...", "channel:UC...", 단일 영상은 None).
+        채널은 핸들로 들어와도 채널 ID로 정규화해서 같은 커서를 씀 (요청 1회).
+        """
+        kind, source_id = parse_source(url)
+        if kind == "video":
+            return None, None, False
+        if kind == "playlist":
+            return f"playlist:{source_id}", source_id, False
+        if kind == "channel":
+            channel_id, uploads = self.uploads_playlist(source_id)
+            return f"channel:{channel_id}", uploads, True
+        raise ValueError(f"YouTube 영상/재생목록/채널 URL이 아닙니다: {url}")
+
+    def resolve(self, url, since=None):
+        """URL → (소스 키, 영상 목록), 단일 영상 URL은 그 영상 하나"""
+        source, playlist_id, newest_first = self.locate(url)
+        if source is None:
+            return None, [{"video_id": parse_source(url)[1], "published_at": None, "title": ""}]
+        return source, self.playlist_videos(playlist_id, since, newest_first)
+
+class SourceSync:
+    """
+    재생목록/채널을 확장해서 새 영상만 작업 대기열(utils.job_queue)에 넣음
+
+    - 채널은 커서(마지막으로 가져간 영상의 게시 시각) 이후에 올라온 영상만 확인
+    - 재생목록은 전체 목록을 읽고 지난 동기화에서 확인한 영상 ID를 뺌 (나중에 추가된 옛 영상도 찾음)
+    - 이미 요약이 저장된 영상(결과 저장소 매니페스트)과 대기열에 있거나 처리 중인 영상
+      (URL 모양과 상관없이 영상 ID로 비교)은 건너뜀
+    - 대기열에는 오래된 영상부터 넣고, 다 넣은 뒤에 커서를 옮김
+    """
+
+    def __init__(self, resolver=None, cursors=None, queue=None, store=None):
+        self.resolver = resolver or SourceResolver()
+        self.cursors = cursors or SyncCursors()
+        self._queue = queue
+        self._store = store
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            from .job_queue import JobQueue
+            self._queue = JobQueue()
+        return self._queue
+
+    @property
+    def store(self):
+        if self._store is None:
+            from .output_store import get_output_store
+            self._store = get_output_store()
+        return self._store
+
+    def sync(self, url, priority=0, options=None, full=False):
+        """
+        URL 하나 동기화
+
+        Args:
+            full: True면 커서를 무시하고 전체 목록 확인 (저장된 요약/대기 중 작업은 여전히 건너뜀)
+
+        Returns:
+            {"source", "found", "enqueued": [video_id], "skipped_stored", "skipped_queued", "cursor"}
+        """
+        source, playlist_id, newest_first = self.resolver.locate(url)
+        if source is None:
+            videos = [{"video_id": parse_source(url)[1], "published_at": None, "title": ""}]
+        elif newest_first:
+            cursor = None if full else self.cursors.get(source)
+            since = cursor["last_published_at"] if cursor else None
+            videos = self.resolver.playlist_videos(playlist_id, since, newest_first)
+        else:
+            seen = set() if full else self.cursors.seen(source)
+            videos = [video for video in self.resolver.playlist_videos(playlist_id)
+                      if video["video_id"] not in seen]
+
+        # youtu.be/<id>, watch?v=<id>&t=... 등 어떤 URL로 넣은 작업이든 영상 ID로 비교
+        queued_ids = {extract_video_id(queued_url) for queued_url in self.queue.active_urls()}
+        report = {"source": source, "found": len(videos), "enqueued": [], "skipped_stored": [], "skipped_queued": []}
+        seen = set()
+        # API는 최신순이므로 오래된 영상부터 넣음 (우선순위가 같으면 먼저 넣은 작업이 먼저 처리됨)
+        for video in sorted(videos, key=lambda video: video["published_at"] or ""):
+            video_id = video["video_id"]
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+            if self.store.latest(video_id):
+                report["skipped_stored"].append(video_id)
+            elif video_id in queued_ids:
+                report["skipped_queued"].append(video_id)
+            else:
+                self.queue.enqueue(video_url(video_id), priority=priority, options=options)
+                report["enqueued"].append(video_id)
+
+        dated = [video for video in videos if video["published_at"]]
+        if source and not newest_first:
+            self.cursors.mark_seen(source, [video["video_id"] for video in videos])
+        elif source and dated:
+            newest = max(dated, key=lambda video: video["published_at"])
+            self.cursors.advance(source, newest["published_at"], newest["video_id"])
+        cursor = self.cursors.get(source) if source else None
+        report["cursor"] = cursor["last_published_at"] if cursor else None
+        logger.info(f"{source or url}: 새 영상 {report['found']}개 중 {len(report['enqueued'])}개 대기열 추가 "
+                    f"(저장됨 {len(report['skipped_stored'])}, 대기 중 {len(report['skipped_queued'])})")
+        return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="재생목록/채널 URL을 영상으로 확장해서 작업 대기열에 추가 (새 영상만)")
+    parser.add_argument("urls", nargs="+", help="YouTube 영상/재생목록/채널 URL")
+    parser.add_argument("--priority", type=int, default=0)
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--full", action="store_true", help="동기화 커서를 무시하고 전체 목록 확인")
+    parser.add_argument("--fixtures", help="YouTube API 대신 사용할 로컬 JSON (FixtureTransport 형식)")
+    parser.add_argument("--dry-run", action="store_true", help="대기열에 넣지 않고 영상 목록만 출력")
+    args = parser.parse_args(argv)
+
+    resolver = SourceResolver(FixtureTransport(args.fixtures) if args.fixtures else None)
+    if args.dry_run:
+        for url in args.urls:
+            source, videos = resolver.resolve(url)
+            print(f"# {source or url}: {len(videos)}개")
+            for video in videos:
+                print(f"{video['video_id']}  {video['published_at'] or '-'}  {video['title']}")
+        return 0
+
+    sync = SourceSync(resolver)
+    for url in args.urls:
+        report = sync.sync(url, priority=args.priority, options={"offline": args.offline}, full=args.full)
+        print(json.dumps({name: len(value) if isinstance(value, list) else value for name, value in report.items()},
+                         ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
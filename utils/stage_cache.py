@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from .metrics import CACHE_LOOKUPS
+from .vocabulary_lexicon import LEVEL_NAMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "stage_cache.db"
+
+# 결과에 영향을 주는 실행 설정 기본값 (환경변수 또는 shared["settings"]로 바꿈)
+DEFAULT_SETTINGS = {
+    "num_topics": 5,
+    "num_questions": 3,
+    "target_age": 5,
+    "review": True,
+    "levels": [],  # 여러 독자 수준을 한 번에 만들 때 등급 이름 목록 (예: ["5살", "초등학생"])
+}
+
+_SETTING_ENV = {
+    "num_topics": "NUM_TOPICS",
+    "num_questions": "NUM_QUESTIONS",
+    "target_age": "TARGET_AGE",
+    "review": "AI_REVIEW",
+    "levels": "AUDIENCE_LEVELS",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stages (
+    key TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+def _coerce(name, value):
+    if name == "levels":
+        levels = [level.strip() for level in value.split(",")] if isinstance(value, str) else list(value)
+        levels = list(dict.fromkeys(level for level in levels if level))
+        unknown = [level for level in levels if level not in LEVEL_NAMES.values()]
+        if unknown:
+            raise ValueError(f"알 수 없는 독자 수준: {', '.join(unknown)} (가능: {', '.join(LEVEL_NAMES.values())})")
+        return levels
+    if isinstance(DEFAULT_SETTINGS[name], bool):
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return bool(value)
+    return int(value)
+
+def pipeline_settings(overrides=None):
+    """
+    실행 설정 (기본값 < 환경변수 < overrides)
+
+    환경변수: NUM_TOPICS, NUM_QUESTIONS, TARGET_AGE, AI_REVIEW(1/0), AUDIENCE_LEVELS("5살,초등학생")
+
+    Args:
+        overrides: {"target_age": 10} 같은 실행별 설정 (보통 shared["settings"])
+
+    Returns:
+        {"num_topics", "num_questions", "target_age", "review", "levels"}
+    """
+    settings = dict(DEFAULT_SETTINGS)
+    for name, env_name in _SETTING_ENV.items():
+        if os.getenv(env_name):
+            settings[name] = _coerce(name, os.getenv(env_name))
+    for name, value in (overrides or {}).items():
+        if name not in DEFAULT_SETTINGS:
+            raise ValueError(f"알 수 없는 설정: {name} (가능: {', '.join(DEFAULT_SETTINGS)})")
+        if value is not None:
+            settings[name] = _coerce(name, value)
+    return settings
+
+def stage_key(stage, version, inputs, config):
+    """(단계 이름, 코드 버전, 입력, 설정) → 해시"""
+    data = json.dumps({"stage": stage, "version": version, "inputs": inputs, "config": config},
+                      sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def stage_cache_enabled():
+    """STAGE_CACHE=0이면 단계 결과를 재사용하지 않음 (벤치마크처럼 매번 계산해야 할 때)"""
+    return os.getenv("STAGE_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+class StageCache:
+    """
+    단계별 출력(shared 키 → 값)을 입력/설정/코드 버전 해시로 저장하는 영속 캐시
+
+    대상 연령만 바꿔서 다시 실행하면 자막 조회/주제 추출/Q&A 생성은 저장된 출력을 그대로 쓰고
+    입력이 바뀐 아이 친화 변환부터만 다시 계산합니다. 출력이 없던 키(None)도 기록해서 복원할 때 지웁니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("STAGE_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key, stage=None):
+        """저장된 출력 {shared 키: 값} 또는 None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT outputs FROM stages WHERE key = ?", (key,)).fetchone()
+        CACHE_LOOKUPS.labels("stage", "hit" if row else "miss").inc()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, stage, outputs):
+        """단계 출력 저장 (같은 키는 덮어씀)"""
+        payload = json.dumps(outputs, ensure_ascii=False, default=str)
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO stages (key, stage, outputs, created_at) VALUES (?, ?, ?, ?)",
+                         (key, stage, payload, time.time()))
+
+    def invalidate(self, stage=None):
+        """저장된 출력 삭제 (stage가 없으면 전부)"""
+        with self._lock, self._connect() as conn:
+            if stage:
+                conn.execute("DELETE FROM stages WHERE stage = ?", (stage,))
+            else:
+                conn.execute("DELETE FROM stages")
+
+    def count(self, stage=None):
+        with self._connect() as conn:
+            if stage:
+                return conn.execute("SELECT COUNT(*) FROM stages WHERE stage = ?", (stage,)).fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM stages").fetchone()[0]
+
+def format_stage_log(stage_log):
+    """shared["stage_log"] → 로그용 한 줄 (재사용한 단계 / 다시 계산한 단계)"""
+    reused = [entry["stage"] for entry in stage_log if entry["status"] == "reused"]
+    computed = [entry["stage"] for entry in stage_log if entry["status"] != "reused"]
+    return f"재사용: {', '.join(reused) or '없음'} / 계산: {', '.join(computed) or '없음'}"
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_stage_cache():
+    """프로세스 전체에서 공유하는 단계 캐시 (STAGE_CACHE_PATH, 기본 stage_cache.db)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = StageCache()
+    return _cache
@@ -1,4 +1,4 @@
-from .call_llm import call_llm, call_llm_mock
+from .response_parser import call_llm_for_items
 import os
 
 def extract_interesting_topics(transcript: str, num_topics: int = 5, use_mock: bool = False) -> list:
@@ -29,41 +29,31 @@ def extract_interesting_topics(transcript: str, num_topics: int = 5, use_mock: b
 
 다음 JSON 형식으로만 응답해주세요 (다른 설명 없이):
 ```json
-[
-    {{
-        "title": "주제 제목 (간결하고 명확하게)",
-        "content": "해당 주제와 관련된 트랜스크립트의 핵심 내용 요약"
-    }},
-    {{
-        "title": "두 번째 주제 제목",
-        "content": "두 번째 주제 관련 내용 요약"
-    }}
-]
+{{
+    "topics": [
+        {{
+            "title": "주제 제목 (간결하고 명확하게)",
+            "content": "해당 주제와 관련된 트랜스크립트의 핵심 내용 요약"
+        }},
+        {{
+            "title": "두 번째 주제 제목",
+            "content": "두 번째 주제 관련 내용 요약"
+        }}
+    ]
+}}
 ```
 """
     
     try:
-        if use_mock:
-            response = call_llm_mock(prompt)
-        else:
-            response = call_llm(prompt, model="gpt-4")
-            
-        # JSON 부분만 추출
-        if "```json" in response:
-            json_start = response.find("```json") + 7
-            json_end = response.find("```", json_start)
-            json_str = response[json_start:json_end].strip()
-        else:
-            json_start = response.find('[')
-            json_end = response.rfind(']') + 1
-            json_str = response[json_start:json_end] if json_start != -1 and json_end != -1 else response
-        
-        if json_str:
-            import json
-            topics = json.loads(json_str)
-            return topics[:num_topics]  # 요청한 개수만큼만 반환
-        else:
-            return []
+        topics = call_llm_for_items(
+            prompt,
+            required_fields=["title", "content"],
+            expected_count=num_topics,
+            list_key="topics",
+            stage="topics",
+            use_mock=use_mock
+        )
+        return topics
     except Exception as e:
         print(f"Error extracting topics: {e}")
         return []
@@ -1,6 +1,6 @@
 import re
 import os
-from .call_llm import call_llm
+from .model_router import call_llm_for_stage
 
 # 자주 틀리는 단어 사전 (한국어 YouTube 자막 기준)
 COMMON_CORRECTIONS = {
@@ -108,7 +108,7 @@ corrections:
 """
     
     try:
-        response = call_llm(prompt)
+        response = call_llm_for_stage("correction", prompt)
         
         # YAML 부분 추출
         if "```yaml" in response:
@@ -0,0 +1,309 @@
+import os
+import re
+import threading
+from collections import deque
+
+# 등급: 1=5살, 2=초등학생, 3=중학생, 4=고등학생, 5=성인
+LEVEL_NAMES = {1: "5살", 2: "초등학생", 3: "중학생", 4: "고등학생", 5: "성인"}
+# 등급별 대표 연령 (여러 수준을 한 번에 만들 때 등급 이름 → target_age)
+LEVEL_AGES = {1: 5, 2: 10, 3: 14, 4: 17, 5: 20}
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "data", "korean_vocabulary.tsv")
+
+# 평균 문장 길이(글자 수) 기준 읽기 등급 상한
+SENTENCE_LENGTH_LEVELS = [(30, 1), (45, 2), (60, 3), (80, 4)]
+
+# 받침 유무에 따라 바뀌는 조사 (받침 있음, 받침 없음)
+PARTICLE_PAIRS = [("이", "가"), ("을", "를"), ("은", "는"), ("과", "와")]
+
+# 글자 중 한글이 이 비율 이상이면 한국어 문장으로 봄
+MIN_HANGUL_RATIO = 0.5
+
+_SENTENCE_SPLIT = re.compile(r'[.!?\n]+')
+_LETTER = re.compile(r'[^\W\d_]')
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+def age_to_level(target_age: int) -> int:
+    """대상 연령을 어휘 등급으로 변환"""
+    if target_age <= 7:
+        return 1
+    if target_age <= 13:
+        return 2
+    if target_age <= 16:
+        return 3
+    if target_age <= 19:
+        return 4
+    return 5
+
+def _has_final_consonant(char: str) -> bool:
+    """한글 음절의 받침 유무 (한글이 아니면 받침 없음으로 취급)"""
+    code = ord(char) - 0xAC00
+    return 0 <= code < 11172 and code % 28 != 0
+
+def _has_rieul_final(char: str) -> bool:
+    code = ord(char) - 0xAC00
+    return 0 <= code < 11172 and code % 28 == 8
+
+def _is_hangul(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+def hangul_ratio(text: str) -> float:
+    """글자(숫자/기호 제외) 중 한글 음절 비율 (한국어 문장인지 가늠, 글자가 없으면 0)"""
+    letters = _LETTER.findall(text or "")
+    return sum(1 for char in letters if _is_hangul(char)) / len(letters) if letters else 0.0
+
+def _adjust_particle(replacement: str, following: str) -> tuple:
+    """
+    치환된 단어 뒤의 조사를 새 단어의 받침에 맞게 고침
+
+    Returns:
+        (고친 조사, 원문에서 건너뛸 글자 수)
+    """
+    if not following or not replacement:
+        return "", 0
+
+    last = replacement[-1]
+    has_final = _has_final_consonant(last)
+
+    # 으로/로
+    if following.startswith("으로") or following.startswith("로"):
+        consumed = 2 if following.startswith("으로") else 1
+        rest = following[consumed:consumed + 1]
+        if rest and _is_hangul(rest):
+            return "", 0
+        particle = "으로" if has_final and not _has_rieul_final(last) else "로"
+        return particle, consumed
+
+    # 조사 뒤에 한글이 바로 이어지면 (예: "이에요") 건드리지 않음
+    first = following[0]
+    if len(following) > 1 and _is_hangul(following[1]):
+        return "", 0
+
+    for with_final, without_final in PARTICLE_PAIRS:
+        if first in (with_final, without_final):
+            return (with_final if has_final else without_final), 1
+
+    return "", 0
+
+class VocabularyLexicon:
+    """
+    등급별 어휘 사전을 Aho-Corasick 오토마톤으로 컴파일한 엔진
+
+    텍스트를 한 번만 훑어서 어려운 단어를 찾고, 읽기 등급을 매기고,
+    쉬운 표현으로 치환합니다 (단어마다 str.replace를 반복하지 않음).
+    """
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries: [(단어, 등급, 쉬운 표현 또는 ""), ...]
+        """
+        self.entries = {}
+        for word, level, replacement in entries:
+            if word:
+                self.entries[word] = (int(level), replacement)
+
+        # goto 테이블, 실패 링크, 각 노드에서 끝나는 단어들
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for word in self.entries:
+            self._add_word(word)
+        self._build_fail_links()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_LEXICON_PATH):
+        """TSV 파일(단어, 등급, 쉬운 표현)에서 사전 로드"""
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line.strip() or line.startswith("#"):
+                    continue
+                parts = line.split("\t")
+                word = parts[0].strip()
+                level = int(parts[1]) if len(parts) > 1 and parts[1].strip() else 5
+                replacement = parts[2].strip() if len(parts) > 2 else ""
+                entries.append((word, level, replacement))
+        return cls(entries)
+
+    def _add_word(self, word):
+        node = 0
+        for char in word:
+            if char not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = len(self._goto) - 1
+            node = self._goto[node][char]
+        self._output[node].append(word)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_matches(self, text: str) -> list:
+        """
+        사전 단어 위치 찾기 (겹치면 먼저 시작하고 더 긴 단어 우선)
+
+        Returns:
+            [(시작, 끝, 단어), ...] - 시작 위치 순서
+        """
+        candidates = []
+        node = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for word in output[node]:
+                start = i - len(word) + 1
+                if not self._word_boundary(text, word, start, i + 1):
+                    continue
+                candidates.append((start, i + 1, word))
+
+        candidates.sort(key=lambda match: (match[0], -(match[1] - match[0])))
+        matches = []
+        last_end = 0
+        for start, end, word in candidates:
+            if start >= last_end:
+                matches.append((start, end, word))
+                last_end = end
+        return matches
+
+    @staticmethod
+    def _word_boundary(text, word, start, end):
+        """
+        다른 단어 안에 들어있는 경우 제외
+        
+        - 영문 약어(AI 등)는 앞뒤가 영문/숫자가 아니어야 함
+        - 한글 단어는 앞 글자가 한글이 아니어야 함 (뒤에는 조사가 붙을 수 있음)
+        """
+        before = text[start - 1] if start > 0 else " "
+        if word.isascii():
+            after = text[end] if end < len(text) else " "
+            return not (before.isascii() and before.isalnum()) and not (after.isascii() and after.isalnum())
+        return not _is_hangul(before)
+
+    def analyze(self, text: str, target_age: int = 5) -> dict:
+        """
+        읽기 등급 점수 계산과 쉬운 표현 치환을 한 번에 수행
+
+        Args:
+            text: 검사할 텍스트
+            target_age: 대상 연령
+
+        Returns:
+            {
+                "reading_level": int,        # 어휘/문장 길이 기준 등급 (1~5)
+                "target_level": int,
+                "meets_target": bool,        # 원문이 이미 대상 연령 수준의 한국어인지
+                "hangul_ratio": float,       # 글자 중 한글 비율 (영어 등 다른 언어는 낮음)
+                "hard_words": [str],         # 대상 등급보다 어려운 단어
+                "unreplaced_words": [str],   # 쉬운 표현이 없어 남은 단어
+                "word_count": int,
+                "simplified_text": str
+            }
+        """
+        target_level = age_to_level(target_age)
+        matches = self.find_matches(text) if text else []
+
+        vocab_level = 1
+        hard_words = []
+        unreplaced_words = []
+        pieces = []
+        cursor = 0
+
+        for start, end, word in matches:
+            if start < cursor:
+                # 앞 단어의 조사를 고치면서 이미 소비한 위치
+                continue
+            level, replacement = self.entries[word]
+            vocab_level = max(vocab_level, level)
+            if level <= target_level:
+                continue
+
+            hard_words.append(word)
+            if not replacement:
+                unreplaced_words.append(word)
+                continue
+
+            pieces.append(text[cursor:start])
+            pieces.append(replacement)
+            particle, consumed = _adjust_particle(replacement, text[end:end + 3])
+            if consumed:
+                pieces.append(particle)
+            cursor = end + consumed
+
+        pieces.append(text[cursor:])
+        sentence_level = self._sentence_level(text)
+        reading_level = max(vocab_level, sentence_level)
+        # 사전은 한국어 낱말만 알므로 영어 문장은 쉬워 보임 — 한국어일 때만 이미 수준에 맞는 것으로 봄
+        korean = hangul_ratio(text)
+
+        return {
+            "reading_level": reading_level,
+            "target_level": target_level,
+            "meets_target": reading_level <= target_level and korean >= MIN_HANGUL_RATIO,
+            "hangul_ratio": round(korean, 3),
+            "hard_words": hard_words,
+            "unreplaced_words": unreplaced_words,
+            "word_count": len(text.split()),
+            "simplified_text": "".join(pieces)
+        }
+
+    @staticmethod
+    def _sentence_level(text):
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s.strip()]
+        if not sentences:
+            return 1
+        average_length = sum(len(s) for s in sentences) / len(sentences)
+        for max_length, level in SENTENCE_LENGTH_LEVELS:
+            if average_length <= max_length:
+                return level
+        return 5
+
+    def simplify(self, text: str, target_age: int = 5) -> str:
+        """대상 연령보다 어려운 단어를 쉬운 표현으로 한 번에 치환"""
+        return self.analyze(text, target_age)["simplified_text"]
+
+    def find_hard_words(self, text: str, target_age: int = 5) -> list:
+        """대상 연령보다 어려운 단어 목록"""
+        target_level = age_to_level(target_age)
+        return [word for _, _, word in self.find_matches(text) if self.entries[word][0] > target_level]
+
+def get_lexicon() -> VocabularyLexicon:
+    """기본 어휘 사전 (처음 한 번만 컴파일)"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = VocabularyLexicon.from_file(os.getenv("VOCABULARY_LEXICON_PATH", DEFAULT_LEXICON_PATH))
+    return _lexicon
+
+def main():
+    """테스트용 함수"""
+    lexicon = get_lexicon()
+    print(f"사전 단어 수: {len(lexicon.entries)}")
+
+    text = "인공지능은 데이터를 분석해서 효율적인 알고리즘을 만들어요. AIR는 공기예요."
+    result = lexicon.analyze(text, target_age=5)
+    print(f"원문: {text}")
+    print(f"읽기 등급: {result['reading_level']} ({LEVEL_NAMES[result['reading_level']]})")
+    print(f"어려운 단어: {result['hard_words']}")
+    print(f"쉽게 바꾼 글: {result['simplified_text']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import re
-import requests
-from bs4 import BeautifulSoup
-from youtube_transcript_api import YouTubeTranscriptApi
+import time
+from .metrics import VIDEO_FETCHES, VIDEO_FETCH_DURATION
+
+# 검색/근거 확인에 쓰는 자막 구간 길이 (낱말 수)
+DEFAULT_PASSAGE_WORDS = 80
 
 def extract_video_id(url):
     """Extract YouTube video ID from URL"""
@@ -11,11 +13,22 @@ def extract_video_id(url):
 
 def get_video_info(url):
     """Get video title, transcript and thumbnail with multi-language support"""
+    start_time = time.perf_counter()
+    video_info = _fetch_video_info(url)
+    VIDEO_FETCH_DURATION.observe(time.perf_counter() - start_time)
+    VIDEO_FETCHES.labels("error" if "error" in video_info else "ok").inc()
+    return video_info
+
+def _fetch_video_info(url):
     video_id = extract_video_id(url)
     if not video_id:
         return {"error": "Invalid YouTube URL"}
     
     try:
+        # 네트워크/파싱 라이브러리는 실제로 가져올 때 로드 (extract_video_id만 쓰는 곳은 가볍게)
+        import requests
+        from bs4 import BeautifulSoup
+        
         # Get title using BeautifulSoup
         response = requests.get(url)
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -26,11 +39,12 @@ def get_video_info(url):
         thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
         
         # Get transcript with multi-language support
-        transcript, language_used = get_transcript_multi_language(video_id)
+        transcript, language_used, segments = get_transcript_multi_language(video_id)
         
         return {
             "title": title,
             "transcript": transcript,
+            "segments": segments,
             "thumbnail_url": thumbnail_url,
             "video_id": video_id,
             "language_used": language_used
@@ -38,12 +52,19 @@ def get_video_info(url):
     except Exception as e:
         return {"error": str(e)}
 
+def _segments(transcript_list):
+    return [{"text": entry["text"], "start": entry.get("start"), "duration": entry.get("duration")}
+            for entry in transcript_list]
+
 def get_transcript_multi_language(video_id):
     """
     Try to get transcript in multiple languages
     Priority: Korean → English → Japanese
-    Returns: (transcript_text, language_used)
+    Returns: (transcript_text, language_used, segments)
+        segments: [{"text", "start", "duration"}] (자막 줄별 시작 시각, 근거 인용용)
     """
+    from youtube_transcript_api import YouTubeTranscriptApi
+    
     # Priority order: Korean, English, Japanese only
     language_priority = ['ko', 'en', 'ja']
     
@@ -55,7 +76,7 @@ def get_transcript_multi_language(video_id):
                 transcript = " ".join([entry["text"] for entry in transcript_list])
                 language_name = {'ko': 'Korean', 'en': 'English', 'ja': 'Japanese'}[lang]
                 print(f"✅ Found {language_name} ({lang}) transcript")
-                return transcript, lang
+                return transcript, lang, _segments(transcript_list)
             except:
                 continue
         
@@ -80,7 +101,7 @@ def get_transcript_multi_language(video_id):
                 transcript = " ".join([entry["text"] for entry in transcript_list])
                 language_name = {'ko': 'Korean', 'en': 'English', 'ja': 'Japanese'}[auto_generated_found]
                 print(f"✅ Found auto-generated {language_name} ({auto_generated_found}) transcript")
-                return transcript, auto_generated_found
+                return transcript, auto_generated_found, _segments(transcript_list)
             
             # If still no luck, provide helpful error message
             suggestion = "🔍 **해결 방법:**\n"
@@ -101,6 +122,35 @@ def get_transcript_multi_language(video_id):
     except Exception as e:
         raise Exception(f"😅 비디오 자막을 가져올 수 없어요!\n\n🔍 **해결 방법:**\n1. 다른 YouTube 비디오를 시도해보세요\n2. 자막이 있는 교육용 비디오를 추천합니다\n3. 최신 업로드 비디오를 선택해보세요\n\n📝 **기술적 오류**: {str(e)}")
 
+def transcript_passages(video_info, words=DEFAULT_PASSAGE_WORDS):
+    """
+    자막 → 검색 단위 구간 [{"text", "start"}]
+
+    자막 줄(segments)이 있으면 줄을 words낱말 이상이 될 때까지 묶고 첫 줄의 시작 시각을 쓰며,
+    없으면 words낱말씩 자르고 start는 자막에서의 위치 비율 × 영상 길이로 추정한 초 (길이를 모르면 None)
+    """
+    if video_info.get("segments"):
+        passages, texts, start, count = [], [], None, 0
+        for segment in video_info["segments"]:
+            if not texts:
+                start = segment.get("start")
+            texts.append(segment["text"].strip())
+            count += len(segment["text"].split())
+            if count >= words:
+                passages.append({"text": " ".join(texts), "start": start})
+                texts, count = [], 0
+        if texts:
+            passages.append({"text": " ".join(texts), "start": start})
+        return passages
+
+    tokens = (video_info.get("transcript") or "").split()
+    duration = video_info.get("duration")
+    passages = []
+    for offset in range(0, len(tokens), words):
+        start = round(float(duration) * offset / len(tokens), 1) if duration else None
+        passages.append({"text": " ".join(tokens[offset:offset + words]), "start": start})
+    return passages
+
 if __name__ == "__main__":
     # Test with Korean video
     test_url = "https://youtu.be/FI8ozR1NLbA?si=EBTyq171a-vdTQB5"